@@ -106,8 +106,9 @@ if not CELERY_BROKER_URL:
     CELERY_BROKER_URL = f"amqp://{ os.getenv('RABBITMQ_USER') }:{ os.getenv('RABBITMQ_PASS') }@taiga-async-rabbitmq:5672/taiga"
 
 CELERY_RESULT_BACKEND = None # for a general installation, we don't need to store the results
-CELERY_ACCEPT_CONTENT = ['pickle', ]  # Values are 'pickle', 'json', 'msgpack' and 'yaml'
-CELERY_TASK_SERIALIZER = "pickle"
+CELERY_ACCEPT_CONTENT = ['json', ]  # Values are 'pickle', 'json', 'msgpack' and 'yaml'
+CELERY_TASK_SERIALIZER = "json"  # Tasks arguments are ids and JSON values, see taiga.base.utils.task_args
+CELERY_RESULT_ACCEPT_CONTENT = ['pickle', 'json', ]
 CELERY_RESULT_SERIALIZER = "pickle"
 CELERY_TIMEZONE = os.getenv('CELERY_TIMEZONE', 'Europe/Madrid')
 CELERY_TASK_DEFAULT_QUEUE = 'tasks'
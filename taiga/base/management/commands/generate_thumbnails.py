@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+# Examples:
+# python manage.py generate_thumbnails
+# python manage.py generate_thumbnails --async
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from taiga.base.tasks import generate_instance_thumbnails
+from taiga.base.utils.thumbnails import get_thumbnailed_fields
+
+
+class Command(BaseCommand):
+    help = 'Generate the thumbnails of the attachments, project logos and user photos without them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--async',
+                            action='store_true',
+                            dest='async',
+                            default=False,
+                            help='Generate them with celery tasks')
+
+    @override_settings(DEBUG=False)
+    def handle(self, *args, **options):
+        count = 0
+        for model_label, (field_name, _) in get_thumbnailed_fields().items():
+            model = apps.get_model(model_label)
+            queryset = (model.objects.exclude(**{"{}__isnull".format(field_name): True})
+                                     .exclude(**{field_name: ""})
+                                     .filter(**{"{}_thumbnails__isnull".format(field_name): True}))
+
+            for pk in queryset.values_list("pk", flat=True).iterator():
+                if options["async"]:
+                    generate_instance_thumbnails.delay(model_label, pk)
+                else:
+                    generate_instance_thumbnails(model_label, pk)
+                count += 1
+
+        self.stdout.write(self.style.SUCCESS("Thumbnails of {} files generated".format(count)))
@@ -8,6 +8,9 @@
 from collections import namedtuple
 
 from django.db import connection
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.core.exceptions import FieldDoesNotExist
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.exceptions import EmptyResultSet
 from taiga.base.api import serializers
@@ -16,6 +19,13 @@ from taiga.base.fields import Field, MethodField
 Neighbor = namedtuple("Neighbor", "left right")
 
 
+# Fields loaded for every neighbor, it's all NeighborSerializer needs
+NEIGHBOR_FIELDS = ("id", "ref", "subject")
+
+# Max depth following the default ordering of related models
+MAX_ORDERING_DEPTH = 3
+
+
 def get_neighbors(obj, results_set=None):
     """Get the neighbors of a model instance.
 
@@ -27,18 +37,198 @@ def get_neighbors(obj, results_set=None):
 
     :return: Tuple `<left neighbor>, <right neighbor>`. Left and right neighbors can be `None`.
     """
-    if results_set is None:
+    if results_set is None or results_set.query.is_empty():
+        # Generate a not empty queryset
         results_set = type(obj).objects.get_queryset()
 
     # Neighbors calculation is at least at project level
-    results_set = results_set.filter(project_id=obj.project.id)
+    results_set = results_set.filter(project_id=obj.project_id)
+
+    ordering = _get_keyset_ordering(results_set)
+    if ordering is None:
+        return _get_neighbors_by_row_number(obj, results_set)
+
+    lookups = [lookup for lookup, descending, nullable in ordering]
+    values = results_set.filter(id=obj.id).values_list(*lookups).first()
+    if values is None:
+        return Neighbor(None, None)
+
+    left = _get_keyset_neighbor(results_set, ordering, values, forward=False)
+    right = _get_keyset_neighbor(results_set, ordering, values, forward=True)
+    return Neighbor(left, right)
+
+
+def _get_keyset_ordering(results_set):
+    """
+    Get the ordering of `results_set` as a list of `(lookup, descending, nullable)`
+    over model fields, always ending with the primary key so it's a total order.
+
+    Return `None` if the ordering can't be used for a keyset lookup (random,
+    raw SQL, annotations, expressions...).
+    """
+    query = results_set.query
+    if query.extra_order_by or query.distinct_fields:
+        return None
+
+    if query.order_by:
+        order_by = query.order_by
+    elif query.default_ordering:
+        order_by = query.get_meta().ordering
+    else:
+        order_by = []
+
+    ordering = []
+    for item in order_by:
+        if not _is_field_ordering_item(item):
+            return None
+
+        name = item.lstrip("-")
+        if name.split(LOOKUP_SEP)[0] in query.annotations or name in query.extra_select:
+            return None
+
+        resolved = _resolve_ordering_item(query.model, name, item.startswith("-"))
+        if resolved is None:
+            return None
+        ordering += resolved
+
+    pk_name = query.get_meta().pk.name
+    if not any(lookup == pk_name for lookup, descending, nullable in ordering):
+        ordering.append((pk_name, False, False))
+    return ordering
+
+
+def _is_field_ordering_item(item):
+    # Random, raw SQL and expression orderings can't be resolved to fields
+    return isinstance(item, str) and item != "?" and "." not in item
+
+
+def _resolve_lookup(model, name):
+    """
+    Get the field at the end of the lookup `name` and the lookup with the
+    `pk` aliases replaced, or `None` if it isn't a chain of concrete fields.
+    """
+    parts = name.split(LOOKUP_SEP)
+    opts = model._meta
+    field = None
+    nullable = False
+    for index, part in enumerate(parts):
+        if field is not None:
+            if not field.is_relation:
+                return None
+            opts = field.related_model._meta
+
+        if part == "pk":
+            part = opts.pk.name
+
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            return None
+
+        if not field.concrete or field.many_to_many:
+            return None
+
+        nullable = nullable or field.null
+        parts[index] = part
+
+    return LOOKUP_SEP.join(parts), field, nullable
+
+
+def _resolve_ordering_item(model, name, descending, prefix="", nullable=False, depth=0):
+    # Follow the lookup to the column Django orders by. Relations are ordered by
+    # the default ordering of the related model (or its pk if it has none).
+    resolved_lookup = _resolve_lookup(model, name)
+    if resolved_lookup is None:
+        return None
+
+    lookup, field, field_nullable = resolved_lookup
+    lookup = prefix + lookup
+    nullable = nullable or field_nullable
+
+    related_ordering = field.related_model._meta.ordering if field.is_relation else None
+    if not related_ordering:
+        return [(lookup, descending, nullable)]
+
+    if depth >= MAX_ORDERING_DEPTH:
+        return None
+
+    resolved = []
+    for item in related_ordering:
+        if not _is_field_ordering_item(item):
+            return None
+
+        item_resolved = _resolve_ordering_item(field.related_model,
+                                               item.lstrip("-"),
+                                               descending != item.startswith("-"),
+                                               prefix=lookup + LOOKUP_SEP,
+                                               nullable=nullable,
+                                               depth=depth + 1)
+        if item_resolved is None:
+            return None
+        resolved += item_resolved
+    return resolved
+
+
+def _get_keyset_neighbor(results_set, ordering, values, forward):
+    # Postgres sorts NULL values as if they were larger than any other value
+    # (NULLS LAST for ASC, NULLS FIRST for DESC), the conditions mimic it.
+    condition = Q(pk__in=[])
+    equal_to_previous = Q()
+    for (lookup, descending, nullable), value in zip(ordering, values):
+        if forward != descending:
+            if value is None:
+                after = Q(pk__in=[])
+            elif nullable:
+                after = Q(**{lookup + "__gt": value}) | Q(**{lookup + "__isnull": True})
+            else:
+                after = Q(**{lookup + "__gt": value})
+        else:
+            if value is None:
+                after = Q(**{lookup + "__isnull": False})
+            else:
+                after = Q(**{lookup + "__lt": value})
+
+        condition |= equal_to_previous & after
+
+        if value is None:
+            equal_to_previous &= Q(**{lookup + "__isnull": True})
+        else:
+            equal_to_previous &= Q(**{lookup: value})
+
+    order_by = []
+    for lookup, descending, nullable in ordering:
+        order_by.append(lookup if forward != descending else "-" + lookup)
+
+    model = results_set.model
+    only_fields = [f for f in NEIGHBOR_FIELDS if _has_field(model, f)]
+
+    queryset = (results_set.filter(condition)
+                           .select_related(None)
+                           .prefetch_related(None)
+                           .order_by(*order_by)
+                           .only(*only_fields))
+    # Avoid calculating the extra columns of the results set for the neighbor
+    queryset.query.set_extra_mask(())
+    queryset.query.set_annotation_mask(())
+
+    return queryset.first()
+
+
+def _has_field(model, name):
+    try:
+        model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return True
+
 
+def _get_neighbors_by_row_number(obj, results_set):
     compiler = results_set.query.get_compiler('default')
     try:
         base_sql, base_params = compiler.as_sql(with_col_aliases=True)
     except EmptyResultSet:
         # Generate a not empty queryset
-        results_set = type(obj).objects.get_queryset().filter(project_id=obj.project.id)
+        results_set = type(obj).objects.get_queryset().filter(project_id=obj.project_id)
         compiler = results_set.query.get_compiler('default')
         base_sql, base_params = compiler.as_sql(with_col_aliases=True)
 
@@ -5,18 +5,67 @@
 #
 # Copyright (c) 2021-present Kaleidos INC
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import signals
+
 from .cleanup_files import cleanup_post_delete
 from easy_thumbnails.files import get_thumbnailer
 
+from taiga.base.utils.thumbnails import get_thumbnailed_fields
+
 
 def _delete_thumbnail_files(**kwargs):
     thumbnailer = get_thumbnailer(kwargs["file"])
     thumbnailer.delete_thumbnails()
 
 
+def _generate_thumbnails_on_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+
+    model_label = sender._meta.label
+    field_name, _ = get_thumbnailed_fields()[model_label]
+    if update_fields is not None and field_name not in update_fields:
+        return
+
+    thumbnails_field_name = "{}_thumbnails".format(field_name)
+    file_obj = getattr(instance, field_name)
+    thumbnails = getattr(instance, thumbnails_field_name) or {}
+    if thumbnails.get("source", None) == (file_obj.name if file_obj else None):
+        return
+
+    if not file_obj:
+        sender.objects.filter(pk=instance.pk).update(**{thumbnails_field_name: None})
+        setattr(instance, thumbnails_field_name, None)
+        return
+
+    from taiga.base.tasks import generate_instance_thumbnails
+
+    if settings.CELERY_ENABLED:
+        # Pending until the task stores them
+        thumbnails = {"source": file_obj.name, "aliases": {}}
+        sender.objects.filter(pk=instance.pk).update(**{thumbnails_field_name: thumbnails})
+        setattr(instance, thumbnails_field_name, thumbnails)
+        transaction.on_commit(lambda: generate_instance_thumbnails.delay(model_label, instance.pk))
+    else:
+        generate_instance_thumbnails(model_label, instance.pk)
+        instance.refresh_from_db(fields=[thumbnails_field_name])
+
+
 def connect_thumbnail_signals():
     cleanup_post_delete.connect(_delete_thumbnail_files)
 
+    for model_label in get_thumbnailed_fields().keys():
+        signals.post_save.connect(_generate_thumbnails_on_save,
+                                  sender=model_label,
+                                  dispatch_uid="generate_thumbnails_{}".format(model_label))
+
 
 def disconnect_thumbnail_signals():
     cleanup_post_delete.disconnect(_delete_thumbnail_files)
+
+    for model_label in get_thumbnailed_fields().keys():
+        signals.post_save.disconnect(_generate_thumbnails_on_save,
+                                     sender=model_label,
+                                     dispatch_uid="generate_thumbnails_{}".format(model_label))
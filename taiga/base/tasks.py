@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+from django.apps import apps
+
+from taiga.celery import app
+
+from .utils.thumbnails import get_thumbnailed_fields
+from .utils.thumbnails import generate_thumbnails
+
+
+@app.task
+def generate_instance_thumbnails(model_label, pk):
+    field_name, thumbnailer_sizes = get_thumbnailed_fields()[model_label]
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return
+
+    file_obj = getattr(instance, field_name)
+    if not file_obj:
+        return
+
+    thumbnails = generate_thumbnails(file_obj, thumbnailer_sizes)
+    # Don't store them if the file has been changed meanwhile
+    (model.objects.filter(pk=pk, **{field_name: file_obj.name})
+                  .update(**{"{}_thumbnails".format(field_name): thumbnails}))
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+import csv
+import io
+
+
+class _EchoBuffer:
+    """
+    A file-like object that returns what is written instead of keeping it.
+    """
+    def write(self, value):
+        return value
+
+
+def iter_csv(fieldnames, rows, *, chunk_size:int=64 * 1024):
+    """
+    Generate a CSV file with a header and the `rows` (dicts) in chunks of
+    about `chunk_size` characters, ready for a `StreamingHttpResponse`.
+    """
+    writer = csv.DictWriter(_EchoBuffer(), fieldnames=fieldnames)
+
+    chunk = [writer.writeheader()]
+    chunk_length = len(chunk[0])
+    for row in rows:
+        line = writer.writerow(row)
+        chunk.append(line)
+        chunk_length += len(line)
+
+        if chunk_length >= chunk_size:
+            yield "".join(chunk)
+            chunk = []
+            chunk_length = 0
+
+    if chunk:
+        yield "".join(chunk)
+
+
+def csv_to_string_io(chunks):
+    """
+    Write a CSV generated by `iter_csv` in a `io.StringIO`.
+    """
+    csv_data = io.StringIO()
+    for chunk in chunks:
+        csv_data.write(chunk)
+    return csv_data
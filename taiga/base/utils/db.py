@@ -63,6 +63,27 @@ def reload_attribute(model_instance, attr_name):
     return qs.values_list(attr_name, flat=True)[0]
 
 
+def increment_attribute_if_matches(model_instance, attr_name, expected_value):
+    """Increment the stored value of a model instance attribute only if it
+    is still `expected_value`, with a single conditional UPDATE.
+
+    :param model_instance: Model instance.
+    :param attr_name: Attribute name to increment.
+    :param expected_value: Value the attribute must have in the database.
+    :return: The new value or None if the stored one doesn't match.
+    """
+    opts = model_instance._meta
+    qn = connection.ops.quote_name
+    sql = "UPDATE {table} SET {column} = {column} + 1 WHERE {pk} = %s AND {column} = %s RETURNING {column}".format(
+        table=qn(opts.db_table), column=qn(opts.get_field(attr_name).column), pk=qn(opts.pk.column))
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [model_instance.pk, expected_value])
+        row = cursor.fetchone()
+
+    return row[0] if row else None
+
+
 @transaction.atomic
 def save_in_bulk(instances, callback=None, precall=None, **save_options):
     """Save a list of model instances.
@@ -6,6 +6,7 @@
 # Copyright (c) 2021-present Kaleidos INC
 
 from functools import wraps, partial
+from itertools import islice
 from django.core.paginator import Paginator
 
 
@@ -36,6 +37,19 @@ def split_by_n(seq:str, n:int):
         seq = seq[n:]
 
 
+def iter_in_chunks(iterable, size:int):
+    """
+    A generator to divide any iterable, even a lazy one, into lists of
+    up to `size` items.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def iter_queryset(queryset, itersize:int=20):
     """
     Util function for iterate in more efficient way
@@ -46,3 +60,24 @@ def iter_queryset(queryset, itersize:int=20):
         page = paginator.page(page_num)
         for element in page.object_list:
             yield element
+
+
+def iter_queryset_in_batches(queryset, batch_size:int=500):
+    """
+    Iterate over all the objects of a queryset, keeping its order, without
+    loading them all at once.
+
+    The ids are read with a server-side cursor and every batch of objects is
+    loaded with its own query, so `select_related`, `prefetch_related` and the
+    extra columns of the queryset are applied batch by batch.
+    """
+    ids = queryset.values_list("id", flat=True).iterator(chunk_size=batch_size)
+    while True:
+        batch_ids = list(islice(ids, batch_size))
+        if not batch_ids:
+            return
+
+        objects = {obj.id: obj for obj in queryset.filter(id__in=batch_ids).order_by()}
+        for id in batch_ids:
+            if id in objects:
+                yield objects[id]
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+# Celery tasks arguments are serialized as JSON, so model instances are sent
+# as references ([typename, pk]) and fetched again in the worker.
+
+from collections import defaultdict
+
+from django.apps import apps
+
+from . import json
+from .db import get_typename_for_model_class
+
+
+def dump_instance_pk(model, pk):
+    """
+    Get the reference to the instance `pk` of `model` without fetching it.
+    """
+    if pk is None:
+        return None
+    return [get_typename_for_model_class(model), pk]
+
+
+def dump_instance(instance):
+    """
+    Get a reference to a model instance that can be sent as a task argument.
+    """
+    if instance is None:
+        return None
+    # Not type(instance), it can be a lazy object like request.user
+    return dump_instance_pk(instance._meta.model, instance.pk)
+
+
+def load_instances(*refs):
+    """
+    Fetch the model instances of the references made by `dump_instance`,
+    with one query per model. Returns a list with None for the references to
+    missing instances.
+    """
+    pks_by_model = defaultdict(set)
+    for ref in refs:
+        if ref is not None:
+            pks_by_model[ref[0]].add(ref[1])
+
+    instances = {}
+    for typename, pks in pks_by_model.items():
+        model = apps.get_model(typename)
+        for pk, instance in model.objects.in_bulk(list(pks)).items():
+            instances[(typename, pk)] = instance
+
+    return [instances.get(tuple(ref), None) if ref is not None else None for ref in refs]
+
+
+def dump_value(value):
+    """
+    Convert a value with dates, decimals, etc. to the JSON compatible value
+    the API would render.
+    """
+    return json.loads(json.dumps(value))
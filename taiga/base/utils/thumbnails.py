@@ -8,6 +8,8 @@
 import os
 
 from psd_tools import PSDImage
+from django.conf import settings
+from django.core.files.storage import default_storage
 from django.db.models.fields.files import FieldFile
 
 from taiga.base.utils.urls import get_absolute_url
@@ -86,3 +88,70 @@ def get_thumbnail_url(file_obj, thumbnailer_size):
     path_url = thumbnail.url
     thumb_url = get_absolute_url(path_url)
     return thumb_url
+
+
+# Thumbnails generated in background
+#
+# The thumbnails of some file fields are generated by a celery task when the
+# file is uploaded (see `taiga.base.signals.thumbnails`) and their names are
+# stored in a `<field>_thumbnails` json field:
+#
+#     {"source": <file name>, "aliases": {<alias>: <thumbnail name or None>}}
+#
+# so the serializers get their urls without touching the storage. While the
+# task runs the aliases are empty. The field is null for the files uploaded
+# before it existed (until `python manage.py generate_thumbnails` is run), and
+# then the thumbnails are got from the storage as they were before.
+
+def get_thumbnailed_fields():
+    """
+    Get a dict with the file field and the thumbnail aliases generated in
+    background of each model.
+    """
+    return {
+        "attachments.Attachment": ("attached_file", (settings.THN_ATTACHMENT_TIMELINE,
+                                                     settings.THN_ATTACHMENT_CARD,
+                                                     settings.THN_ATTACHMENT_PREVIEW)),
+        "projects.Project": ("logo", (settings.THN_LOGO_SMALL, settings.THN_LOGO_BIG)),
+        "users.User": ("photo", (settings.THN_AVATAR_SMALL, settings.THN_AVATAR_BIG)),
+    }
+
+
+def generate_thumbnails(file_obj, thumbnailer_sizes):
+    """
+    Generate the thumbnails of a file and get the value of its
+    `<field>_thumbnails` field.
+    """
+    aliases = {}
+    for thumbnailer_size in thumbnailer_sizes:
+        thumbnail = get_thumbnail(file_obj, thumbnailer_size)
+        aliases[thumbnailer_size] = thumbnail.name if thumbnail else None
+    return {"source": file_obj.name, "aliases": aliases}
+
+
+def get_stored_thumbnail_name(file_obj, thumbnails, thumbnailer_size):
+    """
+    Get the name of a thumbnail generated in background. It's None while
+    the thumbnails are being generated or if the file is not an image.
+    """
+    name = file_obj.name if isinstance(file_obj, FieldFile) else file_obj
+    if not name:
+        return None
+
+    if thumbnails is None:
+        # Not generated in background yet
+        thumbnail = get_thumbnail(file_obj, thumbnailer_size)
+        return thumbnail.name if thumbnail else None
+
+    if thumbnails.get("source", None) != name:
+        return None
+    return thumbnails["aliases"].get(thumbnailer_size, None)
+
+
+def get_stored_thumbnail_url(file_obj, thumbnails, thumbnailer_size):
+    thumbnail_name = get_stored_thumbnail_name(file_obj, thumbnails, thumbnailer_size)
+
+    if not thumbnail_name:
+        return None
+
+    return get_absolute_url(default_storage.url(thumbnail_name))
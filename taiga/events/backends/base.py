@@ -6,6 +6,7 @@
 # Copyright (c) 2021-present Kaleidos INC
 
 import abc
+import contextlib
 import importlib
 
 from django.core.exceptions import ImproperlyConfigured
@@ -13,10 +14,29 @@ from django.conf import settings
 
 
 class BaseEventsPushBackend(object, metaclass=abc.ABCMeta):
+    # Maximum size in bytes of a message, the merged events are split to fit
+    # in it (see `taiga.events.events`). None if there is no limit.
+    max_message_size = None
+
     @abc.abstractmethod
     def emit_event(self, message:str, *, routing_key:str, channel:str="events"):
         pass
 
+    def batch(self):
+        """
+        Get a context manager to emit several events in one go.
+        """
+        return contextlib.nullcontext()
+
+    def emit_events(self, events:list):
+        """
+        Emit a list of events, each one a dict with the `emit_event` keyword
+        arguments. Backends able to send them in one go should override it.
+        """
+        with self.batch():
+            for event in events:
+                self.emit_event(**event)
+
 
 def load_class(path):
     """
@@ -12,12 +12,19 @@ from . import base
 
 
 class EventsPushBackend(base.BaseEventsPushBackend):
-    @transaction.atomic
+    # The NOTIFY payload must be shorter than 8000 bytes
+    max_message_size = 7999
+
+    def batch(self):
+        # All the notifications are delivered together when it's committed
+        return transaction.atomic()
+
     def emit_event(self, message:str, *, routing_key:str, channel:str="events"):
         routing_key = routing_key.replace(".", "__")
         channel = "{channel}_{routing_key}".format(channel=channel,
                                                    routing_key=routing_key)
         sql = "NOTIFY {channel}, %s".format(channel=channel)
-        cursor = connection.cursor()
-        cursor.execute(sql, [message])
-        cursor.close()
+        with transaction.atomic(savepoint=False):
+            cursor = connection.cursor()
+            cursor.execute(sql, [message])
+            cursor.close()
@@ -5,11 +5,13 @@
 #
 # Copyright (c) 2021-present Kaleidos INC
 
-import json
+import collections
 import logging
+import os
+import threading
 
 from amqp import Connection as AmqpConnection
-from amqp.exceptions import AccessRefused
+from amqp.exceptions import AccessRefused, AMQPError
 from amqp.basic_message import Message as AmqpMessage
 from urllib.parse import urlparse
 
@@ -17,6 +19,10 @@ from . import base
 
 log = logging.getLogger("tagia.events")
 
+# One publisher per (process, url). See `get_publisher`.
+_publishers = {}
+_publishers_lock = threading.Lock()
+
 
 def _make_rabbitmq_connection(url):
     parse_result = urlparse(url)
@@ -37,31 +43,117 @@ def _make_rabbitmq_connection(url):
                           password=password, virtual_host=vhost[1:])
 
 
+class RabbitMQPublisher(object):
+    """
+    Long-lived AMQP publisher.
+
+    It keeps one connection to the broker, and one channel, open for the whole
+    life of the process, so emitting an event does not pay for the connection
+    handshake and the exchange declaration anymore. AMQP connections are not
+    thread safe, so the publishes are serialized. If the broker drops the
+    connection, it is reopened (once) on the next publish.
+    """
+
+    def __init__(self, url, *, connection_factory=_make_rabbitmq_connection):
+        self.url = url
+        self.pid = os.getpid()
+        self._connection_factory = connection_factory
+        self._connection = None
+        self._channel = None
+        self._declared_exchanges = set()
+        self._lock = threading.RLock()
+
+    def _get_channel(self):
+        if self._channel is None:
+            connection = self._connection_factory(self.url)
+            connection.connect()
+            self._connection = connection
+            self._channel = connection.channel()
+        return self._channel
+
+    def _declare_exchange(self, rchannel, exchange):
+        if exchange not in self._declared_exchanges:
+            rchannel.exchange_declare(exchange=exchange, type="topic", auto_delete=True)
+            self._declared_exchanges.add(exchange)
+
+    def reset(self):
+        """
+        Drop the current connection, its channel and the known exchanges.
+        """
+        with self._lock:
+            connection, self._connection = self._connection, None
+            self._channel = None
+            self._declared_exchanges = set()
+
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+    def _publish(self, events):
+        # The events are removed from the queue once they are sent, so a
+        # retry only publishes the ones left.
+        rchannel = self._get_channel()
+        while events:
+            event = events[0]
+            self._declare_exchange(rchannel, event["channel"])
+            rchannel.basic_publish(AmqpMessage(event["message"]),
+                                   routing_key=event["routing_key"],
+                                   exchange=event["channel"])
+            events.popleft()
+
+    def publish(self, events):
+        """
+        Publish a list of events, each one a dict with `message`,
+        `routing_key` and `channel`.
+        """
+        events = collections.deque(events)
+        if not events:
+            return
+
+        with self._lock:
+            for attempt in (1, 2):
+                try:
+                    self._publish(events)
+                except AccessRefused:
+                    log.error("EventsPushBackend: Unable to connect with RabbitMQ (access refused) at {}".format(
+                        self.url), exc_info=True)
+                    self.reset()
+                    return
+                except (OSError, AMQPError):
+                    # Probably a stale connection, try again with a new one
+                    self.reset()
+                    if attempt == 2:
+                        log.error("EventsPushBackend: Unable to publish on RabbitMQ at {}".format(self.url),
+                                  exc_info=True)
+                except Exception:
+                    log.error("EventsPushBackend: Unhandled exception", exc_info=True)
+                    self.reset()
+                    return
+                else:
+                    return
+
+
+def get_publisher(url, **options):
+    """
+    Get the publisher for `url` of the current process. A forked process
+    (e.g. a celery or gunicorn worker) never reuses the parent connection.
+    """
+    with _publishers_lock:
+        publisher = _publishers.get(url, None)
+        if publisher is None or publisher.pid != os.getpid():
+            publisher = _publishers[url] = RabbitMQPublisher(url, **options)
+        return publisher
+
+
 class EventsPushBackend(base.BaseEventsPushBackend):
     def __init__(self, url):
         self.url = url
+        self.publisher = get_publisher(url)
 
     def emit_event(self, message:str, *, routing_key:str, channel:str="events"):
-        connection = _make_rabbitmq_connection(self.url)
-        try:
-            connection.connect()
-        except ConnectionRefusedError:
-            err_msg = "EventsPushBackend: Unable to connect with RabbitMQ (connection refused) at {}".format(
-                                                                                                     self.url)
-            log.error(err_msg, exc_info=True)
-        except AccessRefused:
-            err_msg = "EventsPushBackend: Unable to connect with RabbitMQ (access refused) at {}".format(
-                                                                                                 self.url)
-            log.error(err_msg, exc_info=True)
-        else:
-            try:
-                message = AmqpMessage(message)
-                rchannel = connection.channel()
-
-                rchannel.exchange_declare(exchange=channel, type="topic", auto_delete=True)
-                rchannel.basic_publish(message, routing_key=routing_key, exchange=channel)
-                rchannel.close()
-            except Exception:
-                log.error("EventsPushBackend: Unhandled exception", exc_info=True)
-            finally:
-                connection.close()
+        self.emit_events([{"message": message, "routing_key": routing_key, "channel": channel}])
+
+    def emit_events(self, events:list):
+        self.publisher.publish(events)
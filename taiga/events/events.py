@@ -6,6 +6,7 @@
 # Copyright (c) 2021-present Kaleidos INC
 
 import collections
+import threading
 
 from django.db import connection
 from django.utils.translation import gettext_lazy as _
@@ -20,24 +21,137 @@ from taiga.front.templatetags.functions import resolve
 from taiga.projects.history.choices import HistoryType
 
 
+_local = threading.local()
+
+
+def _is_model_change(data):
+    return isinstance(data, dict) and set(data.keys()) == {"type", "matches", "pk"}
+
+
+def _get_messages(session_id, data, pks, many, max_size):
+    """
+    Get the messages of a model change for some pks, split in chunks if the
+    message would be bigger than `max_size` bytes.
+    """
+    data = dict(data, pk=pks if many or len(pks) != 1 else pks[0])
+    message = json.dumps({"session_id": session_id, "data": data})
+    if max_size is None or len(pks) <= 1 or len(message.encode("utf-8")) <= max_size:
+        return [message]
+
+    half = len(pks) // 2
+    return (_get_messages(session_id, data, pks[:half], True, max_size) +
+            _get_messages(session_id, data, pks[half:], True, max_size))
+
+
+def _coalesce_events(events:list, max_size:int=None):
+    """
+    Get the backend events (`emit_event` keyword arguments) of a list of
+    buffered events. The model changes with the same routing key, session,
+    type and content type are merged in one message with the list of their
+    pks, like the ones of `emit_event_for_ids`.
+    """
+    groups = collections.OrderedDict()
+    for event in events:
+        data = event["data"]
+        if not _is_model_change(data):
+            groups[id(event)] = (event, None)
+            continue
+
+        key = (event["channel"], event["routing_key"], event["session_id"], data["type"], data["matches"])
+        if key not in groups:
+            groups[key] = (event, {"pks": [], "seen": set(), "many": False})
+
+        group = groups[key][1]
+        many = isinstance(data["pk"], (list, tuple, set))
+        group["many"] = group["many"] or many
+        for pk in (data["pk"] if many else [data["pk"]]):
+            if pk not in group["seen"]:
+                group["seen"].add(pk)
+                group["pks"].append(pk)
+
+    result = []
+    for event, group in groups.values():
+        if group is None:
+            messages = [json.dumps({"session_id": event["session_id"], "data": event["data"]})]
+        else:
+            messages = _get_messages(event["session_id"], event["data"], group["pks"], group["many"], max_size)
+
+        for message in messages:
+            result.append({"message": message,
+                           "routing_key": event["routing_key"],
+                           "channel": event["channel"]})
+    return result
+
+
+def _emit_events(events:list):
+    if events:
+        backend = backends.get_events_backend()
+        backend.emit_events(_coalesce_events(events, backend.max_message_size))
+
+
+class _EventCommitHook:
+    """
+    The on_commit hook of a buffered event. It confirms the event and, while
+    it is a flushing hook, emits all the confirmed events.
+    """
+    def __init__(self, event:dict, savepoint_ids:tuple):
+        self.event = event
+        self.savepoint_ids = savepoint_ids
+        self.flush = True
+
+    def __call__(self):
+        _local.flushing_hooks.discard(self)
+        _local.confirmed_events.append(self.event)
+        if self.flush:
+            events, _local.confirmed_events = _local.confirmed_events, []
+            _emit_events(events)
+
+
+def _emit_events_on_commit(event:dict):
+    """
+    Buffer the event until the current transaction is committed.
+
+    Each event has an on_commit hook, discarded if its savepoint is rolled
+    back, that confirms it. A hook stops flushing the confirmed events when a
+    later hook is registered in the same or an outer savepoint, because that
+    hook runs after it and can only be discarded with it. So the confirmed
+    events of the transaction are coalesced and emitted together by its last
+    hooks.
+    """
+    if not connection.in_atomic_block:
+        _emit_events([event])
+        return
+
+    if not hasattr(_local, "flushing_hooks"):
+        _local.flushing_hooks = set()
+        _local.confirmed_events = []
+
+    savepoint_ids = tuple(connection.savepoint_ids)
+    for hook in list(_local.flushing_hooks):
+        if hook.savepoint_ids[:len(savepoint_ids)] == savepoint_ids:
+            hook.flush = False
+            _local.flushing_hooks.discard(hook)
+
+    hook = _EventCommitHook(event, savepoint_ids)
+    _local.flushing_hooks.add(hook)
+    connection.on_commit(hook)
+
+
 def emit_event(data:dict, routing_key:str, *,
                sessionid:str=None, channel:str="events",
                on_commit:bool=True):
     if not sessionid:
         sessionid = mw.get_current_session_id()
 
-    data = {"session_id": sessionid,
-            "data": data}
-
-    backend = backends.get_events_backend()
-
-    def backend_emit_event():
-        backend.emit_event(message=json.dumps(data), routing_key=routing_key, channel=channel)
+    event = {"session_id": sessionid,
+             "data": data,
+             "routing_key": routing_key,
+             "channel": channel}
 
     if on_commit:
-        connection.on_commit(backend_emit_event)
+        _emit_events_on_commit(event)
     else:
-        backend_emit_event()
+        _emit_events([event])
 
 
 def emit_event_for_model(obj, *, type:str="change", channel:str="events",
@@ -185,7 +299,7 @@ def emit_event_for_ids(ids, content_type:str, projectid:int, *,
 
     data = {"type": type,
             "matches": content_type,
-            "pk": ids}
+            "pk": list(ids)}
 
     return emit_event(routing_key=routing_key,
                       channel=channel,
@@ -5,7 +5,6 @@
 #
 # Copyright (c) 2021-present Kaleidos INC
 
-import codecs
 import uuid
 import gzip
 
@@ -17,7 +16,6 @@ from django.conf import settings
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 
-from taiga.base.utils import json
 from taiga.base.decorators import detail_route, list_route
 from taiga.base import exceptions as exc
 from taiga.base import response
@@ -58,7 +56,7 @@ class ProjectExporterViewSet(mixins.ImportThrottlingPolicyMixin, GenericViewSet)
         dump_format = request.QUERY_PARAMS.get("dump_format", "plain")
 
         if settings.CELERY_ENABLED:
-            task = tasks.dump_project.delay(request.user, project, dump_format)
+            task = tasks.dump_project.delay(request.user.id, project.id, dump_format)
             tasks.delete_project_dump.apply_async((project.pk, project.slug, task.id, dump_format),
                                                   countdown=settings.EXPORTS_TTL)
             return response.Accepted({"export_id": task.id})
@@ -326,14 +324,17 @@ class ProjectImporterViewSet(mixins.ImportThrottlingPolicyMixin, CreateModelMixi
         if not dump:
             raise exc.WrongArguments(_("Needed dump file"))
 
+        # Save the dump to the storage so it can be read in streaming, here and
+        # from the celery workers, without loading it in memory.
+        dump_path = "imports/{}/{}.json".format(request.user.pk, uuid.uuid4().hex)
         if dump.content_type == "application/gzip":
-            dump = gzip.GzipFile(fileobj=dump)
-
-        reader = codecs.getreader("utf-8")
+            dump_path += ".gz"
+        dump_path = default_storage.save(dump_path, dump)
 
         try:
-            dump = json.load(reader(dump))
-        except Exception:
+            dump = services.read_dump_from_storage(dump_path)
+        except services.reader.InvalidDumpError:
+            default_storage.delete(dump_path)
             raise exc.WrongArguments(_("Invalid dump format"))
 
         slug = dump.get('slug', None)
@@ -352,11 +353,12 @@ class ProjectImporterViewSet(mixins.ImportThrottlingPolicyMixin, CreateModelMixi
             memberships
         )
         if not enough_slots:
+            default_storage.delete(dump_path)
             raise exc.NotEnoughSlotsForProject(is_private, total_memberships, error_message)
 
         # Async mode
         if settings.CELERY_ENABLED:
-            task = tasks.load_project_dump.delay(user, dump)
+            task = tasks.load_project_dump.delay(user.id, dump_path)
             return response.Accepted({"import_id": task.id})
 
         # Sync mode
@@ -376,3 +378,5 @@ class ProjectImporterViewSet(mixins.ImportThrottlingPolicyMixin, CreateModelMixi
             response_data = ProjectSerializer(project_from_qs).data
 
             return response.Created(response_data)
+        finally:
+            default_storage.delete(dump_path)
@@ -8,7 +8,7 @@
 from django.core.management.base import BaseCommand, CommandError
 
 from taiga.projects.models import Project
-from taiga.export_import.services import render_project
+from taiga.export_import.services import render_project_in_parts
 
 import os
 import gzip
@@ -36,6 +36,14 @@ class Command(BaseCommand):
                             metavar="[plain|gzip]",
                             help="Format to the output file plain json or gzipped json. ('plain' by default)")
 
+        parser.add_argument("-w", "--workers",
+                            action="store",
+                            dest="workers",
+                            default=1,
+                            type=int,
+                            metavar="N",
+                            help="Number of processes used to render the big sections. (1 by default)")
+
     def handle(self, *args, **options):
         dst_dir = options["dst_dir"]
 
@@ -53,13 +61,17 @@ class Command(BaseCommand):
             except Project.DoesNotExist:
                 raise CommandError("Project '{}' does not exist".format(project_slug))
 
+            # Running the command again after a crash resumes the render
+            workdir = os.path.join(dst_dir, ".{}.parts".format(project_slug))
+            workers = options["workers"]
+
             if options["format"] == "gzip":
                 dst_file = os.path.join(dst_dir, "{}.json.gz".format(project_slug))
                 with gzip.GzipFile(dst_file, "wb") as f:
-                    render_project(project, f)
+                    render_project_in_parts(project, f, workdir, workers=workers)
             else:
                 dst_file = os.path.join(dst_dir, "{}.json".format(project_slug))
                 with open(dst_file, "wb") as f:
-                    render_project(project, f)
+                    render_project_in_parts(project, f, workdir, workers=workers)
 
             print("-> Generate dump of project '{}' in '{}'".format(project.name, dst_file))
@@ -63,7 +63,7 @@ class Command(BaseCommand):
                 ))
                 continue
 
-            task = tasks.dump_project.delay(user, project, dump_format)
+            task = tasks.dump_project.delay(user.id, project.id, dump_format)
             tasks.delete_project_dump.apply_async(
                 (project.pk, project.slug, task.id, dump_format),
                 countdown=settings.EXPORTS_TTL
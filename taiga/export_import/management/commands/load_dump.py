@@ -21,7 +21,7 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument("dump_file",
-                            help="The path to a dump file (.json).")
+                            help="The path to a dump file (.json or .json.gz).")
 
         parser.add_argument("owner_email",
                             help="The email of the new project owner.")
@@ -37,7 +37,7 @@ class Command(BaseCommand):
         owner_email = options["owner_email"]
         overwrite = options["overwrite"]
 
-        data = json.loads(open(dump_file_path, 'r').read())
+        data = services.read_dump_from_file(dump_file_path)
         try:
             if overwrite:
                 receivers_back = signals.post_delete.receivers
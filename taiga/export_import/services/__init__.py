@@ -8,9 +8,12 @@
 # This makes all code that import services works and
 # is not the baddest practice ;)
 
-from .render import render_project
+from .render import render_project, render_project_in_parts
 from . import render
 
+from .reader import read_dump_from_file, read_dump_from_storage
+from . import reader
+
 from .store import store_project_from_dict
 from . import store
 
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+# Incremental reader for project dumps.
+#
+# A dump is a json object whose big sections (user stories, tasks, issues...,
+# with their attachments encoded in base64) can take gigabytes. Instead of
+# loading it with `json.load`, the dump is scanned once to build a dict with
+# the small project fields and the big sections are exposed as lazy iterables
+# that re-read the file and yield their items one by one.
+
+import gzip
+from contextlib import contextmanager
+
+import ijson
+
+from django.core.files.storage import default_storage
+
+
+GZIP_MAGIC_NUMBER = b"\x1f\x8b"
+
+STREAMED_SECTIONS = ("epics", "user_stories", "tasks", "issues", "wiki_pages", "timeline")
+
+_CONTAINER_START_EVENTS = ("start_map", "start_array")
+_CONTAINER_END_EVENTS = ("end_map", "end_array")
+
+
+class InvalidDumpError(ValueError):
+    pass
+
+
+@contextmanager
+def open_dump(open_file):
+    """
+    Open a (possibly gzipped) dump in binary mode. `open_file` is a callable
+    without arguments that returns a new binary file object.
+    """
+    fd = open_file()
+    try:
+        magic_number = fd.read(len(GZIP_MAGIC_NUMBER))
+        fd.seek(0)
+        if magic_number == GZIP_MAGIC_NUMBER:
+            with gzip.GzipFile(fileobj=fd, mode="rb") as gzip_fd:
+                yield gzip_fd
+        else:
+            yield fd
+    finally:
+        fd.close()
+
+
+class DumpSection:
+    """
+    Lazy and re-iterable list of the items of a big dump section.
+    """
+    def __init__(self, open_file, name):
+        self._open_file = open_file
+        self.name = name
+
+    def __iter__(self):
+        with open_dump(self._open_file) as fd:
+            yield from ijson.items(fd, "{}.item".format(self.name), use_float=True)
+
+
+class StreamedDump(dict):
+    """
+    Dict with the small fields of a dump. The big sections (see
+    STREAMED_SECTIONS) are returned as `DumpSection` objects.
+    """
+    def __init__(self, open_file, header, sections):
+        super().__init__(header)
+        self._sections = {name: DumpSection(open_file, name) for name in sections}
+
+    def __getitem__(self, key):
+        if key in self._sections:
+            return self._sections[key]
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        return key in self._sections or super().__contains__(key)
+
+    def get(self, key, default=None):
+        if key in self._sections:
+            return self._sections[key]
+        return super().get(key, default)
+
+
+def _skip_value(events, event):
+    depth = 1 if event in _CONTAINER_START_EVENTS else 0
+    while depth:
+        _, event, _ = next(events)
+        if event in _CONTAINER_START_EVENTS:
+            depth += 1
+        elif event in _CONTAINER_END_EVENTS:
+            depth -= 1
+
+
+def _build_value(events, event, value):
+    builder = ijson.ObjectBuilder()
+    builder.event(event, value)
+    depth = 1 if event in _CONTAINER_START_EVENTS else 0
+    while depth:
+        _, event, value = next(events)
+        builder.event(event, value)
+        if event in _CONTAINER_START_EVENTS:
+            depth += 1
+        elif event in _CONTAINER_END_EVENTS:
+            depth -= 1
+    return builder.value
+
+
+def _read_header(fd):
+    header = {}
+    sections = set()
+
+    events = ijson.parse(fd, use_float=True)
+    _, event, _ = next(events)
+    if event != "start_map":
+        raise InvalidDumpError("A dump must be a json object")
+
+    for _, event, key in events:
+        if event == "end_map":
+            break
+
+        _, event, value = next(events)
+        if key in STREAMED_SECTIONS:
+            sections.add(key)
+            _skip_value(events, event)
+        else:
+            header[key] = _build_value(events, event, value)
+
+    # Consume the rest of the file to make sure it is a valid json
+    for _ in events:
+        pass
+
+    return header, sections
+
+
+def read_dump(open_file):
+    """
+    Scan a dump and return a `StreamedDump`. `open_file` is a callable without
+    arguments that returns a new binary file object with the dump content. It
+    is called again every time a big section is iterated.
+
+    Raise `InvalidDumpError` if the content is not a valid dump.
+    """
+    try:
+        with open_dump(open_file) as fd:
+            header, sections = _read_header(fd)
+    except (ijson.JSONError, StopIteration, EOFError, OSError) as e:
+        raise InvalidDumpError(str(e)) from e
+
+    return StreamedDump(open_file, header, sections)
+
+
+def read_dump_from_storage(path, storage=default_storage):
+    return read_dump(lambda: storage.open(path, mode="rb"))
+
+
+def read_dump_from_file(path):
+    return read_dump(lambda: open(path, mode="rb"))
@@ -8,17 +8,100 @@
 # This makes all code that import services works and
 # is not the baddest practice ;)
 
-import gc
+import copy
+import os
+import shutil
+
+# The multiprocessing fork of celery, its pools can be used from the prefork workers
+import billiard
+
+from django import db
 
 from taiga.base.utils import json
 from taiga.base.fields import MethodField
+from taiga.projects.models import Project
 from taiga.timeline.service import get_project_timeline
 from taiga.base.api.fields import get_component
 
 from .. import serializers
 
+import logging
+logger = logging.getLogger('taiga.export_import')
+
+
+# These "special" fields have attachments so they are rendered item by item
+ITEMS_SECTIONS = ("wiki_pages", "user_stories", "tasks", "issues", "epics")
+
+# Sections that can be rendered on their own, in parallel, by `render_project_in_parts`
+PARTITIONED_SECTIONS = ITEMS_SECTIONS + ("timeline",)
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+def _get_section_queryset(project, section):
+    if section == "timeline":
+        return get_project_timeline(project)
+
+    value = get_component(project, section)
+    if section != "wiki_pages":
+        value = value.select_related('owner', 'status',
+                                     'project', 'assigned_to',
+                                     'custom_attributes_values')
+
+    if section in ["user_stories", "tasks", "issues"]:
+        value = value.select_related('milestone')
+
+    if section == "issues":
+        value = value.select_related('severity', 'priority', 'type')
+    return value.prefetch_related('history_entry', 'attachments')
+
+
+def render_section(project, section, outfile):
+    """
+    Write the items of a big section of the project (see PARTITIONED_SECTIONS)
+    as a json list.
+    """
+    if section == "timeline":
+        def to_value(item):
+            return serializers.TimelineExportSerializer(item).data
+    else:
+        # The field is shared by all the serializer instances
+        field = copy.copy(serializers.ProjectExportSerializer(project)._field_map.get(section))
+        field.many = False
+        to_value = field.to_value
+
+    outfile.write(b'[\n')
+
+    first_item = True
+    for item in _get_section_queryset(project, section).iterator():
+        # Avoid writing "," in the last element
+        if not first_item:
+            outfile.write(b",\n")
+        else:
+            first_item = False
+
+        outfile.write(json.dumps(to_value(item)).encode())
+
+    outfile.write(b']')
+
+
+def _write_section(project, section, outfile, parts, chunk_size):
+    part_path = parts.get(section, None)
+    if part_path is None:
+        render_section(project, section, outfile)
+        return
+
+    with open(part_path, "rb") as part_file:
+        shutil.copyfileobj(part_file, outfile, chunk_size)
 
-def render_project(project, outfile, chunk_size=8190):
+
+def render_project(project, outfile, chunk_size=8190, parts=None):
+    """
+    Write the dump of a project. `parts` is an optional dict with the paths of
+    big sections already rendered with `render_section`, their content is
+    copied instead of rendering them again.
+    """
+    parts = parts or {}
     serializer = serializers.ProjectExportSerializer(project)
     outfile.write(b'{\n')
 
@@ -31,39 +114,10 @@ def render_project(project, outfile, chunk_size=8190):
             first_field = False
 
         field = serializer._field_map.get(field_name)
-        # field.initialize(parent=serializer, field_name=field_name)
-
-        # These four "special" fields hava attachments so we use them in a special way
-        if field_name in ["wiki_pages", "user_stories", "tasks", "issues", "epics"]:
-            value = get_component(project, field_name)
-            if field_name != "wiki_pages":
-                value = value.select_related('owner', 'status',
-                                             'project', 'assigned_to',
-                                             'custom_attributes_values')
-
-            if field_name in ["user_stories", "tasks", "issues"]:
-                value = value.select_related('milestone')
-
-            if field_name == "issues":
-                value = value.select_related('severity', 'priority', 'type')
-            value = value.prefetch_related('history_entry', 'attachments')
-
-            outfile.write('"{}": [\n'.format(field_name).encode())
-
-            first_item = True
-            for item in value.iterator():
-                # Avoid writing "," in the last element
-                if not first_item:
-                    outfile.write(b",\n")
-                else:
-                    first_item = False
-
-                field.many = False
-                dumped_value = json.dumps(field.to_value(item))
-                outfile.write(dumped_value.encode())
-                outfile.flush()
-            gc.collect()
-            outfile.write(b']')
+
+        if field_name in ITEMS_SECTIONS:
+            outfile.write('"{}": '.format(field_name).encode())
+            _write_section(project, field_name, outfile, parts, chunk_size)
         else:
             if isinstance(field, MethodField):
                 value = field.as_getter(field_name, serializers.ProjectExportSerializer)(serializer, project)
@@ -73,16 +127,107 @@ def render_project(project, outfile, chunk_size=8190):
             outfile.write('"{}": {}'.format(field_name, json.dumps(value)).encode())
 
     # Generate the timeline
-    outfile.write(b',\n"timeline": [\n')
-    first_timeline = True
-    for timeline_item in get_project_timeline(project).iterator():
-        # Avoid writing "," in the last element
-        if not first_timeline:
-            outfile.write(b",\n")
-        else:
-            first_timeline = False
-
-        dumped_value = json.dumps(serializers.TimelineExportSerializer(timeline_item).data)
-        outfile.write(dumped_value.encode())
-
-    outfile.write(b']}\n')
+    outfile.write(b',\n"timeline": ')
+    _write_section(project, "timeline", outfile, parts, chunk_size)
+    outfile.write(b'}\n')
+
+
+########################################################################
+## Partitioned render
+########################################################################
+
+def _get_part_path(workdir, section):
+    return os.path.join(workdir, "{}.json.part".format(section))
+
+
+def _read_manifest(workdir, project):
+    manifest_path = os.path.join(workdir, MANIFEST_FILENAME)
+    try:
+        with open(manifest_path, "r") as manifest_file:
+            manifest = json.loads(manifest_file.read())
+    except (OSError, ValueError):
+        manifest = None
+
+    if not manifest or manifest.get("project") != project.id:
+        return {"project": project.id, "parts": []}
+
+    # Ignore the parts whose file has been lost
+    manifest["parts"] = [section for section in manifest["parts"]
+                         if os.path.exists(_get_part_path(workdir, section))]
+    return manifest
+
+
+def _write_manifest(workdir, manifest):
+    manifest_path = os.path.join(workdir, MANIFEST_FILENAME)
+    with open(manifest_path + ".tmp", "w") as manifest_file:
+        manifest_file.write(json.dumps(manifest))
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+
+def _render_part(project, section, workdir):
+    part_path = _get_part_path(workdir, section)
+    with open(part_path + ".tmp", "wb") as part_file:
+        render_section(project, section, part_file)
+    os.replace(part_path + ".tmp", part_path)
+    return section
+
+
+def _render_part_in_worker(args):
+    project_id, section, workdir = args
+    try:
+        return _render_part(Project.objects.get(id=project_id), section, workdir)
+    finally:
+        db.connections.close_all()
+
+
+def _can_use_workers(workers, sections):
+    return (workers > 1 and len(sections) > 1 and
+            # The open transaction would be lost when closing the connection before forking
+            not db.connection.in_atomic_block)
+
+
+def _render_parts(project, sections, workdir, workers):
+    if not _can_use_workers(workers, sections):
+        for section in sections:
+            yield _render_part(project, section, workdir)
+        return
+
+    # The forked processes must not share the database connections of this one
+    db.connections.close_all()
+    pool = billiard.Pool(processes=min(workers, len(sections)))
+    try:
+        yield from pool.imap_unordered(_render_part_in_worker,
+                                       [(project.id, section, workdir) for section in sections])
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+
+def render_project_in_parts(project, outfile, workdir, workers=1, chunk_size=8190):
+    """
+    Write the dump of a project rendering its big sections concurrently, with
+    up to `workers` processes, into part files in `workdir`, and then
+    concatenating them.
+
+    Every finished part is checkpointed in the manifest of `workdir`, so
+    calling it again with the same `workdir` after a crash only renders the
+    missing parts. `workdir` is removed when the dump is complete.
+    """
+    os.makedirs(workdir, exist_ok=True)
+    manifest = _read_manifest(workdir, project)
+
+    pending_sections = [section for section in PARTITIONED_SECTIONS if section not in manifest["parts"]]
+    if len(pending_sections) < len(PARTITIONED_SECTIONS):
+        logger.info("Resuming export of project %s, already rendered: %s",
+                    project.slug, ", ".join(manifest["parts"]))
+
+    for section in _render_parts(project, pending_sections, workdir, workers):
+        manifest["parts"].append(section)
+        _write_manifest(workdir, manifest)
+
+    parts = {section: _get_part_path(workdir, section) for section in PARTITIONED_SECTIONS}
+    render_project(project, outfile, chunk_size=chunk_size, parts=parts)
+    shutil.rmtree(workdir, ignore_errors=True)
@@ -10,26 +10,36 @@
 
 import os
 import uuid
+from collections import defaultdict
 
 from unidecode import unidecode
 
+from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import utils
 from django.template.defaultfilters import slugify
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from taiga.base.utils.iterators import iter_in_chunks
+from taiga.projects.history.models import HistoryEntry, HistoryLastSnapshot
 from taiga.projects.history.services import make_key_from_model_object, take_snapshot
+from taiga.projects.milestones import services as milestone_services
 from taiga.projects.models import Membership
+from taiga.projects.notifications.choices import NotifyLevel
+from taiga.projects.notifications.models import NotifyPolicy, Watched
 from taiga.projects.references import sequences as seq
 from taiga.projects.references import models as refs
-from taiga.projects.userstories.models import RolePoints
+from taiga.projects.userstories.models import RolePoints, UserStory
 from taiga.projects.services import find_invited_user
+from taiga.projects.tagging.signals import tags_normalization
 from taiga.timeline.service import build_project_namespace
 
 from .. import exceptions as err
 from .. import validators
 from .. import services
+from ..validators.fields import make_lookup_key
 
 import logging
 logger = logging.getLogger('taiga.export_import')
@@ -147,6 +157,13 @@ def _store_attachment(project, obj, attachment):
     return validator
 
 
+def _update_references_sequence(project, max_ref):
+    sequence_name = refs.make_sequence_name(project)
+    if not seq.exists(sequence_name):
+        seq.create(sequence_name)
+    seq.set_max(sequence_name, max_ref)
+
+
 def _store_history(project, obj, history, statuses={}):
     validator = validators.HistoryExportValidator(data=history, context={"project": project, "statuses": statuses})
     if validator.is_valid():
@@ -161,6 +178,218 @@ def _store_history(project, obj, history, statuses={}):
     return validator
 
 
+## BULK STORE
+#
+# The big sections (user stories, tasks and issues) are stored in chunks. The
+# items of a chunk are validated one by one, sharing a `lookups` dict with the
+# related objects already resolved, and then saved with their m2m relations,
+# watchers, custom attributes values and history entries using `bulk_create`.
+# The references sequence is updated once per section.
+#
+# `bulk_create` doesn't send model signals, so what the item signals would do
+# on import (tags normalization, custom attributes values row...) is done here.
+
+BULK_STORE_CHUNK_SIZE = 500
+
+
+def _prefetch_lookups_by_ref(project, lookups, chunk, prefetch_refs):
+    added_keys = []
+    for field, model in prefetch_refs.items():
+        values = {str(data[field]) for data in chunk if data.get(field) is not None}
+        values = [int(value) for value in values
+                  if value.isdigit() and make_lookup_key(model, "ref", value) not in lookups]
+        if not values:
+            continue
+
+        for obj in model.objects.filter(project=project, ref__in=values).only("id", "ref", "project_id"):
+            lookup_key = make_lookup_key(model, "ref", obj.ref)
+            lookups[lookup_key] = obj
+            added_keys.append(lookup_key)
+    return added_keys
+
+
+def _bulk_store_m2m(objs):
+    through_objs = defaultdict(list)
+    for obj in objs:
+        for field_name, related_objs in obj.__dict__.pop("_m2m_data", {}).items():
+            field = obj._meta.get_field(field_name)
+            through_objs[field.remote_field.through] += [
+                field.remote_field.through(**{field.m2m_field_name(): obj,
+                                              field.m2m_reverse_field_name(): related_obj})
+                for related_obj in {related_obj.pk: related_obj for related_obj in related_objs}.values()
+            ]
+
+    for through_model, rows in through_objs.items():
+        through_model.objects.bulk_create(rows)
+
+
+def _bulk_store_watchers(project, objs_with_watchers):
+    emails = set()
+    for obj, watchers in objs_with_watchers:
+        emails.update(watchers)
+    if not emails:
+        return
+
+    user_ids = dict(get_user_model().objects.filter(email__in=emails).values_list("email", "id"))
+    Watched.objects.bulk_create([
+        Watched(content_type=ContentType.objects.get_for_model(obj.__class__),
+                object_id=obj.id, user_id=user_ids[email], project=project)
+        for obj, watchers in objs_with_watchers
+        for email in set(watchers) if email in user_ids
+    ])
+
+    # The same as `add_watcher` does, the watchers need a notify policy
+    now = timezone.now()
+    NotifyPolicy.objects.bulk_create([
+        NotifyPolicy(project=project, user_id=user_id, notify_level=NotifyLevel.involved,
+                     live_notify_level=NotifyLevel.involved, created_at=now, modified_at=now)
+        for user_id in user_ids.values()
+    ], ignore_conflicts=True)
+
+
+def _bulk_store_history(project, stored, statuses):
+    entries = []
+    keys = []
+    for obj, data in stored:
+        history_entries = data.get("history", [])
+        if not history_entries:
+            take_snapshot(obj, user=obj.owner)
+            continue
+
+        key = make_key_from_model_object(obj)
+        keys.append(key)
+        for history in history_entries:
+            validator = validators.HistoryExportValidator(data=history,
+                                                          context={"project": project, "statuses": statuses})
+            if validator.is_valid():
+                validator.object.key = key
+                if validator.object.diff is None:
+                    validator.object.diff = []
+                validator.object.project_id = project.id
+                validator.object._importing = True
+                entries.append(validator.object)
+            else:
+                add_errors("history", validator.errors)
+
+    HistoryEntry.objects.bulk_create(entries)
+    # The same as the `invalidate_last_snapshot` signal handler does
+    HistoryLastSnapshot.objects.filter(key__in=keys).delete()
+
+
+def _bulk_store_custom_attributes_values(model, stored, custom_attributes, custom_attributes_values_field):
+    model = model._meta.get_field("custom_attributes_values").related_model
+    model.objects.bulk_create([
+        model(**{
+            custom_attributes_values_field: obj,
+            "attributes_values": _use_id_instead_name_as_key_in_custom_attributes_values(
+                custom_attributes, data.get("custom_attributes_values", None) or {}
+            ),
+        })
+        for obj, data in stored
+    ])
+
+
+def _validate_chunk(project, chunk, *, section, validator_class, clean_data, lookups):
+    model = validator_class.Meta.model
+
+    stored = []
+    objs_with_watchers = []
+    for data in chunk:
+        validator = validator_class(data=clean_data(project, data),
+                                    context={"project": project, "lookups": lookups})
+        if not validator.is_valid():
+            add_errors(section, validator.errors)
+            continue
+
+        obj = validator.object
+        obj.project = project
+        if obj.owner is None:
+            obj.owner = project.owner
+        if not obj.modified_date:
+            obj.modified_date = timezone.now()
+        tags_normalization(model, obj)
+
+        stored.append((obj, data))
+        objs_with_watchers.append((obj, validator._watchers))
+
+    return stored, objs_with_watchers
+
+
+def _bulk_store_refs(project, model, stored, max_ref):
+    objs_without_ref = [obj for obj, data in stored if not obj.ref]
+    if not objs_without_ref:
+        return
+
+    # New refs can't collide with the ones of this chunk or the previous ones
+    max_ref = max([obj.ref for obj, data in stored if obj.ref] + [max_ref or 0])
+    if max_ref:
+        _update_references_sequence(project, max_ref)
+    for obj in objs_without_ref:
+        obj.ref, _ = refs.make_reference(obj, project)
+    model.objects.bulk_update(objs_without_ref, ["ref"])
+
+
+def _bulk_store_chunk(project, chunk, *, section, validator_class, clean_data, lookups, max_ref,
+                      statuses, custom_attributes, custom_attributes_values_field, store_related):
+    model = validator_class.Meta.model
+
+    stored, objs_with_watchers = _validate_chunk(project, chunk, section=section, validator_class=validator_class,
+                                                 clean_data=clean_data, lookups=lookups)
+    if not stored:
+        return []
+
+    model.objects.bulk_create([obj for obj, data in stored])
+    _bulk_store_refs(project, model, stored, max_ref)
+    _bulk_store_m2m([obj for obj, data in stored])
+    _bulk_store_watchers(project, objs_with_watchers)
+
+    # Every attachment writes its own file, so they are still stored one by one
+    for obj, data in stored:
+        for attachment in data.get("attachments", []):
+            _store_attachment(project, obj, attachment)
+
+    _bulk_store_custom_attributes_values(model, stored, custom_attributes, custom_attributes_values_field)
+    if store_related:
+        store_related(project, stored, lookups)
+    _bulk_store_history(project, stored, statuses)
+
+    return [obj for obj, data in stored]
+
+
+def _bulk_store_items(project, items, *, section, validator_class, clean_data, statuses,
+                      custom_attributes, custom_attributes_values_field,
+                      prefetch_refs={}, store_related=None):
+    """
+    Store the items of a big section in chunks of BULK_STORE_CHUNK_SIZE
+    and return a dict with the ids of the stored items by ref.
+    """
+    lookups = {}
+    statuses = {s.name: s.id for s in statuses.all()}
+    custom_attributes = list(custom_attributes.all().values('id', 'name'))
+
+    stored_ids = {}
+    for chunk in iter_in_chunks(items, BULK_STORE_CHUNK_SIZE):
+        # The related items are only useful for its own chunk
+        prefetched_keys = _prefetch_lookups_by_ref(project, lookups, chunk, prefetch_refs)
+
+        objs = _bulk_store_chunk(project, chunk, section=section, validator_class=validator_class,
+                                 clean_data=clean_data, lookups=lookups,
+                                 max_ref=max(stored_ids, default=None), statuses=statuses,
+                                 custom_attributes=custom_attributes,
+                                 custom_attributes_values_field=custom_attributes_values_field,
+                                 store_related=store_related)
+        for obj in objs:
+            stored_ids[obj.ref] = obj.id
+
+        for lookup_key in prefetched_keys:
+            lookups.pop(lookup_key, None)
+
+    if stored_ids:
+        _update_references_sequence(project, max(stored_ids))
+
+    return stored_ids
+
+
 ## ROLES
 
 def _store_role(project, role):
@@ -369,13 +598,16 @@ def _store_role_point(project, us, role_point):
     return None
 
 
-def store_user_story(project, data):
+def _clean_user_story_data(project, data):
     if "status" not in data and project.default_us_status:
         data["status"] = project.default_us_status.name
 
-    us_data = {key: value for key, value in data.items() if key not in
-               ["role_points", "custom_attributes_values", 'generated_from_task', 'generated_from_issue']}
+    return {key: value for key, value in data.items() if key not in
+            ["role_points", "custom_attributes_values", 'generated_from_task', 'generated_from_issue']}
 
+
+def store_user_story(project, data):
+    us_data = _clean_user_story_data(project, data)
     validator = validators.UserStoryExportValidator(data=us_data, context={"project": project})
 
     if validator.is_valid():
@@ -389,10 +621,7 @@ def store_user_story(project, data):
         validator.save_watchers()
 
         if validator.object.ref:
-            sequence_name = refs.make_sequence_name(project)
-            if not seq.exists(sequence_name):
-                seq.create(sequence_name)
-            seq.set_max(sequence_name, validator.object.ref)
+            _update_references_sequence(project, validator.object.ref)
         else:
             validator.object.ref, _ = refs.make_reference(validator.object, project)
             validator.object.save()
@@ -428,13 +657,37 @@ def store_user_story(project, data):
     return None
 
 
+def _bulk_store_role_points(project, stored, lookups):
+    # Like UserStory.save, every computable role gets the default points
+    # unless the user story data has its own value for it.
+    computable_roles = list(project.roles.filter(computable=True).values_list("id", flat=True))
+
+    role_points = []
+    for us, data in stored:
+        points_by_role = {role_id: project.default_points for role_id in computable_roles}
+        for role_point in data.get("role_points", []):
+            validator = validators.RolePointsExportValidator(data=role_point,
+                                                             context={"project": project, "lookups": lookups})
+            if validator.is_valid():
+                points_by_role[validator.object.role.id] = validator.object.points
+            else:
+                add_errors("role_points", validator.errors)
+
+        role_points += [RolePoints(user_story=us, role_id=role_id, points=points)
+                        for role_id, points in points_by_role.items()]
+
+    RolePoints.objects.bulk_create(role_points)
+
+
 def store_user_stories(project, data):
-    user_stories = {}
-    for userstory in data.get("user_stories", []):
-        validator = store_user_story(project, userstory)
-        if validator:
-            user_stories[validator.object.ref] = validator.object
-    return user_stories
+    return _bulk_store_items(project, data.get("user_stories", []),
+                             section="user_stories",
+                             validator_class=validators.UserStoryExportValidator,
+                             clean_data=_clean_user_story_data,
+                             statuses=project.us_statuses,
+                             custom_attributes=project.userstorycustomattributes,
+                             custom_attributes_values_field="user_story",
+                             store_related=_bulk_store_role_points)
 
 
 def store_user_stories_related_entities(imported_user_stories,
@@ -442,19 +695,21 @@ def store_user_stories_related_entities(imported_user_stories,
                                         imported_issues,
                                         data):
     for us_data in data.get("user_stories", []):
-        us = imported_user_stories.get(us_data.get('ref'))
-        if not us or \
+        us_id = imported_user_stories.get(us_data.get('ref'))
+        if not us_id or \
                 not (us_data.get('generated_from_task')
                      or us_data.get('generated_from_issue')):
             continue
 
+        us = UserStory.objects.get(id=us_id)
+
         if us_data.get('generated_from_task'):
             generated_from_task_ref = int(us_data.get('generated_from_task'))
-            us.generated_from_task = imported_tasks.get(generated_from_task_ref)
+            us.generated_from_task_id = imported_tasks.get(generated_from_task_ref)
 
         if us_data.get('generated_from_issue'):
             generated_from_issue_ref = int(us_data.get('generated_from_issue'))
-            us.generated_from_issue = imported_issues.get(generated_from_issue_ref)
+            us.generated_from_issue_id = imported_issues.get(generated_from_issue_ref)
 
         us.save()
 
@@ -496,10 +751,7 @@ def store_epic(project, data):
         validator.save_watchers()
 
         if validator.object.ref:
-            sequence_name = refs.make_sequence_name(project)
-            if not seq.exists(sequence_name):
-                seq.create(sequence_name)
-            seq.set_max(sequence_name, validator.object.ref)
+            _update_references_sequence(project, validator.object.ref)
         else:
             validator.object.ref, _ = refs.make_reference(validator.object, project)
             validator.object.save()
@@ -535,20 +787,23 @@ def store_epic(project, data):
 
 
 def store_epics(project, data):
-    results = []
+    stored = 0
     for epic in data.get("epics", []):
-        epic = store_epic(project, epic)
-        results.append(epic)
-    return results
+        if store_epic(project, epic):
+            stored += 1
+    return stored
 
 
 ## TASKS
 
-def store_task(project, data):
+def _clean_task_data(project, data):
     if "status" not in data and project.default_task_status:
         data["status"] = project.default_task_status.name
+    return data
 
-    validator = validators.TaskExportValidator(data=data, context={"project": project})
+
+def store_task(project, data):
+    validator = validators.TaskExportValidator(data=_clean_task_data(project, data), context={"project": project})
     if validator.is_valid():
         validator.object.project = project
         if validator.object.owner is None:
@@ -560,10 +815,7 @@ def store_task(project, data):
         validator.save_watchers()
 
         if validator.object.ref:
-            sequence_name = refs.make_sequence_name(project)
-            if not seq.exists(sequence_name):
-                seq.create(sequence_name)
-            seq.set_max(sequence_name, validator.object.ref)
+            _update_references_sequence(project, validator.object.ref)
         else:
             validator.object.ref, _ = refs.make_reference(validator.object, project)
             validator.object.save()
@@ -597,19 +849,19 @@ def store_task(project, data):
 
 
 def store_tasks(project, data):
-    tasks = {}
-    for task in data.get("tasks", []):
-        validator = store_task(project, task)
-        if validator:
-            tasks[validator.object.ref] = validator.object
-    return tasks
+    return _bulk_store_items(project, data.get("tasks", []),
+                             section="tasks",
+                             validator_class=validators.TaskExportValidator,
+                             clean_data=_clean_task_data,
+                             statuses=project.task_statuses,
+                             custom_attributes=project.taskcustomattributes,
+                             custom_attributes_values_field="task",
+                             prefetch_refs={"user_story": UserStory})
 
 
 ## ISSUES
 
-def store_issue(project, data):
-    validator = validators.IssueExportValidator(data=data, context={"project": project})
-
+def _clean_issue_data(project, data):
     if "type" not in data and project.default_issue_type:
         data["type"] = project.default_issue_type.name
 
@@ -621,7 +873,11 @@ def store_issue(project, data):
 
     if "severity" not in data and project.default_severity:
         data["severity"] = project.default_severity.name
+    return data
+
 
+def store_issue(project, data):
+    validator = validators.IssueExportValidator(data=_clean_issue_data(project, data), context={"project": project})
     if validator.is_valid():
         validator.object.project = project
         if validator.object.owner is None:
@@ -633,10 +889,7 @@ def store_issue(project, data):
         validator.save_watchers()
 
         if validator.object.ref:
-            sequence_name = refs.make_sequence_name(project)
-            if not seq.exists(sequence_name):
-                seq.create(sequence_name)
-            seq.set_max(sequence_name, validator.object.ref)
+            _update_references_sequence(project, validator.object.ref)
         else:
             validator.object.ref, _ = refs.make_reference(validator.object, project)
             validator.object.save()
@@ -669,12 +922,13 @@ def store_issue(project, data):
 
 
 def store_issues(project, data):
-    issues = {}
-    for issue in data.get("issues", []):
-        validator = store_issue(project, issue)
-        if validator:
-            issues[validator.object.ref] = validator.object
-    return issues
+    return _bulk_store_items(project, data.get("issues", []),
+                             section="issues",
+                             validator_class=validators.IssueExportValidator,
+                             clean_data=_clean_issue_data,
+                             statuses=project.issue_statuses,
+                             custom_attributes=project.issuecustomattributes,
+                             custom_attributes_values_field="issue")
 
 
 ## WIKI PAGES
@@ -708,10 +962,11 @@ def store_wiki_page(project, wiki_page):
 
 
 def store_wiki_pages(project, data):
-    results = []
+    stored = 0
     for wiki_page in data.get("wiki_pages", []):
-        results.append(store_wiki_page(project, wiki_page))
-    return results
+        if store_wiki_page(project, wiki_page):
+            stored += 1
+    return stored
 
 
 ## WIKI LINKS
@@ -767,11 +1022,12 @@ def store_timeline_entries(project, data):
             (t.get("data", {}).get("userstory", {}).get("project", {}).get("slug", None) != project.slug)
         ), data.get("timeline", []))
 
-    results = []
+    stored = 0
     for timeline in timeline_items:
-        tl = _store_timeline_entry(project, timeline)
-        results.append(tl)
-    return results
+        validator = _store_timeline_entry(project, timeline)
+        if not validator.errors:
+            stored += 1
+    return stored
 
 
 #############################################
@@ -906,6 +1162,7 @@ def _populate_project_object(project, data):
 
     # Regenerate stats
     project.refresh_totals()
+    milestone_services.update_burndown_points(milestone_ids=project.milestones.values_list("id", flat=True))
 
 
 def store_project_from_dict(data, owner=None):
@@ -7,9 +7,13 @@
 
 import datetime
 import logging
+import os
+import shutil
 import sys
 import gzip
+import tempfile
 
+from django.contrib.auth import get_user_model
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from django.utils import timezone
@@ -18,6 +22,7 @@ from django.conf import settings
 from django.utils.translation import gettext as _
 
 from taiga.base.mails import mail_builder
+from taiga.projects.models import Project
 from taiga.base.utils import json
 from taiga.celery import app
 
@@ -30,22 +35,41 @@ logger = logging.getLogger('taiga.export_import')
 import resource
 
 
-@app.task(bind=True)
-def dump_project(self, user, project, dump_format):
+def _get_dump_workdir(project, task_id):
+    # It only depends on the task, so a redelivered task resumes the render
+    base_dir = settings.EXPORTS_WORKDIR or tempfile.gettempdir()
+    return os.path.join(base_dir, "taiga-exports", "{}-{}".format(project.pk, task_id))
+
+
+@app.task(bind=True, acks_late=True)
+def dump_project(self, user_id, project_id, dump_format):
+    try:
+        user = get_user_model().objects.get(id=user_id)
+        project = Project.objects.get(id=project_id)
+    except (get_user_model().DoesNotExist, Project.DoesNotExist):
+        logger.error('Error generating dump of project %s (by user %s): not found', project_id, user_id)
+        return
+
+    workdir = _get_dump_workdir(project, self.request.id)
+    workers = settings.EXPORTS_RENDER_WORKERS
     try:
         if dump_format == "gzip":
             path = "exports/{}/{}-{}.json.gz".format(project.pk, project.slug, self.request.id)
             with default_storage.open(path, mode="wb") as outfile:
-                services.render_project(project, gzip.GzipFile(fileobj=outfile, mode="wb"))
+                with gzip.GzipFile(fileobj=outfile, mode="wb") as gzip_outfile:
+                    services.render_project_in_parts(project, gzip_outfile, workdir, workers=workers)
         else:
             path = "exports/{}/{}-{}.json".format(project.pk, project.slug, self.request.id)
             with default_storage.open(path, mode="wb") as outfile:
-                services.render_project(project, outfile)
+                services.render_project_in_parts(project, outfile, workdir, workers=workers)
 
         url = default_storage.url(path)
 
     except Exception:
         # Error
+        # Only a crashed worker (the task is redelivered) can resume the render
+        shutil.rmtree(workdir, ignore_errors=True)
+
         ctx = {
             "user": user,
             "error_subject": _("Error generating project dump"),
@@ -95,8 +119,20 @@ TRACE ERROR:
 
 
 @app.task
-def load_project_dump(user, dump):
+def load_project_dump(user_id, dump_path):
     try:
+        user = get_user_model().objects.get(id=user_id)
+    except get_user_model().DoesNotExist:
+        default_storage.delete(dump_path)
+        return
+
+    try:
+        dump = services.read_dump_from_storage(dump_path)
+
+        slug = dump.get('slug', None)
+        if slug is not None and Project.objects.filter(slug=slug).exists():
+            del dump['slug']
+
         project = services.store_project_from_dict(dump, user)
     except err.TaigaImportError as e:
         # On Error
@@ -132,3 +168,6 @@ def load_project_dump(user, dump):
         ctx = {"user": user, "project": project}
         email = mail_builder.load_dump(user, ctx)
         email.send()
+
+    finally:
+        default_storage.delete(dump_path)
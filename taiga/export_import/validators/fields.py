@@ -117,6 +117,10 @@ class CommentField(serializers.WritableField):
         into["comment_html"] = mdrender(self.context['project'], data.get("comment", ""))
 
 
+def make_lookup_key(model, slug_field, value):
+    return (model._meta.label_lower, slug_field, str(value))
+
+
 class ProjectRelatedField(serializers.RelatedField):
     read_only = False
     null_values = (None, "")
@@ -126,12 +130,23 @@ class ProjectRelatedField(serializers.RelatedField):
         super().__init__(*args, **kwargs)
 
     def from_native(self, data):
+        # Bulk imports share a `lookups` dict between all the validators of a
+        # section, so every related object is fetched only once.
+        lookups = self.context.get("lookups", None)
+        lookup_key = make_lookup_key(self.queryset.model, self.slug_field, data)
+        if lookups is not None and lookup_key in lookups:
+            return lookups[lookup_key]
+
         try:
             kwargs = {self.slug_field: data, "project": self.context['project']}
-            return self.queryset.get(**kwargs)
+            value = self.queryset.get(**kwargs)
         except ObjectDoesNotExist:
             raise ValidationError(_("{}=\"{}\" not found in this project".format(self.slug_field, data)))
 
+        if lookups is not None:
+            lookups[lookup_key] = value
+        return value
+
 
 class HistorySnapshotField(JSONField):
     def from_native(self, data):
@@ -51,7 +51,7 @@ class AttachmentExportValidator(validators.ModelValidator):
 
     class Meta:
         model = attachments_models.Attachment
-        exclude = ('id', 'content_type', 'object_id', 'project')
+        exclude = ('id', 'content_type', 'object_id', 'project', 'attached_file_thumbnails')
 
 
 class WatcheableObjectModelValidatorMixin(validators.ModelValidator):
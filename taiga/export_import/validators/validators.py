@@ -285,7 +285,7 @@ class TaskExportValidator(WatcheableObjectModelValidatorMixin):
 
     class Meta:
         model = tasks_models.Task
-        exclude = ('id', 'project')
+        exclude = ('id', 'project', 'description_html', 'blocked_note_html')
 
     def custom_attributes_queryset(self, project):
         if project.id not in _custom_tasks_attributes_cache:
@@ -323,7 +323,7 @@ class EpicExportValidator(WatcheableObjectModelValidatorMixin):
 
     class Meta:
         model = epics_models.Epic
-        exclude = ('id', 'project')
+        exclude = ('id', 'project', 'description_html', 'blocked_note_html')
 
     def custom_attributes_queryset(self, project):
         if project.id not in _custom_epics_attributes_cache:
@@ -348,7 +348,8 @@ class UserStoryExportValidator(WatcheableObjectModelValidatorMixin):
 
     class Meta:
         model = userstories_models.UserStory
-        exclude = ('id', 'project', 'points', 'tasks', 'from_task_ref')
+        exclude = ('id', 'project', 'points', 'tasks', 'from_task_ref',
+                   'description_html', 'blocked_note_html')
 
     def custom_attributes_queryset(self, project):
         if project.id not in _custom_userstories_attributes_cache:
@@ -371,7 +372,7 @@ class IssueExportValidator(WatcheableObjectModelValidatorMixin):
 
     class Meta:
         model = issues_models.Issue
-        exclude = ('id', 'project')
+        exclude = ('id', 'project', 'description_html', 'blocked_note_html')
 
     def custom_attributes_queryset(self, project):
         if project.id not in _custom_issues_attributes_cache:
@@ -386,7 +387,7 @@ class WikiPageExportValidator(WatcheableObjectModelValidatorMixin):
 
     class Meta:
         model = wiki_models.WikiPage
-        exclude = ('id', 'project')
+        exclude = ('id', 'project', 'content_html')
 
 
 class WikiLinkExportValidator(validators.ModelValidator):
@@ -442,4 +443,4 @@ class ProjectExportValidator(WatcheableObjectModelValidatorMixin):
 
     class Meta:
         model = projects_models.Project
-        exclude = ('id', 'members')
+        exclude = ('id', 'members', 'logo_thumbnails')
@@ -16,7 +16,7 @@ from taiga.users.services import get_user_photo_url
 from taiga.users.gravatar import get_user_gravatar_id
 
 from taiga.importers import permissions, exceptions
-from taiga.importers.services import resolve_users_bindings
+from taiga.importers.services import resolve_users_bindings, dump_users_bindings
 from .importer import AsanaImporter
 from . import tasks
 
@@ -86,7 +86,8 @@ class AsanaImporterViewSet(viewsets.ViewSet):
         }
 
         if settings.CELERY_ENABLED:
-            task = tasks.import_project.delay(request.user.id, token, project_id, options)
+            task_options = dict(options, users_bindings=dump_users_bindings(options["users_bindings"]))
+            task = tasks.import_project.delay(request.user.id, token, project_id, task_options)
             return response.Accepted({"task_id": task.id})
 
         importer = AsanaImporter(request.user, token)
@@ -13,6 +13,7 @@ from django.utils.translation import gettext as _
 from taiga.base.mails import mail_builder
 from taiga.users.models import User
 from taiga.celery import app
+from taiga.importers.services import load_users_bindings
 from .importer import AsanaImporter
 
 logger = logging.getLogger('taiga.importers.asana')
@@ -21,6 +22,7 @@ logger = logging.getLogger('taiga.importers.asana')
 @app.task(bind=True)
 def import_project(self, user_id, token, project_id, options):
     user = User.objects.get(id=user_id)
+    options["users_bindings"] = load_users_bindings(options.get("users_bindings", {}))
     importer = AsanaImporter(user, token)
     try:
         project = importer.import_project(project_id, options)
@@ -17,7 +17,7 @@ from taiga.users.gravatar import get_user_gravatar_id
 
 from taiga.importers import permissions
 from taiga.importers import exceptions
-from taiga.importers.services import resolve_users_bindings
+from taiga.importers.services import resolve_users_bindings, dump_users_bindings
 from .importer import GithubImporter
 from . import tasks
 
@@ -82,7 +82,8 @@ class GithubImporterViewSet(viewsets.ViewSet):
         }
 
         if settings.CELERY_ENABLED:
-            task = tasks.import_project.delay(request.user.id, token, project_id, options)
+            task_options = dict(options, users_bindings=dump_users_bindings(options["users_bindings"]))
+            task = tasks.import_project.delay(request.user.id, token, project_id, task_options)
             return response.Accepted({"task_id": task.id})
 
         importer = GithubImporter(request.user, token)
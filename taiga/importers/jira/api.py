@@ -20,7 +20,7 @@ from taiga.users.gravatar import get_user_gravatar_id
 
 from taiga.importers import permissions
 from taiga.importers import exceptions
-from taiga.importers.services import resolve_users_bindings
+from taiga.importers.services import resolve_users_bindings, dump_users_bindings
 from .normal import JiraNormalImporter
 from .agile import JiraAgileImporter
 from . import tasks
@@ -160,7 +160,8 @@ class JiraImporterViewSet(viewsets.ViewSet):
             options["types_bindings"] = types_bindings
 
         if settings.CELERY_ENABLED:
-            task = tasks.import_project.delay(request.user.id, url, token, project_id, options, importer_type)
+            task_options = dict(options, users_bindings=dump_users_bindings(options["users_bindings"]))
+            task = tasks.import_project.delay(request.user.id, url, token, project_id, task_options, importer_type)
             return response.Accepted({"task_id": task.id})
 
         project = importer.import_project(project_id, options)
@@ -13,6 +13,7 @@ from django.utils.translation import gettext as _
 from taiga.base.mails import mail_builder
 from taiga.users.models import User
 from taiga.celery import app
+from taiga.importers.services import load_users_bindings
 from .normal import JiraNormalImporter
 from .agile import JiraAgileImporter
 
@@ -22,6 +23,7 @@ logger = logging.getLogger('taiga.importers.jira')
 @app.task(bind=True)
 def import_project(self, user_id, url, token, project_id, options, importer_type):
     user = User.objects.get(id=user_id)
+    options["users_bindings"] = load_users_bindings(options.get("users_bindings", {}))
 
     if importer_type == "agile":
         importer = JiraAgileImporter(user, url, token)
@@ -11,13 +11,17 @@ from taiga.projects.models import Membership
 from taiga.permissions.choices import ANON_PERMISSIONS
 
 
+def _get_user_key(key):
+    try:
+        return int(key)
+    except ValueError:
+        return key
+
+
 def resolve_users_bindings(users_bindings):
     new_users_bindings = {}
     for key,value in users_bindings.items():
-        try:
-            user_key = int(key)
-        except ValueError:
-            user_key = key
+        user_key = _get_user_key(key)
 
         if isinstance(value, str):
             try:
@@ -31,6 +35,21 @@ def resolve_users_bindings(users_bindings):
     return new_users_bindings
 
 
+def dump_users_bindings(users_bindings):
+    """
+    Users bindings with the ids of the users, to send them as a task argument.
+    """
+    return {key: user.id if user else None for key, user in users_bindings.items()}
+
+
+def load_users_bindings(users_bindings):
+    """
+    Users bindings from `dump_users_bindings`, with the users fetched at once.
+    """
+    users = User.objects.in_bulk([user_id for user_id in users_bindings.values() if user_id is not None])
+    return {_get_user_key(key): users.get(user_id, None) for key, user_id in users_bindings.items()}
+
+
 def create_memberships(users_bindings, project, creator, role_name):
     for user in users_bindings.values():
         if Membership.objects.filter(project=project, user=user).count() > 0:
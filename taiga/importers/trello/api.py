@@ -20,7 +20,7 @@ from taiga.users.gravatar import get_user_gravatar_id
 
 from .importer import TrelloImporter
 from taiga.importers import permissions
-from taiga.importers.services import resolve_users_bindings
+from taiga.importers.services import resolve_users_bindings, dump_users_bindings
 from . import tasks
 
 
@@ -84,7 +84,8 @@ class TrelloImporterViewSet(viewsets.ViewSet):
         }
 
         if settings.CELERY_ENABLED:
-            task = tasks.import_project.delay(request.user.id, token, project_id, options)
+            task_options = dict(options, users_bindings=dump_users_bindings(options["users_bindings"]))
+            task = tasks.import_project.delay(request.user.id, token, project_id, task_options)
             return response.Accepted({"task_id": task.id})
 
         importer = TrelloImporter(request.user, token)
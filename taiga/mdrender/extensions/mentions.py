@@ -28,6 +28,8 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
+import re
+
 from django.contrib.auth import get_user_model
 
 from markdown.extensions import Extension
@@ -37,35 +39,69 @@ from xml.etree import ElementTree as etree
 from taiga.front.templatetags.functions import resolve
 
 
+MENTION_RE = r"\B(@)([\w.-]+)\b"
+
+
+def get_mentioned_users(project, text):
+    """
+    Find all the mentions of `text` and return a dict with the user for every
+    mentioned username, or None if there is no such user in the project.
+    """
+    users = {m.group(2): None for m in re.finditer(MENTION_RE, text)}
+    if not users:
+        return users
+
+    kwargs = {"username__in": list(users)}
+    if project is not None:
+        kwargs["memberships__project_id"] = project.id
+
+    for user in get_user_model().objects.filter(**kwargs):
+        users[user.username] = user
+
+    return users
+
+
 class MentionsExtension(Extension):
     project = None
+    users = None
 
     def __init__(self, *args, **kwargs):
         self.project = kwargs.pop("project", None)
+        self.users = kwargs.pop("users", None)
         super().__init__(*args, **kwargs)
 
     def extendMarkdown(self, md):
-        MENTION_RE = r"\B(@)([\w.-]+)\b"
-        mentionsPattern = MentionsPattern(MENTION_RE, project=self.project)
+        mentionsPattern = MentionsPattern(MENTION_RE, project=self.project, users=self.users)
         mentionsPattern.md = md
         md.inlinePatterns.register(mentionsPattern, "mentions", 80)
 
 
 class MentionsPattern(Pattern):
     project = None
+    users = None
 
-    def __init__(self, pattern, md=None, project=None):
+    def __init__(self, pattern, md=None, project=None, users=None):
         self.project = project
+        # Users resolved in bulk by `get_mentioned_users`
+        self.users = users
         super().__init__(pattern, md)
 
-    def handleMatch(self, m):
-        username = m.group(3)
+    def _get_user(self, username):
+        if self.users is not None and username in self.users:
+            return self.users[username]
+
         kwargs = {"username": username}
         if self.project is not None:
             kwargs["memberships__project_id"]=self.project.id
         try:
-            user = get_user_model().objects.get(**kwargs)
+            return get_user_model().objects.get(**kwargs)
         except get_user_model().DoesNotExist:
+            return None
+
+    def handleMatch(self, m):
+        username = m.group(3)
+        user = self._get_user(username)
+        if user is None:
             return "@{}".format(username)
 
         url = resolve("user", username)
@@ -29,35 +29,56 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import re
+
 from markdown.extensions import Extension
 from markdown.inlinepatterns import Pattern
 from xml.etree import ElementTree as etree
 
-from taiga.projects.references.services import get_instance_by_ref
+from taiga.projects.references.services import get_instance_by_ref, get_instances_by_refs
 from taiga.front.templatetags.functions import resolve
 
 
+TAIGA_REFERENCE_RE = r'(?<=^|(?<=[^a-zA-Z0-9-\[]))#(\d+)'
+
+
+def get_referenced_instances(project, text):
+    """
+    Find all the references of `text` and return a dict with the Reference
+    instance for every ref, or None if it doesn't exist.
+    """
+    obj_refs = {int(m.group(1)) for m in re.finditer(TAIGA_REFERENCE_RE, text, re.MULTILINE)}
+    return get_instances_by_refs(project.id, obj_refs)
+
+
 class TaigaReferencesExtension(Extension):
-    def __init__(self, project, *args, **kwargs):
+    def __init__(self, project, *args, references=None, **kwargs):
         self.project = project
+        self.references = references
         return super().__init__(*args, **kwargs)
 
     def extendMarkdown(self, md):
-        TAIGA_REFERENCE_RE = r'(?<=^|(?<=[^a-zA-Z0-9-\[]))#(\d+)'
-        referencesPattern = TaigaReferencesPattern(TAIGA_REFERENCE_RE, self.project)
+        referencesPattern = TaigaReferencesPattern(TAIGA_REFERENCE_RE, self.project, self.references)
         referencesPattern.md = md
         md.inlinePatterns.register(referencesPattern, 'taiga-references', 65)
 
 
 class TaigaReferencesPattern(Pattern):
-    def __init__(self, pattern, project):
+    def __init__(self, pattern, project, references=None):
         self.project = project
+        # References resolved in bulk by `get_referenced_instances`
+        self.references = references
         super().__init__(pattern)
 
+    def _get_instance(self, obj_ref):
+        if self.references is not None and int(obj_ref) in self.references:
+            return self.references[int(obj_ref)]
+        return get_instance_by_ref(self.project.id, obj_ref)
+
     def handleMatch(self, m):
         obj_ref = m.group(2)
 
-        instance = get_instance_by_ref(self.project.id, obj_ref)
+        instance = self._get_instance(obj_ref)
         if instance is None or instance.content_object is None:
             return "#{}".format(obj_ref)
 
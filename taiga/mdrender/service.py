@@ -9,7 +9,11 @@ from django.conf import settings
 
 import hashlib
 import functools
+import queue
 import bleach
+from contextlib import contextmanager
+
+from taiga.projects.attachments.services import REFRESH_PARAM
 
 # BEGIN PATCH
 import html5lib
@@ -39,8 +43,8 @@ from .extensions.semi_sane_lists import SemiSaneListExtension
 from .extensions.strikethrough import StrikethroughExtension
 from .extensions.wikilinks import WikiLinkExtension
 from .extensions.emojify import EmojifyExtension
-from .extensions.mentions import MentionsExtension
-from .extensions.references import TaigaReferencesExtension
+from .extensions.mentions import MentionsExtension, get_mentioned_users
+from .extensions.references import TaigaReferencesExtension, get_referenced_instances
 from .extensions.target_link import TargetBlankLinkExtension
 from .extensions.refresh_attachment import RefreshAttachmentExtension
 
@@ -60,7 +64,7 @@ bleach.ALLOWED_ATTRIBUTES["*"] = ["class", "style", "id"]
 ALLOWED_PROTOCOLS = ["http", "https", "ftp", "mailto"]
 
 
-def _make_extensions_list(project=None):
+def _make_extensions_list(project=None, users=None, references=None):
     return ["pymdownx.tasklist",
             AutolinkExtension(),
             AutomailExtension(),
@@ -68,8 +72,8 @@ def _make_extensions_list(project=None):
             StrikethroughExtension(),
             WikiLinkExtension(project),
             EmojifyExtension(),
-            MentionsExtension(project=project),
-            TaigaReferencesExtension(project),
+            MentionsExtension(project=project, users=users),
+            TaigaReferencesExtension(project, references=references),
             TargetBlankLinkExtension(),
             RefreshAttachmentExtension(project=project),
             "markdown.extensions.extra",
@@ -92,19 +96,65 @@ def _make_extension_configs():
 import diff_match_patch
 
 
+def _get_cache_key(project, text):
+    # Avoid cache of too short texts
+    if len(text) <= settings.MDRENDER_CACHE_MIN_SIZE:
+        return None
+
+    sha1_hash = hashlib.sha1(force_bytes(text)).hexdigest()
+    return "mdrender/{}-{}".format(sha1_hash, project.id)
+
+
+def _get_many_cached(func, project, texts):
+    keys = {}
+    if settings.MDRENDER_CACHE_ENABLE:
+        keys = {text: _get_cache_key(project, text) for text in texts}
+        keys = {text: key for text, key in keys.items() if key is not None}
+
+    rendered = cache.get_many(list(keys.values())) if keys else {}
+    results = {}
+    new_values = {}
+    for text in texts:
+        key = keys.get(text, None)
+        if text in results:
+            continue
+        elif key in rendered:
+            results[text] = rendered[key]
+        else:
+            results[text] = func(project, text)
+            if key is not None:
+                new_values[key] = results[text]
+
+    if new_values:
+        cache.set_many(new_values, timeout=settings.MDRENDER_CACHE_TIMEOUT)
+    return [results[text] for text in texts]
+
+
+def _refresh_cached(func, project, text):
+    returned_value = func(project, text)
+    key = _get_cache_key(project, text) if settings.MDRENDER_CACHE_ENABLE else None
+    if key is not None:
+        cache.set(key, returned_value, timeout=settings.MDRENDER_CACHE_TIMEOUT)
+    return returned_value
+
+
 def cache_by_sha(func):
+    """
+    Cache the result of `func(project, text)` by the sha of the text. The
+    decorated function has also a `many(project, texts)` method that renders
+    a list of texts of the same project getting (and setting) all the cached
+    ones at once, and a `refresh(project, text)` method that renders the text
+    again replacing the cached result (e.g. when a mentioned user changes).
+    """
     @functools.wraps(func)
     def _decorator(project, text):
         if not settings.MDRENDER_CACHE_ENABLE:
             return func(project, text)
 
-        # Avoid cache of too short texts
-        if len(text) <= settings.MDRENDER_CACHE_MIN_SIZE:
+        key = _get_cache_key(project, text)
+        if key is None:
             return func(project, text)
 
-        sha1_hash = hashlib.sha1(force_bytes(text)).hexdigest()
-        key = "mdrender/{}-{}".format(sha1_hash, project.id)
-
         # Try to get it from the cache
         cached = cache.get(key)
         if cached is not None:
@@ -114,27 +164,96 @@ def cache_by_sha(func):
         cache.set(key, returned_value, timeout=settings.MDRENDER_CACHE_TIMEOUT)
         return returned_value
 
+    _decorator.many = functools.partial(_get_many_cached, func)
+    _decorator.refresh = functools.partial(_refresh_cached, func)
     return _decorator
 
 
-def _get_markdown(project):
-    extensions = _make_extensions_list(project=project)
+def _prescan(project, text):
+    """
+    Resolve all the mentions and references of `text` in bulk, instead of
+    one by one while rendering it.
+    """
+    users = get_mentioned_users(project, text)
+    references = get_referenced_instances(project, text) if project is not None else None
+    return {"users": users, "references": references}
+
+
+# Pool of pre-built Markdown engines of this process. See `_get_markdown`.
+_engines = queue.LifoQueue()
+
+
+def _build_markdown():
+    extensions = _make_extensions_list()
     extension_configs = _make_extension_configs()
     md = Markdown(extensions=extensions, extension_configs=extension_configs)
-    md.extracted_data = {"mentions": [], "references": []}
+    # The processors of the taiga extensions that depend on the rendered project
+    md.project_processors = [processor for registry in (md.inlinePatterns, md.treeprocessors)
+                             for processor in registry if hasattr(processor, "project")]
     return md
 
 
+def _bind_markdown(md, project, users=None, references=None):
+    for processor in md.project_processors:
+        processor.project = project
+        if hasattr(processor, "users"):
+            processor.users = users
+        if hasattr(processor, "references"):
+            processor.references = references
+    md.extracted_data = {"mentions": [], "references": []}
+
+
+@contextmanager
+def _get_markdown(project, text=""):
+    """
+    Get a Markdown engine from the pool, bound to `project` and to the
+    mentions and references of `text`, and give it back when done.
+    """
+    try:
+        md = _engines.get_nowait()
+    except queue.Empty:
+        md = _build_markdown()
+
+    _bind_markdown(md, project, **_prescan(project, text))
+    # If the render fails the engine is discarded, its state could be broken
+    yield md
+
+    md.reset()
+    _bind_markdown(md, None)
+    if _engines.qsize() < settings.MDRENDER_POOL_SIZE:
+        _engines.put(md)
+
+
 @cache_by_sha
 def render(project, text):
-    md = _get_markdown(project)
-    return bleach.clean(md.convert(text), protocols=ALLOWED_PROTOCOLS)
+    with _get_markdown(project, text) as md:
+        return bleach.clean(md.convert(text), protocols=ALLOWED_PROTOCOLS)
+
+
+def render_many(project, texts):
+    """
+    Render a list of texts of a project, like the comments of a history page.
+    """
+    return render.many(project, texts)
+
+
+def get_rendered_html(instance, field):
+    """
+    Get the html of the text `field` of an instance, stored when it was saved
+    in its `<field>_html` field. If it has not been rendered yet (e.g. the
+    instance was created in bulk) it's rendered now, and so is it if it links
+    to attachments, because their urls are signed again on every render.
+    """
+    html = getattr(instance, "{}_html".format(field))
+    if html is None or REFRESH_PARAM in html:
+        html = render(instance.project, getattr(instance, field))
+    return html
 
 
 def render_and_extract(project, text):
-    md = _get_markdown(project)
-    result = bleach.clean(md.convert(text), protocols=ALLOWED_PROTOCOLS)
-    return (result, md.extracted_data)
+    with _get_markdown(project, text) as md:
+        result = bleach.clean(md.convert(text), protocols=ALLOWED_PROTOCOLS)
+        return (result, md.extracted_data)
 
 
 class DiffMatchPatch(diff_match_patch.diff_match_patch):
@@ -185,4 +304,4 @@ def get_diff_of_htmls(html1, html2):
     return diffutil.diff_pretty_html(diffs)
 
 
-__all__ = ["render", "get_diff_of_htmls", "render_and_extract"]
+__all__ = ["render", "render_many", "get_rendered_html", "get_diff_of_htmls", "render_and_extract"]
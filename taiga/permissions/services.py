@@ -78,36 +78,45 @@ def _get_membership_permissions(membership):
     return []
 
 
+_ADMINS_PERMISSIONS = frozenset(perm[0] for perm in ADMINS_PERMISSIONS)
+_MEMBERS_PERMISSIONS = frozenset(perm[0] for perm in MEMBERS_PERMISSIONS)
+_ANON_PERMISSIONS = frozenset(perm[0] for perm in ANON_PERMISSIONS)
+_SUPERUSER_PERMISSIONS = _ADMINS_PERMISSIONS | _MEMBERS_PERMISSIONS | _ANON_PERMISSIONS
+
+
 def calculate_permissions(is_authenticated=False, is_superuser=False, is_member=False,
                           is_admin=False, role_permissions=[], anon_permissions=[],
                           public_permissions=[]):
     if is_superuser:
-        admins_permissions = list(map(lambda perm: perm[0], ADMINS_PERMISSIONS))
-        members_permissions = list(map(lambda perm: perm[0], MEMBERS_PERMISSIONS))
-        public_permissions = []
-        anon_permissions = list(map(lambda perm: perm[0], ANON_PERMISSIONS))
-    elif is_member:
+        return _SUPERUSER_PERMISSIONS
+
+    permissions = frozenset(anon_permissions or [])
+    if is_authenticated or is_member:
+        permissions = permissions.union(public_permissions or [])
+    if is_member:
+        permissions = permissions.union(role_permissions or [])
         if is_admin:
-            admins_permissions = list(map(lambda perm: perm[0], ADMINS_PERMISSIONS))
-            members_permissions = list(map(lambda perm: perm[0], MEMBERS_PERMISSIONS))
-        else:
-            admins_permissions = []
-            members_permissions = []
-        members_permissions = members_permissions + role_permissions
-        public_permissions = public_permissions if public_permissions is not None else []
-        anon_permissions = anon_permissions if anon_permissions is not None else []
-    elif is_authenticated:
-        admins_permissions = []
-        members_permissions = []
-        public_permissions = public_permissions if public_permissions is not None else []
-        anon_permissions = anon_permissions if anon_permissions is not None else []
-    else:
-        admins_permissions = []
-        members_permissions = []
-        public_permissions = []
-        anon_permissions = anon_permissions if anon_permissions is not None else []
+            permissions = permissions | _ADMINS_PERMISSIONS | _MEMBERS_PERMISSIONS
+
+    return permissions
+
 
-    return set(admins_permissions + members_permissions + public_permissions + anon_permissions)
+# The permissions of an user in a project are memoized in the user instance,
+# so they live as long as the request. Any change in a membership, a role or a
+# project permissions bumps the version and invalidates all of them.
+_permissions_version = 0
+
+
+def invalidate_permissions_cache(user=None):
+    """
+    Invalidate the memoized permissions of `user` or, if it's None, of all
+    the users.
+    """
+    global _permissions_version
+    if user is None:
+        _permissions_version += 1
+    else:
+        user.__dict__.pop("_cached_project_permissions", None)
 
 
 def get_user_project_permissions(user, project, cache="user"):
@@ -116,17 +125,30 @@ def get_user_project_permissions(user, project, cache="user"):
     in cache
     """
     membership = _get_user_project_membership(user, project, cache=cache)
-    is_member = membership is not None
-    is_admin = is_member and membership.is_admin
-    return calculate_permissions(
-        is_authenticated = user.is_authenticated,
-        is_superuser =  user.is_superuser,
-        is_member = is_member,
-        is_admin = is_admin,
-        role_permissions = _get_membership_permissions(membership),
-        anon_permissions = project.anon_permissions,
-        public_permissions = project.public_permissions
-    )
+
+    if membership is None:
+        key = (project.id, cache, None, False, None, _permissions_version)
+    else:
+        key = (project.id, cache, membership.id, membership.is_admin, membership.role_id,
+               _permissions_version)
+
+    cached_permissions = user.__dict__.setdefault("_cached_project_permissions", {})
+    permissions = cached_permissions.get(key, None)
+    if permissions is None:
+        is_member = membership is not None
+        is_admin = is_member and membership.is_admin
+        permissions = calculate_permissions(
+            is_authenticated = user.is_authenticated,
+            is_superuser =  user.is_superuser,
+            is_member = is_member,
+            is_admin = is_admin,
+            role_permissions = _get_membership_permissions(membership),
+            anon_permissions = project.anon_permissions,
+            public_permissions = project.public_permissions
+        )
+        cached_permissions[key] = permissions
+
+    return permissions
 
 
 def set_base_permissions_for_project(project):
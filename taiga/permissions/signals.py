@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+from .services import invalidate_permissions_cache
+
+
+def invalidate_permissions_cache_on_change(sender, instance, **kwargs):
+    # Memberships, roles and projects define the permissions of the users
+    invalidate_permissions_cache()
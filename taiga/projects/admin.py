@@ -216,13 +216,16 @@ class ProjectAdmin(admin.ModelAdmin):
         from taiga.projects.issues.apps import (connect_all_issues_signals,
                                                 disconnect_all_issues_signals)
         from taiga.projects.apps import (connect_memberships_signals,
-                                         disconnect_memberships_signals)
+                                         disconnect_memberships_signals,
+                                         connect_rendered_html_signals,
+                                         disconnect_rendered_html_signals)
 
         disconnect_events_signals()
         disconnect_all_issues_signals()
         disconnect_all_tasks_signals()
         disconnect_all_userstories_signals()
         disconnect_memberships_signals()
+        disconnect_rendered_html_signals()
 
         try:
             super().delete_queryset(request, queryset)
@@ -232,6 +235,7 @@ class ProjectAdmin(admin.ModelAdmin):
             connect_all_tasks_signals()
             connect_all_userstories_signals()
             connect_memberships_signals()
+            connect_rendered_html_signals()
 
 # User Stories common admins
 class PointsAdmin(admin.ModelAdmin):
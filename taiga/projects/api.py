@@ -110,6 +110,9 @@ class ProjectViewSet(LikedResourceMixin, HistoryResourceMixin,
             qs = project_utils.attach_my_homepage(qs, user=self.request.user)
         elif self.request.QUERY_PARAMS.get('slight', False):
             qs = project_utils.attach_basic_info(qs, user=self.request.user)
+        elif self.action in ("retrieve", "by_slug"):
+            # The configuration is attached from its cache by `retrieve`
+            qs = project_utils.attach_extra_info(qs, user=self.request.user, with_config=False)
         else:
             qs = project_utils.attach_extra_info(qs, user=self.request.user)
 
@@ -148,6 +151,7 @@ class ProjectViewSet(LikedResourceMixin, HistoryResourceMixin,
         if self.object is None:
             raise Http404
 
+        services.attach_project_config(self.object)
         serializer = self.get_serializer(self.object)
         return response.Ok(serializer.data)
 
@@ -365,7 +369,7 @@ class ProjectViewSet(LikedResourceMixin, HistoryResourceMixin,
     def stats(self, request, pk=None):
         project = self.get_object()
         self.check_permissions(request, "stats", project)
-        return response.Ok(services.get_stats_for_project(project))
+        return response.Ok(services.get_cached_stats_for_project(project))
 
     @detail_route(methods=["GET"])
     def member_stats(self, request, pk=None):
@@ -548,10 +552,11 @@ class DeleteOwnProjectsViewSet(ViewSet):
         for project in projects:
             services.orphan_project(project)
 
+        project_ids = [project.id for project in projects]
         if settings.CELERY_ENABLED:
-            services.delete_projects.delay(projects)
+            services.delete_projects.delay(project_ids)
         else:
-            services.delete_projects(projects)
+            services.delete_projects(project_ids)
 
         return response.NoContent()
 
@@ -108,6 +108,142 @@ def disconnect_task_status_signals():
                                  dispatch_uid="try_to_close_or_open_user_stories_when_edit_task_status")
 
 
+## Points Signals
+
+def connect_points_signals():
+    from . import signals as handlers
+    signals.post_save.connect(handlers.update_burndown_points_when_edit_points,
+                              sender=apps.get_model("projects", "Points"),
+                              dispatch_uid="update_burndown_points_when_edit_points")
+
+
+def disconnect_points_signals():
+    signals.post_save.disconnect(sender=apps.get_model("projects", "Points"),
+                                 dispatch_uid="update_burndown_points_when_edit_points")
+
+
+## Permissions cache Signals
+
+PERMISSIONS_MODELS = (("projects", "Project"), ("projects", "Membership"), ("users", "Role"))
+
+
+def connect_permissions_signals():
+    from taiga.permissions import signals as permissions_handlers
+    # Invalidate the memoized permissions when something that defines them changes
+    for app_label, model_name in PERMISSIONS_MODELS:
+        for signal in (signals.post_save, signals.post_delete):
+            signal.connect(permissions_handlers.invalidate_permissions_cache_on_change,
+                           sender=apps.get_model(app_label, model_name),
+                           dispatch_uid="invalidate_permissions_cache_{}_{}".format(app_label, model_name))
+
+
+def disconnect_permissions_signals():
+    for app_label, model_name in PERMISSIONS_MODELS:
+        for signal in (signals.post_save, signals.post_delete):
+            signal.disconnect(sender=apps.get_model(app_label, model_name),
+                              dispatch_uid="invalidate_permissions_cache_{}_{}".format(app_label, model_name))
+
+
+## Project config cache Signals
+
+CONFIG_MODELS = (("projects", "EpicStatus"), ("projects", "Swimlane"),
+                 ("projects", "UserStoryStatus"), ("projects", "UserStoryDueDate"),
+                 ("projects", "Points"), ("projects", "TaskStatus"),
+                 ("projects", "TaskDueDate"), ("projects", "IssueStatus"),
+                 ("projects", "IssueDueDate"), ("projects", "IssueType"),
+                 ("projects", "Priority"), ("projects", "Severity"),
+                 ("custom_attributes", "EpicCustomAttribute"),
+                 ("custom_attributes", "UserStoryCustomAttribute"),
+                 ("custom_attributes", "TaskCustomAttribute"),
+                 ("custom_attributes", "IssueCustomAttribute"),
+                 ("users", "Role"))
+
+
+def connect_config_cache_signals():
+    from . import signals as handlers
+    # Invalidate the cached configuration of the project when a part of it changes
+    for app_label, model_name in CONFIG_MODELS:
+        for signal in (signals.post_save, signals.post_delete):
+            signal.connect(handlers.bump_project_config_version_on_change,
+                           sender=apps.get_model(app_label, model_name),
+                           dispatch_uid="bump_project_config_version_{}_{}".format(app_label, model_name))
+
+
+def disconnect_config_cache_signals():
+    for app_label, model_name in CONFIG_MODELS:
+        for signal in (signals.post_save, signals.post_delete):
+            signal.disconnect(sender=apps.get_model(app_label, model_name),
+                              dispatch_uid="bump_project_config_version_{}_{}".format(app_label, model_name))
+
+
+## Project stats cache Signals
+
+STATS_MODELS = (("projects", "Project"), ("projects", "Points"),
+                ("milestones", "Milestone"), ("userstories", "UserStory"),
+                ("userstories", "RolePoints"))
+
+
+def connect_stats_cache_signals():
+    from . import signals as handlers
+    # Invalidate the cached stats of the project when the estimations or the sprints change
+    for app_label, model_name in STATS_MODELS:
+        for signal in (signals.post_save, signals.post_delete):
+            signal.connect(handlers.bump_project_stats_version_on_change,
+                           sender=apps.get_model(app_label, model_name),
+                           dispatch_uid="bump_project_stats_version_{}_{}".format(app_label, model_name))
+
+
+def disconnect_stats_cache_signals():
+    for app_label, model_name in STATS_MODELS:
+        for signal in (signals.post_save, signals.post_delete):
+            signal.disconnect(sender=apps.get_model(app_label, model_name),
+                              dispatch_uid="bump_project_stats_version_{}_{}".format(app_label, model_name))
+
+
+## Rendered html Signals
+
+RENDERED_HTML_MODELS = (("epics", "Epic"), ("userstories", "UserStory"), ("tasks", "Task"),
+                        ("issues", "Issue"), ("wiki", "WikiPage"))
+
+
+def connect_rendered_html_signals():
+    from . import signals as handlers
+    # Render the html of the texts when they are saved
+    for app_label, model_name in RENDERED_HTML_MODELS:
+        signals.pre_save.connect(handlers.render_html_on_save,
+                                 sender=apps.get_model(app_label, model_name),
+                                 dispatch_uid="render_html_on_save_{}_{}".format(app_label, model_name))
+        signals.post_save.connect(handlers.refresh_references_html_on_save,
+                                  sender=apps.get_model(app_label, model_name),
+                                  dispatch_uid="refresh_references_html_{}_{}".format(app_label, model_name))
+        signals.post_delete.connect(handlers.refresh_references_html_on_delete,
+                                    sender=apps.get_model(app_label, model_name),
+                                    dispatch_uid="refresh_references_html_{}_{}".format(app_label, model_name))
+
+    # Render again the texts that mention a renamed user
+    signals.pre_save.connect(handlers.keep_prev_user_names_on_save,
+                             sender=apps.get_model("users", "User"),
+                             dispatch_uid="keep_prev_user_names_on_save")
+    signals.post_save.connect(handlers.refresh_mentions_html_on_save,
+                              sender=apps.get_model("users", "User"),
+                              dispatch_uid="refresh_mentions_html_on_save")
+
+
+def disconnect_rendered_html_signals():
+    for app_label, model_name in RENDERED_HTML_MODELS:
+        signals.pre_save.disconnect(sender=apps.get_model(app_label, model_name),
+                                    dispatch_uid="render_html_on_save_{}_{}".format(app_label, model_name))
+        signals.post_save.disconnect(sender=apps.get_model(app_label, model_name),
+                                     dispatch_uid="refresh_references_html_{}_{}".format(app_label, model_name))
+        signals.post_delete.disconnect(sender=apps.get_model(app_label, model_name),
+                                       dispatch_uid="refresh_references_html_{}_{}".format(app_label, model_name))
+
+    signals.pre_save.disconnect(sender=apps.get_model("users", "User"),
+                                dispatch_uid="keep_prev_user_names_on_save")
+    signals.post_save.disconnect(sender=apps.get_model("users", "User"),
+                                 dispatch_uid="refresh_mentions_html_on_save")
+
+
 class ProjectsAppConfig(AppConfig):
     name = "taiga.projects"
     verbose_name = "Projects"
@@ -123,3 +259,8 @@ class ProjectsAppConfig(AppConfig):
         connect_us_status_signals()
         connect_swimlane_signals()
         connect_task_status_signals()
+        connect_points_signals()
+        connect_permissions_signals()
+        connect_config_cache_signals()
+        connect_stats_cache_signals()
+        connect_rendered_html_signals()
@@ -0,0 +1,20 @@
+# Generated by Django 3.2.19 on 2026-10-17 12:40
+
+import django.core.serializers.json
+from django.db import migrations
+import taiga.base.db.models.fields.json
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attachments', '0008_auto_20170201_1053'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='attached_file_thumbnails',
+            field=taiga.base.db.models.fields.json.JSONField(blank=True, default=None, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='attached file thumbnails'),
+        ),
+    ]
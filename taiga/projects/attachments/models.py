@@ -15,6 +15,7 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.utils.text import get_valid_filename
 
+from taiga.base.db.models.fields import JSONField
 from taiga.base.utils.files import get_file_path
 
 
@@ -59,6 +60,8 @@ class Attachment(models.Model):
     attached_file = models.FileField(max_length=500, null=True, blank=True,
                                      upload_to=get_attachment_file_path,
                                      verbose_name=_("attached file"))
+    attached_file_thumbnails = JSONField(null=True, blank=True, default=None,
+                                         verbose_name=_("attached file thumbnails"))
 
     sha1 = models.CharField(default="", max_length=40, verbose_name=_("sha1"), blank=True)
 
@@ -9,7 +9,7 @@ from django.conf import settings
 
 from taiga.base.api import serializers
 from taiga.base.fields import MethodField, Field, FileField
-from taiga.base.utils.thumbnails import get_thumbnail_url
+from taiga.base.utils.thumbnails import get_stored_thumbnail_url
 
 from . import services
 
@@ -66,7 +66,12 @@ class BasicAttachmentsInfoSerializerMixin(serializers.LightSerializer):
         if not include_attachments or obj.attachments_attr is None:
             return []
 
+        attachments = []
         for at in obj.attachments_attr:
-            at["thumbnail_card_url"] = get_thumbnail_url(at["attached_file"], settings.THN_ATTACHMENT_CARD)
+            at = dict(at)
+            thumbnails = at.pop("attached_file_thumbnails", None)
+            at["thumbnail_card_url"] = get_stored_thumbnail_url(at["attached_file"], thumbnails,
+                                                                settings.THN_ATTACHMENT_CARD)
+            attachments.append(at)
 
-        return obj.attachments_attr
+        return attachments
@@ -15,7 +15,7 @@ from django.conf import settings
 
 from psycopg2.extras import execute_values
 
-from taiga.base.utils.thumbnails import get_thumbnail_url, get_thumbnail
+from taiga.base.utils.thumbnails import get_stored_thumbnail_name, get_stored_thumbnail_url, get_thumbnail
 
 from . import models
 
@@ -73,6 +73,11 @@ def url_is_an_attachment(url: str, base=None) -> "Union[str, None]":
 
 def get_timeline_image_thumbnail_name(attachment):
     if attachment.attached_file:
+        if attachment.attached_file_thumbnails is not None:
+            return get_stored_thumbnail_name(attachment.attached_file, attachment.attached_file_thumbnails,
+                                             settings.THN_ATTACHMENT_TIMELINE)
+
+        # The timeline entries keep the name, it can't wait for the background generation
         thumbnail = get_thumbnail(attachment.attached_file, settings.THN_ATTACHMENT_TIMELINE)
         return thumbnail.name if thumbnail else None
     return None
@@ -80,13 +85,15 @@ def get_timeline_image_thumbnail_name(attachment):
 
 def get_card_image_thumbnail_url(attachment):
     if attachment.attached_file:
-        return get_thumbnail_url(attachment.attached_file, settings.THN_ATTACHMENT_CARD)
+        return get_stored_thumbnail_url(attachment.attached_file, attachment.attached_file_thumbnails,
+                                        settings.THN_ATTACHMENT_CARD)
     return None
 
 
 def get_attachment_image_preview_url(attachment):
     if attachment.attached_file:
-        return get_thumbnail_url(attachment.attached_file, settings.THN_ATTACHMENT_PREVIEW)
+        return get_stored_thumbnail_url(attachment.attached_file, attachment.attached_file_thumbnails,
+                                        settings.THN_ATTACHMENT_PREVIEW)
     return None
 
 
@@ -44,7 +44,8 @@ def attach_basic_attachments(queryset, as_field="attachments_attr"):
                 FROM(
                     SELECT
                         attachments_attachment.id,
-                        attachments_attachment.attached_file
+                        attachments_attachment.attached_file,
+                        attachments_attachment.attached_file_thumbnails
                     FROM attachments_attachment
                     WHERE attachments_attachment.object_id = {tbl}.id
                      AND  attachments_attachment.content_type_id = {type_id}
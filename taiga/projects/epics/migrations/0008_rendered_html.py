@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+# Generated by Django 3.2.19 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('epics', '0007_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='epic',
+            name='blocked_note_html',
+            field=models.TextField(blank=True, null=True, verbose_name='blocked note html'),
+        ),
+        migrations.AddField(
+            model_name='epic',
+            name='description_html',
+            field=models.TextField(blank=True, null=True, verbose_name='description html'),
+        ),
+    ]
@@ -54,6 +54,7 @@ class Epic(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, models.M
     subject = models.TextField(null=False, blank=False,
                                verbose_name=_("subject"))
     description = models.TextField(null=False, blank=True, verbose_name=_("description"))
+    description_html = models.TextField(null=True, blank=True, verbose_name=_("description html"))
     color = models.CharField(max_length=32, null=False, blank=True,
                              default=generate_random_predefined_hex_color,
                              verbose_name=_("color"))
@@ -9,7 +9,7 @@ from taiga.base.api import serializers
 from taiga.base.fields import Field, MethodField
 from taiga.base.neighbors import NeighborsSerializerMixin
 
-from taiga.mdrender.service import render as mdrender
+from taiga.mdrender.service import get_rendered_html
 from taiga.projects.attachments.serializers import BasicAttachmentsInfoSerializerMixin
 from taiga.projects.mixins.serializers import OwnerExtraInfoSerializerMixin
 from taiga.projects.mixins.serializers import ProjectExtraInfoSerializerMixin
@@ -61,10 +61,10 @@ class EpicSerializer(EpicListSerializer):
         return ""
 
     def get_blocked_note_html(self, obj):
-        return mdrender(obj.project, obj.blocked_note)
+        return get_rendered_html(obj, "blocked_note")
 
     def get_description_html(self, obj):
-        return mdrender(obj.project, obj.description)
+        return get_rendered_html(obj, "description")
 
 
 class EpicNeighborsSerializer(NeighborsSerializerMixin, EpicSerializer):
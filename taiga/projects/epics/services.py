@@ -5,8 +5,6 @@
 #
 # Copyright (c) 2021-present Kaleidos INC
 
-import csv
-import io
 from collections import OrderedDict
 from operator import itemgetter
 from contextlib import closing
@@ -15,9 +13,12 @@ from django.db import connection
 from django.utils.translation import gettext as _
 
 from taiga.base.utils import db, text
+from taiga.base.utils.csv_streams import csv_to_string_io, iter_csv
+from taiga.base.utils.iterators import iter_queryset_in_batches
 from taiga.projects.epics.apps import connect_epics_signals
 from taiga.projects.epics.apps import disconnect_epics_signals
 from taiga.projects.services import apply_order_updates
+from taiga.projects.services import shift_orders_in_bulk
 from taiga.projects.userstories.apps import connect_userstories_signals
 from taiga.projects.userstories.apps import disconnect_userstories_signals
 from taiga.projects.userstories.services import get_userstories_from_bulk
@@ -72,18 +73,15 @@ def update_epics_order_in_bulk(bulk_data: list, field: str, project: object):
 
     [{'epic_id': <value>, 'order': <value>}, ...]
     """
-    epics = project.epics.all()
-
-    epic_orders = {e.id: getattr(e, field) for e in epics}
-    new_epic_orders = {d["epic_id"]: d["order"] for d in bulk_data}
-    apply_order_updates(epic_orders, new_epic_orders)
+    new_epic_orders = [(d["epic_id"], d["order"]) for d in bulk_data]
+    epic_orders = shift_orders_in_bulk(models.Epic, field, new_epic_orders,
+                                       {"project_id": project.id})
 
     epic_ids = epic_orders.keys()
     events.emit_event_for_ids(ids=epic_ids,
                               content_type="epics.epic",
                               projectid=project.pk)
 
-    db.update_attr_in_bulk_for_ids(epic_orders, field, models.Epic)
     return epic_orders
 
 
@@ -157,8 +155,11 @@ def update_epic_related_userstories_order_in_bulk(bulk_data: list, epic: object)
 # CSV
 #####################################################
 
-def epics_to_csv(project, queryset):
-    csv_data = io.StringIO()
+def iter_epics_csv(project, queryset):
+    """
+    Generate the CSV export of the epics of `queryset` in chunks, loading
+    them in batches so it can be streamed with a `StreamingHttpResponse`.
+    """
     fieldnames = ["id", "ref", "subject", "description", "owner", "owner_full_name",
                   "assigned_to", "assigned_to_full_name", "status", "epics_order",
                   "client_requirement", "team_requirement", "attachments", "tags",
@@ -180,42 +181,45 @@ def epics_to_csv(project, queryset):
     queryset = attach_total_voters_to_queryset(queryset)
     queryset = attach_watchers_to_queryset(queryset)
 
-    writer = csv.DictWriter(csv_data, fieldnames=fieldnames)
-    writer.writeheader()
-    for epic in queryset:
-        epic_data = {
-            "id": epic.id,
-            "ref": epic.ref,
-            "subject": epic.subject,
-            "description": epic.description,
-            "owner": epic.owner.username if epic.owner else None,
-            "owner_full_name": epic.owner.get_full_name() if epic.owner else None,
-            "assigned_to": epic.assigned_to.username if epic.assigned_to else None,
-            "assigned_to_full_name": epic.assigned_to.get_full_name() if epic.assigned_to else None,
-            "status": epic.status.name if epic.status else None,
-            "epics_order": epic.epics_order,
-            "client_requirement": epic.client_requirement,
-            "team_requirement": epic.team_requirement,
-            "attachments": epic.attachments.count(),
-            "tags": ",".join(epic.tags or []),
-            "watchers": epic.watchers,
-            "voters": epic.total_voters,
-            "created_date": epic.created_date,
-            "modified_date": epic.modified_date,
-            "related_user_stories": ",".join([
-                "{}#{}".format(us.project.slug, us.ref) for us in epic.user_stories.all()
-            ]),
-        }
-
-        for custom_attr in custom_attrs:
-            if not hasattr(epic, "custom_attributes_values"):
-                continue
-            value = epic.custom_attributes_values.attributes_values.get(str(custom_attr.id), None)
-            epic_data[custom_attr.name] = value
-
-        writer.writerow(epic_data)
-
-    return csv_data
+    def rows():
+        for epic in iter_queryset_in_batches(queryset):
+            epic_data = {
+                "id": epic.id,
+                "ref": epic.ref,
+                "subject": epic.subject,
+                "description": epic.description,
+                "owner": epic.owner.username if epic.owner else None,
+                "owner_full_name": epic.owner.get_full_name() if epic.owner else None,
+                "assigned_to": epic.assigned_to.username if epic.assigned_to else None,
+                "assigned_to_full_name": epic.assigned_to.get_full_name() if epic.assigned_to else None,
+                "status": epic.status.name if epic.status else None,
+                "epics_order": epic.epics_order,
+                "client_requirement": epic.client_requirement,
+                "team_requirement": epic.team_requirement,
+                "attachments": epic.attachments.count(),
+                "tags": ",".join(epic.tags or []),
+                "watchers": epic.watchers,
+                "voters": epic.total_voters,
+                "created_date": epic.created_date,
+                "modified_date": epic.modified_date,
+                "related_user_stories": ",".join([
+                    "{}#{}".format(us.project.slug, us.ref) for us in epic.user_stories.all()
+                ]),
+            }
+
+            for custom_attr in custom_attrs:
+                if not hasattr(epic, "custom_attributes_values"):
+                    continue
+                value = epic.custom_attributes_values.attributes_values.get(str(custom_attr.id), None)
+                epic_data[custom_attr.name] = value
+
+            yield epic_data
+
+    return iter_csv(fieldnames, rows())
+
+
+def epics_to_csv(project, queryset):
+    return csv_to_string_io(iter_epics_csv(project, queryset))
 
 
 #####################################################
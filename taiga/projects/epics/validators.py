@@ -35,7 +35,8 @@ class EpicValidator(AssignedToValidator, WatchersValidator, EditableWatchedResou
 
     class Meta:
         model = models.Epic
-        read_only_fields = ('id', 'ref', 'created_date', 'modified_date', 'owner')
+        read_only_fields = ('id', 'ref', 'created_date', 'modified_date', 'owner',
+                            'description_html', 'blocked_note_html')
 
 
 class EpicsBulkValidator(ProjectExistsValidator, EpicExistsValidator,
@@ -15,7 +15,7 @@ from django.core.exceptions import ObjectDoesNotExist
 
 from taiga.base.utils.iterators import as_tuple
 from taiga.base.utils.iterators import as_dict
-from taiga.mdrender.service import render as mdrender
+from taiga.mdrender.service import get_rendered_html
 
 from taiga.projects.attachments.services import get_timeline_image_thumbnail_name
 
@@ -299,7 +299,7 @@ def epic_freezer(epic) -> dict:
         "epics_order": epic.epics_order,
         "subject": epic.subject,
         "description": epic.description,
-        "description_html": mdrender(epic.project, epic.description),
+        "description_html": get_rendered_html(epic, "description"),
         "assigned_to": epic.assigned_to_id,
         "client_requirement": epic.client_requirement,
         "team_requirement": epic.team_requirement,
@@ -307,7 +307,7 @@ def epic_freezer(epic) -> dict:
         "tags": epic.tags,
         "is_blocked": epic.is_blocked,
         "blocked_note": epic.blocked_note,
-        "blocked_note_html": mdrender(epic.project, epic.blocked_note),
+        "blocked_note_html": get_rendered_html(epic, "blocked_note"),
         "custom_attributes": extract_epic_custom_attributes(epic)
     }
 
@@ -350,7 +350,7 @@ def userstory_freezer(us) -> dict:
         "kanban_order": us.kanban_order,
         "subject": us.subject,
         "description": us.description,
-        "description_html": mdrender(us.project, us.description),
+        "description_html": get_rendered_html(us, "description"),
         "assigned_to": us.assigned_to_id,
         "assigned_users": assigned_users,
         "milestone": us.milestone_id,
@@ -363,7 +363,7 @@ def userstory_freezer(us) -> dict:
         "from_task": us.generated_from_task_id,
         "is_blocked": us.is_blocked,
         "blocked_note": us.blocked_note,
-        "blocked_note_html": mdrender(us.project, us.blocked_note),
+        "blocked_note_html": get_rendered_html(us, "blocked_note"),
         "custom_attributes": extract_user_story_custom_attributes(us),
         "tribe_gig": us.tribe_gig,
         "due_date": str(us.due_date) if us.due_date else None
@@ -385,13 +385,13 @@ def issue_freezer(issue) -> dict:
         "milestone": issue.milestone_id,
         "subject": issue.subject,
         "description": issue.description,
-        "description_html": mdrender(issue.project, issue.description),
+        "description_html": get_rendered_html(issue, "description"),
         "assigned_to": issue.assigned_to_id,
         "attachments": extract_attachments(issue),
         "tags": issue.tags,
         "is_blocked": issue.is_blocked,
         "blocked_note": issue.blocked_note,
-        "blocked_note_html": mdrender(issue.project, issue.blocked_note),
+        "blocked_note_html": get_rendered_html(issue, "blocked_note"),
         "custom_attributes": extract_issue_custom_attributes(issue),
         "due_date": str(issue.due_date) if issue.due_date else None,
         "promoted_to": promoted_to,
@@ -410,7 +410,7 @@ def task_freezer(task) -> dict:
         "milestone": task.milestone_id,
         "subject": task.subject,
         "description": task.description,
-        "description_html": mdrender(task.project, task.description),
+        "description_html": get_rendered_html(task, "description"),
         "assigned_to": task.assigned_to_id,
         "attachments": extract_attachments(task),
         "taskboard_order": task.taskboard_order,
@@ -420,7 +420,7 @@ def task_freezer(task) -> dict:
         "is_iocaine": task.is_iocaine,
         "is_blocked": task.is_blocked,
         "blocked_note": task.blocked_note,
-        "blocked_note_html": mdrender(task.project, task.blocked_note),
+        "blocked_note_html": get_rendered_html(task, "blocked_note"),
         "custom_attributes": extract_task_custom_attributes(task),
         "due_date": str(task.due_date) if task.due_date else None,
         "promoted_to": promoted_to,
@@ -434,7 +434,7 @@ def wikipage_freezer(wiki) -> dict:
         "slug": wiki.slug,
         "owner": wiki.owner_id,
         "content": wiki.content,
-        "content_html": mdrender(wiki.project, wiki.content),
+        "content_html": get_rendered_html(wiki, "content"),
         "attachments": extract_attachments(wiki),
     }
 
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+# Examples:
+# python manage.py rebuild_history_last_snapshots
+# python manage.py rebuild_history_last_snapshots --project 42
+# python manage.py rebuild_history_last_snapshots --purge
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from django_pglocks import advisory_lock
+
+from taiga.projects.history.models import HistoryEntry, HistoryLastSnapshot
+from taiga.projects.history.services import rebuild_last_snapshot_for_key, store_last_snapshot_for_key
+
+
+class Command(BaseCommand):
+    help = 'Backfill the materialized last snapshot of every history key'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--purge',
+                            action='store_true',
+                            dest='purge',
+                            default=False,
+                            help='Purge existing last snapshots')
+        parser.add_argument('--project',
+                            action='store',
+                            dest='project',
+                            default=None,
+                            help='Selected project id')
+
+    @override_settings(DEBUG=False)
+    def handle(self, *args, **options):
+        entries = HistoryEntry.objects.exclude(key=None)
+        last_snapshots = HistoryLastSnapshot.objects.all()
+        if options["project"] is not None:
+            entries = entries.filter(project_id=options["project"])
+            last_snapshots = last_snapshots.filter(entry__project_id=options["project"])
+
+        if options["purge"]:
+            last_snapshots.delete()
+
+        keys = entries.order_by("key").values_list("key", flat=True).distinct()
+        total = 0
+        for key in keys.iterator():
+            with transaction.atomic(), advisory_lock("history-" + key):
+                snapshot, partial_diffs, entry = rebuild_last_snapshot_for_key(key)
+                if snapshot is not None:
+                    store_last_snapshot_for_key(key, snapshot, partial_diffs, entry)
+                    total += 1
+
+        self.stdout.write(self.style.SUCCESS("{} history keys processed".format(total)))
@@ -324,3 +324,19 @@ class HistoryEntry(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+
+
+class HistoryLastSnapshot(models.Model):
+    """
+    Materialized current frozen state of a history key.
+
+    It is the last full snapshot with all the later partial
+    diffs applied, kept up to date by `take_snapshot`, so it
+    doesn't need to rebuild it from the history entries.
+    """
+    key = models.CharField(primary_key=True, max_length=255, editable=False)
+    entry = models.ForeignKey(HistoryEntry, related_name="+", on_delete=models.CASCADE)
+    snapshot = JSONField(null=True, blank=True, default=None)
+
+    # Number of partial diffs stored since the last full snapshot
+    partial_diffs = models.PositiveIntegerField(default=0)
@@ -315,7 +315,13 @@ def _rebuild_snapshot_from_diffs(keysnapshot, partials):
     return result
 
 
-def get_last_snapshot_for_key(key: str) -> FrozenObj:
+def rebuild_last_snapshot_for_key(key: str):
+    """
+    Rebuild the current frozen state of a key from its last full
+    snapshot and the partial diffs stored after it.
+
+    Returns a (snapshot, partial diffs count, last entry) tuple.
+    """
     entry_model = apps.get_model("history", "HistoryEntry")
 
     # Search last snapshot
@@ -325,7 +331,7 @@ def get_last_snapshot_for_key(key: str) -> FrozenObj:
 
     keysnapshot = qs.first()
     if keysnapshot is None:
-        return None, True
+        return None, 0, None
 
     # Get all partial snapshots
     entries = tuple(entry_model.objects
@@ -334,12 +340,44 @@ def get_last_snapshot_for_key(key: str) -> FrozenObj:
                     .order_by("created_at"))
 
     snapshot = _rebuild_snapshot_from_diffs(keysnapshot.snapshot, entries)
+    last_entry = entries[-1] if entries else keysnapshot
+    return snapshot, len(entries), last_entry
+
+
+def store_last_snapshot_for_key(key: str, snapshot: dict, partial_diffs: int, entry: object):
+    """
+    Save the current frozen state of a key in the materialized store.
+    """
+    last_snapshot_model = apps.get_model("history", "HistoryLastSnapshot")
+    last_snapshot_model.objects.update_or_create(key=key, defaults={
+        "snapshot": snapshot,
+        "partial_diffs": partial_diffs,
+        "entry": entry,
+    })
+
+
+def _get_last_snapshot(key: str):
+    last_snapshot_model = apps.get_model("history", "HistoryLastSnapshot")
+    last_snapshot = last_snapshot_model.objects.filter(key=key).first()
+    if last_snapshot is not None:
+        return last_snapshot.snapshot, last_snapshot.partial_diffs
+
+    # Not materialized yet (or invalidated), fallback to the history entries
+    snapshot, partial_diffs, _ = rebuild_last_snapshot_for_key(key)
+    return snapshot, partial_diffs
+
+
+def get_last_snapshot_for_key(key: str) -> FrozenObj:
+    snapshot, partial_diffs = _get_last_snapshot(key)
+    if snapshot is None:
+        return None, True
+
     max_partial_diffs = getattr(settings, "MAX_PARTIAL_DIFFS", 60)
 
-    if len(entries) >= max_partial_diffs:
-        return FrozenObj(keysnapshot.key, snapshot), True
+    if partial_diffs >= max_partial_diffs:
+        return FrozenObj(key, snapshot), True
 
-    return FrozenObj(keysnapshot.key, snapshot), False
+    return FrozenObj(key, snapshot), False
 
 
 # Public api
@@ -380,7 +418,10 @@ def take_snapshot(obj: object, *, comment: str="", user=None,
         typename = get_typename_for_model_class(obj.__class__)
 
         new_fobj = freeze_model_instance(obj)
-        old_fobj, need_real_snapshot = get_last_snapshot_for_key(key)
+        old_snapshot, partial_diffs = _get_last_snapshot(key)
+        old_fobj = None if old_snapshot is None else FrozenObj(key, old_snapshot)
+        need_real_snapshot = (old_fobj is None or
+                              partial_diffs >= getattr(settings, "MAX_PARTIAL_DIFFS", 60))
 
         # migrate diff to latest schema
         if old_fobj:
@@ -433,7 +474,22 @@ def take_snapshot(obj: object, *, comment: str="", user=None,
             "is_snapshot": need_real_snapshot,
         }
 
-        return entry_model.objects.create(**kwargs)
+        # Copied before saving the entry, the signal handlers can modify its diff
+        # (see HistoryEntry.values_diff)
+        if need_real_snapshot:
+            last_snapshot, last_partial_diffs = deepcopy(fdiff.snapshot), 0
+        else:
+            last_snapshot = deepcopy(_rebuild_snapshot_from_diffs(old_snapshot, [fdiff]))
+            last_partial_diffs = partial_diffs + 1
+
+        entry = entry_model(**kwargs)
+        # The last snapshot store is updated below, signal handlers must not invalidate it
+        entry._updating_last_snapshot = True
+        entry.save(force_insert=True)
+
+        store_last_snapshot_for_key(key, last_snapshot, last_partial_diffs, entry)
+
+        return entry
 
 
 # High level query api
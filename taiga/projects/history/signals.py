@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+from django.apps import apps
+
+
+def invalidate_last_snapshot(sender, instance, created, **kwargs):
+    """
+    History entries created out of `take_snapshot` (importers, promotions...)
+    make the materialized last snapshot of their key stale, so it's removed and
+    rebuilt from the history entries the next time it's needed.
+    """
+    if not created or getattr(instance, "_updating_last_snapshot", False):
+        return
+
+    last_snapshot_model = apps.get_model("history", "HistoryLastSnapshot")
+    last_snapshot_model.objects.filter(key=instance.key).delete()
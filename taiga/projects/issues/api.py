@@ -7,7 +7,7 @@
 
 #
 from django.utils.translation import gettext as _
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 
 from taiga.base import filters
 from taiga.base import exceptions as exc
@@ -215,8 +215,8 @@ class IssueViewSet(AssignedToSignalMixin, OCCResourceMixin, VotedResourceMixin,
 
         project = get_object_or_error(Project, request.user, issues_csv_uuid=uuid)
         queryset = project.issues.all().order_by('ref')
-        data = services.issues_to_csv(project, queryset)
-        csv_response = HttpResponse(data.getvalue(), content_type='application/csv; charset=utf-8')
+        data = services.iter_issues_csv(project, queryset)
+        csv_response = StreamingHttpResponse(data, content_type='application/csv; charset=utf-8')
         csv_response['Content-Disposition'] = 'attachment; filename="issues.csv"'
         return csv_response
 
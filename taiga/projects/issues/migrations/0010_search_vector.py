@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+from django.db import migrations
+
+
+# NOTE: The search_vector column is used by taiga.searches.services and it's
+#       kept up to date by a trigger, it isn't a field of the model.
+
+ADD_SEARCH_VECTOR = """
+    ALTER TABLE issues_issue
+     ADD COLUMN search_vector tsvector NULL;
+
+    CREATE OR REPLACE FUNCTION issues_issue_search_vector_update()
+       RETURNS trigger AS $search_vector$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.subject, '') || ' ' || coalesce(NEW.ref::text, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(inmutable_array_to_string(NEW.tags), '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END;
+    $search_vector$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER issues_issue_search_vector_update
+    BEFORE INSERT OR UPDATE OF subject, ref, tags, description, search_vector
+                ON issues_issue
+      FOR EACH ROW EXECUTE PROCEDURE issues_issue_search_vector_update();
+
+    UPDATE issues_issue SET search_vector = NULL;
+
+    CREATE INDEX issues_issue_search_vector_idx
+              ON issues_issue
+           USING gin(search_vector);
+"""
+
+
+DROP_SEARCH_VECTOR = """
+    DROP INDEX IF EXISTS issues_issue_search_vector_idx;
+    DROP TRIGGER IF EXISTS issues_issue_search_vector_update ON issues_issue;
+    DROP FUNCTION IF EXISTS issues_issue_search_vector_update();
+    ALTER TABLE issues_issue DROP COLUMN IF EXISTS search_vector;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0033_text_search_indexes'),
+        ('issues', '0009_auto_20200615_0811'),
+    ]
+
+    operations = [
+        migrations.RunSQL(ADD_SEARCH_VECTOR, DROP_SEARCH_VECTOR),
+    ]
@@ -91,6 +91,7 @@ class Issue(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, DueDate
     subject = models.TextField(null=False, blank=False,
                                verbose_name=_("subject"))
     description = models.TextField(null=False, blank=True, verbose_name=_("description"))
+    description_html = models.TextField(null=True, blank=True, verbose_name=_("description html"))
     assigned_to = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         blank=True,
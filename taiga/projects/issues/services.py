@@ -5,19 +5,18 @@
 #
 # Copyright (c) 2021-present Kaleidos INC
 
-import io
-import csv
 from collections import OrderedDict
 from operator import itemgetter
-from contextlib import closing
 
-from django.db import connection
 from django.utils.translation import gettext as _
 
 from taiga.base.utils import db, text
+from taiga.base.utils.csv_streams import csv_to_string_io, iter_csv
+from taiga.base.utils.iterators import iter_queryset_in_batches
 from taiga.events import events
 
 from taiga.projects.history.services import take_snapshot
+from taiga.projects.services import get_facets_rows
 from taiga.projects.issues.apps import (
     connect_issues_signals,
     disconnect_issues_signals)
@@ -96,8 +95,11 @@ def update_issues_milestone_in_bulk(bulk_data: list, milestone: object):
 #####################################################
 
 
-def issues_to_csv(project, queryset):
-    csv_data = io.StringIO()
+def iter_issues_csv(project, queryset):
+    """
+    Generate the CSV export of the issues of `queryset` in chunks, loading
+    them in batches so it can be streamed with a `StreamingHttpResponse`.
+    """
     fieldnames = ["id", "ref", "subject", "description", "sprint_id", "sprint",
                   "sprint_estimated_start", "sprint_estimated_finish", "owner",
                   "owner_full_name", "assigned_to", "assigned_to_full_name",
@@ -120,126 +122,103 @@ def issues_to_csv(project, queryset):
     queryset = attach_total_voters_to_queryset(queryset)
     queryset = attach_watchers_to_queryset(queryset)
 
-    writer = csv.DictWriter(csv_data, fieldnames=fieldnames)
-    writer.writeheader()
-    for issue in queryset:
-        issue_data = {
-            "id": issue.id,
-            "ref": issue.ref,
-            "subject": issue.subject,
-            "description": issue.description,
-            "sprint_id": issue.milestone.id if issue.milestone else None,
-            "sprint": issue.milestone.name if issue.milestone else None,
-            "sprint_estimated_start": issue.milestone.estimated_start if issue.milestone else None,
-            "sprint_estimated_finish": issue.milestone.estimated_finish if issue.milestone else None,
-            "owner": issue.owner.username if issue.owner else None,
-            "owner_full_name": issue.owner.get_full_name() if issue.owner else None,
-            "assigned_to": issue.assigned_to.username if issue.assigned_to else None,
-            "assigned_to_full_name": issue.assigned_to.get_full_name() if issue.assigned_to else None,
-            "status": issue.status.name if issue.status else None,
-            "severity": issue.severity.name,
-            "priority": issue.priority.name,
-            "type": issue.type.name,
-            "is_closed": issue.is_closed,
-            "attachments": issue.attachments.count(),
-            "external_reference": issue.external_reference,
-            "tags": ",".join(issue.tags or []),
-            "watchers": issue.watchers,
-            "voters": issue.total_voters,
-            "created_date": issue.created_date,
-            "modified_date": issue.modified_date,
-            "finished_date": issue.finished_date,
-            "due_date": issue.due_date,
-            "due_date_reason": issue.due_date_reason,
-        }
-
-        for custom_attr in custom_attrs:
-            if not hasattr(issue, "custom_attributes_values"):
-                continue
-            value = issue.custom_attributes_values.attributes_values.get(str(custom_attr.id), None)
-            issue_data[custom_attr.name] = value
-
-        writer.writerow(issue_data)
-
-    return csv_data
+    def rows():
+        for issue in iter_queryset_in_batches(queryset):
+            issue_data = {
+                "id": issue.id,
+                "ref": issue.ref,
+                "subject": issue.subject,
+                "description": issue.description,
+                "sprint_id": issue.milestone.id if issue.milestone else None,
+                "sprint": issue.milestone.name if issue.milestone else None,
+                "sprint_estimated_start": issue.milestone.estimated_start if issue.milestone else None,
+                "sprint_estimated_finish": issue.milestone.estimated_finish if issue.milestone else None,
+                "owner": issue.owner.username if issue.owner else None,
+                "owner_full_name": issue.owner.get_full_name() if issue.owner else None,
+                "assigned_to": issue.assigned_to.username if issue.assigned_to else None,
+                "assigned_to_full_name": issue.assigned_to.get_full_name() if issue.assigned_to else None,
+                "status": issue.status.name if issue.status else None,
+                "severity": issue.severity.name,
+                "priority": issue.priority.name,
+                "type": issue.type.name,
+                "is_closed": issue.is_closed,
+                "attachments": issue.attachments.count(),
+                "external_reference": issue.external_reference,
+                "tags": ",".join(issue.tags or []),
+                "watchers": issue.watchers,
+                "voters": issue.total_voters,
+                "created_date": issue.created_date,
+                "modified_date": issue.modified_date,
+                "finished_date": issue.finished_date,
+                "due_date": issue.due_date,
+                "due_date_reason": issue.due_date_reason,
+            }
+
+            for custom_attr in custom_attrs:
+                if not hasattr(issue, "custom_attributes_values"):
+                    continue
+                value = issue.custom_attributes_values.attributes_values.get(str(custom_attr.id), None)
+                issue_data[custom_attr.name] = value
+
+            yield issue_data
+
+    return iter_csv(fieldnames, rows())
+
+
+def issues_to_csv(project, queryset):
+    return csv_to_string_io(iter_issues_csv(project, queryset))
 
 
 #####################################################
 # Api filter data
 #####################################################
 
-def _get_issues_statuses(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-        WITH counters AS (
-                SELECT status_id, count(status_id) count
-                  FROM "issues_issue"
-            INNER JOIN "projects_project" ON ("issues_issue"."project_id" = "projects_project"."id")
-                 WHERE {where}
-              GROUP BY status_id
+ISSUES_FILTERS_FROM_SQL = """
+                   "issues_issue"
+        INNER JOIN "projects_project"
+                ON ("issues_issue"."project_id" = "projects_project"."id")
+"""
+
+ISSUES_FILTERS_COLUMNS = [
+    '"issues_issue"."id" "item_id"',
+    '"issues_issue"."status_id" "status_id"',
+    '"issues_issue"."type_id" "type_id"',
+    '"issues_issue"."priority_id" "priority_id"',
+    '"issues_issue"."severity_id" "severity_id"',
+    '"issues_issue"."assigned_to_id" "assigned_to_id"',
+    '"issues_issue"."owner_id" "owner_id"',
+    '"issues_issue"."tags" "tags"',
+]
+
+
+# Statuses, types, priorities and severities
+_ISSUES_CHOICES_SQL = """
+     WITH "counters" AS (
+              SELECT "{column}",
+                     COUNT(*) "count"
+                FROM "items"
+               WHERE {{match}}
+            GROUP BY "{column}"
         )
 
-                 SELECT "projects_issuestatus"."id",
-                        "projects_issuestatus"."name",
-                        "projects_issuestatus"."color",
-                        "projects_issuestatus"."order",
-                        COALESCE(counters.count, 0)
-                   FROM "projects_issuestatus"
-        LEFT OUTER JOIN counters ON counters.status_id = projects_issuestatus.id
-                  WHERE "projects_issuestatus"."project_id" = %s
-               ORDER BY "projects_issuestatus"."order";
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
-
-    result = []
-    for id, name, color, order, count in rows:
-        result.append({
-            "id": id,
-            "name": _(name),
-            "color": color,
-            "order": order,
-            "count": count,
-        })
-    return sorted(result, key=itemgetter("order"))
+             SELECT "{table}"."id" "id",
+                    "{table}"."name" "name",
+                    "{table}"."color" "color",
+                    "{table}"."order" "order",
+                    COALESCE("counters"."count", 0) "count"
+               FROM "{table}"
+    LEFT OUTER JOIN "counters"
+                 ON "counters"."{column}" = "{table}"."id"
+              WHERE "{table}"."project_id" = %s
+"""
 
+_ISSUES_STATUSES_SQL = _ISSUES_CHOICES_SQL.format(table="projects_issuestatus", column="status_id")
+_ISSUES_TYPES_SQL = _ISSUES_CHOICES_SQL.format(table="projects_issuetype", column="type_id")
+_ISSUES_PRIORITIES_SQL = _ISSUES_CHOICES_SQL.format(table="projects_priority", column="priority_id")
+_ISSUES_SEVERITIES_SQL = _ISSUES_CHOICES_SQL.format(table="projects_severity", column="severity_id")
 
-def _get_issues_types(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-        WITH counters AS (
-                SELECT type_id, count(type_id) count
-                  FROM "issues_issue"
-            INNER JOIN "projects_project" ON ("issues_issue"."project_id" = "projects_project"."id")
-                 WHERE {where}
-              GROUP BY type_id
-        )
-
-                 SELECT "projects_issuetype"."id",
-                        "projects_issuetype"."name",
-                        "projects_issuetype"."color",
-                        "projects_issuetype"."order",
-                        COALESCE(counters.count, 0)
-                   FROM "projects_issuetype"
-        LEFT OUTER JOIN counters ON counters.type_id = projects_issuetype.id
-                  WHERE "projects_issuetype"."project_id" = %s
-               ORDER BY "projects_issuetype"."order";
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
 
+def _get_issues_choices(rows):
     result = []
     for id, name, color, order, count in rows:
         result.append({
@@ -252,128 +231,40 @@ def _get_issues_types(project, queryset):
     return sorted(result, key=itemgetter("order"))
 
 
-def _get_issues_priorities(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-        WITH counters AS (
-                SELECT priority_id, count(priority_id) count
-                  FROM "issues_issue"
-            INNER JOIN "projects_project" ON ("issues_issue"."project_id" = "projects_project"."id")
-                 WHERE {where}
-              GROUP BY priority_id
+_ISSUES_ASSIGNED_TO_SQL = """
+     WITH "counters" AS (
+              SELECT "assigned_to_id",
+                     COUNT(*) "count"
+                FROM "items"
+               WHERE {match} AND "items"."assigned_to_id" IS NOT NULL
+            GROUP BY "assigned_to_id"
         )
 
-                 SELECT "projects_priority"."id",
-                        "projects_priority"."name",
-                        "projects_priority"."color",
-                        "projects_priority"."order",
-                        COALESCE(counters.count, 0)
-                   FROM "projects_priority"
-        LEFT OUTER JOIN counters ON counters.priority_id = projects_priority.id
-                  WHERE "projects_priority"."project_id" = %s
-               ORDER BY "projects_priority"."order";
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
-
-    result = []
-    for id, name, color, order, count in rows:
-        result.append({
-            "id": id,
-            "name": _(name),
-            "color": color,
-            "order": order,
-            "count": count,
-        })
-    return sorted(result, key=itemgetter("order"))
-
-
-def _get_issues_severities(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-        WITH counters AS (
-                SELECT severity_id, count(severity_id) count
-                  FROM "issues_issue"
-            INNER JOIN "projects_project" ON ("issues_issue"."project_id" = "projects_project"."id")
-                 WHERE {where}
-              GROUP BY severity_id
-        )
-
-                 SELECT "projects_severity"."id",
-                        "projects_severity"."name",
-                        "projects_severity"."color",
-                        "projects_severity"."order",
-                        COALESCE(counters.count, 0)
-                   FROM "projects_severity"
-        LEFT OUTER JOIN counters ON counters.severity_id = projects_severity.id
-                  WHERE "projects_severity"."project_id" = %s
-               ORDER BY "projects_severity"."order";
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
-
-    result = []
-    for id, name, color, order, count in rows:
-        result.append({
-            "id": id,
-            "name": _(name),
-            "color": color,
-            "order": order,
-            "count": count,
-        })
-    return sorted(result, key=itemgetter("order"))
-
-
-def _get_issues_assigned_to(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-        WITH counters AS (
-                SELECT assigned_to_id,  count(assigned_to_id) count
-                  FROM "issues_issue"
-            INNER JOIN "projects_project" ON ("issues_issue"."project_id" = "projects_project"."id")
-                 WHERE {where} AND "issues_issue"."assigned_to_id" IS NOT NULL
-              GROUP BY assigned_to_id
-        )
-
-                SELECT  "projects_membership"."user_id" user_id,
-                        "users_user"."full_name",
-                        "users_user"."username",
-                        COALESCE("counters".count, 0) count
-                   FROM projects_membership
-        LEFT OUTER JOIN counters ON ("projects_membership"."user_id" = "counters"."assigned_to_id")
-             INNER JOIN "users_user" ON ("projects_membership"."user_id" = "users_user"."id")
-                  WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
-
-        -- unassigned issues
-        UNION
-
-                 SELECT NULL user_id, NULL, NULL, count(coalesce(assigned_to_id, -1)) count
-                   FROM "issues_issue"
-             INNER JOIN "projects_project" ON ("issues_issue"."project_id" = "projects_project"."id")
-                  WHERE {where} AND "issues_issue"."assigned_to_id" IS NULL
-               GROUP BY assigned_to_id
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id] + where_params)
-        rows = cursor.fetchall()
-
+             SELECT "projects_membership"."user_id" "user_id",
+                    "users_user"."full_name" "full_name",
+                    "users_user"."username" "username",
+                    COALESCE("counters"."count", 0) "count"
+               FROM "projects_membership"
+    LEFT OUTER JOIN "counters"
+                 ON ("projects_membership"."user_id" = "counters"."assigned_to_id")
+         INNER JOIN "users_user"
+                 ON ("projects_membership"."user_id" = "users_user"."id")
+              WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
+
+    -- unassigned issues
+    UNION
+
+             SELECT NULL "user_id",
+                    NULL "full_name",
+                    NULL "username",
+                    COUNT(*) "count"
+               FROM "items"
+              WHERE {match} AND "items"."assigned_to_id" IS NULL
+             HAVING COUNT(*) > 0
+"""
+
+
+def _get_issues_assigned_to(rows):
     result = []
     none_valued_added = False
     for id, full_name, username, count in rows:
@@ -397,46 +288,41 @@ def _get_issues_assigned_to(project, queryset):
     return sorted(result, key=itemgetter("full_name"))
 
 
-def _get_issues_owners(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-        WITH counters AS (
-                SELECT "issues_issue"."owner_id" owner_id,  count("issues_issue"."owner_id") count
-                  FROM "issues_issue"
-            INNER JOIN "projects_project" ON ("issues_issue"."project_id" = "projects_project"."id")
-                 WHERE {where}
-              GROUP BY "issues_issue"."owner_id"
+_ISSUES_OWNERS_SQL = """
+     WITH "counters" AS (
+              SELECT "owner_id",
+                     COUNT(*) "count"
+                FROM "items"
+               WHERE {match}
+            GROUP BY "owner_id"
         )
 
-                 SELECT "projects_membership"."user_id" id,
-                        "users_user"."full_name",
-                        "users_user"."username",
-                        COALESCE("counters".count, 0) count
-                   FROM projects_membership
-        LEFT OUTER JOIN counters ON ("projects_membership"."user_id" = "counters"."owner_id")
-             INNER JOIN "users_user" ON ("projects_membership"."user_id" = "users_user"."id")
-                  WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
-
-        -- System users
-        UNION
-
-                 SELECT "users_user"."id" user_id,
-                        "users_user"."full_name" full_name,
-                        "users_user"."username",
-                        COALESCE("counters".count, 0) count
-                   FROM users_user
-        LEFT OUTER JOIN counters ON ("users_user"."id" = "counters"."owner_id")
-                  WHERE ("users_user"."is_system" IS TRUE)
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
-
+             SELECT "projects_membership"."user_id" "user_id",
+                    "users_user"."full_name" "full_name",
+                    "users_user"."username" "username",
+                    COALESCE("counters"."count", 0) "count"
+               FROM "projects_membership"
+    LEFT OUTER JOIN "counters"
+                 ON ("projects_membership"."user_id" = "counters"."owner_id")
+         INNER JOIN "users_user"
+                 ON ("projects_membership"."user_id" = "users_user"."id")
+              WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
+
+    -- System users
+    UNION
+
+             SELECT "users_user"."id" "user_id",
+                    "users_user"."full_name" "full_name",
+                    "users_user"."username" "username",
+                    COALESCE("counters"."count", 0) "count"
+               FROM "users_user"
+    LEFT OUTER JOIN "counters"
+                 ON ("users_user"."id" = "counters"."owner_id")
+              WHERE ("users_user"."is_system" IS TRUE)
+"""
+
+
+def _get_issues_owners(rows):
     result = []
     for id, full_name, username, count in rows:
         if count > 0:
@@ -448,46 +334,29 @@ def _get_issues_owners(project, queryset):
     return sorted(result, key=itemgetter("full_name"))
 
 
-def _get_issues_roles(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-     WITH "issue_counters" AS (
-         SELECT DISTINCT "issues_issue"."status_id" "status_id",
-                         "issues_issue"."id" "issue_id",
-                         "projects_membership"."role_id" "role_id"
-                    FROM "issues_issue"
-              INNER JOIN "projects_project"
-                      ON ("issues_issue"."project_id" = "projects_project"."id")
-         LEFT OUTER JOIN "projects_membership"
-                      ON "projects_membership"."user_id" = "issues_issue"."assigned_to_id"
-                   WHERE {where}
-            ),
-             "counters" AS (
-                  SELECT "role_id" as "role_id",
-                         COUNT("role_id") "count"
-                    FROM "issue_counters"
-                GROUP BY "role_id"
-            )
-
-                 SELECT "users_role"."id",
-                        "users_role"."name",
-                        "users_role"."order",
-                        COALESCE("counters"."count", 0)
-                   FROM "users_role"
-        LEFT OUTER JOIN "counters"
-                     ON "counters"."role_id" = "users_role"."id"
-                  WHERE "users_role"."project_id" = %s
-               ORDER BY "users_role"."order";
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
+_ISSUES_ROLES_SQL = """
+     WITH "counters" AS (
+              SELECT "projects_membership"."role_id" "role_id",
+                     COUNT(DISTINCT "items"."item_id") "count"
+                FROM "items"
+          INNER JOIN "projects_membership"
+                  ON "projects_membership"."user_id" = "items"."assigned_to_id"
+               WHERE {match}
+            GROUP BY "projects_membership"."role_id"
+        )
+
+             SELECT "users_role"."id" "id",
+                    "users_role"."name" "name",
+                    "users_role"."order" "order",
+                    COALESCE("counters"."count", 0) "count"
+               FROM "users_role"
+    LEFT OUTER JOIN "counters"
+                 ON "counters"."role_id" = "users_role"."id"
+              WHERE "users_role"."project_id" = %s
+"""
+
 
+def _get_issues_roles(rows):
     result = []
     for id, name, order, count in rows:
         result.append({
@@ -499,41 +368,35 @@ def _get_issues_roles(project, queryset):
         })
     return sorted(result, key=itemgetter("order"))
 
-def _get_issues_tags(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-        WITH "issues_tags" AS (
-                    SELECT "tag",
-                           COUNT("tag") "counter"
-                      FROM (
-                                SELECT UNNEST("issues_issue"."tags") "tag"
-                                  FROM "issues_issue"
-                            INNER JOIN "projects_project"
-                                    ON ("issues_issue"."project_id" = "projects_project"."id")
-                                 WHERE {where}
-                           ) "tags"
-                  GROUP BY "tag"),
-             "project_tags" AS (
-                    SELECT reduce_dim("tags_colors") "tag_color"
-                      FROM "projects_project"
-                     WHERE "id"=%s)
-
-      SELECT "tag_color"[1] "tag",
-             "tag_color"[2] "color",
-             COALESCE("issues_tags"."counter", 0) "counter"
-        FROM project_tags
-   LEFT JOIN "issues_tags" ON "project_tags"."tag_color"[1] = "issues_tags"."tag"
-    ORDER BY "tag"
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
 
+_ISSUES_TAGS_SQL = """
+     WITH "issues_tags" AS (
+              SELECT "tag",
+                     COUNT("tag") "counter"
+                FROM (
+                    SELECT UNNEST("tags") "tag"
+                      FROM "items"
+                     WHERE {match}
+                    ) "items_tags"
+            GROUP BY "tag"
+        ),
+
+          "project_tags" AS (
+              SELECT reduce_dim("tags_colors") "tag_color"
+                FROM "projects_project"
+               WHERE "id" = %s
+        )
+
+             SELECT "tag_color"[1] "tag",
+                    "tag_color"[2] "color",
+                    COALESCE("issues_tags"."counter", 0) "counter"
+               FROM "project_tags"
+    LEFT OUTER JOIN "issues_tags"
+                 ON "project_tags"."tag_color"[1] = "issues_tags"."tag"
+"""
+
+
+def _get_issues_tags(rows):
     result = []
     for name, color, count in rows:
         result.append({
@@ -548,16 +411,22 @@ def get_issues_filters_data(project, querysets):
     """
     Given a project and an issues queryset, return a simple data structure
     of all possible filters for the issues in the queryset.
-    """
-    data = OrderedDict([
-        ("types", _get_issues_types(project, querysets["types"])),
-        ("statuses", _get_issues_statuses(project, querysets["statuses"])),
-        ("priorities", _get_issues_priorities(project, querysets["priorities"])),
-        ("severities", _get_issues_severities(project, querysets["severities"])),
-        ("assigned_to", _get_issues_assigned_to(project, querysets["assigned_to"])),
-        ("owners", _get_issues_owners(project, querysets["owners"])),
-        ("tags", _get_issues_tags(project, querysets["tags"])),
-        ("roles", _get_issues_roles(project, querysets["roles"])),
-    ])
 
+    All the facets are computed with a single query, see `get_facets_rows`.
+    """
+    facets = [
+        ("types", _ISSUES_TYPES_SQL, _get_issues_choices),
+        ("statuses", _ISSUES_STATUSES_SQL, _get_issues_choices),
+        ("priorities", _ISSUES_PRIORITIES_SQL, _get_issues_choices),
+        ("severities", _ISSUES_SEVERITIES_SQL, _get_issues_choices),
+        ("assigned_to", _ISSUES_ASSIGNED_TO_SQL, _get_issues_assigned_to),
+        ("owners", _ISSUES_OWNERS_SQL, _get_issues_owners),
+        ("tags", _ISSUES_TAGS_SQL, _get_issues_tags),
+        ("roles", _ISSUES_ROLES_SQL, _get_issues_roles),
+    ]
+
+    rows = get_facets_rows(project, ISSUES_FILTERS_FROM_SQL, ISSUES_FILTERS_COLUMNS,
+                           [(name, querysets[name], sql, [project.id]) for name, sql, _fn in facets])
+
+    data = OrderedDict([(name, get_data(rows[name])) for name, _sql, get_data in facets])
     return data
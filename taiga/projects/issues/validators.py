@@ -30,7 +30,8 @@ class IssueValidator(AssignedToValidator, WatchersValidator, EditableWatchedReso
 
     class Meta:
         model = models.Issue
-        read_only_fields = ('id', 'ref', 'created_date', 'modified_date', 'owner')
+        read_only_fields = ('id', 'ref', 'created_date', 'modified_date', 'owner',
+                            'description_html', 'blocked_note_html')
 
 
 class IssuesBulkValidator(ProjectExistsValidator, validators.Validator):
@@ -12,6 +12,7 @@ from django.test.utils import override_settings
 from taiga.base.utils.slug import slugify_uniquely
 from taiga.projects.models import Project
 from taiga.projects.history.models import HistoryEntry
+from taiga.projects.services import update_rendered_html
 from taiga.timeline.rebuilder import rebuild_timeline
 
 
@@ -45,6 +46,10 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS("-> Reset value_diff cache for history entries."))
         HistoryEntry.objects.filter(project=project).update(values_diff_cache=None)
 
+        # Render again the stored html, its links have the project slug
+        self.stdout.write(self.style.SUCCESS("-> Regenerate rendered html."))
+        update_rendered_html([project.id], only_missing=False)
+
         # Regenerate timeline
         self.stdout.write(self.style.SUCCESS("-> Regenerate timeline entries."))
         rebuild_timeline(None, None, project.id)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+# Examples:
+# python manage.py rebuild_project_totals
+# python manage.py rebuild_project_totals --project 42 --project 43
+# python manage.py rebuild_project_totals --check
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.test.utils import override_settings
+
+from taiga.projects.models import Project
+from taiga.projects.services import check_daily_totals, rebuild_daily_totals
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily fans and activity totals of the projects and refresh their totals'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project',
+                            action='append',
+                            dest='projects',
+                            type=int,
+                            default=None,
+                            help='Selected project id (can be used more than once)')
+        parser.add_argument('--check',
+                            action='store_true',
+                            dest='check',
+                            default=False,
+                            help='Only check the daily totals, exit with an error if they are inconsistent')
+
+    @override_settings(DEBUG=False)
+    def handle(self, *args, **options):
+        project_ids = options["projects"]
+
+        if options["check"]:
+            inconsistencies = check_daily_totals(project_ids)
+            for project_id, day, expected_fans, fans, expected_activity, activity in inconsistencies:
+                self.stdout.write("project {} on {}: fans {} (expected {}), activity {} (expected {})".format(
+                    project_id, day, fans, expected_fans, activity, expected_activity))
+
+            if inconsistencies:
+                raise CommandError("{} inconsistent daily totals".format(len(inconsistencies)))
+
+            self.stdout.write(self.style.SUCCESS("Daily totals are consistent"))
+            return
+
+        rebuild_daily_totals(project_ids)
+
+        projects = Project.objects.all()
+        if project_ids is not None:
+            projects = projects.filter(id__in=project_ids)
+
+        for project in projects.iterator():
+            project.refresh_totals()
+
+        self.stdout.write(self.style.SUCCESS("Daily totals rebuilt"))
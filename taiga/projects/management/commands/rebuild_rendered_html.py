@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+# Examples:
+# python manage.py rebuild_rendered_html
+# python manage.py rebuild_rendered_html --project 42 --all
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from taiga.projects.services import update_rendered_html
+
+
+class Command(BaseCommand):
+    help = 'Render and store the html of the descriptions, blocked notes and wiki pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project',
+                            action='append',
+                            dest='projects',
+                            type=int,
+                            default=None,
+                            help='Selected project id (can be used more than once)')
+        parser.add_argument('--all',
+                            action='store_true',
+                            dest='all',
+                            default=False,
+                            help='Render again the texts that were already rendered')
+
+    @override_settings(DEBUG=False)
+    def handle(self, *args, **options):
+        count = update_rendered_html(project_ids=options["projects"], only_missing=not options["all"])
+        self.stdout.write(self.style.SUCCESS("Html of {} objects rendered".format(count)))
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+from django.db import migrations
+
+
+# The update_project_tags_colors trigger updates the project row for every
+# updated item, so a bulk reorder of thousands of cards used to rewrite the
+# project thousands of times. Now it only runs when the tags (or the project)
+# of the item really change.
+
+TABLES = (
+    ("epic", "epics_epic"),
+    ("userstory", "userstories_userstory"),
+    ("task", "tasks_task"),
+    ("issue", "issues_issue"),
+)
+
+CREATE_TRIGGER = """
+    DROP TRIGGER IF EXISTS update_project_tags_colors_on_{name}_update ON {table};
+    CREATE TRIGGER update_project_tags_colors_on_{name}_update
+    AFTER UPDATE ON {table}
+    FOR EACH ROW {when} EXECUTE PROCEDURE update_project_tags_colors();
+"""
+
+WHEN_TAGS_CHANGE = "WHEN (OLD.tags IS DISTINCT FROM NEW.tags OR OLD.project_id IS DISTINCT FROM NEW.project_id)"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0067_auto_20201230_1237'),
+        ('epics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            CREATE_TRIGGER.format(name=name, table=table, when=WHEN_TAGS_CHANGE),
+            CREATE_TRIGGER.format(name=name, table=table, when="")
+        )
+        for name, table in TABLES
+    ]
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+# Generated by Django 3.2.19 on 2026-10-17 07:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# projects_projectdailytotals is maintained by statement level triggers on
+# likes_like and timeline_timeline, so bulk inserts (like the timeline fan-out)
+# update every counter with one upsert per statement.
+
+PROJECT_CONTENT_TYPE = """
+    (SELECT id FROM django_content_type WHERE app_label = 'projects' AND model = 'project')
+"""
+
+UPDATE_DAILY_TOTALS_FUNCTION = """
+    CREATE OR REPLACE FUNCTION {function}()
+    RETURNS trigger AS ${function}$
+    BEGIN
+        IF TG_OP = 'DELETE' OR TG_OP = 'UPDATE' THEN
+            UPDATE projects_projectdailytotals
+               SET {column} = projects_projectdailytotals.{column} - counts.total
+              FROM (SELECT {project_id} AS project_id,
+                           ({created} AT TIME ZONE 'UTC')::date AS day,
+                           count(*) AS total
+                      FROM old_rows
+                     WHERE {where}
+                  GROUP BY 1, 2) AS counts
+             WHERE projects_projectdailytotals.project_id = counts.project_id
+               AND projects_projectdailytotals.day = counts.day;
+        END IF;
+
+        IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+            INSERT INTO projects_projectdailytotals (project_id, day, fans, activity)
+                 SELECT counts.project_id, counts.day, {fans}, {activity}
+                   FROM (SELECT {project_id} AS project_id,
+                                ({created} AT TIME ZONE 'UTC')::date AS day,
+                                count(*) AS total
+                           FROM new_rows
+                          WHERE {where}
+                       GROUP BY 1, 2) AS counts
+             INNER JOIN projects_project ON projects_project.id = counts.project_id
+            ON CONFLICT (project_id, day) DO UPDATE
+                    SET {column} = projects_projectdailytotals.{column} + EXCLUDED.{column};
+        END IF;
+
+        RETURN NULL;
+    END; ${function}$
+    LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS {function}_insert ON {table};
+    CREATE TRIGGER {function}_insert
+    AFTER INSERT ON {table}
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE {function}();
+
+    DROP TRIGGER IF EXISTS {function}_update ON {table};
+    CREATE TRIGGER {function}_update
+    AFTER UPDATE ON {table}
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE {function}();
+
+    DROP TRIGGER IF EXISTS {function}_delete ON {table};
+    CREATE TRIGGER {function}_delete
+    AFTER DELETE ON {table}
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE {function}();
+"""
+
+DROP_DAILY_TOTALS_FUNCTION = """
+    DROP TRIGGER IF EXISTS {function}_insert ON {table};
+    DROP TRIGGER IF EXISTS {function}_update ON {table};
+    DROP TRIGGER IF EXISTS {function}_delete ON {table};
+    DROP FUNCTION IF EXISTS {function}();
+"""
+
+LIKES = {
+    "function": "update_project_daily_totals_on_like",
+    "table": "likes_like",
+    "column": "fans",
+    "fans": "counts.total",
+    "activity": "0",
+    "project_id": "object_id",
+    "created": "created_date",
+    "where": "content_type_id = {}".format(PROJECT_CONTENT_TYPE),
+}
+
+TIMELINE = {
+    "function": "update_project_daily_totals_on_timeline",
+    "table": "timeline_timeline",
+    "column": "activity",
+    "fans": "0",
+    "activity": "counts.total",
+    "project_id": "substring(namespace FROM 9)::integer",
+    "created": "created",
+    "where": "namespace ~ '^project:[0-9]+$'",
+}
+
+# Same query as taiga.projects.services.totals.rebuild_daily_totals
+FILL_DAILY_TOTALS = """
+    INSERT INTO projects_projectdailytotals (project_id, day, fans, activity)
+        SELECT counts.project_id, counts.day, sum(counts.fans), sum(counts.activity)
+          FROM (SELECT object_id AS project_id,
+                       (created_date AT TIME ZONE 'UTC')::date AS day,
+                       count(*) AS fans,
+                       0 AS activity
+                  FROM likes_like
+                 WHERE content_type_id = {project_content_type}
+              GROUP BY 1, 2
+             UNION ALL
+                SELECT substring(namespace FROM 9)::integer AS project_id,
+                       (created AT TIME ZONE 'UTC')::date AS day,
+                       0 AS fans,
+                       count(*) AS activity
+                  FROM timeline_timeline
+                 WHERE namespace ~ '^project:[0-9]+$'
+              GROUP BY 1, 2) AS counts
+    INNER JOIN projects_project ON projects_project.id = counts.project_id
+      GROUP BY counts.project_id, counts.day;
+""".format(project_content_type=PROJECT_CONTENT_TYPE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0068_tags_colors_triggers_on_tags_update'),
+        ('likes', '0002_auto_20151130_2230'),
+        ('timeline', '0008_auto_20190606_1528'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectDailyTotals',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='day')),
+                ('fans', models.IntegerField(default=0, verbose_name='fans')),
+                ('activity', models.IntegerField(default=0, verbose_name='activity')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_totals', to='projects.project', verbose_name='project')),
+            ],
+            options={
+                'verbose_name': 'project daily totals',
+                'verbose_name_plural': 'project daily totals',
+                'ordering': ['project', 'day'],
+                'unique_together': {('project', 'day')},
+            },
+        ),
+        migrations.RunSQL(
+            UPDATE_DAILY_TOTALS_FUNCTION.format(**LIKES),
+            DROP_DAILY_TOTALS_FUNCTION.format(**LIKES)
+        ),
+        migrations.RunSQL(
+            UPDATE_DAILY_TOTALS_FUNCTION.format(**TIMELINE),
+            DROP_DAILY_TOTALS_FUNCTION.format(**TIMELINE)
+        ),
+        migrations.RunSQL(FILL_DAILY_TOTALS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.2.19 on 2026-10-17 12:40
+
+import django.core.serializers.json
+from django.db import migrations
+import taiga.base.db.models.fields.json
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0069_project_daily_totals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='logo_thumbnails',
+            field=taiga.base.db.models.fields.json.JSONField(blank=True, default=None, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='logo thumbnails'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+# Generated by Django 3.2.19 on 2026-10-17 16:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0070_project_logo_thumbnails'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectCacheVersion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, verbose_name='name')),
+                ('version', models.UUIDField(default=uuid.uuid4, verbose_name='version')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cache_versions', to='projects.project', verbose_name='project')),
+            ],
+            options={
+                'verbose_name': 'project cache version',
+                'verbose_name_plural': 'project cache versions',
+                'ordering': ['project', 'name'],
+                'unique_together': {('project', 'name')},
+            },
+        ),
+    ]
@@ -101,22 +101,24 @@ class MilestoneViewSet(HistoryResourceMixin, WatchedResourceMixin,
 
     @detail_route(methods=['get'])
     def stats(self, request, pk=None):
-        milestone = get_object_or_error(models.Milestone, request.user, pk=pk)
+        queryset = milestones_utils.attach_stats_counters(models.Milestone.objects.all())
+        milestone = get_object_or_error(queryset, request.user, pk=pk)
 
         self.check_permissions(request, "stats", milestone)
 
-        total_points = milestone.total_points
+        total_points, closed_points = services.get_points_per_role(milestone)
+        closed_points_by_date = services.get_closed_points_by_date(milestone)
         milestone_stats = {
             'name': milestone.name,
             'estimated_start': milestone.estimated_start,
             'estimated_finish': milestone.estimated_finish,
             'total_points': total_points,
-            'completed_points': milestone.closed_points.values(),
-            'total_userstories': milestone.cached_user_stories.count(),
-            'completed_userstories': milestone.cached_user_stories.filter(is_closed=True).count(),
-            'total_tasks': milestone.tasks.count(),
-            'completed_tasks': milestone.tasks.filter(status__is_closed=True).count(),
-            'iocaine_doses': milestone.tasks.filter(is_iocaine=True).count(),
+            'completed_points': closed_points.values(),
+            'total_userstories': milestone.total_userstories_attr,
+            'completed_userstories': milestone.completed_userstories_attr,
+            'total_tasks': milestone.total_tasks_attr,
+            'completed_tasks': milestone.completed_tasks_attr,
+            'iocaine_doses': milestone.iocaine_doses_attr,
             'days': []
         }
         current_date = milestone.estimated_start
@@ -129,7 +131,7 @@ class MilestoneViewSet(HistoryResourceMixin, WatchedResourceMixin,
             milestone_stats['days'].append({
                 'day': current_date,
                 'name': current_date.day,
-                'open_points':  sumTotalPoints - milestone.total_closed_points_by_date(current_date),
+                'open_points':  sumTotalPoints - closed_points_by_date.get(current_date, 0),
                 'optimal_points': optimal_points,
             })
             current_date = current_date + datetime.timedelta(days=1)
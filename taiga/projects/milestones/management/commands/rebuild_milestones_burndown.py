@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+# Examples:
+# python manage.py rebuild_milestones_burndown
+# python manage.py rebuild_milestones_burndown --project 42
+# python manage.py rebuild_milestones_burndown --milestone 7 --milestone 8
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from taiga.projects.milestones.models import Milestone
+from taiga.projects.milestones.services import update_burndown_points
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the burndown points of the milestones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project',
+                            action='append',
+                            dest='projects',
+                            type=int,
+                            default=None,
+                            help='Selected project id (can be used more than once)')
+        parser.add_argument('--milestone',
+                            action='append',
+                            dest='milestones',
+                            type=int,
+                            default=None,
+                            help='Selected milestone id (can be used more than once)')
+
+    @override_settings(DEBUG=False)
+    def handle(self, *args, **options):
+        project_ids = options["projects"]
+        milestone_ids = options["milestones"]
+
+        if project_ids is None and milestone_ids is None:
+            update_burndown_points()
+            self.stdout.write(self.style.SUCCESS("Burndown of all the milestones rebuilt"))
+            return
+
+        milestones = Milestone.objects.all()
+        if project_ids is not None:
+            milestones = milestones.filter(project_id__in=project_ids)
+        if milestone_ids is not None:
+            milestones = milestones.filter(id__in=milestone_ids)
+
+        milestone_ids = list(milestones.values_list("id", flat=True))
+        update_burndown_points(milestone_ids=milestone_ids)
+        self.stdout.write(self.style.SUCCESS("Burndown of {} milestones rebuilt".format(len(milestone_ids))))
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+# Generated by Django 3.2.19 on 2026-10-17 09:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Same query as taiga.projects.milestones.services.update_burndown_points
+FILL_BURNDOWN_POINTS = """
+    WITH user_stories AS (
+        SELECT userstories_userstory.id,
+               userstories_userstory.milestone_id,
+               userstories_userstory.finish_date,
+               (SELECT COALESCE(SUM(projects_points.value), 0)
+                  FROM userstories_rolepoints
+            INNER JOIN projects_points ON projects_points.id = userstories_rolepoints.points_id
+                 WHERE userstories_rolepoints.user_story_id = userstories_userstory.id) AS points,
+               (SELECT COUNT(*)
+                  FROM tasks_task
+                 WHERE tasks_task.user_story_id = userstories_userstory.id) AS tasks
+          FROM userstories_userstory
+         WHERE userstories_userstory.milestone_id IS NOT NULL
+    )
+    INSERT INTO milestones_burndownpoints (milestone_id, user_story_id, day, points)
+         SELECT user_stories.milestone_id,
+                user_stories.id,
+                (tasks_task.finished_date AT TIME ZONE 'UTC')::date,
+                SUM(user_stories.points / user_stories.tasks)
+           FROM user_stories
+     INNER JOIN tasks_task ON tasks_task.user_story_id = user_stories.id
+                          AND tasks_task.milestone_id = user_stories.milestone_id
+          WHERE tasks_task.finished_date IS NOT NULL
+       GROUP BY 1, 2, 3
+      UNION ALL
+         SELECT user_stories.milestone_id,
+                user_stories.id,
+                (user_stories.finish_date AT TIME ZONE 'UTC')::date,
+                user_stories.points
+           FROM user_stories
+          WHERE user_stories.tasks = 0
+            AND user_stories.finish_date IS NOT NULL;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('milestones', '0003_auto_20200615_0811'),
+        ('userstories', '0022_search_vector'),
+        ('tasks', '0014_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BurndownPoints',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='day')),
+                ('points', models.FloatField(default=0, verbose_name='points')),
+                ('milestone', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='burndown_points', to='milestones.milestone', verbose_name='milestone')),
+                ('user_story', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='userstories.userstory', verbose_name='user story')),
+            ],
+            options={
+                'verbose_name': 'burndown points',
+                'verbose_name_plural': 'burndown points',
+                'ordering': ['milestone', 'day'],
+                'index_together': {('milestone', 'day')},
+            },
+        ),
+        migrations.RunSQL(FILL_BURNDOWN_POINTS, migrations.RunSQL.noop),
+    ]
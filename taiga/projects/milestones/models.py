@@ -171,3 +171,36 @@ class Milestone(WatchedModelMixin, models.Model):
                 current_date = current_date + datetime.timedelta(days=1)
 
         return self._total_closed_points_by_date.get(date, 0)
+
+
+class BurndownPoints(models.Model):
+    """
+    Points closed in a milestone per user story and day (UTC), the increments
+    of the burndown chart. The rows of a user story are rebuilt with
+    `services.update_burndown_points` every time it, its tasks or its
+    estimations change.
+    """
+    milestone = models.ForeignKey(
+        "Milestone",
+        null=False,
+        blank=False,
+        related_name="burndown_points",
+        verbose_name=_("milestone"),
+        on_delete=models.CASCADE,
+    )
+    user_story = models.ForeignKey(
+        "userstories.UserStory",
+        null=False,
+        blank=False,
+        related_name="+",
+        verbose_name=_("user story"),
+        on_delete=models.CASCADE,
+    )
+    day = models.DateField(null=False, blank=False, verbose_name=_("day"))
+    points = models.FloatField(null=False, blank=False, default=0, verbose_name=_("points"))
+
+    class Meta:
+        verbose_name = "burndown points"
+        verbose_name_plural = "burndown points"
+        ordering = ["milestone", "day"]
+        index_together = [("milestone", "day")]
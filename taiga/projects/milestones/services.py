@@ -5,13 +5,22 @@
 #
 # Copyright (c) 2021-present Kaleidos INC
 
+import collections
+import datetime
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
 from taiga.base.utils import db
 from taiga.events import events
 from taiga.projects.history.services import take_snapshot
 from taiga.projects.services import apply_order_updates
 from taiga.projects.issues.models import Issue
 from taiga.projects.tasks.models import Task
-from taiga.projects.userstories.models import UserStory
+from taiga.projects.userstories.models import RolePoints, UserStory
+
+from .models import BurndownPoints
 
 
 def calculate_milestone_is_closed(milestone):
@@ -175,3 +184,127 @@ def snapshot_issues_in_bulk(bulk_data, user):
             take_snapshot(issue, user=user)
         except Issue.DoesNotExist:
             pass
+
+
+#####################################################
+# Burndown
+#####################################################
+
+# Same query as the milestones migration 0004. The points of a user story are
+# split among its tasks and closed with them, a user story without tasks
+# closes all its points at once.
+INSERT_BURNDOWN_POINTS_SQL = """
+    WITH user_stories AS (
+        SELECT userstories_userstory.id,
+               userstories_userstory.milestone_id,
+               userstories_userstory.finish_date,
+               (SELECT COALESCE(SUM(projects_points.value), 0)
+                  FROM userstories_rolepoints
+            INNER JOIN projects_points ON projects_points.id = userstories_rolepoints.points_id
+                 WHERE userstories_rolepoints.user_story_id = userstories_userstory.id) AS points,
+               (SELECT COUNT(*)
+                  FROM tasks_task
+                 WHERE tasks_task.user_story_id = userstories_userstory.id) AS tasks
+          FROM userstories_userstory
+         WHERE userstories_userstory.milestone_id IS NOT NULL {where}
+    )
+    INSERT INTO milestones_burndownpoints (milestone_id, user_story_id, day, points)
+         SELECT user_stories.milestone_id,
+                user_stories.id,
+                (tasks_task.finished_date AT TIME ZONE 'UTC')::date,
+                SUM(user_stories.points / user_stories.tasks)
+           FROM user_stories
+     INNER JOIN tasks_task ON tasks_task.user_story_id = user_stories.id
+                          AND tasks_task.milestone_id = user_stories.milestone_id
+          WHERE tasks_task.finished_date IS NOT NULL
+       GROUP BY 1, 2, 3
+      UNION ALL
+         SELECT user_stories.milestone_id,
+                user_stories.id,
+                (user_stories.finish_date AT TIME ZONE 'UTC')::date,
+                user_stories.points
+           FROM user_stories
+          WHERE user_stories.tasks = 0
+            AND user_stories.finish_date IS NOT NULL;
+"""
+
+
+@transaction.atomic
+def update_burndown_points(user_story_ids=None, milestone_ids=None):
+    """
+    Rebuild the burndown points of some user stories, of all the user stories
+    of some milestones or, without arguments, of every user story.
+    """
+    burndown_points = BurndownPoints.objects.all()
+    where = ""
+    params = []
+
+    if user_story_ids is not None:
+        user_story_ids = [id for id in user_story_ids if id is not None]
+        if not user_story_ids:
+            return
+        # Avoid concurrent rebuilds of the same user stories
+        list(UserStory.objects.select_for_update().filter(id__in=user_story_ids).values_list("id", flat=True))
+        burndown_points = burndown_points.filter(user_story_id__in=user_story_ids)
+        where = "AND userstories_userstory.id = ANY(%s)"
+        params = [user_story_ids]
+
+    elif milestone_ids is not None:
+        milestone_ids = list(milestone_ids)
+        if not milestone_ids:
+            return
+        burndown_points = burndown_points.filter(milestone_id__in=milestone_ids)
+        where = "AND userstories_userstory.milestone_id = ANY(%s)"
+        params = [milestone_ids]
+
+    burndown_points.delete()
+    with connection.cursor() as cursor:
+        cursor.execute(INSERT_BURNDOWN_POINTS_SQL.format(where=where), params)
+
+
+def get_closed_points_by_date(milestone):
+    """
+    Get a dict with the accumulated closed points of every day of the
+    milestone. The points closed before its start are counted on the first day.
+    """
+    increments = collections.defaultdict(int)
+    days = milestone.burndown_points.filter(day__lte=milestone.estimated_finish)\
+                                    .values_list("day")\
+                                    .annotate(points=Sum("points"))\
+                                    .order_by()
+    for day, points in days:
+        increments[max(day, milestone.estimated_start)] += points
+
+    closed_points_by_date = {}
+    acumulated_date_points = 0
+    current_date = milestone.estimated_start
+    while current_date <= milestone.estimated_finish:
+        acumulated_date_points += increments.get(current_date, 0)
+        closed_points_by_date[current_date] = acumulated_date_points
+        current_date = current_date + datetime.timedelta(days=1)
+
+    return closed_points_by_date
+
+
+def get_points_per_role(milestone):
+    """
+    Get the total and the closed points of the user stories of a milestone
+    per role, like `Milestone.total_points` and `Milestone.closed_points`.
+    """
+    points = Coalesce("points__value", Value(0.0))
+    is_closed = Q(user_story__is_closed=True)
+    role_points = RolePoints.objects.filter(user_story__milestone_id=milestone.id)\
+                                    .values("role_id")\
+                                    .annotate(total=Sum(points),
+                                              closed=Sum(points, filter=is_closed),
+                                              closed_count=Count("id", filter=is_closed))\
+                                    .order_by("role_id")
+
+    total_points = {}
+    closed_points = {}
+    for role_point in role_points:
+        total_points[role_point["role_id"]] = role_point["total"]
+        if role_point["closed_count"]:
+            closed_points[role_point["role_id"]] = role_point["closed"]
+
+    return total_points, closed_points
@@ -51,6 +51,36 @@ def attach_closed_points(queryset, as_field="closed_points_attr"):
     return queryset
 
 
+def attach_stats_counters(queryset):
+    """Attach the number of user stories and tasks of the stats to each object of the queryset.
+
+    :param queryset: A Django milestones queryset object.
+
+    :return: Queryset object with the additional `total_userstories_attr`,
+             `completed_userstories_attr`, `total_tasks_attr`, `completed_tasks_attr`
+             and `iocaine_doses_attr` fields.
+    """
+    model = queryset.model
+    userstories_sql = """SELECT COUNT(*)
+                    FROM userstories_userstory
+                    WHERE userstories_userstory.milestone_id = {tbl}.id {where}"""
+    tasks_sql = """SELECT COUNT(*)
+                    FROM tasks_task
+                    LEFT JOIN projects_taskstatus ON projects_taskstatus.id = tasks_task.status_id
+                    WHERE tasks_task.milestone_id = {tbl}.id {where}"""
+
+    tbl = model._meta.db_table
+    queryset = queryset.extra(select={
+        "total_userstories_attr": userstories_sql.format(tbl=tbl, where=""),
+        "completed_userstories_attr": userstories_sql.format(tbl=tbl,
+                                                             where="AND userstories_userstory.is_closed = True"),
+        "total_tasks_attr": tasks_sql.format(tbl=tbl, where=""),
+        "completed_tasks_attr": tasks_sql.format(tbl=tbl, where="AND projects_taskstatus.is_closed = True"),
+        "iocaine_doses_attr": tasks_sql.format(tbl=tbl, where="AND tasks_task.is_iocaine = True"),
+    })
+    return queryset
+
+
 def attach_extra_info(queryset, user=None):
     # Userstories prefetching
     UserStory = apps.get_model("userstories", "UserStory")
@@ -19,6 +19,8 @@ class BlockedMixin(models.Model):
                                      verbose_name=_("is blocked"))
     blocked_note = models.TextField(default="", null=False, blank=True,
                                    verbose_name=_("blocked note"))
+    blocked_note_html = models.TextField(null=True, blank=True, verbose_name=_("blocked note html"))
+
     class Meta:
         abstract = True
 
@@ -11,6 +11,7 @@ from taiga.base import response
 from taiga.base import exceptions as exc
 from taiga.base.api.utils import get_object_or_404
 from taiga.base.decorators import list_route
+from taiga.projects import services
 from taiga.projects.models import Project
 
 
@@ -46,4 +47,6 @@ class BulkUpdateOrderMixin:
             raise exc.Blocked(_("Blocked element"))
 
         self.__class__.bulk_update_order_action(project, request.user, bulk_data)
+        # The orders are updated without sending signals
+        services.bump_project_config_version(project.id)
         return response.NoContent(data=None)
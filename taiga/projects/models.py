@@ -5,12 +5,15 @@
 #
 # Copyright (c) 2021-present Kaleidos INC
 
+import uuid
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.fields import ArrayField
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import Q
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
 from django.apps import apps
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
@@ -39,7 +42,6 @@ from taiga.projects.notifications.services import (
     set_notify_policy_level_to_ignore,
     create_notify_policy_if_not_exists)
 
-from taiga.timeline.service import build_project_namespace
 
 from . import choices
 
@@ -170,6 +172,8 @@ class Project(ProjectDefaults, TaggedMixin, TagsColorsMixin, models.Model):
     logo = models.FileField(upload_to=get_project_logo_file_path,
                             max_length=500, null=True, blank=True,
                             verbose_name=_("logo"))
+    logo_thumbnails = JSONField(null=True, blank=True, default=None,
+                                verbose_name=_("logo thumbnails"))
 
     created_date = models.DateTimeField(null=False, blank=False,
                                         verbose_name=_("created date"),
@@ -332,35 +336,24 @@ class Project(ProjectDefaults, TaggedMixin, TagsColorsMixin, models.Model):
         now = timezone.now()
         self.totals_updated_datetime = now
 
-        Like = apps.get_model("likes", "Like")
-        content_type = apps.get_model("contenttypes", "ContentType").objects.get_for_model(Project)
-        qs = Like.objects.filter(content_type=content_type, object_id=self.id)
-
-        self.total_fans = qs.count()
-
-        qs_week = qs.filter(created_date__gte=now - relativedelta(weeks=1))
-        self.total_fans_last_week = qs_week.count()
-
-        qs_month = qs.filter(created_date__gte=now - relativedelta(months=1))
-        self.total_fans_last_month = qs_month.count()
-
-        qs_year = qs.filter(created_date__gte=now - relativedelta(years=1))
-        self.total_fans_last_year = qs_year.count()
-
-        tl_model = apps.get_model("timeline", "Timeline")
-        namespace = build_project_namespace(self)
-
-        qs = tl_model.objects.filter(namespace=namespace)
-        self.total_activity = qs.count()
-
-        qs_week = qs.filter(created__gte=now - relativedelta(weeks=1))
-        self.total_activity_last_week = qs_week.count()
-
-        qs_month = qs.filter(created__gte=now - relativedelta(months=1))
-        self.total_activity_last_month = qs_month.count()
-
-        qs_year = qs.filter(created__gte=now - relativedelta(years=1))
-        self.total_activity_last_year = qs_year.count()
+        # The daily totals are maintained by triggers on likes_like and
+        # timeline_timeline (see the projects migration 0069)
+        last_week = (now - relativedelta(weeks=1)).date()
+        last_month = (now - relativedelta(months=1)).date()
+        last_year = (now - relativedelta(years=1)).date()
+
+        totals = self.daily_totals.aggregate(
+            total_fans=Coalesce(Sum("fans"), 0),
+            total_fans_last_week=Coalesce(Sum("fans", filter=Q(day__gte=last_week)), 0),
+            total_fans_last_month=Coalesce(Sum("fans", filter=Q(day__gte=last_month)), 0),
+            total_fans_last_year=Coalesce(Sum("fans", filter=Q(day__gte=last_year)), 0),
+            total_activity=Coalesce(Sum("activity"), 0),
+            total_activity_last_week=Coalesce(Sum("activity", filter=Q(day__gte=last_week)), 0),
+            total_activity_last_month=Coalesce(Sum("activity", filter=Q(day__gte=last_month)), 0),
+            total_activity_last_year=Coalesce(Sum("activity", filter=Q(day__gte=last_year)), 0),
+        )
+        for attr, value in totals.items():
+            setattr(self, attr, value)
 
         if save:
             self.save(update_fields=[
@@ -507,7 +500,9 @@ class Project(ProjectDefaults, TaggedMixin, TagsColorsMixin, models.Model):
         from taiga.projects.issues.apps import (connect_all_issues_signals,
                                                 disconnect_all_issues_signals)
         from taiga.projects.apps import (connect_memberships_signals,
-                                         disconnect_memberships_signals)
+                                         disconnect_memberships_signals,
+                                         connect_rendered_html_signals,
+                                         disconnect_rendered_html_signals)
 
         disconnect_events_signals()
         disconnect_all_epics_signals()
@@ -515,6 +510,7 @@ class Project(ProjectDefaults, TaggedMixin, TagsColorsMixin, models.Model):
         disconnect_all_tasks_signals()
         disconnect_all_userstories_signals()
         disconnect_memberships_signals()
+        disconnect_rendered_html_signals()
 
         try:
             self.epics.all().delete()
@@ -530,6 +526,7 @@ class Project(ProjectDefaults, TaggedMixin, TagsColorsMixin, models.Model):
             connect_all_userstories_signals()
             connect_all_epics_signals()
             connect_memberships_signals()
+            connect_rendered_html_signals()
 
 
 class ProjectModulesConfig(models.Model):
@@ -549,6 +546,54 @@ class ProjectModulesConfig(models.Model):
         ordering = ["project"]
 
 
+class ProjectDailyTotals(models.Model):
+    """
+    Number of new fans and timeline entries of a project per day (UTC).
+    Rows are maintained by database triggers, never write them from Python.
+    """
+    project = models.ForeignKey(
+        "Project",
+        null=False,
+        blank=False,
+        related_name="daily_totals",
+        verbose_name=_("project"),
+        on_delete=models.CASCADE,
+    )
+    day = models.DateField(null=False, blank=False, verbose_name=_("day"))
+    fans = models.IntegerField(null=False, blank=False, default=0, verbose_name=_("fans"))
+    activity = models.IntegerField(null=False, blank=False, default=0, verbose_name=_("activity"))
+
+    class Meta:
+        verbose_name = "project daily totals"
+        verbose_name_plural = "project daily totals"
+        ordering = ["project", "day"]
+        unique_together = ("project", "day")
+
+
+class ProjectCacheVersion(models.Model):
+    """
+    Current version of some cached data of a project, see
+    `taiga.projects.services.config_cache`. It's in the database so every
+    process sees the same version.
+    """
+    project = models.ForeignKey(
+        "Project",
+        null=False,
+        blank=False,
+        related_name="cache_versions",
+        verbose_name=_("project"),
+        on_delete=models.CASCADE,
+    )
+    name = models.CharField(max_length=50, null=False, blank=False, verbose_name=_("name"))
+    version = models.UUIDField(null=False, blank=False, default=uuid.uuid4, verbose_name=_("version"))
+
+    class Meta:
+        verbose_name = "project cache version"
+        verbose_name_plural = "project cache versions"
+        ordering = ["project", "name"]
+        unique_together = ("project", "name")
+
+
 # Epic common Models
 class EpicStatus(models.Model):
     name = models.CharField(max_length=255, null=False, blank=False,
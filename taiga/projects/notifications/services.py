@@ -7,7 +7,6 @@
 
 import datetime
 
-from functools import partial
 import logging
 
 from django.apps import apps
@@ -29,7 +28,6 @@ from taiga.projects.history.choices import HistoryType
 from taiga.projects.history.services import (make_key_from_model_object,
                                              get_last_snapshot_for_key,
                                              get_model_from_key)
-from taiga.permissions.services import user_has_perm
 from taiga.events import events
 
 from django_pglocks import advisory_lock
@@ -133,7 +131,7 @@ def get_mentions(project: object, text: str):
     return data.get("mentions")
 
 
-def _filter_by_permissions(obj, user):
+def _get_view_permission(obj):
     UserStory = apps.get_model("userstories", "UserStory")
     Issue = apps.get_model("issues", "Issue")
     Task = apps.get_model("tasks", "Task")
@@ -141,69 +139,147 @@ def _filter_by_permissions(obj, user):
     WikiPage = apps.get_model("wiki", "WikiPage")
 
     if isinstance(obj, UserStory):
-        return user_has_perm(user, "view_us", obj, cache="project")
+        return "view_us"
     elif isinstance(obj, Issue):
-        return user_has_perm(user, "view_issues", obj, cache="project")
+        return "view_issues"
     elif isinstance(obj, Task):
-        return user_has_perm(user, "view_tasks", obj, cache="project")
+        return "view_tasks"
     elif isinstance(obj, Epic):
-        return user_has_perm(user, "view_epics", obj, cache="project")
+        return "view_epics"
     elif isinstance(obj, WikiPage):
-        return user_has_perm(user, "view_wiki_pages", obj, cache="project")
-    return False
-
-
-def _filter_notificable(user):
-    return user.is_active and not user.is_system
+        return "view_wiki_pages"
+    return None
+
+
+_NOTIFY_CANDIDATES_SQL = """
+    WITH candidates AS (
+        -- Project members
+        SELECT projects_membership.user_id, TRUE AS is_project_candidate
+          FROM projects_membership
+         WHERE projects_membership.project_id = %(project_id)s
+           AND projects_membership.user_id IS NOT NULL
+        UNION ALL
+        -- Project watchers
+        SELECT notifications_notifypolicy.user_id, TRUE AS is_project_candidate
+          FROM notifications_notifypolicy
+         WHERE notifications_notifypolicy.project_id = %(project_id)s
+           AND notifications_notifypolicy.notify_level <> %(level_none)s
+        UNION ALL
+        -- Object watchers
+        SELECT notifications_watched.user_id, FALSE AS is_project_candidate
+          FROM notifications_watched
+         WHERE notifications_watched.content_type_id = %(content_type_id)s
+           AND notifications_watched.object_id = %(object_id)s
+        UNION ALL
+        -- Participants and unassigned users
+        SELECT UNNEST(%(user_ids)s::integer[]), FALSE AS is_project_candidate
+    )
+    SELECT users_user.*,
+           BOOL_OR(candidates.is_project_candidate) AS is_project_candidate,
+           BOOL_OR(NOT candidates.is_project_candidate) AS is_object_candidate,
+           notifications_notifypolicy.id AS notify_policy_id,
+           COALESCE(notifications_notifypolicy.notify_level, %(level_involved)s) AS notify_level,
+           COALESCE(notifications_notifypolicy.live_notify_level, %(level_involved)s) AS live_notify_level,
+           (
+               users_user.is_active
+               AND NOT users_user.is_system
+               AND NOT users_user.id = ANY(%(discard_user_ids)s::integer[])
+               AND (
+                   users_user.is_superuser
+                   OR %(perm)s = ANY(projects_project.anon_permissions)
+                   OR %(perm)s = ANY(projects_project.public_permissions)
+                   OR EXISTS (
+                       SELECT 1
+                         FROM projects_membership
+                    LEFT JOIN users_role ON users_role.id = projects_membership.role_id
+                        WHERE projects_membership.project_id = projects_project.id
+                          AND projects_membership.user_id = users_user.id
+                          AND (projects_membership.is_admin OR %(perm)s = ANY(users_role.permissions))
+                   )
+               )
+           ) AS is_notificable
+      FROM candidates
+INNER JOIN users_user ON users_user.id = candidates.user_id
+INNER JOIN projects_project ON projects_project.id = %(project_id)s
+ LEFT JOIN notifications_notifypolicy ON notifications_notifypolicy.project_id = projects_project.id
+                                     AND notifications_notifypolicy.user_id = users_user.id
+  GROUP BY users_user.id, projects_project.id, notifications_notifypolicy.id
+"""
+
+
+def get_notify_candidates(obj, *, history=None, discard_users=None) -> list:
+    """
+    Get, in only one query, the users that could be notified of a change in
+    the specified model instance. Every user is annotated with:
 
+    - `is_project_candidate`: is member or watcher of the project.
+    - `is_object_candidate`: is watcher or participant of the object.
+    - `notify_level` and `live_notify_level`: from their notify policy.
+    - `is_notificable`: is an active user, not discarded and with permissions
+      to view the object.
 
-def get_users_to_notify(obj, *, history=None, discard_users=None, live=False) -> list:
+    The result can be filtered for emails and live notifications with
+    `get_users_to_notify`.
     """
-    Get filtered set of users to notify for specified
-    model instance and changer.
+    perm = _get_view_permission(obj)
+    if perm is None:
+        return []
 
-    NOTE: changer at this momment is not used.
-    NOTE: analogouts to obj.get_watchers_to_notify(changer)
-    """
     project = obj.get_project()
 
-    def _check_level(project: object, user: object, levels: tuple) -> bool:
-        policy = project.cached_notify_policy_for_user(user)
-        if live:
-            return policy.live_notify_level in levels
-        return policy.notify_level in levels
-
-    _can_notify_hard = partial(_check_level, project,
-                               levels=[NotifyLevel.all])
-    _can_notify_light = partial(_check_level, project,
-                                levels=[NotifyLevel.all, NotifyLevel.involved])
-
-    candidates = set()
-    candidates.update(filter(_can_notify_hard, project.members.all()))
-    candidates.update(filter(_can_notify_hard, obj.project.get_watchers()))
-    candidates.update(filter(_can_notify_light, obj.get_watchers()))
-    candidates.update(filter(_can_notify_light, obj.get_participants()))
+    user_ids = [user.id for user in obj.get_participants()]
 
     # If the history is an unassignment change we should notify that user too
-    user_ids = []
     if history and history.type == HistoryType.change and "assigned_to" in history.diff:
-        user_ids = [user_id for user_id in history.diff["assigned_to"] if isinstance(user_id, int)]
+        user_ids += [user_id for user_id in history.diff["assigned_to"] if isinstance(user_id, int)]
+
+    params = {
+        "project_id": project.id,
+        "content_type_id": ContentType.objects.get_for_model(obj).id,
+        "object_id": obj.id,
+        "user_ids": user_ids,
+        "discard_user_ids": [user.id for user in discard_users or []],
+        "perm": perm,
+        "level_none": NotifyLevel.none,
+        "level_involved": NotifyLevel.involved,
+    }
+    candidates = list(get_user_model().objects.raw(_NOTIFY_CANDIDATES_SQL, params))
+
+    # Create the default notify policies of the candidates without one
+    notify_policy_model = apps.get_model("notifications", "NotifyPolicy")
+    now = timezone.now()
+    notify_policy_model.objects.bulk_create([
+        notify_policy_model(project=project, user=user, notify_level=NotifyLevel.involved,
+                            live_notify_level=NotifyLevel.involved, created_at=now, modified_at=now)
+        for user in candidates if user.notify_policy_id is None
+    ], ignore_conflicts=True)
 
-    if user_ids:
-        assigned_to_users = get_user_model().objects.filter(id__in=user_ids)
-        candidates.update(filter(_can_notify_light, assigned_to_users))
+    return candidates
 
-    # Remove the changer from candidates
-    if discard_users:
-        candidates = candidates - set(discard_users)
 
-    # Filter by object permissions
-    candidates = set(filter(partial(_filter_by_permissions, obj), candidates))
+def get_users_to_notify(obj, *, history=None, discard_users=None, live=False, candidates=None) -> list:
+    """
+    Get filtered set of users to notify for specified
+    model instance and changer.
+
+    The candidates returned by `get_notify_candidates` can be
+    passed to reuse them for emails and live notifications.
+
+    NOTE: changer at this momment is not used.
+    NOTE: analogouts to obj.get_watchers_to_notify(changer)
+    """
+    if candidates is None:
+        candidates = get_notify_candidates(obj, history=history, discard_users=discard_users)
 
-    # Filter disabled and system users
-    candidates = set(filter(partial(_filter_notificable), candidates))
+    def _can_notify(user):
+        level = user.live_notify_level if live else user.notify_level
+        if user.is_project_candidate and level == NotifyLevel.all:
+            return True
+        if user.is_object_candidate and level in (NotifyLevel.all, NotifyLevel.involved):
+            return True
+        return False
 
-    return frozenset(candidates)
+    return frozenset(user for user in candidates if user.is_notificable and _can_notify(user))
 
 
 def _resolve_template_name(model: object, *, change_type: int) -> str:
@@ -257,14 +333,15 @@ def send_notifications(obj, *, history):
 
     # Get a complete list of notifiable users for current
     # object and send the change notification to them.
-    notify_users = get_users_to_notify(obj, history=history, discard_users=[notification.owner])
+    candidates = get_notify_candidates(obj, history=history, discard_users=[notification.owner])
+    notify_users = get_users_to_notify(obj, candidates=candidates)
     notification.notify_users.add(*notify_users)
 
     # If we are the min interval is 0 it just work in a synchronous and spamming way
     if settings.CHANGE_NOTIFICATIONS_MIN_INTERVAL == 0:
         send_sync_notifications(notification.id)
 
-    live_notify_users = get_users_to_notify(obj, history=history, discard_users=[notification.owner], live=True)
+    live_notify_users = get_users_to_notify(obj, candidates=candidates, live=True)
     for user in live_notify_users:
         events.emit_live_notification_for_model(obj, user, history)
 
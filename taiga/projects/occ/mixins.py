@@ -39,32 +39,42 @@ class OCCResourceMixin(object):
         return True
 
     def _validate_and_update_version(self, obj):
-        current_version = None
-        if obj.id:
-            current_version = type(obj).objects.model.objects.get(id=obj.id).version
+        if not obj.id:
+            return
 
-            # Extract param version
-            param_version = self._extract_param_version()
-            if not self._validate_param_version(param_version, current_version):
-                raise exc.WrongArguments({"version": _("The version parameter is not valid")})
+        # Extract param version
+        param_version = self._extract_param_version()
+        if not self._validate_param_version(param_version, None):
+            raise exc.WrongArguments({"version": _("The version parameter is not valid")})
 
-            if current_version != param_version:
-                diff_versions = current_version - param_version
+        # Usual case, nobody has modified the object since the client got it:
+        # check and increment the version at once.
+        new_version = db.increment_attribute_if_matches(obj, "version", param_version)
+        if new_version is not None:
+            obj.version = new_version
+            return
 
-                modifying_fields = set(self.request.DATA.keys())
-                if "version" in modifying_fields:
-                    modifying_fields.remove("version")
+        current_version = db.reload_attribute(obj, "version")
+        if not self._validate_param_version(param_version, current_version):
+            raise exc.WrongArguments({"version": _("The version parameter is not valid")})
 
-                modified_fields = set(get_modified_fields(obj, diff_versions))
-                if "version" in modifying_fields:
-                    modified_fields.remove("version")
+        if current_version != param_version:
+            diff_versions = current_version - param_version
 
-                both_modified = modifying_fields & modified_fields
+            modifying_fields = set(self.request.DATA.keys())
+            if "version" in modifying_fields:
+                modifying_fields.remove("version")
 
-                if both_modified:
-                    raise exc.WrongArguments({"version": _("The version doesn't match with the current one")})
+            modified_fields = set(get_modified_fields(obj, diff_versions))
+            if "version" in modifying_fields:
+                modified_fields.remove("version")
 
-            obj.version = models.F('version') + 1
+            both_modified = modifying_fields & modified_fields
+
+            if both_modified:
+                raise exc.WrongArguments({"version": _("The version doesn't match with the current one")})
+
+        obj.version = models.F('version') + 1
 
     def pre_save(self, obj):
         self._validate_and_update_version(obj)
@@ -72,7 +82,8 @@ class OCCResourceMixin(object):
 
     def post_save(self, obj, created=False):
         super().post_save(obj, created)
-        if not created:
+        # Only needed when the version has been merged with concurrent changes
+        if not created and hasattr(obj.version, "resolve_expression"):
             obj.version = db.reload_attribute(obj, 'version')
 
 
@@ -16,3 +16,23 @@ def get_instance_by_ref(project_id, obj_ref):
         instance = None
 
     return instance
+
+
+def get_instances_by_refs(project_id, obj_refs):
+    """
+    Return a dict with the Reference instances of a project for every ref of
+    `obj_refs`, with their content objects already fetched, or None for the
+    refs that don't exist.
+    """
+    model_cls = apps.get_model("references", "Reference")
+    instances = {obj_ref: None for obj_ref in obj_refs}
+    if not instances:
+        return instances
+
+    queryset = (model_cls.objects.filter(project_id=project_id, ref__in=instances.keys())
+                                 .select_related("content_type")
+                                 .prefetch_related("content_object"))
+    for instance in queryset:
+        instances[instance.ref] = instance
+
+    return instances
@@ -177,7 +177,7 @@ class MembershipDictSerializer(serializers.LightDictSerializer):
         return obj["full_name"] or obj["username"] or obj["email"]
 
     def get_photo(self, obj):
-        return get_photo_url(obj['photo'])
+        return get_photo_url(obj['photo'], obj['photo_thumbnails'])
 
     def get_gravatar_id(self, obj):
         return get_gravatar_id(obj['email'])
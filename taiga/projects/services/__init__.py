@@ -12,6 +12,7 @@
 
 
 from .bulk_update_order import apply_order_updates
+from .bulk_update_order import shift_orders_in_bulk
 from .bulk_update_order import bulk_update_severity_order
 from .bulk_update_order import bulk_update_priority_order
 from .bulk_update_order import bulk_update_issue_type_order
@@ -23,7 +24,15 @@ from .bulk_update_order import bulk_update_epic_status_order
 from .bulk_update_order import bulk_update_swimlane_order
 from .bulk_update_order import update_projects_order_in_bulk
 
+from .config_cache import get_project_config
+from .config_cache import attach_project_config
+from .config_cache import bump_project_config_version
+
 from .filters import get_all_tags
+from .filters import get_facets_rows
+
+from .totals import rebuild_daily_totals
+from .totals import check_daily_totals
 
 from .invitations import send_invitation
 from .invitations import find_invited_user
@@ -52,7 +61,14 @@ from .projects import duplicate_project
 
 from .stats import get_stats_for_project_issues
 from .stats import get_stats_for_project
+from .stats import get_cached_stats_for_project
+from .stats import bump_project_stats_version
 from .stats import get_member_stats_for_project
 
+from .rendered_html import render_html_fields
+from .rendered_html import refresh_references_html
+from .rendered_html import refresh_mentions_html
+from .rendered_html import update_rendered_html
+
 from .transfer import request_project_transfer, start_project_transfer
 from .transfer import accept_project_transfer, reject_project_transfer
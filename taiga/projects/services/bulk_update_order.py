@@ -67,6 +67,69 @@ def apply_order_updates(base_orders: dict, new_orders: dict, *, remove_equal_ori
         [base_orders.pop(id, None) for id in common_keys if original_orders[id] == base_orders[id]]
 
 
+SHIFT_ORDER_SQL = """
+    UPDATE "{tbl}"
+       SET "{field}" = CASE WHEN "{tbl}"."id" = %(id)s THEN %(order)s
+                            ELSE "{tbl}"."{field}" + 1
+                       END
+      FROM "{tbl}" AS old,
+           (SELECT "{field}" AS value
+              FROM "{tbl}"
+             WHERE "id" = %(id)s {scope}) AS moved
+     WHERE old."id" = "{tbl}"."id"
+       {tbl_scope}
+       AND NOT ("{tbl}"."id" = ANY(%(moved_ids)s))
+       AND ("{tbl}"."id" = %(id)s
+            OR ("{tbl}"."id" <> %(id)s
+                AND "{tbl}"."{field}" >= %(order)s
+                AND (%(order)s >= moved.value OR "{tbl}"."{field}" < moved.value)))
+ RETURNING "{tbl}"."id", "{tbl}"."{field}", old."{field}"
+"""
+
+
+def shift_orders_in_bulk(model, field: str, new_orders: list, scope: dict, *,
+                         remove_equal_original=False):
+    """
+    Same as `apply_order_updates` but done inside the database: moving an
+    element shifts the range of affected elements with one UPDATE statement, so
+    the elements of the scope are never loaded.
+
+    `new_orders` must be a list of `(id, order)` tuples with the basic order
+    modifications to apply.
+    `scope` must be a dict `{column: value}` with the constraints of the elements
+    that can be affected by the order modifications.
+
+    Return a dict with the new order of the updated elements.
+    """
+    tbl = model._meta.db_table
+    scope_sql = "".join(' AND "{col}" = %(scope_{col})s'.format(col=col) for col in scope)
+    tbl_scope_sql = "".join(' AND "{tbl}"."{col}" = %(scope_{col})s'.format(tbl=tbl, col=col) for col in scope)
+    sql = SHIFT_ORDER_SQL.format(tbl=tbl, field=field, scope=scope_sql, tbl_scope=tbl_scope_sql)
+
+    scope_params = {"scope_{}".format(col): value for col, value in scope.items()}
+
+    updated_orders = {}
+    original_orders = {}
+    moved_ids = []
+
+    # We will apply the multiple order changes by the new position order
+    with connection.cursor() as cursor:
+        for id, order in sorted(new_orders, key=itemgetter(1)):
+            params = {"id": id, "order": order, "moved_ids": moved_ids, **scope_params}
+            cursor.execute(sql, params)
+            for updated_id, new_order, old_order in cursor.fetchall():
+                updated_orders[updated_id] = new_order
+                original_orders.setdefault(updated_id, old_order)
+            moved_ids.append(id)
+
+    # Remove the elements that remains the same
+    if remove_equal_original:
+        updated_orders = {id: order for id, order in updated_orders.items()
+                          if original_orders[id] != order}
+
+    return updated_orders
+
+
 def update_projects_order_in_bulk(bulk_data: list, field: str, user):
     """
     Update the order of user projects in the user membership.
@@ -89,146 +152,60 @@ def update_projects_order_in_bulk(bulk_data: list, field: str, user):
     db.update_attr_in_bulk_for_ids(memberships_orders, field, model=models.Membership)
 
 
+def _update_project_choices_order(project, table, data):
+    if not data:
+        return
+
+    with connection.cursor() as curs:
+        execute_values(curs,
+                       """
+                       UPDATE {table}
+                       SET "order" = tmp.new_order
+                       FROM (VALUES %s) AS tmp (id, new_order)
+                       WHERE tmp.id = {table}.id AND
+                             {table}.project_id = {project_id}""".format(table=table,
+                                                                         project_id=int(project.id)),
+                       data)
+
+
 @transaction.atomic
 def bulk_update_epic_status_order(project, user, data):
-    cursor = connection.cursor()
-
-    sql = """
-    prepare bulk_update_order as update projects_epicstatus set "order" = $1
-        where projects_epicstatus.id = $2 and
-              projects_epicstatus.project_id = $3;
-    """
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.execute("DEALLOCATE bulk_update_order")
-    cursor.close()
+    _update_project_choices_order(project, "projects_epicstatus", data)
 
 
 @transaction.atomic
 def bulk_update_userstory_status_order(project, user, data):
-    cursor = connection.cursor()
-
-    sql = """
-    prepare bulk_update_order as update projects_userstorystatus set "order" = $1
-        where projects_userstorystatus.id = $2 and
-              projects_userstorystatus.project_id = $3;
-    """
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.execute("DEALLOCATE bulk_update_order")
-    cursor.close()
+    _update_project_choices_order(project, "projects_userstorystatus", data)
 
 
 @transaction.atomic
 def bulk_update_points_order(project, user, data):
-    cursor = connection.cursor()
-
-    sql = """
-    prepare bulk_update_order as update projects_points set "order" = $1
-        where projects_points.id = $2 and
-              projects_points.project_id = $3;
-    """
-
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.execute("DEALLOCATE bulk_update_order")
-    cursor.close()
+    _update_project_choices_order(project, "projects_points", data)
 
 
 @transaction.atomic
 def bulk_update_task_status_order(project, user, data):
-    cursor = connection.cursor()
-
-    sql = """
-    prepare bulk_update_order as update projects_taskstatus set "order" = $1
-        where projects_taskstatus.id = $2 and
-              projects_taskstatus.project_id = $3;
-    """
-
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.execute("DEALLOCATE bulk_update_order")
-    cursor.close()
+    _update_project_choices_order(project, "projects_taskstatus", data)
 
 
 @transaction.atomic
 def bulk_update_issue_status_order(project, user, data):
-    cursor = connection.cursor()
-
-    sql = """
-    prepare bulk_update_order as update projects_issuestatus set "order" = $1
-        where projects_issuestatus.id = $2 and
-              projects_issuestatus.project_id = $3;
-    """
-
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.execute("DEALLOCATE bulk_update_order")
-    cursor.close()
+    _update_project_choices_order(project, "projects_issuestatus", data)
 
 
 @transaction.atomic
 def bulk_update_issue_type_order(project, user, data):
-    cursor = connection.cursor()
-
-    sql = """
-    prepare bulk_update_order as update projects_issuetype set "order" = $1
-        where projects_issuetype.id = $2 and
-              projects_issuetype.project_id = $3;
-    """
-
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.execute("DEALLOCATE bulk_update_order")
-    cursor.close()
+    _update_project_choices_order(project, "projects_issuetype", data)
 
 
 @transaction.atomic
 def bulk_update_priority_order(project, user, data):
-    cursor = connection.cursor()
-
-    sql = """
-    prepare bulk_update_order as update projects_priority set "order" = $1
-        where projects_priority.id = $2 and
-              projects_priority.project_id = $3;
-    """
-
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.execute("DEALLOCATE bulk_update_order")
-    cursor.close()
+    _update_project_choices_order(project, "projects_priority", data)
 
 
 @transaction.atomic
 def bulk_update_severity_order(project, user, data):
-    cursor = connection.cursor()
-
-    sql = """
-    prepare bulk_update_order as update projects_severity set "order" = $1
-        where projects_severity.id = $2 and
-              projects_severity.project_id = $3;
-    """
-
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.execute("DEALLOCATE bulk_update_order")
-    cursor.close()
+    _update_project_choices_order(project, "projects_severity", data)
 
 
 @transaction.atomic
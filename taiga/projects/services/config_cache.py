@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+from .. import utils as project_utils
+
+
+def get_project_cache_version(project_id, name):
+    """
+    Get the current version of the cached data `name` of a project. The cached
+    data of a version is never updated, a new version is used instead.
+
+    The versions are stored in the database, the cache can be local to each
+    process.
+    """
+    cache_version_model = apps.get_model("projects", "ProjectCacheVersion")
+    queryset = cache_version_model.objects.filter(project_id=project_id, name=name)
+    version = queryset.values_list("version", flat=True).first()
+    if version is None:
+        # A concurrent request can create it too
+        cache_version_model.objects.bulk_create([cache_version_model(project_id=project_id, name=name)],
+                                                ignore_conflicts=True)
+        version = queryset.values_list("version", flat=True).first()
+    return None if version is None else version.hex
+
+
+def bump_project_cache_version(project_id, name):
+    """
+    Invalidate the cached data `name` of a project.
+
+    The new version is only visible to the other transactions once this one
+    is committed, so they can't cache the old data with it. Without a stored
+    version there is no cached data to invalidate.
+    """
+    cache_version_model = apps.get_model("projects", "ProjectCacheVersion")
+    cache_version_model.objects.filter(project_id=project_id, name=name).update(version=uuid.uuid4())
+
+
+def get_project_config_version(project_id):
+    return get_project_cache_version(project_id, "config")
+
+
+def bump_project_config_version(project_id):
+    """
+    Invalidate the cached configuration of a project.
+    """
+    bump_project_cache_version(project_id, "config")
+
+
+def get_project_config(project_id):
+    """
+    Get a dict with the configuration attributes of a project (statuses,
+    points, custom attributes, roles...), see `utils.attach_config_info`.
+    """
+    key = "projects/{}/config/{}".format(project_id, get_project_config_version(project_id))
+    config = cache.get(key)
+    if config is None:
+        project_model = apps.get_model("projects", "Project")
+        queryset = project_utils.attach_config_info(project_model.objects.filter(id=project_id))
+        config = queryset.values(*project_utils.CONFIG_INFO_ATTRS).first()
+        cache.set(key, config, timeout=settings.PROJECT_CONFIG_CACHE_TIMEOUT)
+    return config
+
+
+def attach_project_config(project):
+    """
+    Set the configuration attributes to a project got with
+    `utils.attach_extra_info(..., with_config=False)`.
+    """
+    for attr, value in (get_project_config(project.id) or {}).items():
+        setattr(project, attr, value)
+    return project
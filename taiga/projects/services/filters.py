@@ -6,6 +6,8 @@
 # Copyright (c) 2021-present Kaleidos INC
 
 from contextlib import closing
+
+from django.core.exceptions import EmptyResultSet
 from django.db import connection
 
 
@@ -54,3 +56,64 @@ def get_all_tags(project):
     result.update(_get_stories_tags(project))
     result.update(_get_tasks_tags(project))
     return sorted(result)
+
+
+def _get_queryset_where(queryset):
+    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
+    try:
+        where, where_params = queryset.query.where.as_sql(compiler, connection)
+    except EmptyResultSet:
+        return "FALSE", []
+    return where or "TRUE", list(where_params)
+
+
+def get_facets_rows(project, from_sql, columns, facets):
+    """
+    Compute the rows of several filter facets of a project (statuses, tags,
+    assigned users...) with a single query.
+
+    The items of the project are selected once from `from_sql` into the
+    "items" CTE, with the `columns` and a boolean column for every facet that
+    says if the item is in the facet queryset. `facets` is a list of
+    (name, queryset, sql, params) where `sql` is a query over "items" that
+    only uses the items with its `{match}` column; so every facet is still
+    computed from its own queryset, i.e. ignoring its own filter.
+
+    The columns of the facet queries must have unique names. Return a dict
+    with the list of row tuples of every facet.
+    """
+    select_sql = list(columns)
+    select_params = []
+    facets_sql = []
+    facets_params = []
+    for index, (name, queryset, sql, params) in enumerate(facets):
+        match = "match_{}".format(index)
+        where, where_params = _get_queryset_where(queryset)
+        select_sql.append('COALESCE(({}), FALSE) "{}"'.format(where, match))
+        select_params += where_params
+
+        facets_sql.append('SELECT %s "facet", row_to_json("facet_rows") "row" FROM ({}) "facet_rows"'
+                          .format(sql.format(match='"items"."{}"'.format(match))))
+        facets_params += [name] + list(params)
+
+    # "items" is referenced by every facet, so postgres materializes it and
+    # the items are scanned (and the querysets filters evaluated) only once
+    sql = """
+        WITH "items" AS (
+            SELECT {columns}
+              FROM {from_sql}
+             WHERE "projects_project"."id" = %s
+        )
+        {facets}
+    """.format(columns=",\n                   ".join(select_sql),
+               from_sql=from_sql,
+               facets="\n         UNION ALL\n        ".join(facets_sql))
+
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, select_params + [project.id] + facets_params)
+        rows = cursor.fetchall()
+
+    result = {facet[0]: [] for facet in facets}
+    for name, row in rows:
+        result[name].append(tuple(row.values()))
+    return result
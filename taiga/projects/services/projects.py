@@ -283,9 +283,9 @@ def delete_project(project_id):
 
 
 @app.task
-def delete_projects(projects):
-    for project in projects:
-        delete_project(project.id)
+def delete_projects(project_ids):
+    for project_id in project_ids:
+        delete_project(project_id)
 
 
 def duplicate_project(project, **new_project_extra_args):
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+# The html of the descriptions, blocked notes and wiki contents is rendered
+# when they are saved and stored in a `<field>_html` field, so the serializers
+# don't run the markdown pipeline on every read (see `get_rendered_html` in
+# taiga.mdrender.service). The field is null while the text has not been
+# rendered (objects created in bulk or with the signals disconnected), and it
+# is rendered again in background when a referenced item changes or is deleted
+# or when a mentioned user changes.
+
+import re
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from taiga.celery import app
+from taiga.mdrender.extensions.mentions import MENTION_RE
+from taiga.mdrender.extensions.references import TAIGA_REFERENCE_RE
+from taiga.mdrender.service import render as mdrender
+
+from ..apps import RENDERED_HTML_MODELS
+
+
+def get_rendered_fields(model):
+    """
+    Get the (text field, html field) pairs of a model, i.e. the fields with a
+    `<field>_html` field where their rendered html is stored.
+    """
+    names = [field.name for field in model._meta.concrete_fields]
+    return [(name[:-len("_html")], name) for name in names
+            if name.endswith("_html") and name[:-len("_html")] in names]
+
+
+def render_html_fields(model, instance, update_fields=None):
+    """
+    Set the html of the text fields of an instance that is going to be saved.
+    Only the changed texts are rendered. The previous subject is kept in
+    `instance.prev_subject` to know if its references must be updated.
+    """
+    fields = get_rendered_fields(model)
+    if update_fields is not None:
+        fields = [(field, html_field) for field, html_field in fields if field in update_fields]
+
+    is_referenceable = hasattr(instance, "ref") and hasattr(instance, "subject")
+    columns = [column for pair in fields for column in pair] + (["subject"] if is_referenceable else [])
+
+    prev = None
+    if instance.pk is not None and columns:
+        prev = model.objects.filter(pk=instance.pk).values(*columns).first()
+    prev = prev or {}
+
+    instance.prev_subject = prev.get("subject", None)
+    for field, html_field in fields:
+        text = getattr(instance, field)
+        if prev.get(html_field, None) is not None and prev[field] == text:
+            # Keep the stored html, it could have been rendered again in background
+            setattr(instance, html_field, prev[html_field])
+        else:
+            setattr(instance, html_field, mdrender(instance.project, text) if text else "")
+
+
+def _run_in_background(task, *args):
+    if settings.CELERY_ENABLED:
+        transaction.on_commit(lambda: task.delay(*args))
+    else:
+        task(*args)
+
+
+def refresh_references_html(instance, deleted=False):
+    """
+    Render again, in background, the texts that reference an instance whose
+    subject has changed or that has been deleted.
+    """
+    if instance.ref is None:
+        return
+    if not deleted:
+        prev_subject = getattr(instance, "prev_subject", None)
+        if prev_subject is None or prev_subject == instance.subject:
+            return
+    _run_in_background(refresh_rendered_html_of_reference, instance.project_id, instance.ref)
+
+
+def refresh_mentions_html(user, prev_username, prev_full_name):
+    """
+    Render again, in background, the texts that mention a renamed user.
+    """
+    if prev_username is None or (prev_username, prev_full_name) == (user.username, user.full_name):
+        return
+    usernames = sorted({prev_username, user.username})
+    _run_in_background(refresh_rendered_html_of_mentions, user.id, usernames)
+
+
+def _render_html_values(instance, fields):
+    # Rendered again even if cached, a referenced item or a mentioned user could have changed
+    return {html_field: mdrender.refresh(instance.project, getattr(instance, field))
+            for field, html_field in fields}
+
+
+def _refresh_rendered_html(filters, needle, is_affected):
+    for app_label, model_name in RENDERED_HTML_MODELS:
+        model = apps.get_model(app_label, model_name)
+        fields = get_rendered_fields(model)
+
+        # A first filter in the database, the texts are checked again with the markdown regexps
+        lookup = Q()
+        for field, html_field in fields:
+            lookup |= Q(**{"{}__contains".format(field): needle})
+
+        queryset = model.objects.filter(filters).filter(lookup).select_related("project")
+        for instance in queryset.iterator():
+            affected_fields = [(field, html_field) for field, html_field in fields
+                               if is_affected(getattr(instance, field))]
+            if affected_fields:
+                # Without signals, the instance has not changed
+                model.objects.filter(pk=instance.pk).update(**_render_html_values(instance, affected_fields))
+
+
+def update_rendered_html(project_ids=None, only_missing=True):
+    """
+    Render and store the html of the texts of some projects (all if None),
+    only the ones that have not been rendered yet if `only_missing`. Return
+    the number of updated objects.
+    """
+    count = 0
+    for app_label, model_name in RENDERED_HTML_MODELS:
+        model = apps.get_model(app_label, model_name)
+        fields = get_rendered_fields(model)
+
+        queryset = model.objects.all()
+        if project_ids is not None:
+            queryset = queryset.filter(project_id__in=project_ids)
+        if only_missing:
+            lookup = Q()
+            for field, html_field in fields:
+                lookup |= Q(**{"{}__isnull".format(html_field): True})
+            queryset = queryset.filter(lookup)
+
+        for instance in queryset.select_related("project").iterator():
+            model.objects.filter(pk=instance.pk).update(**_render_html_values(instance, fields))
+            count += 1
+    return count
+
+
+@app.task
+def refresh_rendered_html_of_reference(project_id, ref):
+    def _is_affected(text):
+        return ref in {int(m.group(1)) for m in re.finditer(TAIGA_REFERENCE_RE, text, re.MULTILINE)}
+
+    _refresh_rendered_html(Q(project_id=project_id), "#{}".format(ref), _is_affected)
+
+
+@app.task
+def refresh_rendered_html_of_mentions(user_id, usernames):
+    # The mentions are only rendered in the projects of the user
+    membership_model = apps.get_model("projects", "Membership")
+    project_ids = list(membership_model.objects.filter(user_id=user_id).values_list("project_id", flat=True))
+    if not project_ids:
+        return
+
+    for username in usernames:
+        def _is_affected(text, username=username):
+            return username in {m.group(2) for m in re.finditer(MENTION_RE, text)}
+
+        _refresh_rendered_html(Q(project_id__in=project_ids), "@{}".format(username), _is_affected)
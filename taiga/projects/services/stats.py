@@ -5,13 +5,20 @@
 #
 # Copyright (c) 2021-present Kaleidos INC
 
+from django.utils import translation
 from django.utils.translation import gettext as _
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Sum, OuterRef, Subquery
+from django.db.models.functions import TruncDate
 from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
 import datetime
 import copy
 import collections
 
+from .config_cache import get_project_cache_version
+from .config_cache import bump_project_cache_version
+
 
 def _count_status_object(status_obj, counting_storage):
     if status_obj.id in counting_storage:
@@ -213,119 +220,130 @@ def _get_milestones_stats_for_backlog(project, milestones):
     return milestones_stats
 
 
-def get_stats_for_project(project):
-    # Let's fetch all the estimations related to a project with all the necesary
-    # related data
+def _get_estimations_for_stats(project):
     RolePoints = apps.get_model('userstories', 'RolePoints')
-    role_points = RolePoints.objects.filter(
-        user_story__project = project,
-    ).prefetch_related(
-        "user_story",
-        "user_story__assigned_to",
-        "user_story__milestone",
-        "user_story__status",
-        "role",
-        "points")
+    # None estimations doesn't affect to project stats
+    return RolePoints.objects.filter(user_story__project=project,
+                                     points__value__isnull=False)
+
+
+def _get_grouped_estimations(project):
+    # Let's sum all the estimations of the project grouped by role, milestone
+    # and closed condition of the user story
+    return _get_estimations_for_stats(project)\
+        .values("role_id",
+                "user_story__is_closed",
+                "user_story__milestone_id",
+                "user_story__milestone__closed")\
+        .annotate(points=Sum("points__value"))\
+        .order_by()
 
-    # Data inicialization
-    project._closed_points = 0
-    project._closed_points_per_role = {}
-    project._closed_points_from_closed_milestones = 0
-    project._defined_points = 0
-    project._defined_points_per_role = {}
-    project._assigned_points = 0
-    project._assigned_points_per_role = {}
-    project._future_team_increment = 0
-    project._future_client_increment = 0
 
-    # The key will be the milestone id and it will be ordered by estimated_start
-    milestones = collections.OrderedDict()
-    for milestone in project.milestones.order_by("estimated_start"):
-        milestone._closed_points = 0
-        milestone._team_increment_points = 0
-        milestone._client_increment_points = 0
-        milestones[milestone.id] = milestone
+def _get_grouped_requirements(project):
+    # And the estimations of the extra requirements grouped by the milestone
+    # whose dates range contains the creation date of the user story
+    Milestone = apps.get_model('milestones', 'Milestone')
+    created_in_milestone = Milestone.objects.filter(
+        project_id=project.id,
+        estimated_start__lte=OuterRef("created_day"),
+        estimated_finish__gt=OuterRef("created_day"),
+    ).order_by("estimated_start", "id").values("id")[:1]
+
+    return _get_estimations_for_stats(project)\
+        .filter(Q(user_story__team_requirement=True) | Q(user_story__client_requirement=True))\
+        .annotate(created_day=TruncDate("user_story__created_date"))\
+        .annotate(created_in_milestone_id=Subquery(created_in_milestone))\
+        .values("created_in_milestone_id",
+                "user_story__team_requirement",
+                "user_story__client_requirement")\
+        .annotate(points=Sum("points__value"))\
+        .order_by()
 
-    def _find_milestone_for_userstory(user_story):
-        for m in milestones.values():
-            if m.estimated_finish > user_story.created_date.date() and\
-               m.estimated_start <= user_story.created_date.date():
 
-              return m
+def _add_points_per_role(points_per_role, role_id, points_value):
+    points_per_role[role_id] = points_per_role.get(role_id, 0) + points_value
 
-        return None
 
-    def _update_team_increment(milestone, value):
-        if milestone:
-            milestones[milestone.id]._team_increment_points += value
-        else:
-            project._future_team_increment += value
+def _add_estimations_stats(project, milestones, estimations):
+    for estimation in estimations:
+        role_id = estimation["role_id"]
+        milestone_id = estimation["user_story__milestone_id"]
+        points_value = estimation["points"]
 
-    def _update_client_increment(milestone, value):
-        if milestone:
-            milestones[milestone.id]._client_increment_points += value
-        else:
-            project._future_client_increment += value
-
-    # Iterate over all the project estimations and update our stats
-    for role_point in role_points:
-        role_id = role_point.role.id
-        points_value = role_point.points.value
-        user_story = getattr(role_point, "user_story", None)
-
-        milestone = None
-        is_team_requirement = None
-        is_client_requirement = None
-        us_milestone = None
-
-        if user_story:
-            milestone = user_story.milestone
-            is_team_requirement = user_story.team_requirement
-            is_client_requirement = user_story.client_requirement
-            us_milestone = _find_milestone_for_userstory(user_story)
-
-        # None estimations doesn't affect to project stats
-        if points_value is None:
-            continue
-
-        # Total defined points
+        # Total defined points and defined points per role
         project._defined_points += points_value
-
-        # Defined points per role
-        project._defined_points_for_role = project._defined_points_per_role.get(role_id, 0)
-        project._defined_points_for_role += points_value
-        project._defined_points_per_role[role_id] = project._defined_points_for_role
+        _add_points_per_role(project._defined_points_per_role, role_id, points_value)
 
         # Closed points
-        if user_story and user_story.is_closed:
+        if estimation["user_story__is_closed"]:
             project._closed_points += points_value
-            closed_points_for_role = project._closed_points_per_role.get(role_id, 0)
-            closed_points_for_role += points_value
-            project._closed_points_per_role[role_id] = closed_points_for_role
+            _add_points_per_role(project._closed_points_per_role, role_id, points_value)
 
-            if milestone is not None:
-                milestones[milestone.id]._closed_points += points_value
+            if milestone_id is not None:
+                milestones[milestone_id]._closed_points += points_value
 
-        if milestone is not None and milestone.closed:
+        if milestone_id is not None and estimation["user_story__milestone__closed"]:
             project._closed_points_from_closed_milestones += points_value
 
         # Assigned to milestone points
-        if user_story and user_story.milestone is not None:
+        if milestone_id is not None:
             project._assigned_points += points_value
-            assigned_points_for_role = project._assigned_points_per_role.get(role_id, 0)
-            assigned_points_for_role += points_value
-            project._assigned_points_per_role[role_id] = assigned_points_for_role
+            _add_points_per_role(project._assigned_points_per_role, role_id, points_value)
+
+
+def _add_increment(project, milestones, milestone_id, team_value, client_value):
+    if milestone_id is not None:
+        milestones[milestone_id]._team_increment_points += team_value
+        milestones[milestone_id]._client_increment_points += client_value
+    else:
+        project._future_team_increment += team_value
+        project._future_client_increment += client_value
+
+
+def _add_requirements_stats(project, milestones, requirements):
+    for requirement in requirements:
+        milestone_id = requirement["created_in_milestone_id"]
+        is_team_requirement = requirement["user_story__team_requirement"]
+        is_client_requirement = requirement["user_story__client_requirement"]
+        points_value = requirement["points"]
 
-        # Extra requirements
         if is_team_requirement and is_client_requirement:
-            _update_team_increment(us_milestone, points_value/2)
-            _update_client_increment(us_milestone, points_value/2)
+            _add_increment(project, milestones, milestone_id, points_value / 2, points_value / 2)
 
         if is_team_requirement and not is_client_requirement:
-            _update_team_increment(us_milestone, points_value)
+            _add_increment(project, milestones, milestone_id, points_value, 0)
 
         if not is_team_requirement and is_client_requirement:
-            _update_client_increment(us_milestone, points_value)
+            _add_increment(project, milestones, milestone_id, 0, points_value)
+
+
+def get_stats_for_project(project):
+    estimations = _get_grouped_estimations(project)
+    requirements = _get_grouped_requirements(project)
+
+    # Data inicialization
+    project._closed_points = 0
+    project._closed_points_per_role = {}
+    project._closed_points_from_closed_milestones = 0
+    project._defined_points = 0
+    project._defined_points_per_role = {}
+    project._assigned_points = 0
+    project._assigned_points_per_role = {}
+    project._future_team_increment = 0
+    project._future_client_increment = 0
+
+    # The key will be the milestone id and it will be ordered by estimated_start
+    milestones = collections.OrderedDict()
+    for milestone in project.milestones.order_by("estimated_start", "id"):
+        milestone._closed_points = 0
+        milestone._team_increment_points = 0
+        milestone._client_increment_points = 0
+        milestones[milestone.id] = milestone
+
+    # Iterate over the grouped estimations and update our stats
+    _add_estimations_stats(project, milestones, estimations)
+    # Extra requirements
+    _add_requirements_stats(project, milestones, requirements)
 
     # Speed calculations
     speed = 0
@@ -351,6 +369,28 @@ def get_stats_for_project(project):
     return project_stats
 
 
+def get_cached_stats_for_project(project):
+    """
+    Same as `get_stats_for_project` but the result is cached until a user
+    story, an estimation, a sprint or the project itself change, in any
+    process (the version is stored in the database).
+    """
+    version = get_project_cache_version(project.id, "stats")
+    key = "projects/{}/stats/{}/{}".format(project.id, version, translation.get_language())
+    project_stats = cache.get(key)
+    if project_stats is None:
+        project_stats = get_stats_for_project(project)
+        cache.set(key, project_stats, timeout=settings.PROJECT_STATS_CACHE_TIMEOUT)
+    return project_stats
+
+
+def bump_project_stats_version(project_id):
+    """
+    Invalidate the cached stats of a project.
+    """
+    bump_project_cache_version(project_id, "stats")
+
+
 def _get_closed_bugs_per_member_stats(project):
     # Closed bugs per user
     closed_bugs = project.issues.filter(status__is_closed=True)\
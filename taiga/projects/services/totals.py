@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+from django.db import connection, transaction
+
+
+# Expected daily totals calculated from likes_like and timeline_timeline. They
+# must be the same counts the triggers of projects_projectdailytotals keep.
+EXPECTED_DAILY_TOTALS_SQL = """
+    SELECT counts.project_id, counts.day, sum(counts.fans) AS fans, sum(counts.activity) AS activity
+      FROM (SELECT likes_like.object_id AS project_id,
+                   (likes_like.created_date AT TIME ZONE 'UTC')::date AS day,
+                   count(*) AS fans,
+                   0 AS activity
+              FROM likes_like
+             WHERE likes_like.content_type_id = (SELECT id
+                                                  FROM django_content_type
+                                                 WHERE app_label = 'projects' AND model = 'project')
+                   {likes_where}
+          GROUP BY 1, 2
+         UNION ALL
+            SELECT substring(timeline_timeline.namespace FROM 9)::integer AS project_id,
+                   (timeline_timeline.created AT TIME ZONE 'UTC')::date AS day,
+                   0 AS fans,
+                   count(*) AS activity
+              FROM timeline_timeline
+             WHERE timeline_timeline.namespace ~ '^project:[0-9]+$'
+                   {timeline_where}
+          GROUP BY 1, 2) AS counts
+INNER JOIN projects_project ON projects_project.id = counts.project_id
+  GROUP BY counts.project_id, counts.day
+"""
+
+
+def _expected_daily_totals_sql(project_ids):
+    if project_ids is None:
+        return EXPECTED_DAILY_TOTALS_SQL.format(likes_where="", timeline_where=""), None
+
+    sql = EXPECTED_DAILY_TOTALS_SQL.format(
+        likes_where="AND likes_like.object_id = ANY(%(project_ids)s)",
+        timeline_where="AND timeline_timeline.namespace = ANY(%(namespaces)s)"
+    )
+    params = {
+        "project_ids": list(project_ids),
+        "namespaces": ["project:{}".format(id) for id in project_ids],
+    }
+    return sql, params
+
+
+@transaction.atomic
+def rebuild_daily_totals(project_ids=None):
+    """
+    Recalculate the daily totals (fans and activity) of the projects with id
+    in `project_ids`, or of all the projects.
+    """
+    expected_sql, params = _expected_daily_totals_sql(project_ids)
+    where = "" if project_ids is None else "WHERE project_id = ANY(%(project_ids)s)"
+
+    with connection.cursor() as cursor:
+        # Block the triggers of concurrent inserts until the rebuild is committed,
+        # the rows they add are not visible here so they are not counted twice.
+        cursor.execute("LOCK TABLE projects_projectdailytotals IN EXCLUSIVE MODE")
+        cursor.execute("DELETE FROM projects_projectdailytotals {}".format(where), params)
+        cursor.execute("""
+            INSERT INTO projects_projectdailytotals (project_id, day, fans, activity)
+            {}
+        """.format(expected_sql), params)
+
+
+def check_daily_totals(project_ids=None):
+    """
+    Compare the daily totals of the projects with id in `project_ids` (or of
+    all the projects) with the likes and timeline entries.
+
+    Return a list of `(project_id, day, expected_fans, fans, expected_activity,
+    activity)` tuples, one for every inconsistent day.
+    """
+    expected_sql, params = _expected_daily_totals_sql(project_ids)
+    where = "" if project_ids is None else "WHERE project_id = ANY(%(project_ids)s)"
+
+    sql = """
+        WITH expected AS ({expected_sql}),
+             current AS (SELECT project_id, day, fans, activity
+                           FROM projects_projectdailytotals
+                           {where})
+           SELECT coalesce(expected.project_id, current.project_id),
+                  coalesce(expected.day, current.day),
+                  coalesce(expected.fans, 0),
+                  coalesce(current.fans, 0),
+                  coalesce(expected.activity, 0),
+                  coalesce(current.activity, 0)
+             FROM expected
+  FULL OUTER JOIN current ON current.project_id = expected.project_id AND
+                             current.day = expected.day
+            WHERE coalesce(expected.fans, 0) <> coalesce(current.fans, 0) OR
+                  coalesce(expected.activity, 0) <> coalesce(current.activity, 0)
+         ORDER BY 1, 2
+    """.format(expected_sql=expected_sql, where=where)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
@@ -160,6 +160,87 @@ def try_to_close_or_open_user_stories_when_edit_task_status(sender, instance, cr
             services.open_userstory(user_story)
 
 
+## Points
+
+def update_burndown_points_when_edit_points(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    from taiga.projects.milestones import services as milestone_service
+    UserStory = apps.get_model("userstories", "UserStory")
+    user_story_ids = UserStory.objects.filter(milestone__isnull=False,
+                                              role_points__points=instance)\
+                                      .values_list("id", flat=True)\
+                                      .distinct()
+    milestone_service.update_burndown_points(user_story_ids=list(user_story_ids))
+
+
+## Project config cache
+
+def bump_project_config_version_on_change(sender, instance, **kwargs):
+    from taiga.projects.services import bump_project_config_version
+    # Statuses, points, custom attributes, roles... are the cached configuration of the project
+    if instance.project_id is not None:
+        bump_project_config_version(instance.project_id)
+
+
+## Project stats cache
+
+def bump_project_stats_version_on_change(sender, instance, **kwargs):
+    from taiga.projects.services import bump_project_stats_version
+    # The project, its sprints, its user stories and their estimations are the source of the stats
+    if sender._meta.label == "projects.Project":
+        project_id = instance.id
+    elif sender._meta.label == "userstories.RolePoints":
+        UserStory = apps.get_model("userstories", "UserStory")
+        project_id = UserStory.objects.filter(id=instance.user_story_id)\
+                                      .values_list("project_id", flat=True).first()
+    else:
+        project_id = instance.project_id
+
+    if project_id is not None:
+        bump_project_stats_version(project_id)
+
+
+## Rendered html
+
+def render_html_on_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    from taiga.projects.services import render_html_fields
+    if raw:
+        return
+    render_html_fields(sender, instance, update_fields=update_fields)
+
+
+def refresh_references_html_on_save(sender, instance, created, raw=False, **kwargs):
+    from taiga.projects.services import refresh_references_html
+    if raw or created or not hasattr(instance, "ref"):
+        return
+    refresh_references_html(instance)
+
+
+def refresh_references_html_on_delete(sender, instance, **kwargs):
+    from taiga.projects.services import refresh_references_html
+    if not hasattr(instance, "ref"):
+        return
+    refresh_references_html(instance, deleted=True)
+
+
+def keep_prev_user_names_on_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    instance.prev_names = None
+    if update_fields is not None and not {"username", "full_name"} & set(update_fields):
+        return
+    if not raw and instance.pk is not None:
+        instance.prev_names = sender.objects.filter(pk=instance.pk).values_list("username", "full_name").first()
+
+
+def refresh_mentions_html_on_save(sender, instance, created, raw=False, **kwargs):
+    from taiga.projects.services import refresh_mentions_html
+    prev_names = getattr(instance, "prev_names", None)
+    if raw or created or prev_names is None:
+        return
+    refresh_mentions_html(instance, *prev_names)
+
+
 ## Custom signals
 
 issue_status_post_move_on_destroy = Signal()
@@ -5,7 +5,7 @@
 #
 # Copyright (c) 2021-present Kaleidos INC
 
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.utils.translation import gettext as _
 
 from taiga.base.api.utils import get_object_or_error
@@ -236,8 +236,8 @@ class TaskViewSet(AssignedToSignalMixin, OCCResourceMixin, VotedResourceMixin,
 
         project = get_object_or_error(Project, request.user, tasks_csv_uuid=uuid)
         queryset = project.tasks.all().order_by('ref')
-        data = services.tasks_to_csv(project, queryset)
-        csv_response = HttpResponse(data.getvalue(), content_type='application/csv; charset=utf-8')
+        data = services.iter_tasks_csv(project, queryset)
+        csv_response = StreamingHttpResponse(data, content_type='application/csv; charset=utf-8')
         csv_response['Content-Disposition'] = 'attachment; filename="tasks.csv"'
         return csv_response
 
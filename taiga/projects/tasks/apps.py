@@ -40,6 +40,17 @@ def connect_tasks_close_or_open_us_and_milestone_signals():
                                 dispatch_uid="try_to_close_or_open_us_and_milestone_when_delete_task")
 
 
+def connect_tasks_burndown_signals():
+    from . import signals as handlers
+    # Burndown of the milestone
+    signals.post_save.connect(handlers.update_burndown_points_when_create_or_edit_task,
+                              sender=apps.get_model("tasks", "Task"),
+                              dispatch_uid="update_burndown_points_when_create_or_edit_task")
+    signals.post_delete.connect(handlers.update_burndown_points_when_delete_task,
+                                sender=apps.get_model("tasks", "Task"),
+                                dispatch_uid="update_burndown_points_when_delete_task")
+
+
 def connect_tasks_custom_attributes_signals():
     from taiga.projects.custom_attributes import signals as custom_attributes_handlers
     signals.post_save.connect(custom_attributes_handlers.create_custom_attribute_value_when_create_task,
@@ -50,6 +61,7 @@ def connect_tasks_custom_attributes_signals():
 def connect_all_tasks_signals():
     connect_tasks_signals()
     connect_tasks_close_or_open_us_and_milestone_signals()
+    connect_tasks_burndown_signals()
     connect_tasks_custom_attributes_signals()
 
 
@@ -74,9 +86,17 @@ def disconnect_tasks_custom_attributes_signals():
                                  dispatch_uid="create_custom_attribute_value_when_create_task")
 
 
+def disconnect_tasks_burndown_signals():
+    signals.post_save.disconnect(sender=apps.get_model("tasks", "Task"),
+                                 dispatch_uid="update_burndown_points_when_create_or_edit_task")
+    signals.post_delete.disconnect(sender=apps.get_model("tasks", "Task"),
+                                   dispatch_uid="update_burndown_points_when_delete_task")
+
+
 def disconnect_all_tasks_signals():
     disconnect_tasks_signals()
     disconnect_tasks_close_or_open_us_and_milestone_signals()
+    disconnect_tasks_burndown_signals()
     disconnect_tasks_custom_attributes_signals()
 
 
@@ -81,6 +81,7 @@ class Task(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, DueDateM
                                           verbose_name=_("taskboard order"))
 
     description = models.TextField(null=False, blank=True, verbose_name=_("description"))
+    description_html = models.TextField(null=True, blank=True, verbose_name=_("description html"))
     assigned_to = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         blank=True,
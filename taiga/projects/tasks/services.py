@@ -5,21 +5,21 @@
 #
 # Copyright (c) 2021-present Kaleidos INC
 
-import csv
-import io
 import logging
 
 from collections import OrderedDict
 from operator import itemgetter
-from contextlib import closing
 
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import connection
 from django.utils.translation import gettext as _
 
 from taiga.base.utils import db, text
+from taiga.base.utils.csv_streams import csv_to_string_io, iter_csv
+from taiga.base.utils.iterators import iter_queryset_in_batches
 from taiga.projects.history.services import take_snapshot
 from taiga.projects.services import apply_order_updates
+from taiga.projects.services import get_facets_rows
+from taiga.projects.services import shift_orders_in_bulk
 from taiga.projects.tasks.apps import connect_tasks_signals
 from taiga.projects.tasks.apps import disconnect_tasks_signals
 from taiga.events import events
@@ -77,24 +77,22 @@ def update_tasks_order_in_bulk(bulk_data: list, field: str, project: object,
 
     [{'task_id': <value>, 'order': <value>}, ...]
     """
-    tasks = project.tasks.all()
+    scope = {"project_id": project.id}
     if user_story is not None:
-        tasks = tasks.filter(user_story=user_story)
+        scope["user_story_id"] = user_story.id
     if status is not None:
-        tasks = tasks.filter(status=status)
+        scope["status_id"] = status.id
     if milestone is not None:
-        tasks = tasks.filter(milestone=milestone)
+        scope["milestone_id"] = milestone.id
 
-    task_orders = {task.id: getattr(task, field) for task in tasks}
-    new_task_orders = {e["task_id"]: e["order"] for e in bulk_data}
-    apply_order_updates(task_orders, new_task_orders)
+    new_task_orders = [(e["task_id"], e["order"]) for e in bulk_data]
+    task_orders = shift_orders_in_bulk(models.Task, field, new_task_orders, scope)
 
     task_ids = task_orders.keys()
     events.emit_event_for_ids(ids=task_ids,
                               content_type="tasks.task",
                               projectid=project.pk)
 
-    db.update_attr_in_bulk_for_ids(task_orders, field, models.Task)
     return task_orders
 
 
@@ -114,6 +112,8 @@ def update_tasks_milestone_in_bulk(bulk_data: list, milestone: object):
     `bulk_data` should be a list of dicts with the following format:
     [{'task_id': <value>, 'order': <value>}, ...]
     """
+    from taiga.projects.milestones import services as milestone_services
+
     tasks = milestone.tasks.all()
     task_orders = {task.id: getattr(task, "taskboard_order") for task in tasks}
     new_task_orders = {}
@@ -137,6 +137,11 @@ def update_tasks_milestone_in_bulk(bulk_data: list, milestone: object):
 
     db.update_attr_in_bulk_for_ids(task_orders, "taskboard_order", models.Task)
 
+    # The milestones are updated without sending signals
+    user_story_ids = models.Task.objects.filter(id__in=task_ids, user_story__isnull=False)\
+                                        .values_list("user_story_id", flat=True)
+    milestone_services.update_burndown_points(user_story_ids=set(user_story_ids))
+
     return task_milestones
 
 
@@ -144,8 +149,11 @@ def update_tasks_milestone_in_bulk(bulk_data: list, milestone: object):
 # CSV
 #####################################################
 
-def tasks_to_csv(project, queryset):
-    csv_data = io.StringIO()
+def iter_tasks_csv(project, queryset):
+    """
+    Generate the CSV export of the tasks of `queryset` in chunks, loading
+    them in batches so it can be streamed with a `StreamingHttpResponse`.
+    """
     fieldnames = ["id", "ref", "subject", "description", "user_story", "sprint_id",
                   "sprint", "sprint_estimated_start", "sprint_estimated_finish",
                   "owner", "owner_full_name",
@@ -175,78 +183,93 @@ def tasks_to_csv(project, queryset):
     queryset = attach_total_voters_to_queryset(queryset)
     queryset = attach_watchers_to_queryset(queryset)
 
-    writer = csv.DictWriter(csv_data, fieldnames=fieldnames)
-    writer.writeheader()
-    for task in queryset:
-        task_data = {
-            "id": task.id,
-            "ref": task.ref,
-            "subject": task.subject,
-            "description": task.description,
-            "user_story": task.user_story.ref if task.user_story else None,
-            "sprint_id": task.milestone.id if task.milestone else None,
-            "sprint": task.milestone.name if task.milestone else None,
-            "sprint_estimated_start": task.milestone.estimated_start if task.milestone else None,
-            "sprint_estimated_finish": task.milestone.estimated_finish if task.milestone else None,
-            "owner": task.owner.username if task.owner else None,
-            "owner_full_name": task.owner.get_full_name() if task.owner else None,
-            "assigned_to": task.assigned_to.username if task.assigned_to else None,
-            "assigned_to_full_name": task.assigned_to.get_full_name() if task.assigned_to else None,
-            "status": task.status.name if task.status else None,
-            "is_iocaine": task.is_iocaine,
-            "is_closed": task.status is not None and task.status.is_closed,
-            "us_order": task.us_order,
-            "taskboard_order": task.taskboard_order,
-            "attachments": task.attachments.count(),
-            "external_reference": task.external_reference,
-            "tags": ",".join(task.tags or []),
-            "watchers": task.watchers,
-            "voters": task.total_voters,
-            "created_date": task.created_date,
-            "modified_date": task.modified_date,
-            "finished_date": task.finished_date,
-            "due_date": task.due_date,
-            "due_date_reason": task.due_date_reason,
-        }
-        for custom_attr in custom_attrs:
-            if not hasattr(task, "custom_attributes_values"):
-                continue
-            value = task.custom_attributes_values.attributes_values.get(str(custom_attr.id), None)
-            task_data[custom_attr.name] = value
-        writer.writerow(task_data)
-
-    return csv_data
+    def rows():
+        for task in iter_queryset_in_batches(queryset):
+            task_data = {
+                "id": task.id,
+                "ref": task.ref,
+                "subject": task.subject,
+                "description": task.description,
+                "user_story": task.user_story.ref if task.user_story else None,
+                "sprint_id": task.milestone.id if task.milestone else None,
+                "sprint": task.milestone.name if task.milestone else None,
+                "sprint_estimated_start": task.milestone.estimated_start if task.milestone else None,
+                "sprint_estimated_finish": task.milestone.estimated_finish if task.milestone else None,
+                "owner": task.owner.username if task.owner else None,
+                "owner_full_name": task.owner.get_full_name() if task.owner else None,
+                "assigned_to": task.assigned_to.username if task.assigned_to else None,
+                "assigned_to_full_name": task.assigned_to.get_full_name() if task.assigned_to else None,
+                "status": task.status.name if task.status else None,
+                "is_iocaine": task.is_iocaine,
+                "is_closed": task.status is not None and task.status.is_closed,
+                "us_order": task.us_order,
+                "taskboard_order": task.taskboard_order,
+                "attachments": task.attachments.count(),
+                "external_reference": task.external_reference,
+                "tags": ",".join(task.tags or []),
+                "watchers": task.watchers,
+                "voters": task.total_voters,
+                "created_date": task.created_date,
+                "modified_date": task.modified_date,
+                "finished_date": task.finished_date,
+                "due_date": task.due_date,
+                "due_date_reason": task.due_date_reason,
+            }
+            for custom_attr in custom_attrs:
+                if not hasattr(task, "custom_attributes_values"):
+                    continue
+                value = task.custom_attributes_values.attributes_values.get(str(custom_attr.id), None)
+                task_data[custom_attr.name] = value
+            yield task_data
+
+    return iter_csv(fieldnames, rows())
+
+
+def tasks_to_csv(project, queryset):
+    return csv_to_string_io(iter_tasks_csv(project, queryset))
 
 
 #####################################################
 # Api filter data
 #####################################################
 
-def _get_tasks_statuses(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-      SELECT "projects_taskstatus"."id",
-             "projects_taskstatus"."name",
-             "projects_taskstatus"."color",
-             "projects_taskstatus"."order",
-             (SELECT count(*)
-                FROM "tasks_task"
-                     INNER JOIN "projects_project" ON
-                                ("tasks_task"."project_id" = "projects_project"."id")
-               WHERE {where} AND "tasks_task"."status_id" = "projects_taskstatus"."id")
-        FROM "projects_taskstatus"
-       WHERE "projects_taskstatus"."project_id" = %s
-    ORDER BY "projects_taskstatus"."order";
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
+TASKS_FILTERS_FROM_SQL = """
+                   "tasks_task"
+        INNER JOIN "projects_project"
+                ON ("tasks_task"."project_id" = "projects_project"."id")
+"""
+
+TASKS_FILTERS_COLUMNS = [
+    '"tasks_task"."id" "item_id"',
+    '"tasks_task"."status_id" "status_id"',
+    '"tasks_task"."assigned_to_id" "assigned_to_id"',
+    '"tasks_task"."owner_id" "owner_id"',
+    '"tasks_task"."tags" "tags"',
+]
+
+
+_TASKS_STATUSES_SQL = """
+     WITH "counters" AS (
+              SELECT "status_id",
+                     COUNT(*) "count"
+                FROM "items"
+               WHERE {match}
+            GROUP BY "status_id"
+        )
+
+             SELECT "projects_taskstatus"."id" "id",
+                    "projects_taskstatus"."name" "name",
+                    "projects_taskstatus"."color" "color",
+                    "projects_taskstatus"."order" "order",
+                    COALESCE("counters"."count", 0) "count"
+               FROM "projects_taskstatus"
+    LEFT OUTER JOIN "counters"
+                 ON "counters"."status_id" = "projects_taskstatus"."id"
+              WHERE "projects_taskstatus"."project_id" = %s
+"""
+
 
+def _get_tasks_statuses(rows):
     result = []
     for id, name, color, order, count in rows:
         result.append({
@@ -259,44 +282,40 @@ def _get_tasks_statuses(project, queryset):
     return sorted(result, key=itemgetter("order"))
 
 
-def _get_tasks_assigned_to(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-        WITH counters AS (
-                SELECT assigned_to_id,  count(assigned_to_id) count
-                  FROM "tasks_task"
-            INNER JOIN "projects_project" ON ("tasks_task"."project_id" = "projects_project"."id")
-                 WHERE {where} AND "tasks_task"."assigned_to_id" IS NOT NULL
-              GROUP BY assigned_to_id
+_TASKS_ASSIGNED_TO_SQL = """
+     WITH "counters" AS (
+              SELECT "assigned_to_id",
+                     COUNT(*) "count"
+                FROM "items"
+               WHERE {match} AND "items"."assigned_to_id" IS NOT NULL
+            GROUP BY "assigned_to_id"
         )
 
-                 SELECT "projects_membership"."user_id" user_id,
-                        "users_user"."full_name",
-                        "users_user"."username",
-                        COALESCE("counters".count, 0) count
-                   FROM projects_membership
-        LEFT OUTER JOIN counters ON ("projects_membership"."user_id" = "counters"."assigned_to_id")
-             INNER JOIN "users_user" ON ("projects_membership"."user_id" = "users_user"."id")
-                  WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
-
-        -- unassigned tasks
-        UNION
-
-                 SELECT NULL user_id, NULL, NULL, count(coalesce(assigned_to_id, -1)) count
-                   FROM "tasks_task"
-             INNER JOIN "projects_project" ON ("tasks_task"."project_id" = "projects_project"."id")
-                  WHERE {where} AND "tasks_task"."assigned_to_id" IS NULL
-               GROUP BY assigned_to_id
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id] + where_params)
-        rows = cursor.fetchall()
-
+             SELECT "projects_membership"."user_id" "user_id",
+                    "users_user"."full_name" "full_name",
+                    "users_user"."username" "username",
+                    COALESCE("counters"."count", 0) "count"
+               FROM "projects_membership"
+    LEFT OUTER JOIN "counters"
+                 ON ("projects_membership"."user_id" = "counters"."assigned_to_id")
+         INNER JOIN "users_user"
+                 ON ("projects_membership"."user_id" = "users_user"."id")
+              WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
+
+    -- unassigned tasks
+    UNION
+
+             SELECT NULL "user_id",
+                    NULL "full_name",
+                    NULL "username",
+                    COUNT(*) "count"
+               FROM "items"
+              WHERE {match} AND "items"."assigned_to_id" IS NULL
+             HAVING COUNT(*) > 0
+"""
+
+
+def _get_tasks_assigned_to(rows):
     result = []
     none_valued_added = False
     for id, full_name, username, count in rows:
@@ -320,46 +339,29 @@ def _get_tasks_assigned_to(project, queryset):
     return sorted(result, key=itemgetter("full_name"))
 
 
-def _get_tasks_roles(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-     WITH "task_counters" AS (
-         SELECT DISTINCT "tasks_task"."status_id" "status_id",
-                         "tasks_task"."id" "us_id",
-                         "projects_membership"."role_id" "role_id"
-                    FROM "tasks_task"
-              INNER JOIN "projects_project"
-                      ON ("tasks_task"."project_id" = "projects_project"."id")
-         LEFT OUTER JOIN "projects_membership"
-                      ON "projects_membership"."user_id" = "tasks_task"."assigned_to_id"
-                   WHERE {where}
-            ),
-             "counters" AS (
-                  SELECT "role_id" as "role_id",
-                         COUNT("role_id") "count"
-                    FROM "task_counters"
-                GROUP BY "role_id"
-            )
-
-                 SELECT "users_role"."id",
-                        "users_role"."name",
-                        "users_role"."order",
-                        COALESCE("counters"."count", 0)
-                   FROM "users_role"
-        LEFT OUTER JOIN "counters"
-                     ON "counters"."role_id" = "users_role"."id"
-                  WHERE "users_role"."project_id" = %s
-               ORDER BY "users_role"."order";
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
+_TASKS_ROLES_SQL = """
+     WITH "counters" AS (
+              SELECT "projects_membership"."role_id" "role_id",
+                     COUNT(DISTINCT "items"."item_id") "count"
+                FROM "items"
+          INNER JOIN "projects_membership"
+                  ON "projects_membership"."user_id" = "items"."assigned_to_id"
+               WHERE {match}
+            GROUP BY "projects_membership"."role_id"
+        )
+
+             SELECT "users_role"."id" "id",
+                    "users_role"."name" "name",
+                    "users_role"."order" "order",
+                    COALESCE("counters"."count", 0) "count"
+               FROM "users_role"
+    LEFT OUTER JOIN "counters"
+                 ON "counters"."role_id" = "users_role"."id"
+              WHERE "users_role"."project_id" = %s
+"""
+
 
+def _get_tasks_roles(rows):
     result = []
     for id, name, order, count in rows:
         result.append({
@@ -372,47 +374,41 @@ def _get_tasks_roles(project, queryset):
     return sorted(result, key=itemgetter("order"))
 
 
-def _get_tasks_owners(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-        WITH counters AS (
-                SELECT "tasks_task"."owner_id" owner_id,
-                       count(coalesce("tasks_task"."owner_id", -1)) count
-                  FROM "tasks_task"
-            INNER JOIN "projects_project" ON ("tasks_task"."project_id" = "projects_project"."id")
-                 WHERE {where}
-              GROUP BY "tasks_task"."owner_id"
+_TASKS_OWNERS_SQL = """
+     WITH "counters" AS (
+              SELECT "owner_id",
+                     COUNT(*) "count"
+                FROM "items"
+               WHERE {match}
+            GROUP BY "owner_id"
         )
 
-                 SELECT "projects_membership"."user_id" id,
-                        "users_user"."full_name",
-                        "users_user"."username",
-                        COALESCE("counters".count, 0) count
-                   FROM projects_membership
-        LEFT OUTER JOIN counters ON ("projects_membership"."user_id" = "counters"."owner_id")
-             INNER JOIN "users_user" ON ("projects_membership"."user_id" = "users_user"."id")
-                  WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
-
-        -- System users
-        UNION
-
-                 SELECT "users_user"."id" user_id,
-                        "users_user"."full_name" full_name,
-                        "users_user"."username" username,
-                        COALESCE("counters".count, 0) count
-                   FROM users_user
-        LEFT OUTER JOIN counters ON ("users_user"."id" = "counters"."owner_id")
-                  WHERE ("users_user"."is_system" IS TRUE)
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
-
+             SELECT "projects_membership"."user_id" "user_id",
+                    "users_user"."full_name" "full_name",
+                    "users_user"."username" "username",
+                    COALESCE("counters"."count", 0) "count"
+               FROM "projects_membership"
+    LEFT OUTER JOIN "counters"
+                 ON ("projects_membership"."user_id" = "counters"."owner_id")
+         INNER JOIN "users_user"
+                 ON ("projects_membership"."user_id" = "users_user"."id")
+              WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
+
+    -- System users
+    UNION
+
+             SELECT "users_user"."id" "user_id",
+                    "users_user"."full_name" "full_name",
+                    "users_user"."username" "username",
+                    COALESCE("counters"."count", 0) "count"
+               FROM "users_user"
+    LEFT OUTER JOIN "counters"
+                 ON ("users_user"."id" = "counters"."owner_id")
+              WHERE ("users_user"."is_system" IS TRUE)
+"""
+
+
+def _get_tasks_owners(rows):
     result = []
     for id, full_name, username, count in rows:
         if count > 0:
@@ -424,39 +420,34 @@ def _get_tasks_owners(project, queryset):
     return sorted(result, key=itemgetter("full_name"))
 
 
-def _get_tasks_tags(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-        WITH tasks_tags AS (
-                    SELECT tag,
-                           COUNT(tag) counter FROM (
-                                SELECT UNNEST(tasks_task.tags) tag
-                                  FROM tasks_task
-                            INNER JOIN projects_project
-                                        ON (tasks_task.project_id = projects_project.id)
-                                 WHERE {where}) tags
-                  GROUP BY tag),
-             project_tags AS (
-                    SELECT reduce_dim(tags_colors) tag_color
-                      FROM projects_project
-                     WHERE id=%s)
-
-      SELECT tag_color[1] tag,
-             tag_color[2] color,
-             COALESCE(tasks_tags.counter, 0) counter
-        FROM project_tags
-   LEFT JOIN tasks_tags ON project_tags.tag_color[1] = tasks_tags.tag
-    ORDER BY tag
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
+_TASKS_TAGS_SQL = """
+     WITH "tasks_tags" AS (
+              SELECT "tag",
+                     COUNT("tag") "counter"
+                FROM (
+                    SELECT UNNEST("tags") "tag"
+                      FROM "items"
+                     WHERE {match}
+                    ) "items_tags"
+            GROUP BY "tag"
+        ),
+
+          "project_tags" AS (
+              SELECT reduce_dim("tags_colors") "tag_color"
+                FROM "projects_project"
+               WHERE "id" = %s
+        )
+
+             SELECT "tag_color"[1] "tag",
+                    "tag_color"[2] "color",
+                    COALESCE("tasks_tags"."counter", 0) "counter"
+               FROM "project_tags"
+    LEFT OUTER JOIN "tasks_tags"
+                 ON "project_tags"."tag_color"[1] = "tasks_tags"."tag"
+"""
+
 
+def _get_tasks_tags(rows):
     result = []
     for name, color, count in rows:
         result.append({
@@ -471,13 +462,19 @@ def get_tasks_filters_data(project, querysets):
     """
     Given a project and an tasks queryset, return a simple data structure
     of all possible filters for the tasks in the queryset.
-    """
-    data = OrderedDict([
-        ("statuses", _get_tasks_statuses(project, querysets["statuses"])),
-        ("assigned_to", _get_tasks_assigned_to(project, querysets["assigned_to"])),
-        ("owners", _get_tasks_owners(project, querysets["owners"])),
-        ("tags", _get_tasks_tags(project, querysets["tags"])),
-        ("roles", _get_tasks_roles(project, querysets["roles"])),
-    ])
 
+    All the facets are computed with a single query, see `get_facets_rows`.
+    """
+    facets = [
+        ("statuses", _TASKS_STATUSES_SQL, _get_tasks_statuses),
+        ("assigned_to", _TASKS_ASSIGNED_TO_SQL, _get_tasks_assigned_to),
+        ("owners", _TASKS_OWNERS_SQL, _get_tasks_owners),
+        ("tags", _TASKS_TAGS_SQL, _get_tasks_tags),
+        ("roles", _TASKS_ROLES_SQL, _get_tasks_roles),
+    ]
+
+    rows = get_facets_rows(project, TASKS_FILTERS_FROM_SQL, TASKS_FILTERS_COLUMNS,
+                           [(name, querysets[name], sql, [project.id]) for name, sql, _fn in facets])
+
+    data = OrderedDict([(name, get_data(rows[name])) for name, _sql, get_data in facets])
     return data
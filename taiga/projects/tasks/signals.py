@@ -87,6 +87,32 @@ def _try_to_close_milestone_when_delete_task(instance):
             services.close_milestone(instance.milestone)
 
 
+####################################
+# Signals for the burndown of milestones
+####################################
+
+def update_burndown_points_when_create_or_edit_task(sender, instance, created, **kwargs):
+    if instance._importing:
+        return
+
+    from taiga.projects.milestones import services as milestone_service
+
+    # The points of the user story are split among its tasks
+    user_story_ids = [instance.user_story_id]
+    prev = getattr(instance, "prev", None)
+    if prev and prev.user_story_id != instance.user_story_id:
+        user_story_ids.append(prev.user_story_id)
+    milestone_service.update_burndown_points(user_story_ids=user_story_ids)
+
+
+def update_burndown_points_when_delete_task(sender, instance, **kwargs):
+    if instance._importing:
+        return
+
+    from taiga.projects.milestones import services as milestone_service
+    milestone_service.update_burndown_points(user_story_ids=[instance.user_story_id])
+
+
 ####################################
 # Signals for set finished date
 ####################################
@@ -30,7 +30,8 @@ class TaskValidator(AssignedToValidator, WatchersValidator, EditableWatchedResou
 
     class Meta:
         model = models.Task
-        read_only_fields = ('id', 'ref', 'created_date', 'modified_date', 'owner')
+        read_only_fields = ('id', 'ref', 'created_date', 'modified_date', 'owner',
+                            'description_html', 'blocked_note_html')
 
 
 class TasksBulkValidator(ProjectExistsValidator, validators.Validator):
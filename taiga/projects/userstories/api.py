@@ -10,7 +10,7 @@ from django.db import transaction
 from django.db.models import Max
 
 from django.utils.translation import gettext as _
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 
 from taiga.base import filters as base_filters
 from taiga.base import exceptions as exc
@@ -376,8 +376,8 @@ class UserStoryViewSet(AssignedUsersSignalMixin, OCCResourceMixin,
 
         project = get_object_or_error(Project, request.user, userstories_csv_uuid=uuid)
         queryset = project.user_stories.all().order_by('ref')
-        data = services.userstories_to_csv(project, queryset)
-        csv_response = HttpResponse(data.getvalue(), content_type='application/csv; charset=utf-8')
+        data = services.iter_userstories_csv(project, queryset)
+        csv_response = StreamingHttpResponse(data, content_type='application/csv; charset=utf-8')
         csv_response['Content-Disposition'] = 'attachment; filename="userstories.csv"'
         return csv_response
 
@@ -43,6 +43,17 @@ def connect_userstories_signals():
                                 sender=apps.get_model("userstories", "UserStory"),
                                 dispatch_uid="try_to_close_milestone_when_delete_us")
 
+    # Burndown of the milestone
+    signals.post_save.connect(handlers.update_burndown_points_when_create_or_edit_us,
+                              sender=apps.get_model("userstories", "UserStory"),
+                              dispatch_uid="update_burndown_points_when_create_or_edit_us")
+    signals.post_save.connect(handlers.update_burndown_points_when_create_or_edit_role_points,
+                              sender=apps.get_model("userstories", "RolePoints"),
+                              dispatch_uid="update_burndown_points_when_create_or_edit_role_points")
+    signals.post_delete.connect(handlers.delete_burndown_points_when_delete_us,
+                                sender=apps.get_model("userstories", "UserStory"),
+                                dispatch_uid="delete_burndown_points_when_delete_us")
+
     # Tags
     signals.pre_save.connect(tagging_handlers.tags_normalization,
                              sender=apps.get_model("userstories", "UserStory"),
@@ -76,6 +87,13 @@ def disconnect_userstories_signals():
     signals.post_delete.disconnect(sender=apps.get_model("userstories", "UserStory"),
                                    dispatch_uid="try_to_close_milestone_when_delete_us")
 
+    signals.post_save.disconnect(sender=apps.get_model("userstories", "UserStory"),
+                                 dispatch_uid="update_burndown_points_when_create_or_edit_us")
+    signals.post_save.disconnect(sender=apps.get_model("userstories", "RolePoints"),
+                                 dispatch_uid="update_burndown_points_when_create_or_edit_role_points")
+    signals.post_delete.disconnect(sender=apps.get_model("userstories", "UserStory"),
+                                   dispatch_uid="delete_burndown_points_when_delete_us")
+
     signals.pre_save.disconnect(sender=apps.get_model("userstories", "UserStory"),
                                 dispatch_uid="tags_normalization_user_story")
 
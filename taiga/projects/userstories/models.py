@@ -108,6 +108,7 @@ class UserStory(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, Due
     subject = models.TextField(null=False, blank=False,
                                verbose_name=_("subject"))
     description = models.TextField(null=False, blank=True, verbose_name=_("description"))
+    description_html = models.TextField(null=True, blank=True, verbose_name=_("description html"))
     assigned_to = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         blank=True,
@@ -7,11 +7,8 @@
 
 from typing import List, Optional
 
-import csv
-import io
 from collections import OrderedDict
 from operator import itemgetter
-from contextlib import closing
 
 from django.conf import settings
 from django.db import connection
@@ -22,6 +19,8 @@ from django.utils.translation import gettext as _
 from psycopg2.extras import execute_values
 
 from taiga.base.utils import db, text
+from taiga.base.utils.csv_streams import csv_to_string_io, iter_csv
+from taiga.base.utils.iterators import iter_queryset_in_batches
 from taiga.celery import app
 from taiga.events import events
 from taiga.projects.history.services import take_snapshot
@@ -29,6 +28,9 @@ from taiga.projects.models import Project, UserStoryStatus, Swimlane
 from taiga.projects.milestones.models import Milestone
 from taiga.projects.notifications.utils import attach_watchers_to_queryset
 from taiga.projects.services import apply_order_updates
+from taiga.projects.services import bump_project_stats_version
+from taiga.projects.services import get_facets_rows
+from taiga.projects.services import shift_orders_in_bulk
 from taiga.projects.tasks.models import Task
 from taiga.projects.userstories.apps import connect_userstories_signals
 from taiga.projects.userstories.apps import disconnect_userstories_signals
@@ -93,21 +95,20 @@ def update_userstories_order_in_bulk(bulk_data: list, field: str,
 
     [{'us_id': <value>, 'order': <value>}, ...]
     """
-    user_stories = project.user_stories.all()
+    scope = {"project_id": project.id}
     if status is not None:
-        user_stories = user_stories.filter(status=status)
+        scope["status_id"] = status.id
     if milestone is not None:
-        user_stories = user_stories.filter(milestone=milestone)
+        scope["milestone_id"] = milestone.id
 
-    us_orders = {us.id: getattr(us, field) for us in user_stories}
-    new_us_orders = {e["us_id"]: e["order"] for e in bulk_data}
-    apply_order_updates(us_orders, new_us_orders, remove_equal_original=True)
+    new_us_orders = [(e["us_id"], e["order"]) for e in bulk_data]
+    us_orders = shift_orders_in_bulk(models.UserStory, field, new_us_orders, scope,
+                                     remove_equal_original=True)
 
     user_story_ids = us_orders.keys()
     events.emit_event_for_ids(ids=user_story_ids,
                               content_type="userstories.userstory",
                               projectid=project.pk)
-    db.update_attr_in_bulk_for_ids(us_orders, field, models.UserStory)
     return us_orders
 
 
@@ -153,6 +154,8 @@ def update_userstories_backlog_or_sprint_order_in_bulk(user: User,
 
      - `bulk_userstories` should be a list of user stories IDs
     """
+    from taiga.projects.milestones import services as milestone_services
+
     # Get ids from milestones affected
     milestones_ids = set(project.milestones.filter(user_stories__in=bulk_userstories).values_list('id', flat=True))
     if milestone:
@@ -218,11 +221,14 @@ def update_userstories_backlog_or_sprint_order_in_bulk(user: User,
     bulk_userstories_objects = project.user_stories.filter(id__in=bulk_userstories)
     bulk_userstories_objects.update(milestone=milestone)
     project.tasks.filter(user_story__in=bulk_userstories).update(milestone=milestone)
+    # The milestones are updated without sending signals
+    bump_project_stats_version(project.id)
+    milestone_services.update_burndown_points(user_story_ids=bulk_userstories)
 
     # Generate snapshots for user stories and tasks and calculate if aafected milestones
     # are cosed or open now.
     if settings.CELERY_ENABLED:
-        _async_tasks_after_backlog_or_sprint_order_change.delay(bulk_userstories, milestones_ids, user.id)
+        _async_tasks_after_backlog_or_sprint_order_change.delay(bulk_userstories, list(milestones_ids), user.id)
     else:
         _async_tasks_after_backlog_or_sprint_order_change(bulk_userstories, milestones_ids, user.id)
 
@@ -377,6 +383,8 @@ def update_userstories_milestone_in_bulk(bulk_data: list, milestone: object):
     `bulk_data` should be a list of dicts with the following format:
     [{'us_id': <value>, 'order': <value>}, ...]
     """
+    from taiga.projects.milestones import services as milestone_services
+
     user_stories = milestone.user_stories.all()
     us_orders = {us.id: getattr(us, "sprint_order") for us in user_stories}
     new_us_orders = {}
@@ -398,12 +406,16 @@ def update_userstories_milestone_in_bulk(bulk_data: list, milestone: object):
     db.update_attr_in_bulk_for_ids(us_milestones, "milestone_id",
                                    model=models.UserStory)
     db.update_attr_in_bulk_for_ids(us_orders, "sprint_order", models.UserStory)
+    # The milestones are updated without sending signals
+    bump_project_stats_version(milestone.project_id)
 
     # Updating the milestone for the tasks
     Task.objects.filter(
         user_story_id__in=[e["us_id"] for e in bulk_data]).update(
         milestone=milestone)
 
+    milestone_services.update_burndown_points(user_story_ids=list(user_story_ids))
+
     return us_orders
 
 
@@ -491,8 +503,11 @@ def _recalculate_is_closed_for_milestone(milestone):
 # CSV
 #####################################################
 
-def userstories_to_csv(project, queryset):
-    csv_data = io.StringIO()
+def iter_userstories_csv(project, queryset):
+    """
+    Generate the CSV export of the user stories of `queryset` in chunks, loading
+    them in batches so it can be streamed with a `StreamingHttpResponse`.
+    """
     fieldnames = ["id", "ref", "subject", "description", "sprint_id", "sprint",
                   "sprint_estimated_start", "sprint_estimated_finish", "owner",
                   "owner_full_name", "assigned_to", "assigned_to_full_name",
@@ -522,9 +537,11 @@ def userstories_to_csv(project, queryset):
                                          "tasks",
                                          "epics",
                                          "attachments",
-                                         "custom_attributes_values")
+                                         "custom_attributes_values",
+                                         "assigned_users")
     queryset = queryset.select_related("milestone",
                                        "project",
+                                       "swimlane",
                                        "status",
                                        "owner",
                                        "assigned_to",
@@ -534,124 +551,132 @@ def userstories_to_csv(project, queryset):
     queryset = attach_total_voters_to_queryset(queryset)
     queryset = attach_watchers_to_queryset(queryset)
 
-    writer = csv.DictWriter(csv_data, fieldnames=fieldnames)
-    writer.writeheader()
-    for us in queryset:
-        row = {
-            "id": us.id,
-            "ref": us.ref,
-            "subject": us.subject,
-            "description": us.description,
-            "sprint_id": us.milestone.id if us.milestone else None,
-            "sprint": us.milestone.name if us.milestone else None,
-            "sprint_estimated_start": us.milestone.estimated_start if
-            us.milestone else None,
-            "sprint_estimated_finish": us.milestone.estimated_finish if
-            us.milestone else None,
-            "owner": us.owner.username if us.owner else None,
-            "owner_full_name": us.owner.get_full_name() if us.owner else None,
-            "assigned_to": us.assigned_to.username if us.assigned_to else None,
-            "assigned_to_full_name": us.assigned_to.get_full_name() if
-            us.assigned_to else None,
-            "assigned_users": ",".join(
-                [assigned_user.username for assigned_user in
-                 us.assigned_users.all()]),
-            "assigned_users_full_name": ",".join(
-                [assigned_user.get_full_name() for assigned_user in
-                 us.assigned_users.all()]),
-            "status": us.status.name if us.status else None,
-            "is_closed": us.is_closed,
-            "swimlane": us.swimlane.name if us.swimlane else None,
-            "backlog_order": us.backlog_order,
-            "sprint_order": us.sprint_order,
-            "kanban_order": us.kanban_order,
-            "created_date": us.created_date,
-            "modified_date": us.modified_date,
-            "finish_date": us.finish_date,
-            "client_requirement": us.client_requirement,
-            "team_requirement": us.team_requirement,
-            "attachments": us.attachments.count(),
-            "generated_from_issue": us.generated_from_issue.ref if
-            us.generated_from_issue else None,
-            "generated_from_task": us.generated_from_task.ref if
-            us.generated_from_task else None,
-            "from_task_ref": us.from_task_ref,
-            "external_reference": us.external_reference,
-            "tasks": ",".join([str(task.ref) for task in us.tasks.all()]),
-            "tags": ",".join(us.tags or []),
-            "watchers": us.watchers,
-            "voters": us.total_voters,
-            "due_date": us.due_date,
-            "due_date_reason": us.due_date_reason,
-            "epics": ",".join([str(epic.ref) for epic in us.epics.all()]),
-        }
-
-        us_role_points_by_role_id = {us_rp.role.id: us_rp.points.value for
-                                     us_rp in us.role_points.all()}
-        for role in roles:
-            row["{}-points".format(role.slug)] = \
-                us_role_points_by_role_id.get(role.id, 0)
-
-        row['total-points'] = us.get_total_points()
-
-        for custom_attr in custom_attrs:
-            if not hasattr(us, "custom_attributes_values"):
-                continue
-            value = us.custom_attributes_values.attributes_values.get(
-                str(custom_attr.id), None)
-            row[custom_attr.name] = value
-
-        writer.writerow(row)
-
-    return csv_data
+    def rows():
+        for us in iter_queryset_in_batches(queryset):
+            row = {
+                "id": us.id,
+                "ref": us.ref,
+                "subject": us.subject,
+                "description": us.description,
+                "sprint_id": us.milestone.id if us.milestone else None,
+                "sprint": us.milestone.name if us.milestone else None,
+                "sprint_estimated_start": us.milestone.estimated_start if
+                us.milestone else None,
+                "sprint_estimated_finish": us.milestone.estimated_finish if
+                us.milestone else None,
+                "owner": us.owner.username if us.owner else None,
+                "owner_full_name": us.owner.get_full_name() if us.owner else None,
+                "assigned_to": us.assigned_to.username if us.assigned_to else None,
+                "assigned_to_full_name": us.assigned_to.get_full_name() if
+                us.assigned_to else None,
+                "assigned_users": ",".join(
+                    [assigned_user.username for assigned_user in
+                     us.assigned_users.all()]),
+                "assigned_users_full_name": ",".join(
+                    [assigned_user.get_full_name() for assigned_user in
+                     us.assigned_users.all()]),
+                "status": us.status.name if us.status else None,
+                "is_closed": us.is_closed,
+                "swimlane": us.swimlane.name if us.swimlane else None,
+                "backlog_order": us.backlog_order,
+                "sprint_order": us.sprint_order,
+                "kanban_order": us.kanban_order,
+                "created_date": us.created_date,
+                "modified_date": us.modified_date,
+                "finish_date": us.finish_date,
+                "client_requirement": us.client_requirement,
+                "team_requirement": us.team_requirement,
+                "attachments": us.attachments.count(),
+                "generated_from_issue": us.generated_from_issue.ref if
+                us.generated_from_issue else None,
+                "generated_from_task": us.generated_from_task.ref if
+                us.generated_from_task else None,
+                "from_task_ref": us.from_task_ref,
+                "external_reference": us.external_reference,
+                "tasks": ",".join([str(task.ref) for task in us.tasks.all()]),
+                "tags": ",".join(us.tags or []),
+                "watchers": us.watchers,
+                "voters": us.total_voters,
+                "due_date": us.due_date,
+                "due_date_reason": us.due_date_reason,
+                "epics": ",".join([str(epic.ref) for epic in us.epics.all()]),
+            }
+
+            us_role_points_by_role_id = {us_rp.role.id: us_rp.points.value for
+                                         us_rp in us.role_points.all()}
+            for role in roles:
+                row["{}-points".format(role.slug)] = \
+                    us_role_points_by_role_id.get(role.id, 0)
+
+            row['total-points'] = us.get_total_points()
+
+            for custom_attr in custom_attrs:
+                if not hasattr(us, "custom_attributes_values"):
+                    continue
+                value = us.custom_attributes_values.attributes_values.get(
+                    str(custom_attr.id), None)
+                row[custom_attr.name] = value
+
+            yield row
+
+    return iter_csv(fieldnames, rows())
+
+
+def userstories_to_csv(project, queryset):
+    return csv_to_string_io(iter_userstories_csv(project, queryset))
 
 
 #####################################################
 # Api filter data
 #####################################################
 
-def _get_userstories_statuses(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-     WITH "us_counters" AS (
-         SELECT DISTINCT "userstories_userstory"."status_id" "status_id",
-                         "userstories_userstory"."id" "us_id"
-                    FROM "userstories_userstory"
-              INNER JOIN "projects_project"
-                      ON ("userstories_userstory"."project_id" = "projects_project"."id")
-         LEFT OUTER JOIN "epics_relateduserstory"
-                      ON "userstories_userstory"."id" = "epics_relateduserstory"."user_story_id"
-         LEFT OUTER JOIN "userstories_userstory_assigned_users"
-                      ON "userstories_userstory"."id" = "userstories_userstory_assigned_users"."userstory_id"
-                   WHERE {where}
-            ),
-             "counters" AS (
-                  SELECT "status_id",
-                         COUNT("status_id") "count"
-                    FROM "us_counters"
-                GROUP BY "status_id"
-            )
-
-                 SELECT "projects_userstorystatus"."id",
-                        "projects_userstorystatus"."name",
-                        "projects_userstorystatus"."color",
-                        "projects_userstorystatus"."order",
-                        COALESCE("counters"."count", 0)
-                   FROM "projects_userstorystatus"
-        LEFT OUTER JOIN "counters"
-                     ON "counters"."status_id" = "projects_userstorystatus"."id"
-                  WHERE "projects_userstorystatus"."project_id" = %s
-               ORDER BY "projects_userstorystatus"."order";
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
-
+USERSTORIES_FILTERS_FROM_SQL = """
+                   "userstories_userstory"
+        INNER JOIN "projects_project"
+                ON ("userstories_userstory"."project_id" = "projects_project"."id")
+        INNER JOIN "projects_userstorystatus"
+                ON ("userstories_userstory"."status_id" = "projects_userstorystatus"."id")
+   LEFT OUTER JOIN "epics_relateduserstory"
+                ON ("userstories_userstory"."id" = "epics_relateduserstory"."user_story_id")
+   LEFT OUTER JOIN "userstories_userstory_assigned_users"
+                ON ("userstories_userstory"."id" = "userstories_userstory_assigned_users"."userstory_id")
+"""
+
+# There is a row for every user story, related epic and assigned user
+USERSTORIES_FILTERS_COLUMNS = [
+    '"userstories_userstory"."id" "item_id"',
+    '"userstories_userstory"."status_id" "status_id"',
+    '"userstories_userstory"."assigned_to_id" "assigned_to_id"',
+    '"userstories_userstory"."owner_id" "owner_id"',
+    '"userstories_userstory"."tags" "tags"',
+    '"epics_relateduserstory"."id" "related_epic_id"',
+    '"epics_relateduserstory"."epic_id" "epic_id"',
+    '"userstories_userstory_assigned_users"."user_id" "assigned_user_id"',
+]
+
+
+_USERSTORIES_STATUSES_SQL = """
+     WITH "counters" AS (
+              SELECT "status_id",
+                     COUNT(DISTINCT "item_id") "count"
+                FROM "items"
+               WHERE {match}
+            GROUP BY "status_id"
+        )
+
+             SELECT "projects_userstorystatus"."id" "id",
+                    "projects_userstorystatus"."name" "name",
+                    "projects_userstorystatus"."color" "color",
+                    "projects_userstorystatus"."order" "order",
+                    COALESCE("counters"."count", 0) "count"
+               FROM "projects_userstorystatus"
+    LEFT OUTER JOIN "counters"
+                 ON "counters"."status_id" = "projects_userstorystatus"."id"
+              WHERE "projects_userstorystatus"."project_id" = %s
+"""
+
+
+def _get_userstories_statuses(rows):
     result = []
     for id, name, color, order, count in rows:
         result.append({
@@ -664,70 +689,40 @@ def _get_userstories_statuses(project, queryset):
     return sorted(result, key=itemgetter("order"))
 
 
-def _get_userstories_assigned_to(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-     WITH "us_counters" AS (
-         SELECT DISTINCT "userstories_userstory"."assigned_to_id" "assigned_to_id",
-                         "userstories_userstory"."id" "us_id"
-                    FROM "userstories_userstory"
-              INNER JOIN "projects_project"
-                      ON ("userstories_userstory"."project_id" = "projects_project"."id")
-                INNER JOIN "projects_userstorystatus"
-                    ON ("userstories_userstory"."status_id" = "projects_userstorystatus"."id")
-         LEFT OUTER JOIN "epics_relateduserstory"
-                      ON "userstories_userstory"."id" = "epics_relateduserstory"."user_story_id"
-         LEFT OUTER JOIN "userstories_userstory_assigned_users"
-                      ON "userstories_userstory"."id" = "userstories_userstory_assigned_users"."userstory_id"
-                   WHERE {where}
-            ),
-
-            "counters" AS (
-                 SELECT "assigned_to_id",
-                        COUNT("assigned_to_id")
-                   FROM "us_counters"
-               GROUP BY "assigned_to_id"
-            )
-
-                 SELECT "projects_membership"."user_id" "user_id",
-                        "users_user"."full_name" "full_name",
-                        "users_user"."username" "username",
-                        COALESCE("counters".count, 0) "count"
-                   FROM "projects_membership"
-        LEFT OUTER JOIN "counters"
-                     ON ("projects_membership"."user_id" = "counters"."assigned_to_id")
-             INNER JOIN "users_user"
-                     ON ("projects_membership"."user_id" = "users_user"."id")
-                  WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
-
-        -- unassigned userstories
-        UNION
-
-                 SELECT NULL "user_id",
-                        NULL "full_name",
-                        NULL "username",
-                        count(coalesce("assigned_to_id", -1)) "count"
-                   FROM "userstories_userstory"
-             INNER JOIN "projects_project"
-                     ON ("userstories_userstory"."project_id" = "projects_project"."id")
-             INNER JOIN "projects_userstorystatus"
-                    ON ("userstories_userstory"."status_id" = "projects_userstorystatus"."id")
-        LEFT OUTER JOIN "epics_relateduserstory"
-                     ON ("userstories_userstory"."id" = "epics_relateduserstory"."user_story_id")
-        LEFT OUTER JOIN "userstories_userstory_assigned_users"
-                      ON "userstories_userstory"."id" = "userstories_userstory_assigned_users"."userstory_id"
-                  WHERE {where} AND "userstories_userstory"."assigned_to_id" IS NULL
-               GROUP BY "assigned_to_id"
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id] + where_params)
-        rows = cursor.fetchall()
-
+_USERSTORIES_ASSIGNED_TO_SQL = """
+     WITH "counters" AS (
+              SELECT "assigned_to_id",
+                     COUNT(DISTINCT "item_id") "count"
+                FROM "items"
+               WHERE {match}
+            GROUP BY "assigned_to_id"
+        )
+
+             SELECT "projects_membership"."user_id" "user_id",
+                    "users_user"."full_name" "full_name",
+                    "users_user"."username" "username",
+                    COALESCE("counters"."count", 0) "count"
+               FROM "projects_membership"
+    LEFT OUTER JOIN "counters"
+                 ON ("projects_membership"."user_id" = "counters"."assigned_to_id")
+         INNER JOIN "users_user"
+                 ON ("projects_membership"."user_id" = "users_user"."id")
+              WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
+
+    -- unassigned userstories
+    UNION
+
+             SELECT NULL "user_id",
+                    NULL "full_name",
+                    NULL "username",
+                    COUNT(*) "count"
+               FROM "items"
+              WHERE {match} AND "items"."assigned_to_id" IS NULL
+             HAVING COUNT(*) > 0
+"""
+
+
+def _get_userstories_assigned_to(rows):
     result = []
     none_valued_added = False
     for id, full_name, username, count in rows:
@@ -751,85 +746,55 @@ def _get_userstories_assigned_to(project, queryset):
     return sorted(result, key=itemgetter("full_name"))
 
 
-def _get_userstories_assigned_users(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-     WITH "us_counters" AS (
-         SELECT DISTINCT COALESCE("userstories_userstory_assigned_users"."user_id",
-            "userstories_userstory"."assigned_to_id") as "assigned_user_id",
-                "userstories_userstory"."id" "us_id"
-                    FROM "userstories_userstory"
-              LEFT JOIN "userstories_userstory_assigned_users"
-                      ON "userstories_userstory_assigned_users"."userstory_id" = "userstories_userstory"."id"
-              INNER JOIN "projects_project"
-                      ON ("userstories_userstory"."project_id" = "projects_project"."id")
-                INNER JOIN "projects_userstorystatus"
-                    ON ("userstories_userstory"."status_id" = "projects_userstorystatus"."id")
-              LEFT OUTER JOIN "epics_relateduserstory"
-                      ON "userstories_userstory"."id" = "epics_relateduserstory"."user_story_id"
-                   WHERE {where}
-            ),
-
-            "counters" AS (
-                 SELECT "assigned_user_id",
-                        COUNT("assigned_user_id")
-                   FROM "us_counters"
-               GROUP BY "assigned_user_id"
-            )
-
-                 SELECT "projects_membership"."user_id" "user_id",
-                        "users_user"."full_name" "full_name",
-                        "users_user"."username" "username",
-                        COALESCE("counters".count, 0) "count",
-                        "users_user"."photo" "photo",
-                        "users_user"."email" "email"
-                   FROM "projects_membership"
-        LEFT OUTER JOIN "counters"
-                     ON ("projects_membership"."user_id" = "counters"."assigned_user_id")
-             INNER JOIN "users_user"
-                     ON ("projects_membership"."user_id" = "users_user"."id")
-                  WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
-
-        -- unassigned userstories
-        UNION
-
-                 SELECT NULL "user_id",
-                        NULL "full_name",
-                        NULL "username",
-                        count(coalesce("assigned_to_id", -1)) "count",
-                        NULL "photo",
-                        NULL "email"
-                   FROM "userstories_userstory"
-             INNER JOIN "projects_project"
-                     ON ("userstories_userstory"."project_id" = "projects_project"."id")
-            INNER JOIN "projects_userstorystatus"
-                ON ("userstories_userstory"."status_id" = "projects_userstorystatus"."id")
-        LEFT OUTER JOIN "epics_relateduserstory"
-                     ON ("userstories_userstory"."id" = "epics_relateduserstory"."user_story_id")
-                  WHERE {where} AND "userstories_userstory"."id" NOT IN (
-                    SELECT "userstories_userstory_assigned_users"."userstory_id" FROM
-                      "userstories_userstory_assigned_users"
-                  ) AND "userstories_userstory"."assigned_to_id" IS NULL
-               GROUP BY "username";
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id] + where_params)
-        rows = cursor.fetchall()
-
+_USERSTORIES_ASSIGNED_USERS_SQL = """
+     WITH "counters" AS (
+              SELECT COALESCE("assigned_user_id", "assigned_to_id") "assigned_user_id",
+                     COUNT(DISTINCT "item_id") "count"
+                FROM "items"
+               WHERE {match}
+            GROUP BY 1
+        )
+
+             SELECT "projects_membership"."user_id" "user_id",
+                    "users_user"."full_name" "full_name",
+                    "users_user"."username" "username",
+                    COALESCE("counters"."count", 0) "count",
+                    "users_user"."photo" "photo",
+                    "users_user"."photo_thumbnails" "photo_thumbnails",
+                    "users_user"."email" "email"
+               FROM "projects_membership"
+    LEFT OUTER JOIN "counters"
+                 ON ("projects_membership"."user_id" = "counters"."assigned_user_id")
+         INNER JOIN "users_user"
+                 ON ("projects_membership"."user_id" = "users_user"."id")
+              WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
+
+    -- unassigned userstories
+    UNION
+
+             SELECT NULL "user_id",
+                    NULL "full_name",
+                    NULL "username",
+                    COUNT(*) "count",
+                    NULL "photo",
+                    NULL "photo_thumbnails",
+                    NULL "email"
+               FROM "items"
+              WHERE {match} AND "items"."assigned_user_id" IS NULL AND "items"."assigned_to_id" IS NULL
+             HAVING COUNT(*) > 0
+"""
+
+
+def _get_userstories_assigned_users(rows):
     result = []
     none_valued_added = False
-    for id, full_name, username, count, photo, email in rows:
+    for id, full_name, username, count, photo, photo_thumbnails, email in rows:
         result.append({
             "id": id,
             "full_name": full_name or username or "",
             "count": count,
-            "photo": get_photo_url(photo),
-            "big_photo": get_big_photo_url(photo),
+            "photo": get_photo_url(photo, photo_thumbnails),
+            "big_photo": get_big_photo_url(photo, photo_thumbnails),
             "gravatar_id": get_gravatar_id(email) if email else None
         })
 
@@ -850,125 +815,90 @@ def _get_userstories_assigned_users(project, queryset):
     return sorted(result, key=itemgetter("full_name"))
 
 
-def _get_userstories_owners(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-     WITH "us_counters" AS(
-         SELECT DISTINCT "userstories_userstory"."owner_id" "owner_id",
-                         "userstories_userstory"."id" "us_id"
-                    FROM "userstories_userstory"
-              INNER JOIN "projects_project"
-                      ON ("userstories_userstory"."project_id" = "projects_project"."id")
-                INNER JOIN "projects_userstorystatus"
-                    ON ("userstories_userstory"."status_id" = "projects_userstorystatus"."id")
-         LEFT OUTER JOIN "epics_relateduserstory"
-                      ON ("userstories_userstory"."id" = "epics_relateduserstory"."user_story_id")
-         LEFT OUTER JOIN "userstories_userstory_assigned_users"
-                      ON "userstories_userstory"."id" = "userstories_userstory_assigned_users"."userstory_id"
-                   WHERE {where}
-            ),
-
-            "counters" AS (
-                 SELECT "owner_id",
-                        COUNT("owner_id")
-                   FROM "us_counters"
-               GROUP BY "owner_id"
-            )
-
-                 SELECT "projects_membership"."user_id" "user_id",
-                        "users_user"."full_name",
-                        "users_user"."username",
-                        COALESCE("counters".count, 0) "count",
-                        "users_user"."photo" "photo",
-                        "users_user"."email" "email"
-                   FROM "projects_membership"
-        LEFT OUTER JOIN "counters"
-                     ON ("projects_membership"."user_id" = "counters"."owner_id")
-             INNER JOIN "users_user"
-                     ON ("projects_membership"."user_id" = "users_user"."id")
-                  WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
-
-        -- System users
-                  UNION
-
-                 SELECT "users_user"."id" "user_id",
-                        "users_user"."full_name" "full_name",
-                        "users_user"."username" "username",
-                        COALESCE("counters"."count", 0) "count",
-                        NULL "photo",
-                        NULL "email"
-                   FROM "users_user"
-        LEFT OUTER JOIN "counters"
-                     ON ("users_user"."id" = "counters"."owner_id")
-                  WHERE ("users_user"."is_system" IS TRUE)
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
-
+_USERSTORIES_OWNERS_SQL = """
+     WITH "counters" AS (
+              SELECT "owner_id",
+                     COUNT(DISTINCT "item_id") "count"
+                FROM "items"
+               WHERE {match}
+            GROUP BY "owner_id"
+        )
+
+             SELECT "projects_membership"."user_id" "user_id",
+                    "users_user"."full_name" "full_name",
+                    "users_user"."username" "username",
+                    COALESCE("counters"."count", 0) "count",
+                    "users_user"."photo" "photo",
+                    "users_user"."photo_thumbnails" "photo_thumbnails",
+                    "users_user"."email" "email"
+               FROM "projects_membership"
+    LEFT OUTER JOIN "counters"
+                 ON ("projects_membership"."user_id" = "counters"."owner_id")
+         INNER JOIN "users_user"
+                 ON ("projects_membership"."user_id" = "users_user"."id")
+              WHERE "projects_membership"."project_id" = %s AND "projects_membership"."user_id" IS NOT NULL
+
+    -- System users
+    UNION
+
+             SELECT "users_user"."id" "user_id",
+                    "users_user"."full_name" "full_name",
+                    "users_user"."username" "username",
+                    COALESCE("counters"."count", 0) "count",
+                    NULL "photo",
+                    NULL "photo_thumbnails",
+                    NULL "email"
+               FROM "users_user"
+    LEFT OUTER JOIN "counters"
+                 ON ("users_user"."id" = "counters"."owner_id")
+              WHERE ("users_user"."is_system" IS TRUE)
+"""
+
+
+def _get_userstories_owners(rows):
     result = []
-    for id, full_name, username, count, photo, email in rows:
+    for id, full_name, username, count, photo, photo_thumbnails, email in rows:
         if count > 0:
             result.append({
                 "id": id,
                 "full_name": full_name or username or "",
                 "count": count,
-                "photo": get_photo_url(photo),
-                "big_photo": get_big_photo_url(photo),
+                "photo": get_photo_url(photo, photo_thumbnails),
+                "big_photo": get_big_photo_url(photo, photo_thumbnails),
                 "gravatar_id": get_gravatar_id(email) if email else None
             })
     return sorted(result, key=itemgetter("full_name"))
 
 
-def _get_userstories_tags(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-           WITH "userstories_tags" AS (
-                   SELECT "tag",
-                          COUNT("tag") "counter"
-                     FROM (
-                      SELECT DISTINCT "userstories_userstory"."id" "us_id",
-                                       UNNEST("userstories_userstory"."tags") "tag"
-                                 FROM "userstories_userstory"
-                        INNER JOIN "projects_project"
-                            ON ("userstories_userstory"."project_id" = "projects_project"."id")
-                        INNER JOIN "projects_userstorystatus"
-                            ON ("userstories_userstory"."status_id" = "projects_userstorystatus"."id")
-                        LEFT OUTER JOIN "epics_relateduserstory"
-                            ON ("userstories_userstory"."id" = "epics_relateduserstory"."user_story_id")
-                        LEFT OUTER JOIN "userstories_userstory_assigned_users"
-                            ON "userstories_userstory"."id" = "userstories_userstory_assigned_users"."userstory_id"
-                                WHERE {where}
-                          ) "tags"
-                    GROUP BY "tag"),
-
-                "project_tags" AS (
-                       SELECT reduce_dim("tags_colors") "tag_color"
-                         FROM "projects_project"
-                        WHERE "id"=%s)
-
-         SELECT "tag_color"[1] "tag",
-                "tag_color"[2] "color",
-                COALESCE("userstories_tags"."counter", 0) "counter"
-           FROM "project_tags"
-LEFT OUTER JOIN "userstories_tags"
-             ON "project_tags"."tag_color"[1] = "userstories_tags"."tag"
-       ORDER BY "tag"
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
-
+_USERSTORIES_TAGS_SQL = """
+     WITH "userstories_tags" AS (
+              SELECT "tag",
+                     COUNT(DISTINCT "item_id") "counter"
+                FROM (
+                    SELECT "item_id",
+                           UNNEST("tags") "tag"
+                      FROM "items"
+                     WHERE {match}
+                    ) "items_tags"
+            GROUP BY "tag"
+        ),
+
+          "project_tags" AS (
+              SELECT reduce_dim("tags_colors") "tag_color"
+                FROM "projects_project"
+               WHERE "id" = %s
+        )
+
+             SELECT "tag_color"[1] "tag",
+                    "tag_color"[2] "color",
+                    COALESCE("userstories_tags"."counter", 0) "counter"
+               FROM "project_tags"
+    LEFT OUTER JOIN "userstories_tags"
+                 ON "project_tags"."tag_color"[1] = "userstories_tags"."tag"
+"""
+
+
+def _get_userstories_tags(rows):
     result = []
     for name, color, count in rows:
         result.append({
@@ -979,63 +909,40 @@ LEFT OUTER JOIN "userstories_tags"
     return sorted(result, key=itemgetter("name"))
 
 
-def _get_userstories_epics(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-    extra_sql = """
-       WITH "counters" AS (
-               SELECT "epics_relateduserstory"."epic_id" AS "epic_id",
-                      count("epics_relateduserstory"."id") AS "counter"
-                 FROM "epics_relateduserstory"
-           INNER JOIN "userstories_userstory"
-                   ON ("userstories_userstory"."id" = "epics_relateduserstory"."user_story_id")
-           INNER JOIN "projects_project"
-                   ON ("userstories_userstory"."project_id" = "projects_project"."id")
-            INNER JOIN "projects_userstorystatus"
-                    ON ("userstories_userstory"."status_id" = "projects_userstorystatus"."id")
-            LEFT OUTER JOIN "userstories_userstory_assigned_users"
-                ON "userstories_userstory"."id" = "userstories_userstory_assigned_users"."userstory_id"
-                WHERE {where}
-             GROUP BY "epics_relateduserstory"."epic_id"
-       )
-
-         -- User stories with no epics (return results only if there are userstories)
-               SELECT NULL AS "id",
-                      NULL AS "ref",
-                      NULL AS "subject",
-                      0 AS "order",
-                      count(COALESCE("epics_relateduserstory"."epic_id", -1)) AS "counter"
-                 FROM "userstories_userstory"
-      LEFT OUTER JOIN "epics_relateduserstory"
-                   ON ("epics_relateduserstory"."user_story_id" = "userstories_userstory"."id")
-           INNER JOIN "projects_project"
-                   ON ("userstories_userstory"."project_id" = "projects_project"."id")
-            INNER JOIN "projects_userstorystatus"
-                ON ("userstories_userstory"."status_id" = "projects_userstorystatus"."id")
-         LEFT OUTER JOIN "userstories_userstory_assigned_users"
-                      ON "userstories_userstory"."id" = "userstories_userstory_assigned_users"."userstory_id"
-                WHERE {where} AND "epics_relateduserstory"."epic_id" IS NULL
-             GROUP BY "epics_relateduserstory"."epic_id"
-
-                UNION
-
-               SELECT "epics_epic"."id" AS "id",
-                      "epics_epic"."ref" AS "ref",
-                      "epics_epic"."subject" AS "subject",
-                      "epics_epic"."epics_order" AS "order",
-                      COALESCE("counters"."counter", 0) AS "counter"
-                 FROM "epics_epic"
-      LEFT OUTER JOIN "counters"
-                   ON ("counters"."epic_id" = "epics_epic"."id")
-                WHERE "epics_epic"."project_id" = %s
-        """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + where_params + [project.id])
-        rows = cursor.fetchall()
-
+_USERSTORIES_EPICS_SQL = """
+     WITH "counters" AS (
+              SELECT "epic_id",
+                     COUNT("related_epic_id") "counter"
+                FROM "items"
+               WHERE {match} AND "items"."epic_id" IS NOT NULL
+            GROUP BY "epic_id"
+        )
+
+    -- User stories with no epics (return results only if there are userstories)
+             SELECT NULL "id",
+                    NULL "ref",
+                    NULL "subject",
+                    0 "order",
+                    COUNT(*) "counter"
+               FROM "items"
+              WHERE {match} AND "items"."epic_id" IS NULL
+             HAVING COUNT(*) > 0
+
+              UNION
+
+             SELECT "epics_epic"."id" "id",
+                    "epics_epic"."ref" "ref",
+                    "epics_epic"."subject" "subject",
+                    "epics_epic"."epics_order" "order",
+                    COALESCE("counters"."counter", 0) "counter"
+               FROM "epics_epic"
+    LEFT OUTER JOIN "counters"
+                 ON ("counters"."epic_id" = "epics_epic"."id")
+              WHERE "epics_epic"."project_id" = %s
+"""
+
+
+def _get_userstories_epics(rows):
     result = []
     for id, ref, subject, order, count in rows:
         result.append({
@@ -1060,53 +967,30 @@ def _get_userstories_epics(project, queryset):
     return result
 
 
-def _get_userstories_roles(project, queryset):
-    compiler = connection.ops.compiler(queryset.query.compiler)(queryset.query, connection, None)
-    queryset_where_tuple = queryset.query.where.as_sql(compiler, connection)
-    where = queryset_where_tuple[0]
-    where_params = queryset_where_tuple[1]
-
-    extra_sql = """
-     WITH "us_counters" AS (
-         SELECT DISTINCT "userstories_userstory"."status_id" "status_id",
-                         "userstories_userstory"."id" "us_id",
-                         "projects_membership"."role_id" "role_id"
-                    FROM "userstories_userstory"
-              INNER JOIN "projects_project"
-                      ON ("userstories_userstory"."project_id" = "projects_project"."id")
-            INNER JOIN "projects_userstorystatus"
-                ON ("userstories_userstory"."status_id" = "projects_userstorystatus"."id")
-         LEFT OUTER JOIN "epics_relateduserstory"
-                      ON "userstories_userstory"."id" = "epics_relateduserstory"."user_story_id"
-         LEFT OUTER JOIN "userstories_userstory_assigned_users"
-                      ON "userstories_userstory_assigned_users"."userstory_id" = "userstories_userstory"."id"
-         LEFT OUTER JOIN "projects_membership"
-                      ON "projects_membership"."user_id" = "userstories_userstory"."assigned_to_id"
-                      OR "projects_membership"."user_id" = "userstories_userstory_assigned_users"."user_id"
-                   WHERE {where}
-            ),
-             "counters" AS (
-                  SELECT "role_id" as "role_id",
-                         COUNT("role_id") "count"
-                    FROM "us_counters"
-                GROUP BY "role_id"
-            )
-
-                 SELECT "users_role"."id",
-                        "users_role"."name",
-                        "users_role"."order",
-                        COALESCE("counters"."count", 0)
-                   FROM "users_role"
-        LEFT OUTER JOIN "counters"
-                     ON "counters"."role_id" = "users_role"."id"
-                  WHERE "users_role"."project_id" = %s
-               ORDER BY "users_role"."order";
-    """.format(where=where)
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, where_params + [project.id])
-        rows = cursor.fetchall()
-
+_USERSTORIES_ROLES_SQL = """
+     WITH "counters" AS (
+              SELECT "projects_membership"."role_id" "role_id",
+                     COUNT(DISTINCT "items"."item_id") "count"
+                FROM "items"
+          INNER JOIN "projects_membership"
+                  ON "projects_membership"."user_id" = "items"."assigned_to_id"
+                  OR "projects_membership"."user_id" = "items"."assigned_user_id"
+               WHERE {match}
+            GROUP BY "projects_membership"."role_id"
+        )
+
+             SELECT "users_role"."id" "id",
+                    "users_role"."name" "name",
+                    "users_role"."order" "order",
+                    COALESCE("counters"."count", 0) "count"
+               FROM "users_role"
+    LEFT OUTER JOIN "counters"
+                 ON "counters"."role_id" = "users_role"."id"
+              WHERE "users_role"."project_id" = %s
+"""
+
+
+def _get_userstories_roles(rows):
     result = []
     for id, name, order, count in rows:
         result.append({
@@ -1123,17 +1007,21 @@ def get_userstories_filters_data(project, querysets):
     """
     Given a project and an userstories queryset, return a simple data structure
     of all possible filters for the userstories in the queryset.
-    """
-    data = OrderedDict([
-        ("statuses", _get_userstories_statuses(project, querysets["statuses"])),
-        ("assigned_to",
-         _get_userstories_assigned_to(project, querysets["assigned_to"])),
-        ("assigned_users",
-         _get_userstories_assigned_users(project, querysets["assigned_users"])),
-        ("owners", _get_userstories_owners(project, querysets["owners"])),
-        ("tags", _get_userstories_tags(project, querysets["tags"])),
-        ("epics", _get_userstories_epics(project, querysets["epics"])),
-        ("roles", _get_userstories_roles(project, querysets["roles"])),
-    ])
 
+    All the facets are computed with a single query, see `get_facets_rows`.
+    """
+    facets = [
+        ("statuses", _USERSTORIES_STATUSES_SQL, _get_userstories_statuses),
+        ("assigned_to", _USERSTORIES_ASSIGNED_TO_SQL, _get_userstories_assigned_to),
+        ("assigned_users", _USERSTORIES_ASSIGNED_USERS_SQL, _get_userstories_assigned_users),
+        ("owners", _USERSTORIES_OWNERS_SQL, _get_userstories_owners),
+        ("tags", _USERSTORIES_TAGS_SQL, _get_userstories_tags),
+        ("epics", _USERSTORIES_EPICS_SQL, _get_userstories_epics),
+        ("roles", _USERSTORIES_ROLES_SQL, _get_userstories_roles),
+    ]
+
+    rows = get_facets_rows(project, USERSTORIES_FILTERS_FROM_SQL, USERSTORIES_FILTERS_COLUMNS,
+                           [(name, querysets[name], sql, [project.id]) for name, sql, _fn in facets])
+
+    data = OrderedDict([(name, get_data(rows[name])) for name, _sql, get_data in facets])
     return data
@@ -113,3 +113,27 @@ def _try_to_close_milestone_when_delete_us(instance):
     with suppress(ObjectDoesNotExist):
         if instance.milestone_id and milestone_service.calculate_milestone_is_closed(instance.milestone):
                 milestone_service.close_milestone(instance.milestone)
+
+
+####################################
+# Signals for the burndown of milestones
+####################################
+
+def update_burndown_points_when_create_or_edit_us(sender, instance, **kwargs):
+    if instance._importing:
+        return
+
+    from taiga.projects.milestones import services as milestone_service
+    milestone_service.update_burndown_points(user_story_ids=[instance.id])
+
+
+def update_burndown_points_when_create_or_edit_role_points(sender, instance, **kwargs):
+    from taiga.projects.milestones import services as milestone_service
+    milestone_service.update_burndown_points(user_story_ids=[instance.user_story_id])
+
+
+def delete_burndown_points_when_delete_us(sender, instance, **kwargs):
+    # The tasks deleted in cascade could have rebuilt the burndown points of
+    # the user story after the collector got them
+    from taiga.projects.milestones.models import BurndownPoints
+    BurndownPoints.objects.filter(user_story_id=instance.id).delete()
@@ -55,7 +55,8 @@ class UserStoryValidator(AssignedToValidator, WatchersValidator,
     class Meta:
         model = models.UserStory
         depth = 0
-        read_only_fields = ('id', 'ref', 'created_date', 'modified_date', 'owner', 'kanban_order')
+        read_only_fields = ('id', 'ref', 'created_date', 'modified_date', 'owner', 'kanban_order',
+                            'description_html', 'blocked_note_html')
 
 
 class UserStoriesBulkValidator(ProjectExistsValidator, validators.Validator):
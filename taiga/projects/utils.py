@@ -24,6 +24,7 @@ def attach_members(queryset, as_field="members_attr"):
                                concat(full_name, username) complete_user_name,
                                users_user.color,
                                users_user.photo,
+                               users_user.photo_thumbnails,
                                users_user.is_active,
                                users_role.id "role",
                                users_role.name role_name
@@ -577,10 +578,24 @@ def attach_my_homepage(queryset, user, as_field="my_homepage_attr"):
     return queryset
 
 
-def attach_extra_info(queryset, user=None):
-    queryset = attach_members(queryset)
-    queryset = attach_closed_milestones(queryset)
-    queryset = attach_notify_policies(queryset)
+# Attributes attached by `attach_config_info`
+CONFIG_INFO_ATTRS = ("epic_statuses_attr", "swimlanes_attr", "userstory_statuses_attr",
+                     "userstory_duedates_attr", "points_attr", "task_statuses_attr",
+                     "task_duedates_attr", "issue_statuses_attr", "issue_duedates_attr",
+                     "issue_types_attr", "priorities_attr", "severities_attr",
+                     "epic_custom_attributes_attr", "userstory_custom_attributes_attr",
+                     "task_custom_attributes_attr", "issue_custom_attributes_attr",
+                     "roles_attr")
+
+
+def attach_config_info(queryset):
+    """Attach the configuration of the projects (statuses, points, custom attributes,
+    roles...), it is the same for every user.
+
+    :param queryset: A Django projects queryset object.
+
+    :return: Queryset
+    """
     queryset = attach_epic_statuses(queryset)
     queryset = attach_swimlanes(queryset)
     queryset = attach_userstory_statuses(queryset)
@@ -598,6 +613,23 @@ def attach_extra_info(queryset, user=None):
     queryset = attach_task_custom_attributes(queryset)
     queryset = attach_issue_custom_attributes(queryset)
     queryset = attach_roles(queryset)
+
+    return queryset
+
+
+def attach_extra_info(queryset, user=None, with_config=True):
+    """Attach all the information of the projects. With `with_config=False` the
+    configuration must be attached later, with `services.attach_project_config`.
+
+    :param queryset: A Django projects queryset object.
+
+    :return: Queryset
+    """
+    queryset = attach_members(queryset)
+    queryset = attach_closed_milestones(queryset)
+    queryset = attach_notify_policies(queryset)
+    if with_config:
+        queryset = attach_config_info(queryset)
     queryset = attach_is_fan(queryset, user)
     queryset = attach_my_role_permissions(queryset, user)
     queryset = attach_milestones(queryset)
@@ -288,7 +288,8 @@ class ProjectValidator(validators.ModelValidator):
 
     class Meta:
         model = models.Project
-        read_only_fields = ("created_date", "modified_date", "slug", "blocked_code", "owner")
+        read_only_fields = ("created_date", "modified_date", "slug", "blocked_code", "owner",
+                            "logo_thumbnails")
 
 
 ######################################################
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+from django.db import migrations
+
+
+# NOTE: The search_vector column is used by taiga.searches.services and it's
+#       kept up to date by a trigger, it isn't a field of the model.
+
+ADD_SEARCH_VECTOR = """
+    ALTER TABLE wiki_wikipage
+     ADD COLUMN search_vector tsvector NULL;
+
+    CREATE OR REPLACE FUNCTION wiki_wikipage_search_vector_update()
+       RETURNS trigger AS $search_vector$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.slug, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.content, '')), 'B');
+        RETURN NEW;
+    END;
+    $search_vector$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER wiki_wikipage_search_vector_update
+    BEFORE INSERT OR UPDATE OF slug, content, search_vector
+                ON wiki_wikipage
+      FOR EACH ROW EXECUTE PROCEDURE wiki_wikipage_search_vector_update();
+
+    UPDATE wiki_wikipage SET search_vector = NULL;
+
+    CREATE INDEX wiki_wikipage_search_vector_idx
+              ON wiki_wikipage
+           USING gin(search_vector);
+"""
+
+
+DROP_SEARCH_VECTOR = """
+    DROP INDEX IF EXISTS wiki_wikipage_search_vector_idx;
+    DROP TRIGGER IF EXISTS wiki_wikipage_search_vector_update ON wiki_wikipage;
+    DROP FUNCTION IF EXISTS wiki_wikipage_search_vector_update();
+    ALTER TABLE wiki_wikipage DROP COLUMN IF EXISTS search_vector;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0033_text_search_indexes'),
+        ('wiki', '0005_auto_20161201_1628'),
+    ]
+
+    operations = [
+        migrations.RunSQL(ADD_SEARCH_VECTOR, DROP_SEARCH_VECTOR),
+    ]
@@ -31,6 +31,7 @@ class WikiPage(OCCModelMixin, WatchedModelMixin, models.Model):
                             verbose_name=_("slug"), allow_unicode=True)
     content = models.TextField(null=False, blank=True,
                                verbose_name=_("content"))
+    content_html = models.TextField(null=True, blank=True, verbose_name=_("content html"))
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True,
@@ -10,7 +10,7 @@ from taiga.base.fields import Field, MethodField
 from taiga.projects.history import services as history_service
 from taiga.projects.mixins.serializers import ProjectExtraInfoSerializerMixin
 from taiga.projects.notifications.mixins import WatchedResourceSerializer
-from taiga.mdrender.service import render as mdrender
+from taiga.mdrender.service import get_rendered_html
 
 
 class WikiPageSerializer(
@@ -32,7 +32,7 @@ class WikiPageSerializer(
     version = Field()
 
     def get_html(self, obj):
-        return mdrender(obj.project, obj.content)
+        return get_rendered_html(obj, "content")
 
     def get_editions(self, obj):
         return history_service.get_history_queryset_by_model_instance(obj).count() + 1  # +1 for creation
@@ -17,7 +17,7 @@ class WikiPageValidator(WatchersValidator, validators.ModelValidator):
 
     class Meta:
         model = models.WikiPage
-        read_only_fields = ('modified_date', 'created_date', 'owner')
+        read_only_fields = ('modified_date', 'created_date', 'owner', 'content_html')
 
 
 class WikiLinkValidator(validators.ModelValidator):
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+# Examples:
+# python manage.py rebuild_search_vectors
+# python manage.py rebuild_search_vectors --project 42
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.test.utils import override_settings
+
+from taiga.projects.models import Project
+from taiga.searches.services import rebuild_search_vectors
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search vectors of epics, user stories, tasks, issues and wiki pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project',
+                            action='store',
+                            dest='project',
+                            default=None,
+                            help='Selected project id')
+
+    @override_settings(DEBUG=False)
+    def handle(self, *args, **options):
+        project = None
+        if options["project"] is not None:
+            try:
+                project = Project.objects.get(id=options["project"])
+            except Project.DoesNotExist:
+                raise CommandError("There is no project with the id '{}'".format(options["project"]))
+
+        rebuild_search_vectors(project)
+        self.stdout.write(self.style.SUCCESS("Search vectors rebuilt"))
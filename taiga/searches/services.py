@@ -7,11 +7,14 @@
 
 from django.apps import apps
 from django.conf import settings
+from django.db import connection
 from taiga.base.utils.db import to_tsquery
 from taiga.projects.userstories.utils import attach_total_points
 
 MAX_RESULTS = getattr(settings, "SEARCHES_MAX_RESULTS", 150)
 
+SEARCHABLE_TABLES = ("epics_epic", "userstories_userstory", "tasks_task", "issues_issue", "wiki_wikipage")
+
 
 def search_epics(project, text):
     model = apps.get_model("epics", "Epic")
@@ -44,27 +47,34 @@ def search_issues(project, text):
 def search_wiki_pages(project, text):
     model = apps.get_model("wiki", "WikiPage")
     queryset = model.objects.filter(project_id=project.pk)
-    tsquery = "to_tsquery('simple', %s)"
-    tsvector = """
-        setweight(to_tsvector('simple', coalesce(wiki_wikipage.slug)), 'A') ||
-        setweight(to_tsvector('simple', coalesce(wiki_wikipage.content)), 'B')
-    """
-
-    return _search_by_query(queryset, tsquery, tsvector, text)
+    table = "wiki_wikipage"
+    return _search_items(queryset, table, text)
 
 
 def _search_items(queryset, table, text):
+    # The search_vector column is precomputed and indexed (GIN), it's
+    # kept up to date by a trigger on every table (see the migrations)
     tsquery = "to_tsquery('simple', %s)"
-    tsvector = """
-        setweight(to_tsvector('simple',
-                              coalesce({table}.subject) || ' ' ||
-                              coalesce({table}.ref)), 'A') ||
-        setweight(to_tsvector('simple', coalesce(inmutable_array_to_string({table}.tags))), 'B') ||
-        setweight(to_tsvector('simple', coalesce({table}.description)), 'C')
-    """.format(table=table)
+    tsvector = "{table}.search_vector".format(table=table)
     return _search_by_query(queryset, tsquery, tsvector, text)
 
 
+def rebuild_search_vectors(project=None):
+    """
+    Recompute the search vectors of all the searchable items. Setting the
+    column to NULL is enough to make the trigger compute it again.
+    """
+    sql = "UPDATE {table} SET search_vector = NULL"
+    params = []
+    if project is not None:
+        sql += " WHERE project_id = %s"
+        params = [project.id]
+
+    with connection.cursor() as cursor:
+        for table in SEARCHABLE_TABLES:
+            cursor.execute(sql.format(table=table), params)
+
+
 def _search_by_query(queryset, tsquery, tsvector, text):
     select = {
         "rank": "ts_rank({tsvector},{tsquery})".format(tsquery=tsquery,
@@ -13,6 +13,7 @@ from django.db.models.expressions import RawSQL
 from django.db.models import Q
 from django.db.models.query import QuerySet
 from django.db import connection
+from django.utils.dateparse import parse_datetime
 
 from functools import partial, wraps
 
@@ -72,6 +73,57 @@ def _add_to_objects_timeline(objects, instance: object, event_type: str, created
         _add_to_object_timeline(obj, instance, event_type, created_datetime, namespace, extra_data)
 
 
+def _build_timeline_entries(entries, instance: object, event_type: str, created_datetime: object,
+                            extra_data: dict={}):
+    """
+    Build (without saving) the Timeline rows for every (obj, namespace) pair
+    in `entries`. The event payload and content types are computed only once
+    for the whole fan-out.
+    """
+    assert isinstance(instance, Model), "instance must be a instance of Model"
+    from .models import Timeline
+    event_type_key = _get_impl_key_from_model(instance.__class__, event_type)
+    impl = _timeline_impl_map.get(event_type_key, None)
+
+    project = None
+    if hasattr(instance, "project"):
+        project = instance.project
+
+    data = impl(instance, extra_data=extra_data)
+    data_content_type = ContentType.objects.get_for_model(instance.__class__)
+
+    timeline_entries = []
+    for obj, namespace in entries:
+        assert isinstance(obj, Model), "obj must be a instance of Model"
+        timeline_entries.append(Timeline(
+            content_type=ContentType.objects.get_for_model(obj.__class__),
+            object_id=obj.pk,
+            namespace=namespace,
+            event_type=event_type_key,
+            project=project,
+            data=data,
+            data_content_type=data_content_type,
+            created=created_datetime,
+        ))
+
+    return timeline_entries
+
+
+def _add_to_objects_timeline_in_bulk(entries, instance: object, event_type: str, created_datetime: object,
+                                     extra_data: dict={}):
+    """
+    Batched version of `_add_to_objects_timeline`. `entries` is an iterable of
+    (obj, namespace) pairs and all the rows are written with a single INSERT.
+    """
+    from .models import Timeline
+    timeline_entries = _build_timeline_entries(entries, instance, event_type, created_datetime,
+                                               extra_data=extra_data)
+    if not timeline_entries:
+        return []
+
+    return Timeline.objects.bulk_create(timeline_entries)
+
+
 def _push_to_timeline(objects, instance: object, event_type: str, created_datetime: object,
                       namespace: str="default", extra_data: dict={}):
     if isinstance(objects, Model):
@@ -82,9 +134,33 @@ def _push_to_timeline(objects, instance: object, event_type: str, created_dateti
         raise Exception("Invalid objects parameter")
 
 
+def _push_to_project_timelines(project_id, user, obj, event_type, created_datetime, extra_data={},
+                               refresh_totals=True):
+    projectModel = apps.get_model("projects", "Project")
+    try:
+        project = projectModel.objects.get(id=project_id)
+    except projectModel.DoesNotExist:
+        return
+
+    # Project timeline and related people timelines, written at once
+    entries = [(project, build_project_namespace(project))]
+    if hasattr(obj, "get_related_people"):
+        user_namespace = build_user_namespace(user)
+        entries += [(related_user, user_namespace) for related_user in obj.get_related_people()]
+
+    _add_to_objects_timeline_in_bulk(entries, obj, event_type, created_datetime,
+                                     extra_data=extra_data)
+
+    if refresh_totals:
+        project.refresh_totals()
+
+
 @app.task
 def push_to_timelines(project_id, user_id, obj_app_label, obj_model_name, obj_id, event_type,
                       created_datetime, extra_data={}, refresh_totals=True):
+    if isinstance(created_datetime, str):
+        # Sent as JSON by celery
+        created_datetime = parse_datetime(created_datetime)
 
     ObjModel = apps.get_model(obj_app_label, obj_model_name)
     try:
@@ -99,27 +175,8 @@ def push_to_timelines(project_id, user_id, obj_app_label, obj_model_name, obj_id
 
     if project_id is not None:
         # Actions related with a project
-
-        projectModel = apps.get_model("projects", "Project")
-        try:
-            project = projectModel.objects.get(id=project_id)
-        except projectModel.DoesNotExist:
-            return
-
-        # Project timeline
-        _push_to_timeline(project, obj, event_type, created_datetime,
-                          namespace=build_project_namespace(project),
-                          extra_data=extra_data)
-
-        if refresh_totals:
-            project.refresh_totals()
-
-        if hasattr(obj, "get_related_people"):
-            related_people = obj.get_related_people()
-
-            _push_to_timeline(related_people, obj, event_type, created_datetime,
-                              namespace=build_user_namespace(user),
-                              extra_data=extra_data)
+        _push_to_project_timelines(project_id, user, obj, event_type, created_datetime,
+                                   extra_data=extra_data, refresh_totals=refresh_totals)
     else:
         # Actions not related with a project
         # - Me
@@ -12,6 +12,7 @@ from django.utils import timezone
 from django.utils.translation import gettext as _
 from django.db import connection
 
+from taiga.base.utils import task_args
 from taiga.projects.history import services as history_services
 from taiga.projects.history.choices import HistoryType
 from taiga.timeline.service import (push_to_timelines,
@@ -25,6 +26,9 @@ def _push_to_timelines(project, user, obj, event_type, created_datetime, extra_d
 
     ct = ContentType.objects.get_for_model(obj)
     if settings.CELERY_ENABLED:
+        # Task arguments are sent as JSON
+        created_datetime = created_datetime.isoformat()
+        extra_data = task_args.dump_value(extra_data)
         connection.on_commit(lambda: push_to_timelines.delay(project_id,
                                                              user.id,
                                                              ct.app_label,
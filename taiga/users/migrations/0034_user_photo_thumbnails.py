@@ -0,0 +1,20 @@
+# Generated by Django 3.2.19 on 2026-10-17 12:40
+
+import django.core.serializers.json
+from django.db import migrations
+import taiga.base.db.models.fields.json
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0033_auto_20211110_1526'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='photo_thumbnails',
+            field=taiga.base.db.models.fields.json.JSONField(blank=True, default=None, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='photo thumbnails'),
+        ),
+    ]
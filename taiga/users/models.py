@@ -138,6 +138,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     photo = models.FileField(upload_to=get_user_file_path,
                              max_length=500, null=True, blank=True,
                              verbose_name=_("photo"))
+    photo_thumbnails = JSONField(null=True, blank=True, default=None,
+                                 verbose_name=_("photo thumbnails"))
     date_joined = models.DateTimeField(_("date joined"), default=timezone.now)
     date_cancelled = models.DateTimeField(_("date cancelled"), null=True, blank=True, default=None)
     accepted_terms = models.BooleanField(_("accepted terms"), default=True)
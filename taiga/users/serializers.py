@@ -10,7 +10,7 @@ from django.conf import settings
 from taiga.base.api import serializers
 from taiga.base.fields import Field, MethodField, I18NField
 
-from taiga.base.utils.thumbnails import get_thumbnail_url
+from taiga.base.utils.thumbnails import get_stored_thumbnail_url
 
 from taiga.projects.models import Project
 from .services import get_user_photo_url, get_user_big_photo_url
@@ -204,7 +204,7 @@ class HighLightedContentSerializer(serializers.LightSerializer):
     def get_logo_small_url(self, obj):
         logo = self._none_if_not_project(obj, "logo")
         if logo:
-            return get_thumbnail_url(logo, settings.THN_LOGO_SMALL)
+            return get_stored_thumbnail_url(logo, obj.logo_thumbnails, settings.THN_LOGO_SMALL)
         return None
 
     def get_assigned_to_extra_info(self, obj):
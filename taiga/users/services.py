@@ -23,12 +23,9 @@ from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.utils.translation import gettext as _
 
-from easy_thumbnails.files import get_thumbnailer
-from easy_thumbnails.exceptions import InvalidImageFormatError
-
 from taiga.base import exceptions as exc
 from taiga.base.utils.db import to_tsquery
-from taiga.base.utils.urls import get_absolute_url
+from taiga.base.utils.thumbnails import get_stored_thumbnail_url
 from taiga.projects.notifications.choices import NotifyLevel
 from taiga.projects.notifications.services import get_projects_watched
 
@@ -65,40 +62,28 @@ def get_and_validate_user(*, username: str, password: str) -> bool:
     return user
 
 
-def get_photo_url(photo):
+def get_photo_url(photo, thumbnails):
     """Get a photo absolute url and the photo automatically cropped."""
-    if not photo:
-        return None
-    try:
-        url = get_thumbnailer(photo)[settings.THN_AVATAR_SMALL].url
-        return get_absolute_url(url)
-    except InvalidImageFormatError as e:
-        return None
+    return get_stored_thumbnail_url(photo, thumbnails, settings.THN_AVATAR_SMALL)
 
 
 def get_user_photo_url(user):
     """Get the user's photo url."""
     if not user:
         return None
-    return get_photo_url(user.photo)
+    return get_photo_url(user.photo, user.photo_thumbnails)
 
 
-def get_big_photo_url(photo):
+def get_big_photo_url(photo, thumbnails):
     """Get a big photo absolute url and the photo automatically cropped."""
-    if not photo:
-        return None
-    try:
-        url = get_thumbnailer(photo)[settings.THN_AVATAR_BIG].url
-        return get_absolute_url(url)
-    except InvalidImageFormatError as e:
-        return None
+    return get_stored_thumbnail_url(photo, thumbnails, settings.THN_AVATAR_BIG)
 
 
 def get_user_big_photo_url(user):
     """Get the user's big photo url."""
     if not user:
         return None
-    return get_big_photo_url(user.photo)
+    return get_big_photo_url(user.photo, user.photo_thumbnails)
 
 
 def get_visible_project_ids(from_user, by_user):
@@ -320,6 +305,7 @@ def get_watched_list(for_user, from_user, type=None, q=None):
     SELECT entities.*,
            projects_project.name as project_name, projects_project.description as description, projects_project.slug as project_slug, projects_project.is_private as project_is_private,
            projects_project.blocked_code as project_blocked_code, projects_project.tags_colors, projects_project.logo,
+           projects_project.logo_thumbnails::json as logo_thumbnails,
            users_user.id as assigned_to_id,
            row_to_json(users_user) as assigned_to_extra_info
 
@@ -420,6 +406,7 @@ def get_liked_list(for_user, from_user, type=None, q=None):
     SELECT entities.*,
            projects_project.name as project_name, projects_project.description as description, projects_project.slug as project_slug, projects_project.is_private as project_is_private,
            projects_project.blocked_code as project_blocked_code, projects_project.tags_colors, projects_project.logo,
+           projects_project.logo_thumbnails::json as logo_thumbnails,
            users_user.id as assigned_to_id,
            row_to_json(users_user) as assigned_to_extra_info
         FROM (
@@ -503,6 +490,7 @@ def get_voted_list(for_user, from_user, type=None, q=None):
     SELECT entities.*,
            projects_project.name as project_name, projects_project.description as description, projects_project.slug as project_slug, projects_project.is_private as project_is_private,
            projects_project.blocked_code as project_blocked_code, projects_project.tags_colors, projects_project.logo,
+           projects_project.logo_thumbnails::json as logo_thumbnails,
            users_user.id as assigned_to_id,
            row_to_json(users_user) as assigned_to_extra_info
         FROM (
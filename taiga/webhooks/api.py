@@ -16,6 +16,7 @@ from taiga.base.api import ModelListViewSet
 from taiga.base.api.mixins import BlockedByProjectMixin
 
 from taiga.base.decorators import detail_route
+from taiga.base.utils import task_args
 
 from . import models
 from . import serializers
@@ -38,7 +39,9 @@ class WebhookViewSet(BlockedByProjectMixin, ModelCrudViewSet):
         self.check_permissions(request, 'test', webhook)
         self.pre_conditions_blocked(webhook)
 
-        webhooklog = tasks.test_webhook(webhook.id, webhook.url, webhook.key, request.user, timezone.now())
+        webhooklog = tasks.test_webhook(webhook.id, webhook.url, webhook.key,
+                                        task_args.dump_instance(request.user),
+                                        task_args.dump_value(timezone.now()))
         log = serializers.WebhookLogSerializer(webhooklog)
 
         return response.Ok(log.data)
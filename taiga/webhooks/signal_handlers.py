@@ -5,25 +5,23 @@
 #
 # Copyright (c) 2021-present Kaleidos INC
 
+from django.contrib.auth import get_user_model
 from django.db import connection
 from django.conf import settings
 from django.utils import timezone
 
+from taiga.base.utils import task_args
 from taiga.projects.history import services as history_service
 from taiga.projects.history.choices import HistoryType
 
 from . import tasks
+from .models import Webhook
 
 
-def _get_project_webhooks(project):
-    webhooks = []
-    for webhook in project.webhooks.all():
-        webhooks.append({
-            "id": webhook.pk,
-            "url": webhook.url,
-            "key": webhook.key,
-        })
-    return webhooks
+def _get_project_webhooks(project_id):
+    return list(Webhook.objects.filter(project_id=project_id)
+                               .order_by("id")
+                               .values("id", "url", "key"))
 
 
 def on_new_history_entry(sender, instance, created, **kwargs):
@@ -33,41 +31,39 @@ def on_new_history_entry(sender, instance, created, **kwargs):
     if instance.is_hidden:
         return None
 
-    model = history_service.get_model_from_key(instance.key)
-    pk = history_service.get_pk_from_key(instance.key)
-    try:
-        obj = model.objects.get(pk=pk)
-    except model.DoesNotExist:
-        # Catch simultaneous DELETE request
+    webhooks = _get_project_webhooks(instance.project_id)
+    if not webhooks:
         return None
 
-    webhooks = _get_project_webhooks(obj.project)
+    model = history_service.get_model_from_key(instance.key)
+    pk = model._meta.pk.to_python(history_service.get_pk_from_key(instance.key))
+    by = task_args.dump_instance_pk(get_user_model(), instance.user["pk"])
+    date = task_args.dump_value(timezone.now())
 
+    # The object is serialized once, in the task, for all the webhooks
     if instance.type == HistoryType.create:
-        task = tasks.create_webhook
-        extra_args = []
+        task = tasks.create_webhooks
+        extra_args = [task_args.dump_instance_pk(model, pk)]
     elif instance.type == HistoryType.change:
-        task = tasks.change_webhook
-        extra_args = [instance]
+        task = tasks.change_webhooks
+        extra_args = [task_args.dump_instance_pk(model, pk), task_args.dump_instance(instance)]
     elif instance.type == HistoryType.delete:
-        task = tasks.delete_webhook
-        extra_args = []
-
-    by = instance.owner
-    date = timezone.now()
-
-    webhooks_args = []
-    for webhook in webhooks:
-        args = [webhook["id"], webhook["url"], webhook["key"], by, date, obj] + extra_args
-        webhooks_args.append(args)
+        # The object will not exist anymore when the task is run
+        try:
+            obj = model.objects.get(pk=pk)
+        except model.DoesNotExist:
+            # Catch simultaneous DELETE request
+            return None
 
-    connection.on_commit(lambda: _execute_task(task, webhooks_args))
+        task = tasks.delete_webhooks
+        extra_args = [tasks.get_type(obj), task_args.dump_value(tasks.serialize(obj))]
 
+    args = [webhooks, by, date] + extra_args
+    connection.on_commit(lambda: _execute_task(task, args))
 
-def _execute_task(task, webhooks_args):
-    for webhook_args in webhooks_args:
 
-        if settings.CELERY_ENABLED:
-            task.delay(*webhook_args)
-        else:
-            task(*webhook_args)
+def _execute_task(task, args):
+    if settings.CELERY_ENABLED:
+        task.delay(*args)
+    else:
+        task(*args)
@@ -7,13 +7,19 @@
 
 import hmac
 import hashlib
+import logging
+import threading
 import requests
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
 from requests.exceptions import RequestException
 
 from django.conf import settings
+from django.db import connection
 
 from taiga.base.api.renderers import UnicodeJSONRenderer
-from taiga.base.utils import json, urls
+from taiga.base.utils import json, task_args, urls
 from taiga.base.utils.db import get_typename_for_model_instance
 from taiga.celery import app
 
@@ -22,10 +28,12 @@ from .serializers import (EpicSerializer, EpicRelatedUserStorySerializer,
                           WikiPageSerializer, MilestoneSerializer,
                           HistoryEntrySerializer, UserSerializer)
 
-from .models import WebhookLog
+from .models import Webhook, WebhookLog
 
+logger = logging.getLogger(__name__)
 
-def _serialize(obj):
+
+def serialize(obj):
     content_type = get_typename_for_model_instance(obj)
     if content_type == "epics.epic":
         return EpicSerializer(obj).data
@@ -45,7 +53,7 @@ def _serialize(obj):
         return HistoryEntrySerializer(obj).data
 
 
-def _get_type(obj):
+def get_type(obj):
     content_type = get_typename_for_model_instance(obj)
     return content_type.split(".")[1]
 
@@ -55,16 +63,67 @@ def _generate_signature(data, key):
     return mac.hexdigest()
 
 
-def _remove_leftover_webhooklogs(webhook_id):
-    # Only the last ten webhook logs traces are required
-    # so remove the leftover
-    ids = (WebhookLog.objects.filter(webhook_id=webhook_id)
-               .order_by("-id")
-               .values_list('id', flat=True)[10:])
-    WebhookLog.objects.filter(id__in=ids).delete()
+# Only the last ten webhook logs traces are required
+WEBHOOKLOGS_LIMIT = 10
+
+_LEFTOVER_WEBHOOKLOGS_SQL = """
+    DELETE FROM "webhooks_webhooklog"
+          WHERE "id" IN (SELECT "id"
+                           FROM (SELECT "id",
+                                        row_number() OVER (PARTITION BY "webhook_id" ORDER BY "id" DESC) "position"
+                                   FROM "webhooks_webhooklog"
+                                  WHERE "webhook_id" = ANY(%s)) "logs"
+                          WHERE "position" > %s)
+"""
+
+
+def _remove_leftover_webhooklogs(*webhook_ids):
+    with connection.cursor() as cursor:
+        cursor.execute(_LEFTOVER_WEBHOOKLOGS_SQL, [list(webhook_ids), WEBHOOKLOGS_LIMIT])
+
+
+# The HTTP sessions are kept, per worker thread, to reuse their keep-alive
+# connections with the hosts of the webhooks. A host can be shared by the
+# webhooks of different projects, so the sessions never store cookies.
+
+MAX_SESSIONS = 100
 
+_sessions = threading.local()
 
-def _send_request(webhook_id, url, key, data):
+
+def _get_session(url):
+    sessions = getattr(_sessions, "by_host", None)
+    if sessions is None:
+        sessions = _sessions.by_host = OrderedDict()
+
+    parts = urlsplit(url)
+    host = (parts.scheme, parts.netloc)
+    session = sessions.pop(host, None)
+    if session is None:
+        session = requests.Session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        if len(sessions) >= MAX_SESSIONS:
+            sessions.popitem(last=False)[1].close()
+
+    # The last used session is the last one to be closed
+    sessions[host] = session
+    return session
+
+
+def _save_log(webhook_log, logs):
+    if logs is None:
+        webhook_log.save()
+        _remove_leftover_webhooklogs(webhook_log.webhook_id)
+    else:
+        logs.append(webhook_log)
+    return webhook_log
+
+
+def _send_request(webhook_id, url, key, data, logs=None):
+    """
+    Send the data to a webhook and get its log. The log is saved or, if a
+    `logs` list is given, appended to it to be saved in bulk.
+    """
     serialized_data = UnicodeJSONRenderer().render(data)
     signature = _generate_signature(serialized_data, key)
     headers = {
@@ -78,92 +137,125 @@ def _send_request(webhook_id, url, key, data):
             urls.validate_private_url(url)
         except (urls.IpAddresValueError, urls.HostnameException) as e:
             # Error validating url
-            webhook_log = WebhookLog.objects.create(webhook_id=webhook_id,
-                                                    url=url,
-                                                    status=0,
-                                                    request_data=data,
-                                                    request_headers=dict(),
-                                                    response_data="error-in-request: {}".format(str(e)),
-                                                    response_headers={},
-                                                    duration=0)
-            _remove_leftover_webhooklogs(webhook_id)
-
-            return webhook_log
+            webhook_log = WebhookLog(webhook_id=webhook_id,
+                                     url=url,
+                                     status=0,
+                                     request_data=data,
+                                     request_headers=dict(),
+                                     response_data="error-in-request: {}".format(str(e)),
+                                     response_headers={},
+                                     duration=0)
+            return _save_log(webhook_log, logs)
 
     request = requests.Request('POST', url, data=serialized_data, headers=headers)
     prepared_request = request.prepare()
 
-    with requests.Session() as session:
-        response = None
+    session = _get_session(url)
+    response = None
+    try:
+        response = session.send(prepared_request, allow_redirects=settings.WEBHOOKS_ALLOW_REDIRECTS)
+
+        if not settings.WEBHOOKS_ALLOW_REDIRECTS and response.status_code in [301, 302, 303, 307, 308]:
+            raise RequestException("Redirects are not allowed")
+
+    except RequestException as e:
+        # Error sending the webhook
+        webhook_log = WebhookLog(webhook_id=webhook_id,
+                                 url=url,
+                                 status=response.status_code if response else 0,
+                                 request_data=data,
+                                 request_headers=dict(prepared_request.headers),
+                                 response_data="error-in-request: {}".format(str(e)),
+                                 response_headers={},
+                                 duration=0)
+    else:
+        # Webhook was sent successfully
+
+        # response.content can be a not valid json so we encapsulate it
+        response_data = json.dumps({"content": response.text})
+        webhook_log = WebhookLog(webhook_id=webhook_id, url=url,
+                                 status=response.status_code,
+                                 request_data=data,
+                                 request_headers=dict(prepared_request.headers),
+                                 response_data=response_data,
+                                 response_headers=dict(response.headers),
+                                 duration=response.elapsed.total_seconds())
+
+    return _save_log(webhook_log, logs)
+
+
+def _send_requests(webhooks, data):
+    """
+    Send the same data to some webhooks, their logs are saved in bulk.
+    """
+    logs = []
+    for webhook in webhooks:
+        # An error in a webhook must not stop the others
         try:
-            response = session.send(prepared_request, allow_redirects=settings.WEBHOOKS_ALLOW_REDIRECTS)
-
-            if not settings.WEBHOOKS_ALLOW_REDIRECTS and response.status_code in [301, 302, 303, 307, 308]:
-                raise RequestException("Redirects are not allowed")
-
-        except RequestException as e:
-            # Error sending the webhook
-            webhook_log = WebhookLog.objects.create(webhook_id=webhook_id,
-                                                    url=url,
-                                                    status=response.status_code if response else 0,
-                                                    request_data=data,
-                                                    request_headers=dict(prepared_request.headers),
-                                                    response_data="error-in-request: {}".format(str(e)),
-                                                    response_headers={},
-                                                    duration=0)
-        else:
-            # Webhook was sent successfully
-
-            # response.content can be a not valid json so we encapsulate it
-            response_data = json.dumps({"content": response.text})
-            webhook_log = WebhookLog.objects.create(webhook_id=webhook_id, url=url,
-                                                    status=response.status_code,
-                                                    request_data=data,
-                                                    request_headers=dict(prepared_request.headers),
-                                                    response_data=response_data,
-                                                    response_headers=dict(response.headers),
-                                                    duration=response.elapsed.total_seconds())
-        finally:
-            _remove_leftover_webhooklogs(webhook_id)
+            _send_request(webhook["id"], webhook["url"], webhook["key"], data, logs=logs)
+        except Exception:
+            logger.exception("Error sending the webhook %s", webhook["id"])
 
-    return webhook_log
+    # Skip the logs of the webhooks deleted meanwhile
+    webhook_ids = set(Webhook.objects.filter(id__in=[webhook["id"] for webhook in webhooks])
+                                     .values_list("id", flat=True))
+    WebhookLog.objects.bulk_create([log for log in logs if log.webhook_id in webhook_ids])
+    _remove_leftover_webhooklogs(*webhook_ids)
 
 
+# The model instances arguments of these tasks are references made with
+# `taiga.base.utils.task_args.dump_instance`.
+
+# The webhooks arguments are lists of {"id", "url", "key"} dicts, all of
+# them of the project of the object.
+
 @app.task
-def create_webhook(webhook_id, url, key, by, date, obj):
+def create_webhooks(webhooks, by, date, obj):
+    by, obj = task_args.load_instances(by, obj)
+    if obj is None:
+        # Deleted before running the task
+        return None
+
     data = {}
     data['action'] = "create"
-    data['type'] = _get_type(obj)
+    data['type'] = get_type(obj)
     data['by'] = UserSerializer(by).data
     data['date'] = date
-    data['data'] = _serialize(obj)
+    data['data'] = serialize(obj)
 
-    return _send_request(webhook_id, url, key, data)
+    _send_requests(webhooks, data)
 
 
 @app.task
-def delete_webhook(webhook_id, url, key, by, date, obj):
+def delete_webhooks(webhooks, by, date, obj_type, obj_data):
+    by = task_args.load_instances(by)[0]
+
     data = {}
     data['action'] = "delete"
-    data['type'] = _get_type(obj)
+    data['type'] = obj_type
     data['by'] = UserSerializer(by).data
     data['date'] = date
-    data['data'] = _serialize(obj)
+    data['data'] = obj_data
 
-    return _send_request(webhook_id, url, key, data)
+    _send_requests(webhooks, data)
 
 
 @app.task
-def change_webhook(webhook_id, url, key, by, date, obj, change):
+def change_webhooks(webhooks, by, date, obj, change):
+    by, obj, change = task_args.load_instances(by, obj, change)
+    if obj is None or change is None:
+        # Deleted before running the task
+        return None
+
     data = {}
     data['action'] = "change"
-    data['type'] = _get_type(obj)
+    data['type'] = get_type(obj)
     data['by'] = UserSerializer(by).data
     data['date'] = date
-    data['data'] = _serialize(obj)
-    data['change'] = _serialize(change)
+    data['data'] = serialize(obj)
+    data['change'] = serialize(change)
 
-    return _send_request(webhook_id, url, key, data)
+    _send_requests(webhooks, data)
 
 
 @app.task
@@ -173,6 +265,8 @@ def resend_webhook(webhook_id, url, key, data):
 
 @app.task
 def test_webhook(webhook_id, url, key, by, date):
+    by = task_args.load_instances(by)[0]
+
     data = {}
     data['action'] = "test"
     data['type'] = "test"
@@ -7,12 +7,19 @@
 
 import pytest
 
+from unittest import mock
+
+from django.conf import settings
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 from taiga.base.utils import json
+from taiga.projects.attachments.models import Attachment
+from taiga.projects.attachments.services import get_attachment_image_preview_url
+from taiga.projects.attachments.services import get_card_image_thumbnail_url
 
 from .. import factories as f
+from ..utils import DUMMY_BMP_DATA
 
 pytestmark = pytest.mark.django_db
 
@@ -71,6 +78,50 @@ def test_create_attachment_with_long_file_name(client):
     assert response.data["attached_file"].endswith("/"+100*"x"+".txt")
 
 
+def test_create_attachment_generates_the_thumbnails(client):
+    issue = f.create_issue()
+    f.MembershipFactory(project=issue.project, user=issue.owner, is_admin=True)
+
+    url = reverse("issue-attachments-list")
+
+    data = {"description": "test",
+            "object_id": issue.pk,
+            "project": issue.project.id,
+            "attached_file": SimpleUploadedFile("test.bmp", DUMMY_BMP_DATA)}
+
+    client.login(issue.owner)
+    response = client.post(url, data)
+    assert response.status_code == 201
+    assert response.data["thumbnail_card_url"] is not None
+
+    attachment = Attachment.objects.get(id=response.data["id"])
+    assert attachment.attached_file_thumbnails["source"] == attachment.attached_file.name
+    assert response.data["thumbnail_card_url"].endswith(
+        attachment.attached_file_thumbnails["aliases"][settings.THN_ATTACHMENT_CARD])
+
+
+def test_attachment_thumbnail_urls_while_the_thumbnails_are_pending(client):
+    attachment = f.IssueAttachmentFactory(attached_file=SimpleUploadedFile("test.bmp", DUMMY_BMP_DATA))
+    pending = {"source": attachment.attached_file.name, "aliases": {}}
+    Attachment.objects.filter(id=attachment.id).update(attached_file_thumbnails=pending)
+    attachment.refresh_from_db()
+
+    with mock.patch("taiga.base.utils.thumbnails.get_thumbnailer") as get_thumbnailer_mock:
+        assert get_card_image_thumbnail_url(attachment) is None
+        assert get_attachment_image_preview_url(attachment) is None
+    assert not get_thumbnailer_mock.called
+
+
+def test_attachment_thumbnail_urls_without_stored_thumbnails(client):
+    attachment = f.IssueAttachmentFactory(attached_file=SimpleUploadedFile("test.bmp", DUMMY_BMP_DATA))
+    # Uploaded before the thumbnails were generated in background
+    Attachment.objects.filter(id=attachment.id).update(attached_file_thumbnails=None)
+    attachment.refresh_from_db()
+
+    assert get_card_image_thumbnail_url(attachment) is not None
+    assert get_attachment_image_preview_url(attachment) is not None
+
+
 ######################################
 # Sorting attachments
 ######################################
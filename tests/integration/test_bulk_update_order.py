@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from taiga.projects.services import apply_order_updates, shift_orders_in_bulk
+from taiga.projects.userstories.models import UserStory
+
+from .. import factories as f
+from ..utils import disconnect_signals, reconnect_signals
+
+
+pytestmark = pytest.mark.django_db
+
+
+def setup_module():
+    disconnect_signals()
+
+
+def teardown_module():
+    reconnect_signals()
+
+
+def _create_user_stories(project, status, orders):
+    user_stories = [f.UserStoryFactory.create(project=project, status=status, kanban_order=order)
+                    for order in orders]
+    return [us.id for us in user_stories]
+
+
+def _get_orders(project):
+    return dict(UserStory.objects.filter(project=project).values_list("id", "kanban_order"))
+
+
+@pytest.mark.parametrize("orders,moves", [
+    ([1, 2, 3, 4, 5, 6], [(3, 2)]),
+    ([1, 2, 3, 4, 5, 6], [(0, 3)]),
+    ([1, 2, 3, 4, 5, 6], [(3, 2), (4, 3)]),
+    ([1, 2, 3, 4, 5, 6], [(0, 3), (1, 4)]),
+    ([1, 2, 3, 4, 5, 6], [(2, 3)]),
+    ([1, 1, 5, 5, 9, 9], [(5, 0), (0, 5)]),
+    ([10, 20, 30, 40], [(3, 15), (0, 35)]),
+])
+def test_shift_orders_in_bulk_is_equivalent_to_apply_order_updates(orders, moves):
+    project = f.ProjectFactory.create()
+    status = f.UserStoryStatusFactory.create(project=project)
+    ids = _create_user_stories(project, status, orders)
+
+    base_orders = _get_orders(project)
+    new_orders = [(ids[index], order) for index, order in moves]
+    apply_order_updates(base_orders, dict(new_orders))
+
+    updated = shift_orders_in_bulk(UserStory, "kanban_order", new_orders,
+                                   {"project_id": project.id, "status_id": status.id})
+
+    assert updated == base_orders
+    expected_orders = dict(zip(ids, orders))
+    expected_orders.update(base_orders)
+    assert _get_orders(project) == expected_orders
+
+
+def test_shift_orders_in_bulk_is_limited_to_the_scope():
+    project = f.ProjectFactory.create()
+    status1 = f.UserStoryStatusFactory.create(project=project)
+    status2 = f.UserStoryStatusFactory.create(project=project)
+    ids1 = _create_user_stories(project, status1, [1, 2, 3])
+    ids2 = _create_user_stories(project, status2, [1, 2, 3])
+
+    updated = shift_orders_in_bulk(UserStory, "kanban_order", [(ids1[2], 1), (ids2[0], 3)],
+                                   {"project_id": project.id, "status_id": status1.id})
+
+    assert updated == {ids1[2]: 1, ids1[0]: 2, ids1[1]: 3}
+    assert _get_orders(project) == {ids1[0]: 2, ids1[1]: 3, ids1[2]: 1,
+                                    ids2[0]: 1, ids2[1]: 2, ids2[2]: 3}
+
+
+def test_shift_orders_in_bulk_remove_equal_original():
+    project = f.ProjectFactory.create()
+    ids = _create_user_stories(project, None, [1, 2, 3])
+
+    updated = shift_orders_in_bulk(UserStory, "kanban_order", [(ids[2], 3)],
+                                   {"project_id": project.id}, remove_equal_original=True)
+
+    assert updated == {}
+
+
+def test_shift_orders_in_bulk_runs_one_statement_per_move():
+    project = f.ProjectFactory.create()
+    ids = _create_user_stories(project, None, range(20))
+
+    with CaptureQueriesContext(connection) as captured:
+        shift_orders_in_bulk(UserStory, "kanban_order", [(ids[15], 2)], {"project_id": project.id})
+
+    assert len(captured) == 1
+
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+import json
+import pytest
+from unittest.mock import patch
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from taiga.events import events
+from taiga.events.backends.postgresql import EventsPushBackend
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def test_emit_event_without_transaction():
+    with patch("taiga.events.backends.base.BaseEventsPushBackend.emit_events") as emit_events_mock:
+        events.emit_event({"pk": 1}, "changes.project.1.userstories", sessionid="test")
+
+    assert emit_events_mock.call_count == 1
+    assert len(emit_events_mock.call_args[0][0]) == 1
+
+
+def test_emit_events_of_a_transaction_together():
+    with patch("taiga.events.backends.base.BaseEventsPushBackend.emit_events") as emit_events_mock:
+        with transaction.atomic():
+            events.emit_event({"pk": 1}, "changes.project.1.userstories", sessionid="test")
+            events.emit_event({"pk": 2}, "changes.project.1.userstories", sessionid="test")
+            events.emit_event({"pk": 3}, "changes.project.1.tasks", sessionid="test")
+            assert emit_events_mock.call_count == 0
+
+    assert emit_events_mock.call_count == 1
+    emitted = emit_events_mock.call_args[0][0]
+    assert [e["routing_key"] for e in emitted] == ["changes.project.1.userstories",
+                                                  "changes.project.1.userstories",
+                                                  "changes.project.1.tasks"]
+
+
+def test_emit_events_of_a_rolled_back_savepoint_are_discarded():
+    with patch("taiga.events.backends.base.BaseEventsPushBackend.emit_events") as emit_events_mock:
+        with transaction.atomic():
+            events.emit_event({"pk": 1}, "changes.project.1.userstories", sessionid="test")
+            try:
+                with transaction.atomic():
+                    events.emit_event({"pk": 2}, "changes.project.1.userstories", sessionid="test")
+                    raise ValueError()
+            except ValueError:
+                pass
+
+    emitted = [e for call in emit_events_mock.call_args_list for e in call[0][0]]
+    assert len(emitted) == 1
+    assert '"pk": 1' in emitted[0]["message"]
+
+
+def test_emit_events_of_a_rolled_back_transaction_are_discarded():
+    with patch("taiga.events.backends.base.BaseEventsPushBackend.emit_events") as emit_events_mock:
+        try:
+            with transaction.atomic():
+                events.emit_event({"pk": 1}, "changes.project.1.userstories", sessionid="test")
+                raise ValueError()
+        except ValueError:
+            pass
+
+        with transaction.atomic():
+            events.emit_event({"pk": 2}, "changes.project.1.userstories", sessionid="test")
+
+    emitted = [e for call in emit_events_mock.call_args_list for e in call[0][0]]
+    assert len(emitted) == 1
+    assert '"pk": 2' in emitted[0]["message"]
+
+
+def test_emit_events_of_a_savepoint_before_a_rolled_back_one():
+    with patch("taiga.events.backends.base.BaseEventsPushBackend.emit_events") as emit_events_mock:
+        with transaction.atomic():
+            with transaction.atomic():
+                events.emit_event({"pk": 1}, "changes.project.1.userstories", sessionid="test")
+            try:
+                with transaction.atomic():
+                    events.emit_event({"pk": 2}, "changes.project.1.userstories", sessionid="test")
+                    raise ValueError()
+            except ValueError:
+                pass
+
+    assert emit_events_mock.call_count == 1
+    emitted = emit_events_mock.call_args[0][0]
+    assert len(emitted) == 1
+    assert '"pk": 1' in emitted[0]["message"]
+
+def _emit_change(pk, routing_key="changes.project.1.userstories.userstory", type="change"):
+    events.emit_event({"type": type, "matches": "userstories.userstory", "pk": pk}, routing_key, sessionid="test")
+
+
+def test_emit_changes_of_a_transaction_merged_by_routing_key():
+    with patch("taiga.events.backends.base.BaseEventsPushBackend.emit_events") as emit_events_mock:
+        with transaction.atomic():
+            for pk in range(1, 501):
+                with transaction.atomic():
+                    _emit_change(pk)
+            _emit_change(1)
+            _emit_change(1, type="delete")
+            _emit_change(1, routing_key="changes.project.2.userstories.userstory")
+
+    assert emit_events_mock.call_count == 1
+    emitted = emit_events_mock.call_args[0][0]
+    assert [e["routing_key"] for e in emitted] == ["changes.project.1.userstories.userstory",
+                                                  "changes.project.1.userstories.userstory",
+                                                  "changes.project.2.userstories.userstory"]
+    assert [json.loads(e["message"])["data"]["pk"] for e in emitted] == [list(range(1, 501)), 1, 1]
+
+
+def test_emit_event_for_ids_of_any_iterable():
+    with patch("taiga.events.backends.base.BaseEventsPushBackend.emit_events") as emit_events_mock:
+        with transaction.atomic():
+            events.emit_event_for_ids({1: 1, 2: 2}.keys(), "userstories.userstory", 1, sessionid="test")
+
+    emitted = emit_events_mock.call_args[0][0]
+    assert [json.loads(e["message"])["data"]["pk"] for e in emitted] == [[1, 2]]
+
+def test_emit_merged_changes_in_chunks():
+    with patch("taiga.events.backends.base.BaseEventsPushBackend.emit_events") as emit_events_mock:
+        with transaction.atomic():
+            for pk in range(100000, 103000):
+                _emit_change(pk)
+
+    emitted = emit_events_mock.call_args[0][0]
+    assert len(emitted) > 1
+    assert all(len(e["message"].encode("utf-8")) <= EventsPushBackend.max_message_size for e in emitted)
+    pks = [pk for e in emitted for pk in json.loads(e["message"])["data"]["pk"]]
+    assert pks == list(range(100000, 103000))
+
+
+def test_postgresql_backend_emits_events_in_one_transaction():
+    backend = EventsPushBackend()
+    with CaptureQueriesContext(connection) as captured:
+        backend.emit_events([{"message": "{}", "routing_key": "changes.project.1.userstories"},
+                             {"message": "{}", "routing_key": "changes.project.1.tasks"}])
+
+    statements = [query["sql"] for query in captured]
+    assert len([sql for sql in statements if sql.startswith("NOTIFY")]) == 2
+    assert not [sql for sql in statements if "SAVEPOINT" in sql]
@@ -16,7 +16,7 @@ from .. import factories as f
 
 from taiga.base.utils import json
 from taiga.projects.history import services
-from taiga.projects.history.models import HistoryEntry
+from taiga.projects.history.models import HistoryEntry, HistoryLastSnapshot
 from taiga.projects.history.choices import HistoryType
 from taiga.projects.history.services import make_key_from_model_object
 
@@ -132,6 +132,94 @@ def test_real_snapshot_frequency(settings):
     assert qs_partials.count() == 2
 
 
+def test_take_snapshot_updates_last_snapshot(settings):
+    settings.MAX_PARTIAL_DIFFS = 2
+    issue = f.IssueFactory.create()
+    key = make_key_from_model_object(issue)
+
+    services.take_snapshot(issue, user=issue.owner)
+    last_snapshot = HistoryLastSnapshot.objects.get(key=key)
+    assert last_snapshot.partial_diffs == 0
+    assert last_snapshot.entry.is_snapshot
+
+    for counter in range(3):
+        issue.description = "desc{}".format(counter)
+        issue.save()
+        services.take_snapshot(issue, user=issue.owner)
+
+        last_snapshot = HistoryLastSnapshot.objects.get(key=key)
+        snapshot, partial_diffs, entry = services.rebuild_last_snapshot_for_key(key)
+        assert last_snapshot.snapshot == snapshot
+        assert last_snapshot.partial_diffs == partial_diffs
+        assert last_snapshot.entry == entry
+
+    assert last_snapshot.snapshot["description"] == "desc2"
+    assert last_snapshot.partial_diffs == 0
+
+
+def test_take_snapshot_does_not_rebuild_from_partial_diffs(settings):
+    issue = f.IssueFactory.create()
+    services.take_snapshot(issue, user=issue.owner)
+    issue.description = "foo1"
+    issue.save()
+    services.take_snapshot(issue, user=issue.owner)
+
+    issue.description = "foo2"
+    issue.save()
+    with patch("taiga.projects.history.services.rebuild_last_snapshot_for_key") as rebuild_mock:
+        services.take_snapshot(issue, user=issue.owner)
+        assert rebuild_mock.call_count == 0
+
+    last_entry = HistoryEntry.objects.order_by("-created_at").first()
+    assert last_entry.diff["description"] == ["foo1", "foo2"]
+
+
+def test_last_snapshot_is_not_modified_by_the_entry_values_diff():
+    issue = f.IssueFactory.create()
+    key = make_key_from_model_object(issue)
+    custom_attr = f.IssueCustomAttributeFactory(project=issue.project)
+    services.take_snapshot(issue, user=issue.owner)
+
+    issue.custom_attributes_values.attributes_values = {str(custom_attr.id): "test"}
+    issue.custom_attributes_values.save()
+    entry = services.take_snapshot(issue, user=issue.owner)
+    assert len(entry.values_diff["custom_attributes"]["new"]) == 1
+
+    last_snapshot = HistoryLastSnapshot.objects.get(key=key)
+    assert all("value_diff" not in attr for attr in last_snapshot.snapshot["custom_attributes"])
+
+def test_history_entries_created_out_of_take_snapshot_invalidate_last_snapshot():
+    issue = f.IssueFactory.create()
+    key = make_key_from_model_object(issue)
+    services.take_snapshot(issue, user=issue.owner)
+    assert HistoryLastSnapshot.objects.filter(key=key).exists()
+
+    HistoryEntry.objects.create(project=issue.project, key=key, type=HistoryType.change,
+                                diff={"subject": ["old", "new"]}, user={"pk": None, "name": ""})
+    assert not HistoryLastSnapshot.objects.filter(key=key).exists()
+
+    obj, _ = services.get_last_snapshot_for_key(key)
+    assert obj.snapshot["subject"] == "new"
+
+
+def test_rebuild_history_last_snapshots_command():
+    from django.core.management import call_command
+
+    issue = f.IssueFactory.create()
+    key = make_key_from_model_object(issue)
+    services.take_snapshot(issue, user=issue.owner)
+    issue.description = "foo1"
+    issue.save()
+    services.take_snapshot(issue, user=issue.owner)
+    HistoryLastSnapshot.objects.all().delete()
+
+    call_command("rebuild_history_last_snapshots")
+
+    last_snapshot = HistoryLastSnapshot.objects.get(key=key)
+    assert last_snapshot.snapshot["description"] == "foo1"
+    assert last_snapshot.partial_diffs == 1
+
+
 def test_issue_resource_history_test(client):
     user = f.UserFactory.create()
     project = f.ProjectFactory.create(owner=user)
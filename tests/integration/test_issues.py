@@ -13,12 +13,15 @@ from urllib.parse import quote
 
 from unittest import mock
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
 from taiga.base.utils import json
 from taiga.permissions.choices import MEMBERS_PERMISSIONS, ANON_PERMISSIONS
 from taiga.projects.issues import services
+from taiga.projects.issues.models import Issue
 from taiga.projects.userstories.models import UserStory
 from taiga.projects.occ import OCCResourceMixin
 
@@ -613,6 +616,29 @@ def test_api_filters_data(client):
     assert next(filter(lambda i: i['name'] == tag3, response.data["tags"]))["count"] == 3
 
 
+def test_get_issues_filters_data_in_a_single_query():
+    data = create_filter_issues_context()
+    project = data["project"]
+    (user1, user2, user3, ) = data["users"]
+    (status0, status1, status2, status3, ) = data["statuses"]
+
+    queryset = Issue.objects.filter(project=project)
+    querysets = {name: queryset.filter(owner=user2)
+                 for name in ("types", "statuses", "priorities", "severities",
+                              "assigned_to", "owners", "tags", "roles")}
+    querysets["statuses"] = queryset
+
+    with CaptureQueriesContext(connection) as captured:
+        filters_data = services.get_issues_filters_data(project, querysets)
+    assert len(captured) == 1
+
+    statuses = {status["id"]: status["count"] for status in filters_data["statuses"]}
+    assert [statuses[status.id] for status in (status0, status1, status2, status3)] == [3, 2, 1, 4]
+
+    owners = {owner["id"]: owner["count"] for owner in filters_data["owners"]}
+    assert owners == {user2.id: 4}
+
+
 def test_get_invalid_csv(client):
     url = reverse("issues-csv")
     project = f.ProjectFactory.create(issues_csv_uuid=uuid.uuid4().hex)
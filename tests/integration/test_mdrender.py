@@ -7,8 +7,17 @@
 
 import pytest
 
-from taiga.mdrender.service import render, render_and_extract
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
+from taiga.mdrender.service import get_rendered_html, render, render_and_extract
+from taiga.projects.attachments.services import REFRESH_PARAM
+from taiga.projects.services import update_rendered_html
+from taiga.projects.userstories.models import UserStory
+from taiga.projects.userstories.serializers import UserStorySerializer
+from taiga.projects.userstories.utils import attach_extra_info
+
+from unittest import mock
 from unittest.mock import MagicMock
 
 from .. import factories
@@ -61,3 +70,115 @@ def test_proccessor_valid_email():
     result = render(dummy_project, "**beta.tester@taiga.io**")
     expected_result = "<p><strong><a href=\"mailto:beta.tester@taiga.io\" target=\"_blank\">beta.tester@taiga.io</a></strong></p>"
     assert result == expected_result
+
+
+def test_rendered_html_is_stored_on_save():
+    us = factories.UserStoryFactory(description="**bold**")
+    assert us.description_html == "<p><strong>bold</strong></p>"
+
+    us.subject = "new subject"
+    with mock.patch("taiga.projects.services.rendered_html.mdrender") as mdrender_mock:
+        us.save()
+    assert not mdrender_mock.called
+    assert UserStory.objects.get(id=us.id).description_html == "<p><strong>bold</strong></p>"
+
+    us.description = ""
+    us.save()
+    assert UserStory.objects.get(id=us.id).description_html == ""
+
+
+def test_serializer_uses_stored_rendered_html():
+    us = factories.UserStoryFactory(description="**bold**")
+    with mock.patch("taiga.mdrender.service.render") as render_mock:
+        data = UserStorySerializer(attach_extra_info(UserStory.objects.all(), user=us.owner).get(id=us.id)).data
+    assert not render_mock.called
+    assert data["description_html"] == "<p><strong>bold</strong></p>"
+
+
+def test_rendered_html_of_references_is_refreshed_on_subject_change():
+    project = factories.ProjectFactory()
+    referenced = factories.UserStoryFactory(project=project, subject="old subject")
+    us = factories.UserStoryFactory(project=project, description="see #{}".format(referenced.ref))
+    assert "old subject" in us.description_html
+
+    referenced.subject = "new subject"
+    referenced.save()
+    assert "new subject" in UserStory.objects.get(id=us.id).description_html
+
+
+def test_rendered_html_is_refreshed_on_project_slug_change():
+    from django.core.management import call_command
+
+    project = factories.ProjectFactory()
+    referenced = factories.UserStoryFactory(project=project)
+    us = factories.UserStoryFactory(project=project, description="see #{}".format(referenced.ref))
+
+    call_command("change_project_slug", project.slug, "new-project-slug")
+    assert "/project/new-project-slug/" in UserStory.objects.get(id=us.id).description_html
+
+def test_rendered_html_of_references_is_refreshed_on_delete():
+    project = factories.ProjectFactory()
+    referenced = factories.UserStoryFactory(project=project, subject="deleted subject")
+    us = factories.UserStoryFactory(project=project, description="see #{}".format(referenced.ref))
+    assert "deleted subject" in us.description_html
+
+    referenced.delete()
+    assert "deleted subject" not in UserStory.objects.get(id=us.id).description_html
+
+
+def test_rendered_html_with_attachments_is_rendered_on_read():
+    us = factories.UserStoryFactory(description="[file](http://localhost:8000/media/file.txt#{}=us:1)".format(
+        REFRESH_PARAM))
+    UserStory.objects.filter(id=us.id).update(description_html="<p>{} stale</p>".format(REFRESH_PARAM))
+    us = UserStory.objects.get(id=us.id)
+
+    assert get_rendered_html(us, "description") == render(us.project, us.description)
+
+
+def test_rendered_html_of_mentions_is_refreshed_on_user_rename():
+    user = factories.UserFactory(username="user1", full_name="old name")
+    project = factories.ProjectFactory()
+    factories.MembershipFactory(user=user, project=project)
+    us = factories.UserStoryFactory(project=project, description="@user1")
+    assert "old name" in us.description_html
+
+    user.full_name = "new name"
+    user.save()
+    assert "new name" in UserStory.objects.get(id=us.id).description_html
+
+
+def test_update_rendered_html_only_missing():
+    us = factories.UserStoryFactory(description="**bold**")
+    UserStory.objects.filter(id=us.id).update(description_html=None, blocked_note_html=None)
+
+    assert update_rendered_html(project_ids=[us.project_id]) == 1
+    assert UserStory.objects.get(id=us.id).description_html == "<p><strong>bold</strong></p>"
+    assert update_rendered_html(project_ids=[us.project_id]) == 0
+
+
+def _create_reference_heavy_project(num_items):
+    project = factories.ProjectFactory()
+    users = [factories.UserFactory(username="user{}".format(i)) for i in range(num_items)]
+    for user in users:
+        factories.MembershipFactory(user=user, project=project)
+    us_list = [factories.UserStoryFactory(project=project) for i in range(num_items)]
+    issues = [factories.IssueFactory(project=project) for i in range(num_items)]
+    text = "\n\n".join("* @{} see #{} and #{}".format(user.username, us.ref, issue.ref)
+                       for user, us, issue in zip(users, us_list, issues))
+    return project, users, us_list + issues, text
+
+
+def test_render_and_extract_resolves_mentions_and_references_in_bulk():
+    project, users, items, text = _create_reference_heavy_project(5)
+    # Warm up the content types cache
+    render_and_extract(project, text)
+
+    with CaptureQueriesContext(connection) as captured:
+        (result, extracted) = render_and_extract(project, text + "\n\n@notvaliduser #9999")
+
+    # users, references and one query per content type of the references
+    assert len(captured) == 4
+    assert sorted(extracted["mentions"], key=lambda user: user.id) == sorted(users, key=lambda user: user.id)
+    assert sorted(extracted["references"], key=lambda item: item.ref) == sorted(items, key=lambda item: item.ref)
+    assert "@notvaliduser #9999" in result
+
@@ -10,10 +10,14 @@ import pytest
 from datetime import timedelta
 from urllib.parse import quote
 
+from django.core.management import call_command
 from django.urls import reverse
 from django.utils import timezone
 
 from taiga.base.utils import json
+from taiga.projects.milestones import services
+from taiga.projects.milestones.models import BurndownPoints, Milestone
+from taiga.projects.tasks.models import Task
 
 from .. import factories as f
 
@@ -375,3 +379,112 @@ def test_api_move_issues_to_another_sprint_close_previous(client):
     assert project.milestones.get(id=milestone1.id).issues.count() == 1
     assert project.milestones.get(id=milestone2.id).issues.count() == 1
     assert project.milestones.get(id=milestone1.id).closed
+
+
+def _create_sprint_with_burndown():
+    user = f.UserFactory.create()
+    project = f.ProjectFactory.create(owner=user)
+    role = f.RoleFactory.create(project=project, computable=True)
+    f.MembershipFactory.create(project=project, user=user, role=role, is_admin=True)
+    points = f.PointsFactory.create(project=project, value=6)
+    start = timezone.now().date() - timedelta(days=5)
+    sprint = f.MilestoneFactory.create(project=project, owner=user, estimated_start=start,
+                                       estimated_finish=start + timedelta(days=10))
+    open_task_status = f.TaskStatusFactory.create(project=project, is_closed=False)
+    closed_task_status = f.TaskStatusFactory.create(project=project, is_closed=True)
+    closed_us_status = f.UserStoryStatusFactory.create(project=project, is_closed=True)
+
+    def _create_user_story(**kwargs):
+        us = f.UserStoryFactory.create(project=project, owner=user, milestone=sprint, **kwargs)
+        role_points = us.role_points.get(role=role)
+        role_points.points = points
+        role_points.save()
+        return us
+
+    # Two of three tasks closed, the first one before the start of the sprint
+    us1 = _create_user_story()
+    task1 = f.TaskFactory.create(project=project, milestone=sprint, user_story=us1, status=closed_task_status)
+    f.TaskFactory.create(project=project, milestone=sprint, user_story=us1, status=closed_task_status)
+    f.TaskFactory.create(project=project, milestone=sprint, user_story=us1, status=open_task_status)
+    Task.objects.filter(id=task1.id).update(finished_date=timezone.now() - timedelta(days=10))
+    services.update_burndown_points(user_story_ids=[us1.id])
+
+    # Closed without tasks
+    _create_user_story(status=closed_us_status)
+
+    return user, sprint
+
+
+def test_burndown_points_match_milestone_closed_points_by_date():
+    user, sprint = _create_sprint_with_burndown()
+
+    closed_points_by_date = services.get_closed_points_by_date(sprint)
+
+    sprint = Milestone.objects.get(id=sprint.id)
+    current_date = sprint.estimated_start
+    while current_date <= sprint.estimated_finish:
+        assert closed_points_by_date[current_date] == sprint.total_closed_points_by_date(current_date)
+        current_date = current_date + timedelta(days=1)
+
+    assert closed_points_by_date[sprint.estimated_start] == 2
+    assert closed_points_by_date[sprint.estimated_finish] == 10
+
+
+def test_burndown_points_when_reopen_task():
+    user, sprint = _create_sprint_with_burndown()
+    open_task_status = f.TaskStatusFactory.create(project=sprint.project, is_closed=False)
+
+    for task in Task.objects.filter(milestone=sprint, status__is_closed=True):
+        task.status = open_task_status
+        task.save()
+
+    closed_points_by_date = services.get_closed_points_by_date(sprint)
+    assert closed_points_by_date[sprint.estimated_finish] == 6
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_delete_closed_user_story_with_tasks(client):
+    user, sprint = _create_sprint_with_burndown()
+    closed_task_status = f.TaskStatusFactory.create(project=sprint.project, is_closed=True)
+    us = sprint.user_stories.filter(tasks__isnull=False).distinct().get()
+    for task in us.tasks.all():
+        task.status = closed_task_status
+        task.save()
+    assert sprint.user_stories.get(id=us.id).is_closed
+
+    client.login(user)
+    response = client.delete(reverse("userstories-detail", args=[us.pk]))
+
+    assert response.status_code == 204
+    assert not BurndownPoints.objects.filter(user_story_id=us.id).exists()
+    assert services.get_closed_points_by_date(sprint)[sprint.estimated_finish] == 6
+
+
+def test_api_milestone_stats(client):
+    user, sprint = _create_sprint_with_burndown()
+    url = reverse("milestones-stats", args=[sprint.pk])
+
+    client.login(user)
+    response = client.json.get(url)
+
+    assert response.status_code == 200
+    assert sum(response.data["total_points"].values()) == 12
+    assert sum(response.data["completed_points"]) == 6
+    assert response.data["total_userstories"] == 2
+    assert response.data["completed_userstories"] == 1
+    assert response.data["total_tasks"] == 3
+    assert response.data["completed_tasks"] == 2
+    assert response.data["iocaine_doses"] == 0
+    assert response.data["days"][0]["open_points"] == 10
+    assert response.data["days"][-1]["open_points"] == 2
+
+
+def test_rebuild_milestones_burndown_command():
+    user, sprint = _create_sprint_with_burndown()
+    expected = services.get_closed_points_by_date(sprint)
+
+    BurndownPoints.objects.filter(milestone=sprint).delete()
+    assert services.get_closed_points_by_date(sprint)[sprint.estimated_finish] == 0
+
+    call_command("rebuild_milestones_burndown", projects=[sprint.project_id])
+    assert services.get_closed_points_by_date(sprint) == expected
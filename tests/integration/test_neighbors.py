@@ -7,6 +7,10 @@
 
 import pytest
 
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+
 from taiga.projects.userstories.models import UserStory
 from taiga.projects.issues.models import Issue
 from taiga.base import neighbors as n
@@ -316,3 +320,59 @@ class TestIssues:
         assert issue1_neighbors.right == issue2
         assert issue2_neighbors.left == issue1
         assert issue2_neighbors.right is None
+
+
+@pytest.mark.django_db
+class TestKeyset:
+    def test_keyset_lookup_does_not_scan_the_results_set(self):
+        project = f.ProjectFactory.create()
+        severity = f.SeverityFactory.create(project=project)
+
+        issue1 = f.IssueFactory.create(project=project, severity=severity)
+        issue2 = f.IssueFactory.create(project=project, severity=severity)
+        issue3 = f.IssueFactory.create(project=project, severity=severity)
+
+        issues = Issue.objects.filter(project=project).order_by("severity", "-id")
+
+        with CaptureQueriesContext(connection) as captured:
+            neighbors = n.get_neighbors(issue2, results_set=issues)
+
+        assert len(captured) == 3
+        assert all("ROW_NUMBER" not in query["sql"] for query in captured.captured_queries)
+        assert all("LIMIT 1" in query["sql"] for query in captured.captured_queries)
+        assert neighbors.left == issue3
+        assert neighbors.right == issue1
+
+    def test_ordering_by_nullable_field_asc(self):
+        project = f.ProjectFactory.create()
+        assigned_to1 = f.UserFactory.create(full_name="Chuck Norris")
+        issue1 = f.IssueFactory.create(project=project, assigned_to=None)
+        issue2 = f.IssueFactory.create(project=project, assigned_to=assigned_to1)
+        issue3 = f.IssueFactory.create(project=project, assigned_to=None)
+
+        issues = Issue.objects.filter(project=project).order_by("assigned_to__full_name", "-id")
+
+        issue2_neighbors = n.get_neighbors(issue2, results_set=issues)
+        issue3_neighbors = n.get_neighbors(issue3, results_set=issues)
+
+        assert issue2_neighbors.left is None
+        assert issue2_neighbors.right == issue3
+        assert issue3_neighbors.left == issue2
+        assert issue3_neighbors.right == issue1
+
+    def test_ordering_not_supported_falls_back_to_row_number(self):
+        project = f.ProjectFactory.create()
+
+        us1 = f.UserStoryFactory.create(project=project, backlog_order=3)
+        us2 = f.UserStoryFactory.create(project=project, backlog_order=2)
+        us3 = f.UserStoryFactory.create(project=project, backlog_order=1)
+
+        user_stories = (UserStory.objects.annotate(negative_order=-F("backlog_order"))
+                                         .order_by("negative_order"))
+
+        with CaptureQueriesContext(connection) as captured:
+            neighbors = n.get_neighbors(us2, results_set=user_stories)
+
+        assert "ROW_NUMBER" in captured.captured_queries[0]["sql"]
+        assert neighbors.left == us1
+        assert neighbors.right == us3
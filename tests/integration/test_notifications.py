@@ -191,7 +191,6 @@ def test_users_to_notify():
     policy_member1.notify_level = NotifyLevel.all
     policy_member1.save()
 
-    del project.cached_notify_policies
     users = services.get_users_to_notify(issue)
     assert len(users) == 2
     assert users == {member1.user, issue.get_owner()}
@@ -201,7 +200,6 @@ def test_users_to_notify():
     policy_member3.notify_level = NotifyLevel.all
     policy_member3.save()
 
-    del project.cached_notify_policies
     users = services.get_users_to_notify(issue)
     assert len(users) == 3
     assert users == {member1.user, member3.user, issue.get_owner()}
@@ -211,14 +209,12 @@ def test_users_to_notify():
     policy_member3.save()
 
     issue.add_watcher(member3.user)
-    del project.cached_notify_policies
     users = services.get_users_to_notify(issue)
     assert len(users) == 2
     assert users == {member1.user, issue.get_owner()}
 
     # Test with watchers without permissions
     issue.add_watcher(member5.user)
-    del project.cached_notify_policies
     users = services.get_users_to_notify(issue)
     assert len(users) == 2
     assert users == {member1.user, issue.get_owner()}
@@ -234,6 +230,47 @@ def test_users_to_notify():
     assert users == {member1.user, issue.get_owner()}
 
 
+def test_get_notify_candidates_in_one_query(django_assert_num_queries):
+    project = f.ProjectFactory.create(anon_permissions=[])
+    role = f.RoleFactory.create(project=project, permissions=["view_issues"])
+    member1 = f.MembershipFactory.create(project=project, role=role)
+    member2 = f.MembershipFactory.create(project=project, role=role)
+    policy_member1 = member1.user.notify_policies.get(project=project)
+    policy_member1.notify_level = NotifyLevel.all
+    policy_member1.live_notify_level = NotifyLevel.none
+    policy_member1.save()
+    issue = f.IssueFactory.create(project=project, owner=member2.user)
+    watcher_without_perms = f.UserFactory.create()
+    issue.add_watcher(watcher_without_perms)
+    services.get_notify_candidates(issue)
+
+    with django_assert_num_queries(1):
+        candidates = services.get_notify_candidates(issue, discard_users=[member2.user])
+
+    assert {user.id: user.is_notificable for user in candidates} == {
+        member1.user.id: True,
+        member2.user.id: False,
+        watcher_without_perms.id: False,
+    }
+    assert services.get_users_to_notify(issue, candidates=candidates) == {member1.user}
+    assert services.get_users_to_notify(issue, candidates=candidates, live=True) == set()
+
+
+def test_get_notify_candidates_creates_missing_notify_policies():
+    project = f.ProjectFactory.create(anon_permissions=["view_issues"])
+    issue = f.IssueFactory.create(project=project)
+    watching_user = f.UserFactory()
+    issue.add_watcher(watching_user)
+    watching_user.notify_policies.filter(project=project).delete()
+
+    users = services.get_users_to_notify(issue)
+
+    assert users == {watching_user, issue.owner}
+    policy = watching_user.notify_policies.get(project=project)
+    assert policy.notify_level == NotifyLevel.involved
+    assert policy.live_notify_level == NotifyLevel.involved
+
+
 def test_watching_users_to_notify_on_issue_modification_1():
     # If:
     # - the user is watching the issue
@@ -10,6 +10,7 @@ from unittest.mock import patch
 
 from django.urls import reverse
 
+from taiga.base.utils import db
 from taiga.base.utils import json
 
 from .. import factories as f
@@ -347,3 +348,39 @@ def test_invalid_save_without_version_parameter(client):
         data = {"subject": "test 1"}
         response = client.patch(url, json.dumps(data), content_type="application/json")
         assert response.status_code == 400
+
+
+def test_valid_save_checks_and_increments_version_at_once(client):
+    user = f.UserFactory.create()
+    project = f.ProjectFactory.create(owner=user)
+    f.MembershipFactory.create(project=project, user=user, is_admin=True)
+    client.login(user)
+
+    mock_path = "taiga.projects.userstories.api.UserStoryViewSet.pre_conditions_on_save"
+    with patch(mock_path):
+        url = reverse("userstories-list")
+        data = {"subject": "test",
+                "project": project.id,
+                "status": f.UserStoryStatusFactory.create(project=project).id}
+        response = client.json.post(url, json.dumps(data))
+        assert response.status_code == 201
+
+        userstory_id = response.data["id"]
+        url = reverse("userstories-detail", args=(userstory_id,))
+        with patch("taiga.projects.occ.mixins.get_modified_fields") as get_modified_fields_mock, \
+                patch("taiga.projects.occ.mixins.db.reload_attribute") as reload_attribute_mock:
+            data = {"version": 1, "subject": "test 1"}
+            response = client.patch(url, json.dumps(data), content_type="application/json")
+
+        assert response.status_code == 200
+        assert response.data["version"] == 2
+        assert not get_modified_fields_mock.called
+        assert not reload_attribute_mock.called
+
+
+def test_increment_attribute_if_matches():
+    us = f.UserStoryFactory.create(version=3)
+
+    assert db.increment_attribute_if_matches(us, "version", 2) is None
+    assert db.increment_attribute_if_matches(us, "version", 3) == 4
+    assert db.reload_attribute(us, "version") == 4
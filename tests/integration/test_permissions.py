@@ -9,6 +9,9 @@ import pytest
 
 from taiga.permissions import services, choices
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
 from .. import factories
 
@@ -120,3 +123,63 @@ def test_authenticated_user_has_perm_on_project_related_object():
 def test_authenticated_user_has_perm_on_invalid_object():
     user1 = factories.UserFactory()
     assert services.user_has_perm(user1, "test", user1) is False
+
+
+def test_user_project_permissions_are_memoized_in_the_user():
+    user = factories.UserFactory()
+    project = factories.ProjectFactory()
+    role = factories.RoleFactory(project=project, permissions=["view_us"])
+    factories.MembershipFactory(user=user, project=project, role=role)
+
+    permissions = services.get_user_project_permissions(user, project)
+    assert permissions == {"view_us"}
+    assert services.get_user_project_permissions(user, project) is permissions
+
+
+def test_user_project_permissions_are_invalidated_when_a_role_changes():
+    user = factories.UserFactory()
+    project = factories.ProjectFactory()
+    role = factories.RoleFactory(project=project, permissions=["view_us"])
+    factories.MembershipFactory(user=user, project=project, role=role)
+    assert services.user_has_perm(user, "view_us", project)
+
+    role.permissions = []
+    role.save()
+    # The membership of the user is cached too
+    user.cached_membership_for_project(project).role.permissions = []
+
+    assert not services.user_has_perm(user, "view_us", project)
+
+
+def test_user_project_permissions_are_invalidated_explicitly():
+    user = factories.UserFactory()
+    project = factories.ProjectFactory(anon_permissions=[], public_permissions=["view_us"])
+    assert services.user_has_perm(user, "view_us", project)
+
+    project.public_permissions = []
+    assert services.user_has_perm(user, "view_us", project)
+
+    services.invalidate_permissions_cache(user)
+    assert not services.user_has_perm(user, "view_us", project)
+
+
+def test_permission_checks_do_not_add_queries_per_object_in_list_views(client):
+    user = factories.UserFactory()
+    project = factories.ProjectFactory(anon_permissions=[], public_permissions=[])
+    role = factories.RoleFactory(project=project,
+                                 permissions=list(map(lambda x: x[0], choices.MEMBERS_PERMISSIONS)))
+    factories.MembershipFactory(user=user, project=project, role=role)
+    url = reverse("userstories-list") + "?project={}".format(project.id)
+
+    def count_list_queries():
+        client.login(user)
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url)
+        assert response.status_code == 200
+        return len(captured)
+
+    factories.UserStoryFactory.create_batch(2, project=project, owner=user)
+    queries = count_list_queries()
+
+    factories.UserStoryFactory.create_batch(8, project=project, owner=user)
+    assert count_list_queries() == queries
@@ -10,13 +10,16 @@ from django.conf import settings
 from django.core.files import File
 from django.core import mail
 from django.core import signing
+from django.core.cache import cache
 
 from taiga.base import exceptions as exc
 from taiga.base.utils import json
+from taiga.projects import utils as project_utils
+from taiga.projects.services import config_cache
 from taiga.projects.services import stats as stats_services
 from taiga.projects.history.services import take_snapshot
 from taiga.permissions.choices import ANON_PERMISSIONS
-from taiga.projects.models import Project, Swimlane
+from taiga.projects.models import Project, ProjectCacheVersion, Swimlane
 from taiga.projects.userstories.models import UserStory
 from taiga.projects.tasks.models import Task
 from taiga.projects.issues.models import Issue
@@ -2934,3 +2937,68 @@ def test_swimlane_userstory_statuses_creation_when_a_new_user_story_status_is_cr
 
     assert swimlane2.statuses.count() == 3
     assert swimlane2.statuses.all()[2].wip_limit is None
+
+
+def test_get_project_detail_uses_cached_config(client):
+    project = f.create_project(is_private=False,
+                               anon_permissions=['view_project'],
+                               public_permissions=['view_project'])
+    f.MembershipFactory.create(project=project, user=project.owner, is_admin=True)
+    url = reverse("projects-detail", kwargs={"pk": project.id})
+
+    with mock.patch("taiga.projects.services.config_cache.project_utils.attach_config_info",
+                    wraps=project_utils.attach_config_info) as attach_config_info_mock:
+        response = client.json.get(url)
+        assert response.status_code == 200
+        response = client.json.get(url)
+        assert response.status_code == 200
+        assert attach_config_info_mock.call_count == 1
+
+        status = f.UserStoryStatusFactory.create(project=project)
+        response = client.json.get(url)
+        assert response.status_code == 200
+        assert attach_config_info_mock.call_count == 2
+        assert status.id in [us_status["id"] for us_status in response.data["us_statuses"]]
+
+        # The orders are updated without signals
+        client.login(project.owner)
+        data = {"bulk_userstory_statuses": [(status.id, 0)], "project": project.id}
+        response = client.json.post(reverse("userstory-statuses-bulk-update-order"), json.dumps(data))
+        assert response.status_code == 204
+        response = client.json.get(url)
+        assert attach_config_info_mock.call_count == 3
+
+
+def test_get_project_stats_uses_cached_stats(client):
+    project = f.create_project(is_private=False,
+                               anon_permissions=['view_project'],
+                               public_permissions=['view_project'])
+    url = reverse("projects-stats", kwargs={"pk": project.id})
+
+    with mock.patch("taiga.projects.services.stats.get_stats_for_project",
+                    wraps=stats_services.get_stats_for_project) as get_stats_for_project_mock:
+        response = client.json.get(url)
+        assert response.status_code == 200
+        response = client.json.get(url)
+        assert response.status_code == 200
+        assert get_stats_for_project_mock.call_count == 1
+
+        f.MilestoneFactory.create(project=project)
+        response = client.json.get(url)
+        assert response.status_code == 200
+        assert get_stats_for_project_mock.call_count == 2
+        assert len(response.data["milestones"]) == 2
+
+
+def test_project_cache_version_is_shared_by_the_processes():
+    project = f.ProjectFactory.create()
+    version = config_cache.get_project_config_version(project.id)
+    assert ProjectCacheVersion.objects.get(project=project, name="config").version.hex == version
+
+    # As in another process, with its own cache
+    cache.clear()
+    assert config_cache.get_project_config_version(project.id) == version
+
+    config_cache.bump_project_config_version(project.id)
+    cache.clear()
+    assert config_cache.get_project_config_version(project.id) != version
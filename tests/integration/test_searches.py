@@ -7,11 +7,14 @@
 
 import pytest
 
+from django.core.management import call_command
+from django.db import connection
 from django.urls import reverse
 
 from .. import factories as f
 
 from taiga.permissions.choices import MEMBERS_PERMISSIONS
+from taiga.searches import services
 from tests.utils import disconnect_signals, reconnect_signals
 
 
@@ -140,3 +143,86 @@ def test_search_text_query_with_an_invalid_project_id(client, searches_initial_d
 
     response = client.get(reverse("search-list"), {"project": "new", "text": "future"})
     assert response.status_code == 404
+
+
+def _get_search_vector(table, pk):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT search_vector::text FROM {} WHERE id = %s".format(table), [pk])
+        return cursor.fetchone()[0]
+
+
+def test_search_vector_is_updated_on_save():
+    issue = f.IssueFactory(subject="Flux capacitor", description="", tags=[])
+    vector = _get_search_vector("issues_issue", issue.id)
+    assert "'flux':1A" in vector
+    assert "'capacitor':2A" in vector
+
+    issue.subject = "Delorean"
+    issue.tags = ["plutonium"]
+    issue.save()
+    vector = _get_search_vector("issues_issue", issue.id)
+    assert "flux" not in vector
+    assert "'delorean':1A" in vector
+    assert "'plutonium'" in vector
+
+    wikipage = f.WikiPageFactory(slug="time-machine", content="Hill Valley")
+    vector = _get_search_vector("wiki_wikipage", wikipage.id)
+    assert "'hill':" in vector and "'valley':" in vector
+
+
+def test_rebuild_search_vectors(client, searches_initial_data):
+    data = searches_initial_data
+
+    with connection.cursor() as cursor:
+        for table in services.SEARCHABLE_TABLES:
+            # Bypass the trigger to simulate stale vectors
+            cursor.execute("ALTER TABLE {table} DISABLE TRIGGER {table}_search_vector_update".format(table=table))
+            cursor.execute("UPDATE {} SET search_vector = NULL".format(table))
+            cursor.execute("ALTER TABLE {table} ENABLE TRIGGER {table}_search_vector_update".format(table=table))
+
+    client.login(data.member1.user)
+    response = client.get(reverse("search-list"), {"project": data.project1.id, "text": "future"})
+    assert response.status_code == 200
+    assert response.data["count"] == 0
+
+    call_command("rebuild_search_vectors", project=data.project1.id)
+
+    response = client.get(reverse("search-list"), {"project": data.project1.id, "text": "future"})
+    assert response.status_code == 200
+    assert response.data["count"] == 12
+    assert _get_search_vector("epics_epic", data.epic21.id) is None
+
+    call_command("rebuild_search_vectors")
+    assert _get_search_vector("epics_epic", data.epic21.id) is not None
+
+
+def test_stored_search_vector_matches_the_computed_one():
+    from django.utils import timezone
+    from taiga.projects.issues.models import Issue
+
+    project = f.ProjectFactory.create()
+    issue = f.IssueFactory.create(project=project)
+    words = ["back", "future", "delorean", "flux", "capacitor", "plutonium", "marty", "doc"]
+    Issue.objects.bulk_create([
+        Issue(project=project, owner=issue.owner, status=issue.status, severity=issue.severity,
+              priority=issue.priority, type=issue.type, ref=1000 + i,
+              subject=" ".join(words[i % 8:] + words[:i % 8]),
+              description="Description {}".format(i), tags=[words[i % 8]],
+              modified_date=timezone.now())
+        for i in range(40)
+    ])
+
+    on_the_fly = """
+        setweight(to_tsvector('simple', coalesce(issues_issue.subject) || ' ' || coalesce(issues_issue.ref)), 'A') ||
+        setweight(to_tsvector('simple', coalesce(inmutable_array_to_string(issues_issue.tags))), 'B') ||
+        setweight(to_tsvector('simple', coalesce(issues_issue.description)), 'C')
+    """
+
+    results = {}
+    for name, tsvector in (("on the fly", on_the_fly), ("stored", "issues_issue.search_vector")):
+        queryset = Issue.objects.filter(project_id=project.id)
+        results[name] = [i.id for i in services._search_by_query(queryset, "to_tsquery('simple', %s)",
+                                                                 tsvector, "plutonium")]
+
+    assert len(results["stored"]) == 40
+    assert sorted(results["stored"]) == sorted(results["on the fly"])
@@ -6,11 +6,21 @@
 # Copyright (c) 2021-present Kaleidos INC
 
 import pytest
+import uuid
+
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from .. import factories as f
 from tests.utils import disconnect_signals, reconnect_signals
 
 from taiga.projects.services.stats import get_stats_for_project
+from taiga.projects.services.stats import get_cached_stats_for_project
+from taiga.projects.services.stats import bump_project_stats_version
+from taiga.projects.models import ProjectCacheVersion
 
 
 pytestmark = pytest.mark.django_db
@@ -148,3 +158,64 @@ def test_project_assigned_points(client, data):
     data.user_story4.save()
     project_stats = get_stats_for_project(data.project)
     assert project_stats["assigned_points_per_role"] == {data.role1.pk: 63, data.role2.pk: 0}
+
+
+def test_project_team_and_client_increments():
+    project = f.ProjectFactory.create(total_milestones=3)
+    role = f.RoleFactory.create(project=project)
+    points = f.PointsFactory.create(project=project, value=4)
+    f.MilestoneFactory.create(project=project, estimated_start=date(2021, 1, 1),
+                              estimated_finish=date(2021, 1, 15))
+    f.MilestoneFactory.create(project=project, estimated_start=date(2021, 1, 15),
+                              estimated_finish=date(2021, 1, 29))
+
+    def _create_user_story(day, **kwargs):
+        created_date = datetime(2021, 1, 1, 12, tzinfo=dt_timezone.utc) + timedelta(days=day - 1)
+        user_story = f.UserStoryFactory.create(project=project, milestone=None,
+                                               created_date=created_date, **kwargs)
+        user_story.role_points.filter(role=role).update(points=points)
+
+    # In the first sprint, in the second one, after all the sprints and not a requirement
+    _create_user_story(10, team_requirement=True)
+    _create_user_story(15, client_requirement=True)
+    _create_user_story(32, team_requirement=True, client_requirement=True)
+    _create_user_story(20)
+
+    project_stats = get_stats_for_project(project)
+    assert project_stats["defined_points"] == 16
+    assert [(m["team-increment"], m["client-increment"]) for m in project_stats["milestones"]] == [
+        (0, 0), (4, 0), (6, 6), (6, 6)
+    ]
+
+
+def test_project_stats_queries(data):
+    with CaptureQueriesContext(connection) as captured:
+        get_stats_for_project(data.project)
+    # The estimations, the extra requirements and the milestones
+    assert len(captured) == 3
+
+
+def test_project_cached_stats(data):
+    with mock.patch("taiga.projects.services.stats.get_stats_for_project",
+                    wraps=get_stats_for_project) as get_stats_for_project_mock:
+        project_stats = get_cached_stats_for_project(data.project)
+        assert get_cached_stats_for_project(data.project) == project_stats
+        assert get_stats_for_project_mock.call_count == 1
+
+        data.user_story1.role_points.filter(role=data.role1).update(points=data.points6)
+        bump_project_stats_version(data.project.id)
+        project_stats = get_cached_stats_for_project(data.project)
+        assert get_stats_for_project_mock.call_count == 2
+        assert project_stats["defined_points_per_role"] == {data.role1.pk: 94, data.role2.pk: 0}
+
+
+def test_project_cached_stats_bumped_by_another_process(data):
+    with mock.patch("taiga.projects.services.stats.get_stats_for_project",
+                    wraps=get_stats_for_project) as get_stats_for_project_mock:
+        get_cached_stats_for_project(data.project)
+        assert get_stats_for_project_mock.call_count == 1
+
+        # The version is not in the cache of this process
+        ProjectCacheVersion.objects.filter(project=data.project, name="stats").update(version=uuid.uuid4())
+        get_cached_stats_for_project(data.project)
+        assert get_stats_for_project_mock.call_count == 2
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+import json
+import pickle
+import pytest
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+
+from taiga.base.utils import task_args
+from taiga.projects.history import services as history_services
+from taiga.projects.history.models import HistoryEntry
+
+from .. import factories as f
+
+pytestmark = pytest.mark.django_db
+
+
+def test_dump_and_load_instances():
+    user = f.UserFactory.create()
+    us1 = f.UserStoryFactory.create()
+    us2 = f.UserStoryFactory.create()
+
+    refs = json.loads(json.dumps([task_args.dump_instance(us1),
+                                  task_args.dump_instance(user),
+                                  None,
+                                  task_args.dump_instance(us2),
+                                  task_args.dump_instance_pk(type(us2), -1)]))
+
+    with CaptureQueriesContext(connection) as captured:
+        instances = task_args.load_instances(*refs)
+
+    # One query per model
+    assert len(captured) == 2
+    assert instances == [us1, user, None, us2, None]
+
+
+
+def test_dump_lazy_instance():
+    user = f.UserFactory.create()
+    lazy_user = SimpleLazyObject(lambda: user)
+
+    assert task_args.dump_instance(lazy_user) == task_args.dump_instance(user)
+    assert task_args.load_instances(task_args.dump_instance(lazy_user)) == [user]
+
+def test_dump_value():
+    date = timezone.datetime(2021, 3, 4, 5, 6, 7, 123456, tzinfo=timezone.utc)
+    assert task_args.dump_value({"date": date, "ids": (1, 2)}) == {"date": "2021-03-04T05:06:07.123Z", "ids": [1, 2]}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_webhooks_tasks_arguments_are_json(settings):
+    settings.WEBHOOKS_ENABLED = True
+    project = f.ProjectFactory()
+    f.WebhookFactory.create(project=project)
+    us = f.UserStoryFactory.create(project=project)
+
+    with patch("taiga.webhooks.signal_handlers._execute_task") as execute_task_mock:
+        history_services.take_snapshot(us, user=us.owner)
+        us.subject = "test"
+        us.save()
+        history_services.take_snapshot(us, user=us.owner, comment="test")
+        history_services.take_snapshot(us, user=us.owner, delete=True)
+
+    assert execute_task_mock.call_count == 3
+    for call in execute_task_mock.call_args_list:
+        webhooks_args = call[0][1]
+        assert json.loads(json.dumps(webhooks_args)) == webhooks_args
+
+
+def test_tasks_messages_are_smaller_than_pickled_instances():
+    user = f.UserFactory.create()
+    project = f.ProjectFactory.create(owner=user)
+    us = f.UserStoryFactory.create(project=project, owner=user, description="test " * 200)
+    history_services.take_snapshot(us, user=user)
+    us.subject = "test"
+    us.save()
+    history_entry = history_services.take_snapshot(us, user=user, comment="test")
+    history_entry = HistoryEntry.objects.get(id=history_entry.id)
+    date = timezone.now()
+
+    # Arguments of a webhook change task
+    pickle_size = len(pickle.dumps([1, "http://example.com", "key", user, date, us, history_entry]))
+    json_size = len(json.dumps([1, "http://example.com", "key",
+                                task_args.dump_instance(user),
+                                task_args.dump_value(date),
+                                task_args.dump_instance(us),
+                                task_args.dump_instance(history_entry)]).encode())
+    assert json_size < pickle_size
@@ -13,6 +13,8 @@ from urllib.parse import quote
 
 from unittest import mock
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -968,6 +970,28 @@ def test_api_filters_data(client):
     assert next(filter(lambda i: i['name'] == tag3, response.data["tags"]))["count"] == 3
 
 
+def test_get_tasks_filters_data_in_a_single_query():
+    data = create_tasks_fixtures()
+    project = data["project"]
+    (user1, user2, user3, ) = data["users"]
+    (status0, status1, status2, status3, ) = data["statuses"]
+
+    queryset = Task.objects.filter(project=project)
+    querysets = {name: queryset.filter(owner=user2)
+                 for name in ("statuses", "assigned_to", "owners", "tags", "roles")}
+    querysets["statuses"] = queryset
+
+    with CaptureQueriesContext(connection) as captured:
+        filters_data = services.get_tasks_filters_data(project, querysets)
+    assert len(captured) == 1
+
+    statuses = {status["id"]: status["count"] for status in filters_data["statuses"]}
+    assert [statuses[status.id] for status in (status0, status1, status2, status3)] == [3, 2, 1, 4]
+
+    owners = {owner["id"]: owner["count"] for owner in filters_data["owners"]}
+    assert owners == {user2.id: 4}
+
+
 def test_api_validator_assigned_to_when_update_tasks(client):
     project = f.create_project(anon_permissions=list(map(lambda x: x[0], ANON_PERMISSIONS)),
                                public_permissions=list(map(lambda x: x[0], ANON_PERMISSIONS)))
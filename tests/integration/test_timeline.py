@@ -10,6 +10,7 @@ import pytest
 
 from .. import factories
 from django.contrib.auth.models import AnonymousUser
+from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 from taiga.timeline.service import build_project_namespace, build_user_namespace, get_timeline
 from taiga.projects.history import services as history_services
@@ -34,6 +35,43 @@ def test_add_to_object_timeline():
     assert Timeline.objects.order_by("-id")[0].data == id(task)
 
 
+def test_add_to_objects_timeline_in_bulk(django_assert_num_queries):
+    Timeline.objects.all().delete()
+    user1 = factories.UserFactory()
+    user2 = factories.UserFactory()
+    task = factories.TaskFactory()
+    project = task.project
+
+    service.register_timeline_implementation("tasks.task", "test", lambda x, extra_data=None: id(x))
+
+    entries = [
+        (project, build_project_namespace(project)),
+        (user1, build_user_namespace(user1)),
+        (user2, build_user_namespace(user1)),
+    ]
+    # Warm up the content types cache
+    ContentType.objects.get_for_models(project, user1, task)
+
+    with django_assert_num_queries(1):
+        service._add_to_objects_timeline_in_bulk(entries, task, "test", task.created_date)
+
+    assert Timeline.objects.filter(event_type="tasks.task.test").count() == 3
+    assert Timeline.objects.filter(namespace=build_project_namespace(project),
+                                   event_type="tasks.task.test").count() == 1
+    assert Timeline.objects.filter(namespace=build_user_namespace(user1),
+                                   event_type="tasks.task.test").count() == 2
+    assert set(Timeline.objects.filter(event_type="tasks.task.test").values_list("data", flat=True)) == {id(task)}
+
+
+def test_add_to_objects_timeline_in_bulk_without_entries(django_assert_num_queries):
+    task = factories.TaskFactory()
+
+    service.register_timeline_implementation("tasks.task", "test", lambda x, extra_data=None: id(x))
+
+    with django_assert_num_queries(0):
+        assert service._add_to_objects_timeline_in_bulk([], task, "test", task.created_date) == []
+
+
 def test_get_timeline():
     Timeline.objects.all().delete()
 
@@ -669,3 +707,41 @@ def _helper_get_timelines_for_accessing_users(project, users):
             timeline_counts['user_timelines'][users.index(accessing_user)].append(user_timeline.count())
 
     return timeline_counts
+
+
+def test_push_to_timelines_fan_out_in_bulk():
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    project = factories.ProjectFactory.create()
+    user_story = factories.UserStoryFactory.create(project=project)
+    watchers = factories.UserFactory.create_batch(5)
+    entries = [(project, build_project_namespace(project))]
+    entries += [(watcher, build_user_namespace(project.owner)) for watcher in watchers]
+
+    service.register_timeline_implementation("userstories.userstory", "fanout",
+                                             lambda x, extra_data=None: {"id": x.id})
+
+    with CaptureQueriesContext(connection) as captured:
+        service._add_to_objects_timeline_in_bulk(entries, user_story, "fanout", user_story.created_date)
+
+    inserts = [query for query in captured if query["sql"].startswith("INSERT")]
+    assert len(inserts) == 1
+    assert Timeline.objects.filter(event_type="userstories.userstory.fanout").count() == len(entries)
+
+
+def test_push_to_timelines_with_a_json_date():
+    from taiga.base.utils.task_args import dump_value
+
+    project = factories.ProjectFactory.create()
+    user_story = factories.UserStoryFactory.create(project=project, owner=project.owner)
+    Timeline.objects.all().delete()
+    created_datetime = timezone.now().replace(microsecond=0)
+
+    # The celery tasks get the dates as JSON strings
+    service.push_to_timelines(project.id, project.owner.id, "userstories", "userstory", user_story.id,
+                              "create", dump_value(created_datetime))
+
+    timeline = Timeline.objects.get(event_type="userstories.userstory.create",
+                                    namespace=build_project_namespace(project))
+    assert timeline.created == created_datetime
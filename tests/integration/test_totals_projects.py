@@ -12,7 +12,14 @@ import datetime
 from .. import factories as f
 
 from taiga.projects.history.choices import HistoryType
-from taiga.projects.models import Project
+from taiga.projects.models import Project, ProjectDailyTotals
+from taiga.projects.services import check_daily_totals, rebuild_daily_totals
+from taiga.timeline.models import Timeline
+from taiga.timeline.service import build_project_namespace
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import CommandError
 
 from django.urls import reverse
 from django.utils import timezone
@@ -148,3 +155,85 @@ def test_project_totals_updated_on_like(client):
     assert project.total_fans_last_month == 2
     assert project.total_fans_last_year == 3
     assert project.totals_updated_datetime > totals_updated_datetime
+
+
+def _daily_totals(project):
+    return {(t.day, t.fans, t.activity) for t in ProjectDailyTotals.objects.filter(project=project)}
+
+
+def test_project_daily_totals_are_updated_on_bulk_insert_and_delete():
+    project = f.create_project()
+    other_project = f.create_project()
+    now = timezone.now()
+    yesterday = now - datetime.timedelta(days=1)
+    content_type = ContentType.objects.get_for_model(project)
+
+    Timeline.objects.bulk_create([
+        Timeline(content_object=project, namespace=build_project_namespace(project), event_type="test",
+                 project=project, data={}, data_content_type=content_type, created=created)
+        for created in [now, now, yesterday]
+    ] + [
+        Timeline(content_object=project, namespace="user:1", event_type="test",
+                 project=project, data={}, data_content_type=content_type, created=now)
+    ])
+
+    assert _daily_totals(project) == {(now.date(), 0, 2), (yesterday.date(), 0, 1)}
+    assert _daily_totals(other_project) == set()
+
+    like = f.LikeFactory.create(content_object=project)
+    assert _daily_totals(project) == {(now.date(), 1, 2), (yesterday.date(), 0, 1)}
+
+    like.created_date = yesterday
+    like.save()
+    assert _daily_totals(project) == {(now.date(), 0, 2), (yesterday.date(), 1, 1)}
+
+    Timeline.objects.filter(project=project, created=yesterday).delete()
+    like.delete()
+    assert _daily_totals(project) == {(now.date(), 0, 2), (yesterday.date(), 0, 0)}
+    assert check_daily_totals([project.id]) == []
+
+
+def test_project_refresh_totals_reads_the_daily_totals(django_assert_num_queries):
+    project = f.create_project()
+    now = timezone.now()
+    for days in [0, 10, 100, 1000]:
+        l = f.LikeFactory.create(content_object=project)
+        l.created_date = now - datetime.timedelta(days=days)
+        l.save()
+
+    project = Project.objects.get(id=project.id)
+    # One aggregate over the daily totals, the rest are from Project.save
+    with django_assert_num_queries(3):
+        project.refresh_totals()
+
+    assert project.total_fans == 4
+    assert project.total_fans_last_week == 1
+    assert project.total_fans_last_month == 2
+    assert project.total_fans_last_year == 3
+
+
+def test_rebuild_and_check_project_daily_totals():
+    project = f.create_project()
+    f.LikeFactory.create(content_object=project)
+    Timeline.objects.create(content_object=project, namespace=build_project_namespace(project),
+                            event_type="test", project=project, data={},
+                            data_content_type=ContentType.objects.get_for_model(project))
+    today = timezone.now().date()
+
+    ProjectDailyTotals.objects.filter(project=project).update(fans=10, activity=0)
+    assert check_daily_totals([project.id]) == [(project.id, today, 1, 10, 1, 0)]
+
+    with pytest.raises(CommandError):
+        call_command("rebuild_project_totals", check=True, projects=[project.id])
+
+    rebuild_daily_totals([project.id])
+    assert check_daily_totals() == []
+    assert _daily_totals(project) == {(today, 1, 1)}
+
+    ProjectDailyTotals.objects.filter(project=project).delete()
+    call_command("rebuild_project_totals", projects=[project.id])
+    call_command("rebuild_project_totals", check=True)
+
+    project = Project.objects.get(id=project.id)
+    assert project.total_fans == 1
+    assert project.total_activity == 1
@@ -8,6 +8,7 @@
 import pytest
 import datetime
 from tempfile import NamedTemporaryFile
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
@@ -27,6 +28,7 @@ from taiga.auth.tokens import AccessToken, CancelToken
 from taiga.permissions.choices import MEMBERS_PERMISSIONS, ANON_PERMISSIONS
 from taiga.projects import choices as project_choices
 from taiga.users.services import get_watched_list, get_voted_list, get_liked_list
+from taiga.users.services import get_user_photo_url
 from taiga.projects.notifications.choices import NotifyLevel
 from taiga.projects.notifications.models import NotifyPolicy
 
@@ -440,6 +442,36 @@ def test_change_avatar_with_long_file_name(client):
         assert response.status_code == 200
 
 
+def test_change_avatar_generates_the_thumbnails(client):
+    url = reverse('users-change-avatar')
+    user = f.UserFactory()
+
+    with NamedTemporaryFile(suffix=".bmp") as avatar:
+        avatar.write(DUMMY_BMP_DATA)
+        avatar.seek(0)
+
+        client.login(user)
+        post_data = {'avatar': avatar}
+        response = client.post(url, post_data)
+
+    assert response.status_code == 200
+    user.refresh_from_db()
+    assert user.photo_thumbnails["source"] == user.photo.name
+    assert response.data["photo"] == get_thumbnail_url(user.photo, settings.THN_AVATAR_SMALL)
+    assert response.data["big_photo"] == get_thumbnail_url(user.photo, settings.THN_AVATAR_BIG)
+
+
+def test_user_photo_url_while_the_thumbnails_are_pending():
+    user = f.UserFactory()
+    models.User.objects.filter(id=user.id).update(photo="user/photo.bmp",
+                                                  photo_thumbnails={"source": "user/photo.bmp", "aliases": {}})
+    user.refresh_from_db()
+
+    with mock.patch("taiga.base.utils.thumbnails.get_thumbnailer") as get_thumbnailer_mock:
+        assert get_user_photo_url(user) is None
+    assert not get_thumbnailer_mock.called
+
+
 @pytest.mark.django_db(transaction=True)
 def test_change_avatar_removes_the_old_one(client):
     url = reverse('users-change-avatar')
@@ -7,15 +7,19 @@
 
 import uuid
 import csv
+import io
 
 from datetime import timedelta
 from urllib.parse import quote
 
 from unittest import mock
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
 from taiga.base.utils import json
+from taiga.base.utils.iterators import iter_queryset_in_batches
 from taiga.permissions.choices import MEMBERS_PERMISSIONS, ANON_PERMISSIONS
 from taiga.projects.occ import OCCResourceMixin
 from taiga.projects.userstories import services, models
@@ -117,11 +121,13 @@ def test_update_userstories_order_in_bulk():
     us2 = f.UserStoryFactory.create(project=project, backlog_order=2)
     data = [{"us_id": us1.id, "order": 2}, {"us_id": us2.id, "order": 1}]
 
-    with mock.patch("taiga.projects.userstories.services.db") as db:
-        services.update_userstories_order_in_bulk(data, "backlog_order", project)
-        db.update_attr_in_bulk_for_ids.assert_called_once_with({us2.id: 1, us1.id: 2},
-                                                                "backlog_order",
-                                                                models.UserStory)
+    updated = services.update_userstories_order_in_bulk(data, "backlog_order", project)
+    assert updated == {us2.id: 1, us1.id: 2}
+
+    us1.refresh_from_db()
+    us2.refresh_from_db()
+    assert us1.backlog_order == 2
+    assert us2.backlog_order == 1
 
 
 def test_create_userstory_with_assign_to(client):
@@ -1199,6 +1205,33 @@ def test_api_filters_data_roles_with_assigned_users(client):
                        response.data["roles"]))["count"] == 1
 
 
+def test_get_userstories_filters_data_in_a_single_query():
+    data = create_uss_fixtures()
+    project = data["project"]
+    (user1, user2, user3, ) = data["users"]
+    (status0, status1, status2, status3, ) = data["statuses"]
+    (epic0, epic1, epic2, ) = data["epics"]
+
+    # Every facet is computed from its own queryset
+    queryset = models.UserStory.objects.filter(project=project)
+    querysets = {name: queryset.filter(status=status3)
+                 for name in ("assigned_to", "assigned_users", "owners", "tags", "epics", "roles")}
+    querysets["statuses"] = queryset
+
+    with CaptureQueriesContext(connection) as captured:
+        filters_data = services.get_userstories_filters_data(project, querysets)
+    assert len(captured) == 1
+
+    statuses = {status["id"]: status["count"] for status in filters_data["statuses"]}
+    assert [statuses[status.id] for status in (status0, status1, status2, status3)] == [3, 2, 1, 4]
+
+    owners = {owner["id"]: owner["count"] for owner in filters_data["owners"]}
+    assert owners == {user1.id: 1, user2.id: 2, user3.id: 1}
+
+    epics = {epic["id"]: epic["count"] for epic in filters_data["epics"]}
+    assert epics == {None: 1, epic0.id: 2, epic1.id: 0, epic2.id: 2}
+
+
 def test_get_invalid_csv(client):
     url = reverse("userstories-csv")
     project = f.ProjectFactory.create()
@@ -1220,6 +1253,34 @@ def test_get_valid_csv(client):
     assert response.status_code == 200
 
 
+def test_get_valid_csv_is_streamed(client):
+    url = reverse("userstories-csv")
+    project = f.ProjectFactory.create(userstories_csv_uuid=uuid.uuid4().hex)
+    us1 = f.UserStoryFactory.create(project=project, subject="First")
+    us2 = f.UserStoryFactory.create(project=project, subject="Second")
+
+    response = client.get(
+        "{}?uuid={}".format(url, project.userstories_csv_uuid))
+    assert response.status_code == 200
+    assert response.streaming
+
+    content = b"".join(response.streaming_content).decode("utf-8")
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert [(int(row["id"]), row["subject"]) for row in rows] == [(us1.id, "First"), (us2.id, "Second")]
+
+
+def test_iter_queryset_in_batches_keeps_the_order(django_assert_num_queries):
+    project = f.ProjectFactory.create()
+    user_stories = [f.UserStoryFactory.create(project=project) for i in range(5)]
+    queryset = project.user_stories.all().order_by("-ref").prefetch_related("attachments")
+
+    # The ids query and two queries (objects + prefetch) for every batch
+    with django_assert_num_queries(1 + 3 * 2):
+        result = list(iter_queryset_in_batches(queryset, batch_size=2))
+
+    assert result == list(reversed(user_stories))
+
+
 def test_custom_fields_csv_generation():
     project = f.ProjectFactory.create(userstories_csv_uuid=uuid.uuid4().hex)
     attr = f.UserStoryCustomAttributeFactory.create(project=project,
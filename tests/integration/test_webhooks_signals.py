@@ -5,13 +5,18 @@
 #
 # Copyright (c) 2021-present Kaleidos INC
 
+import json
 import pytest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch
 from unittest.mock import Mock
 
 from .. import factories as f
 
 from taiga.projects.history import services
+from taiga.webhooks import tasks
+from taiga.webhooks.models import WebhookLog
 
 pytestmark = pytest.mark.django_db(transaction=True)
 
@@ -123,3 +128,112 @@ def test_send_request_one_webhook_signal(settings):
          patch("taiga.base.utils.urls.validate_private_url", return_value=True):
             services.take_snapshot(obj, user=obj.owner, comment="test", delete=True)
             assert session_send_mock.call_count == 1
+
+
+class WebhookStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append((self.client_address, self.path, json.loads(body)))
+
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def webhook_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WebhookStubHandler)
+    server.received = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_send_webhooks_to_a_local_server(settings, webhook_server):
+    settings.WEBHOOKS_ENABLED = True
+    settings.WEBHOOKS_ALLOW_PRIVATE_ADDRESS = True
+    project = f.ProjectFactory()
+    url = "http://127.0.0.1:{}/hook{{}}".format(webhook_server.server_port)
+    for i in range(3):
+        f.WebhookFactory.create(project=project, url=url.format(i))
+
+    obj = f.UserStoryFactory.create(project=project)
+    services.take_snapshot(obj, user=obj.owner)
+
+    assert sorted(path for address, path, data in webhook_server.received) == ["/hook0", "/hook1", "/hook2"]
+    # The same event through the same keep-alive connection
+    assert len({json.dumps(data, sort_keys=True) for address, path, data in webhook_server.received}) == 1
+    assert len({address for address, path, data in webhook_server.received}) == 1
+    assert WebhookLog.objects.filter(webhook__project=project, status=200).count() == 3
+
+
+def test_leftover_webhooklogs_are_removed(settings):
+    settings.WEBHOOKS_ENABLED = True
+    project = f.ProjectFactory()
+    webhooks = [f.WebhookFactory.create(project=project), f.WebhookFactory.create(project=project)]
+    for webhook in webhooks:
+        f.WebhookLogFactory.create_batch(12, webhook=webhook)
+
+    obj = f.UserStoryFactory.create(project=project)
+
+    response = Mock(status_code=200, headers={}, text="ok")
+    response.elapsed.total_seconds.return_value = 100
+
+    with patch("taiga.webhooks.tasks.requests.Session.send", return_value=response), \
+         patch("taiga.base.utils.urls.validate_private_url", return_value=True):
+        services.take_snapshot(obj, user=obj.owner)
+
+    for webhook in webhooks:
+        logs = WebhookLog.objects.filter(webhook=webhook).order_by("-id")
+        assert logs.count() == 10
+        assert logs[0].request_data["action"] == "create"
+
+
+def test_an_error_in_a_webhook_does_not_stop_the_others(settings):
+    settings.WEBHOOKS_ENABLED = True
+    project = f.ProjectFactory()
+    failing_webhook = f.WebhookFactory.create(project=project, url="http://failing.example.com")
+    webhook = f.WebhookFactory.create(project=project, url="http://working.example.com")
+
+    response = Mock(status_code=200, headers={}, text="ok")
+    response.elapsed.total_seconds.return_value = 100
+
+    def send(request, **kwargs):
+        if request.url.startswith(failing_webhook.url):
+            raise ValueError("unexpected error")
+        return response
+
+    obj = f.UserStoryFactory.create(project=project)
+
+    with patch("taiga.webhooks.tasks.requests.Session.send", side_effect=send), \
+         patch("taiga.base.utils.urls.validate_private_url", return_value=True):
+        services.take_snapshot(obj, user=obj.owner)
+
+    assert not WebhookLog.objects.filter(webhook=failing_webhook).exists()
+    assert WebhookLog.objects.filter(webhook=webhook, status=200).count() == 1
+
+
+def test_logs_of_deleted_webhooks_are_skipped(settings):
+    project = f.ProjectFactory()
+    webhook = f.WebhookFactory.create(project=project)
+    deleted_webhook = f.WebhookFactory.create(project=project)
+    webhooks = [{"id": w.id, "url": w.url, "key": w.key} for w in (webhook, deleted_webhook)]
+    deleted_webhook.delete()
+
+    response = Mock(status_code=200, headers={}, text="ok")
+    response.elapsed.total_seconds.return_value = 100
+
+    with patch("taiga.webhooks.tasks.requests.Session.send", return_value=response), \
+         patch("taiga.base.utils.urls.validate_private_url", return_value=True):
+        tasks._send_requests(webhooks, {"action": "test"})
+
+    assert WebhookLog.objects.filter(webhook=webhook).count() == 1
+    assert WebhookLog.objects.count() == 1
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2021-present Kaleidos INC
+
+import pytest
+
+from amqp.exceptions import AccessRefused, RecoverableConnectionError
+
+from taiga.events.backends import rabbitmq
+
+
+class FakeBroker:
+    def __init__(self):
+        self.connections = []
+        self.exchanges = []
+        self.messages = []
+        self.fail_next_publish = None
+        self.fail_on_message = {}
+
+    def connect(self, url):
+        connection = FakeConnection(self)
+        self.connections.append(connection)
+        return connection
+
+
+class FakeConnection:
+    def __init__(self, broker):
+        self.broker = broker
+        self.connected = False
+        self.channels = []
+
+    def connect(self):
+        self.connected = True
+
+    def channel(self):
+        rchannel = FakeChannel(self.broker)
+        self.channels.append(rchannel)
+        return rchannel
+
+    def close(self):
+        self.connected = False
+
+
+class FakeChannel:
+    def __init__(self, broker):
+        self.broker = broker
+        self.closed = False
+
+    def exchange_declare(self, exchange, type, auto_delete):
+        self.broker.exchanges.append(exchange)
+
+    def basic_publish(self, message, routing_key, exchange):
+        if self.broker.fail_next_publish is not None:
+            exc, self.broker.fail_next_publish = self.broker.fail_next_publish, None
+            raise exc
+        if message.body in self.broker.fail_on_message:
+            raise self.broker.fail_on_message.pop(message.body)
+        self.broker.messages.append((exchange, routing_key, message.body))
+
+    def close(self):
+        self.closed = True
+
+
+def _event(message, routing_key="changes.project.1.userstories", channel="events"):
+    return {"message": message, "routing_key": routing_key, "channel": channel}
+
+
+@pytest.fixture
+def broker():
+    return FakeBroker()
+
+
+@pytest.fixture
+def publisher(broker):
+    return rabbitmq.RabbitMQPublisher("//guest:guest@localhost/", connection_factory=broker.connect)
+
+
+def test_publisher_reuses_the_connection(broker, publisher):
+    publisher.publish([_event("1")])
+    publisher.publish([_event("2"), _event("3")])
+
+    assert len(broker.connections) == 1
+    assert len(broker.connections[0].channels) == 1
+    assert broker.exchanges == ["events"]
+    assert [m[2] for m in broker.messages] == ["1", "2", "3"]
+
+
+def test_publisher_reconnects_on_failure(broker, publisher):
+    publisher.publish([_event("1")])
+    broker.fail_next_publish = RecoverableConnectionError()
+    publisher.publish([_event("2")])
+
+    assert len(broker.connections) == 2
+    assert not broker.connections[0].connected
+    assert broker.connections[1].connected
+    assert [m[2] for m in broker.messages] == ["1", "2"]
+
+
+def test_publisher_gives_up_on_access_refused(broker, publisher):
+    broker.fail_next_publish = AccessRefused()
+    publisher.publish([_event("1")])
+
+    assert len(broker.connections) == 1
+    assert broker.messages == []
+
+
+def test_publisher_retries_only_the_events_not_sent(broker, publisher):
+    broker.fail_on_message["2"] = RecoverableConnectionError()
+    publisher.publish([_event("1"), _event("2"), _event("3")])
+
+    assert len(broker.connections) == 2
+    assert [m[2] for m in broker.messages] == ["1", "2", "3"]
+
+
+def test_get_publisher_is_shared_per_process():
+    url = "//guest:guest@localhost/test-get-publisher"
+    publisher = rabbitmq.get_publisher(url)
+    assert rabbitmq.get_publisher(url) is publisher
+
+    publisher.pid = -1  # As if the process had been forked
+    assert rabbitmq.get_publisher(url) is not publisher
@@ -7,9 +7,12 @@
 
 import pytest
 import io
+import os
 
 from taiga.base.utils import json
-from taiga.export_import.services import render_project
+from taiga.export_import import serializers
+from taiga.export_import.services import render_project, render_project_in_parts
+from taiga.projects.models import Project
 
 from tests.utils import disconnect_signals, reconnect_signals
 
@@ -57,3 +60,51 @@ def test_export_epic_with_user_stories(client):
 
     assert project_data["epics"][0]["related_user_stories"][0]["user_story"] == user_story.ref
     assert len(project_data["epics"][0]["related_user_stories"]) == 1
+
+
+def test_export_does_not_change_the_project_serializer(client):
+    user_story = f.UserStoryFactory.create()
+    render_project(user_story.project, io.BytesIO())
+
+    data = serializers.ProjectExportSerializer(user_story.project).data
+    assert [us["ref"] for us in data["user_stories"]] == [user_story.ref]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_export_project_in_parts(tmp_path, workers):
+    project = f.ProjectFactory.create()
+    f.UserStoryFactory.create(project=project)
+    f.TaskFactory.create(project=project)
+    f.IssueFactory.create(project=project)
+    f.WikiPageFactory.create(project=project)
+
+    output = io.BytesIO()
+    render_project(project, output)
+
+    # The files of the rendered project have been read to the end
+    project = Project.objects.get(id=project.id)
+
+    workdir = str(tmp_path / "parts")
+    partitioned_output = io.BytesIO()
+    render_project_in_parts(project, partitioned_output, workdir, workers=workers)
+
+    assert partitioned_output.getvalue() == output.getvalue()
+    assert not os.path.exists(workdir)
+
+
+def test_export_project_in_parts_resumes_from_manifest(tmp_path):
+    user_story = f.UserStoryFactory.create()
+    project = user_story.project
+
+    workdir = tmp_path / "parts"
+    workdir.mkdir()
+    (workdir / "user_stories.json.part").write_bytes(b'[\n{"subject": "rendered before the crash"}]')
+    (workdir / "tasks.json.part").write_bytes(b'[\n{"subject": "not in the manifest"}]')
+    (workdir / "manifest.json").write_text(json.dumps({"project": project.id, "parts": ["user_stories"]}))
+
+    output = io.BytesIO()
+    render_project_in_parts(project, output, str(workdir))
+    project_data = json.loads(output.getvalue())
+
+    assert project_data["user_stories"] == [{"subject": "rendered before the crash"}]
+    assert project_data["tasks"] == []
+    assert not workdir.exists()
@@ -5,12 +5,23 @@
 #
 # Copyright (c) 2021-present Kaleidos INC
 
+import base64
+import gzip
 import pytest
 import io
+import tracemalloc
 from .. import factories as f
 
 from taiga.base.utils import json
 from taiga.export_import.services import render_project, store_project_from_dict
+from taiga.export_import.services import store
+from taiga.projects.history.services import take_snapshot
+from taiga.projects.notifications.models import NotifyPolicy
+from taiga.projects.notifications.services import add_watcher
+from taiga.projects.references import sequences as seq
+from taiga.projects.references.models import make_sequence_name
+from taiga.export_import.services import read_dump_from_file
+from taiga.export_import.services.reader import InvalidDumpError, DumpSection
 
 pytestmark = pytest.mark.django_db(transaction=True)
 
@@ -44,3 +55,202 @@ def test_import_epic_with_user_stories(client):
     assert related_userstory.user_story.ref == user_story.ref
     assert related_userstory.order == 55
     assert related_userstory.epic.ref == epic.ref
+
+
+def _write_dump(path, data, compress=False):
+    content = json.dumps(data).encode("utf-8")
+    with open(path, "wb") as fd:
+        fd.write(gzip.compress(content) if compress else content)
+    return str(path)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_read_dump_streams_big_sections(tmp_path, compress):
+    path = _write_dump(tmp_path / "dump.json", {
+        "name": "Streamed project",
+        "user_stories": [{"ref": 1, "subject": "one"}, {"ref": 2, "subject": "two"}],
+        "memberships": [{"email": "test@test.com"}],
+        "timeline": [],
+        "is_private": True,
+    }, compress=compress)
+
+    dump = read_dump_from_file(path)
+
+    assert dict(dump) == {
+        "name": "Streamed project",
+        "memberships": [{"email": "test@test.com"}],
+        "is_private": True,
+    }
+    assert isinstance(dump.get("user_stories"), DumpSection)
+    assert [us["ref"] for us in dump.get("user_stories", [])] == [1, 2]
+    # Sections can be iterated more than once
+    assert [us["ref"] for us in dump["user_stories"]] == [1, 2]
+    assert list(dump.get("timeline", [])) == []
+    assert dump.get("tasks", []) == []
+
+
+@pytest.mark.parametrize("content", [b"test", b"[]", b'{"name": "Truncated", "user_stories": [{}'])
+def test_read_invalid_dump(tmp_path, content):
+    path = tmp_path / "dump.json"
+    path.write_bytes(content)
+
+    with pytest.raises(InvalidDumpError):
+        read_dump_from_file(str(path))
+
+
+def test_import_streamed_dump(tmp_path):
+    project = f.ProjectFactory()
+    project.default_points = f.PointsFactory.create(project=project)
+    project.default_issue_type = f.IssueTypeFactory.create(project=project)
+    project.default_issue_status = f.IssueStatusFactory.create(project=project)
+    project.default_epic_status = f.EpicStatusFactory.create(project=project)
+    project.default_us_status = f.UserStoryStatusFactory.create(project=project)
+    project.default_task_status = f.TaskStatusFactory.create(project=project)
+    project.default_priority = f.PriorityFactory.create(project=project)
+    project.default_severity = f.SeverityFactory.create(project=project)
+
+    epic = f.EpicFactory.create(project=project, status=project.default_epic_status)
+    task = f.TaskFactory.create(project=project, status=project.default_task_status, milestone=None,
+                                user_story=None)
+    user_story = f.UserStoryFactory.create(project=project, status=project.default_us_status, milestone=None,
+                                           generated_from_task=task)
+    f.RelatedUserStory.create(epic=epic, user_story=user_story, order=1)
+    f.WikiPageFactory.create(project=project)
+
+    path = tmp_path / "dump.json.gz"
+    with gzip.GzipFile(str(path), mode="wb") as outfile:
+        render_project(project, outfile)
+
+    project.delete()
+
+    project = store_project_from_dict(read_dump_from_file(str(path)))
+    assert project.epics.count() == 1
+    assert project.tasks.count() == 1
+    assert project.wiki_pages.count() == 1
+    assert project.user_stories.count() == 1
+    imported_user_story = project.user_stories.first()
+    assert imported_user_story.ref == user_story.ref
+    assert imported_user_story.generated_from_task.ref == task.ref
+    assert project.epics.first().user_stories.count() == 1
+
+
+def test_read_streamed_dump_does_not_load_the_whole_file(tmp_path):
+    attachment = base64.b64encode(b"x" * 16 * 1024).decode("utf-8")
+    path = _write_dump(tmp_path / "dump.json", {
+        "name": "Big project",
+        "user_stories": [
+            {"ref": i, "subject": "User story {}".format(i),
+             "attachments": [{"attached_file": {"name": "file.bin", "data": attachment}}]}
+            for i in range(200)
+        ],
+    })
+
+    def consume(dump):
+        for item in dump.get("user_stories", []):
+            pass
+
+    tracemalloc.start()
+    with open(path, "rb") as fd:
+        consume(json.loads(fd.read()))
+    _, load_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    consume(read_dump_from_file(path))
+    _, stream_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert stream_peak * 10 < load_peak
+
+
+def _create_project_with_defaults():
+    project = f.ProjectFactory()
+    project.default_points = f.PointsFactory.create(project=project)
+    project.default_issue_type = f.IssueTypeFactory.create(project=project)
+    project.default_issue_status = f.IssueStatusFactory.create(project=project)
+    project.default_epic_status = f.EpicStatusFactory.create(project=project)
+    project.default_us_status = f.UserStoryStatusFactory.create(project=project)
+    project.default_task_status = f.TaskStatusFactory.create(project=project)
+    project.default_priority = f.PriorityFactory.create(project=project)
+    project.default_severity = f.SeverityFactory.create(project=project)
+    project.save()
+    return project
+
+
+def test_import_user_stories_and_tasks_in_chunks(monkeypatch):
+    monkeypatch.setattr(store, "BULK_STORE_CHUNK_SIZE", 2)
+
+    project = _create_project_with_defaults()
+    role = f.RoleFactory.create(project=project, computable=True)
+    points = f.PointsFactory.create(project=project, value=3)
+    custom_attribute = f.UserStoryCustomAttributeFactory.create(project=project)
+    watcher = f.UserFactory.create()
+
+    user_stories = [f.UserStoryFactory.create(project=project, status=project.default_us_status,
+                                              milestone=None, owner=project.owner)
+                    for i in range(5)]
+    tasks = [f.TaskFactory.create(project=project, status=project.default_task_status, milestone=None,
+                                  user_story=us, owner=project.owner)
+             for us in user_stories]
+
+    user_story = user_stories[0]
+    user_story.role_points.filter(role=role).update(points=points)
+    user_story.custom_attributes_values.attributes_values = {str(custom_attribute.id): "value"}
+    user_story.custom_attributes_values.save()
+    user_story.assigned_users.add(watcher)
+    add_watcher(user_story, watcher)
+    take_snapshot(user_story, user=project.owner)
+
+    output = io.BytesIO()
+    render_project(project, output)
+    project_data = json.loads(output.getvalue())
+    project.delete()
+
+    project = store_project_from_dict(project_data)
+    assert project.user_stories.count() == 5
+    assert project.tasks.count() == 5
+    for task in tasks:
+        assert project.tasks.get(ref=task.ref).user_story.ref == task.user_story.ref
+
+    imported_user_story = project.user_stories.get(ref=user_story.ref)
+    assert imported_user_story.role_points.get(role__name=role.name).points.name == points.name
+    assert list(imported_user_story.assigned_users.all()) == [watcher]
+    assert watcher in imported_user_story.get_watchers()
+    assert NotifyPolicy.objects.filter(project=project, user=watcher).exists()
+    custom_attribute = project.userstorycustomattributes.get(name=custom_attribute.name)
+    assert imported_user_story.custom_attributes_values.attributes_values == {str(custom_attribute.id): "value"}
+
+    computable_roles = project.roles.filter(computable=True).count()
+    for us in project.user_stories.all():
+        assert us.custom_attributes_values is not None
+        assert us.role_points.count() == computable_roles
+
+    max_ref = max(project.user_stories.order_by("-ref").first().ref, project.tasks.order_by("-ref").first().ref)
+    assert seq.next_value(make_sequence_name(project)) > max_ref
+
+
+def test_import_user_stories_without_ref_in_a_later_chunk(monkeypatch):
+    monkeypatch.setattr(store, "BULK_STORE_CHUNK_SIZE", 2)
+
+    project = _create_project_with_defaults()
+    for i in range(4):
+        f.UserStoryFactory.create(project=project, status=project.default_us_status,
+                                  milestone=None, owner=project.owner)
+
+    output = io.BytesIO()
+    render_project(project, output)
+    project_data = json.loads(output.getvalue())
+    user_stories_data = sorted(project_data.pop("user_stories"), key=lambda data: data["ref"])
+    project.delete()
+
+    project = store_project_from_dict(project_data)
+    # The first chunk keeps its refs, the second one needs new refs
+    for data in user_stories_data[2:]:
+        data.pop("ref")
+    stored_ids = store.store_user_stories(project, {"user_stories": user_stories_data})
+
+    assert len(stored_ids) == 4
+    refs = list(project.user_stories.values_list("ref", flat=True))
+    assert len(set(refs)) == 4
+    kept_refs = [data["ref"] for data in user_stories_data[:2]]
+    assert min(set(refs) - set(kept_refs)) > max(kept_refs)
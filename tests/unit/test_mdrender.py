@@ -7,6 +7,7 @@
 
 from unittest.mock import patch, MagicMock
 
+from taiga.mdrender import service
 from taiga.mdrender.extensions import emojify
 from taiga.mdrender.extensions import refresh_attachment
 from taiga.mdrender.service import render, cache_by_sha, get_diff_of_htmls, render_and_extract
@@ -37,14 +38,15 @@ def test_proccessor_invalid_emoji():
 def test_mentions_valid_username():
     with patch("taiga.mdrender.extensions.mentions.get_user_model") as get_user_model_mock:
         dummy_uuser = MagicMock()
+        dummy_uuser.username = "hermione"
         dummy_uuser.get_full_name.return_value = "Hermione Granger"
-        get_user_model_mock.return_value.objects.get = MagicMock(return_value=dummy_uuser)
+        get_user_model_mock.return_value.objects.filter = MagicMock(return_value=[dummy_uuser])
 
         result = render(dummy_project, "text @hermione text")
 
-        get_user_model_mock.return_value.objects.get.assert_called_with(
+        get_user_model_mock.return_value.objects.filter.assert_called_once_with(
             memberships__project_id=1,
-            username="hermione",
+            username__in=["hermione"],
         )
         assert result == ('<p>text <a class="mention" href="http://localhost:9001/profile/hermione" '
                           'title="Hermione Granger">@hermione</a> text</p>')
@@ -53,14 +55,15 @@ def test_mentions_valid_username():
 def test_mentions_valid_username_with_points():
     with patch("taiga.mdrender.extensions.mentions.get_user_model") as get_user_model_mock:
         dummy_uuser = MagicMock()
+        dummy_uuser.username = "luna.lovegood"
         dummy_uuser.get_full_name.return_value = "Luna Lovegood"
-        get_user_model_mock.return_value.objects.get = MagicMock(return_value=dummy_uuser)
+        get_user_model_mock.return_value.objects.filter = MagicMock(return_value=[dummy_uuser])
 
         result = render(dummy_project, "text @luna.lovegood text")
 
-        get_user_model_mock.return_value.objects.get.assert_called_with(
+        get_user_model_mock.return_value.objects.filter.assert_called_once_with(
             memberships__project_id=1,
-            username="luna.lovegood",
+            username__in=["luna.lovegood"],
         )
         assert result == ('<p>text <a class="mention" href="http://localhost:9001/profile/luna.lovegood" '
                           'title="Luna Lovegood">@luna.lovegood</a> text</p>')
@@ -69,22 +72,24 @@ def test_mentions_valid_username_with_points():
 def test_mentions_valid_username_with_dash():
     with patch("taiga.mdrender.extensions.mentions.get_user_model") as get_user_model_mock:
         dummy_uuser = MagicMock()
+        dummy_uuser.username = "super-ginny"
         dummy_uuser.get_full_name.return_value = "Ginny Weasley"
-        get_user_model_mock.return_value.objects.get = MagicMock(return_value=dummy_uuser)
+        get_user_model_mock.return_value.objects.filter = MagicMock(return_value=[dummy_uuser])
 
         result = render(dummy_project, "text @super-ginny text")
 
-        get_user_model_mock.return_value.objects.get.assert_called_with(
+        get_user_model_mock.return_value.objects.filter.assert_called_once_with(
             memberships__project_id=1,
-            username="super-ginny",
+            username__in=["super-ginny"],
         )
         assert result == ('<p>text <a class="mention" href="http://localhost:9001/profile/super-ginny" '
                           'title="Ginny Weasley">@super-ginny</a> text</p>')
 
 
 def test_proccessor_valid_us_reference():
-    with patch("taiga.mdrender.extensions.references.get_instance_by_ref") as mock:
-        instance = mock.return_value
+    with patch("taiga.mdrender.extensions.references.get_instances_by_refs") as mock:
+        instance = MagicMock()
+        mock.return_value = {1: instance}
         instance.content_type.model = "userstory"
         instance.content_object.subject = "test"
         result = render(dummy_project, "**#1**")
@@ -93,8 +98,9 @@ def test_proccessor_valid_us_reference():
 
 
 def test_proccessor_valid_issue_reference():
-    with patch("taiga.mdrender.extensions.references.get_instance_by_ref") as mock:
-        instance = mock.return_value
+    with patch("taiga.mdrender.extensions.references.get_instances_by_refs") as mock:
+        instance = MagicMock()
+        mock.return_value = {2: instance}
         instance.content_type.model = "issue"
         instance.content_object.subject = "test"
         result = render(dummy_project, "**#2**")
@@ -103,8 +109,9 @@ def test_proccessor_valid_issue_reference():
 
 
 def test_proccessor_valid_task_reference():
-    with patch("taiga.mdrender.extensions.references.get_instance_by_ref") as mock:
-        instance = mock.return_value
+    with patch("taiga.mdrender.extensions.references.get_instances_by_refs") as mock:
+        instance = MagicMock()
+        mock.return_value = {3: instance}
         instance.content_type.model = "task"
         instance.content_object.subject = "test"
         result = render(dummy_project, "**#3**")
@@ -113,8 +120,9 @@ def test_proccessor_valid_task_reference():
 
 
 def test_proccessor_invalid_type_reference():
-    with patch("taiga.mdrender.extensions.references.get_instance_by_ref") as mock:
-        instance = mock.return_value
+    with patch("taiga.mdrender.extensions.references.get_instances_by_refs") as mock:
+        instance = MagicMock()
+        mock.return_value = {4: instance}
         instance.content_type.model = "other"
         instance.content_object.subject = "test"
         result = render(dummy_project, "**#4**")
@@ -122,8 +130,8 @@ def test_proccessor_invalid_type_reference():
 
 
 def test_proccessor_invalid_reference():
-    with patch("taiga.mdrender.extensions.references.get_instance_by_ref") as mock:
-        mock.return_value = None
+    with patch("taiga.mdrender.extensions.references.get_instances_by_refs") as mock:
+        mock.return_value = {5: None}
         result = render(dummy_project, "**#5**")
         assert result == "<p><strong>#5</strong></p>"
 
@@ -273,6 +281,44 @@ def test_cache_by_sha():
     assert result_a_1 == result_a_2  # Cached!
 
 
+def test_cache_by_sha_many():
+    calls = []
+
+    @cache_by_sha
+    def test_cache(project, text):
+        calls.append(text)
+        return time.time()
+
+    padding = "X" * 40  # Needed as cache is disabled for text under 40 chars
+
+    results_1 = test_cache.many(dummy_project, ["C" + padding, "B", "C" + padding])
+    results_2 = test_cache.many(dummy_project, ["C" + padding, "B"])
+
+    assert calls == ["C" + padding, "B", "B"]
+    assert results_1[0] == results_1[2] == results_2[0]  # Cached!
+    assert results_1[1] != results_2[1]  # No cached!
+
+
+def test_render_reuses_markdown_engines():
+    other_project = MagicMock()
+    other_project.id = 2
+    other_project.slug = "other"
+
+    render(dummy_project, "[[test]]")
+    with patch("taiga.mdrender.service._build_markdown", wraps=service._build_markdown) as build_mock:
+        result_1 = render(dummy_project, "[[test]]")
+        result_2 = render(other_project, "[[test]]")
+
+    assert build_mock.call_count == 0
+    assert "/project/test/wiki/test" in result_1
+    assert "/project/other/wiki/test" in result_2
+
+
+def test_render_resets_markdown_engines():
+    text = "text[^1]\n\n[^1]: note"
+    assert render(dummy_project, text) == render(dummy_project, text)
+
+
 def test_get_diff_of_htmls_insertions():
     result = get_diff_of_htmls("", "<p>test</p>")
     assert result == "<ins style=\"background:#e6ffe6;\">&lt;p&gt;test&lt;/p&gt;</ins>"
@@ -289,8 +335,9 @@ def test_get_diff_of_htmls_modifications():
 
 
 def test_render_and_extract_references():
-    with patch("taiga.mdrender.extensions.references.get_instance_by_ref") as mock:
-        instance = mock.return_value
+    with patch("taiga.mdrender.extensions.references.get_instances_by_refs") as mock:
+        instance = MagicMock()
+        mock.return_value = {1: instance}
         instance.content_type.model = "issue"
         instance.content_object.subject = "test"
         (_, extracted) = render_and_extract(dummy_project, "**#1**")
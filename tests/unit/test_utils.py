@@ -15,6 +15,7 @@ import re
 from taiga.base.utils.urls import get_absolute_url, is_absolute_url, build_url, \
     validate_private_url, IpAddresValueError, HostnameException
 from taiga.base.utils.db import save_in_bulk, update_in_bulk, to_tsquery
+from taiga.base.utils.csv_streams import iter_csv, csv_to_string_io
 
 pytestmark = pytest.mark.django_db(transaction=True)
 
@@ -140,3 +141,14 @@ def test_validate_invalid_destination_address(url):
 ])
 def test_validate_good_destination_address(url):
     assert validate_private_url(url) is None
+
+
+def test_iter_csv_in_chunks():
+    rows = [{"id": i, "name": "name, {}".format(i)} for i in range(100)]
+
+    chunks = list(iter_csv(["id", "name"], rows, chunk_size=100))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) < 200 for chunk in chunks)
+    assert "".join(chunks).splitlines()[:2] == ["id,name", '0,"name, 0"']
+    assert csv_to_string_io(iter(chunks)).getvalue() == "".join(chunks)